@@ -11,6 +11,8 @@ import streamlit as st
 import sys
 from streamlit_option_menu import option_menu
 
+from core import prerender, warmup
+
 # 1) Configuração básica da página
 st.set_page_config(
     page_title="L.P.B. — Portfólio | Lucas Brito",
@@ -19,6 +21,18 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# 1.1) Pré-renderiza as páginas estáticas (Home, Currículo, Governança) uma
+#      única vez por processo; as visitas seguintes só reenviam o payload pronto.
+prerender.warm_up()
+
+# 1.2) Aquece o processo (imports pesados, dados macro e caches das visões
+#      padrão da Macro Economia) — ver core/warmup.py. Com `python -m core.serve`
+#      o aquecimento já começou na subida do servidor; com `streamlit run`, começa
+#      aqui. Quem chegar durante o aquecimento espera por ele em vez de refazê-lo.
+if not warmup.status()["done"]:
+    with st.spinner("Preparando o app…"):
+        warmup.run()
+
 # 2) Sidebar — agora com option_menu
 with st.sidebar:
     st.title("📌 Menu")
@@ -30,11 +44,11 @@ with st.sidebar:
         options=[
             "Home",
             "Currículo",
-            "Dados & F1 (Em Breve)",
+            "Dados & F1",
             "Governança de Dados",
             "Macro Economia",
-         #   "Valuation (Em Breve)",
-         #   "Análise Quant",
+            "Valuation",
+            "Análise Quant",
         ],
         icons=[
             "house",
@@ -42,8 +56,8 @@ with st.sidebar:
             "car-front",
             "database",      
             "bar-chart-line",
-          #  "currency-dollar",
-          #  "graph-up-arrow"
+            "currency-dollar",
+            "graph-up-arrow",
         ], 
         menu_icon="cast",
         default_index=0,
@@ -57,11 +71,11 @@ st.markdown("# L.P.B. — Portfólio")
 routes = {
     "Home": "sections.Home",
     "Currículo": "sections.Curriculo",
-    "Dados & F1 (Em Breve)": "sections.Dados_F1",
+    "Dados & F1": "sections.Dados_F1",
     "Governança de Dados": "sections.Governanca_dados",
     "Macro Economia": "sections.Macro_economia",
-    # "Valuation": "sections.Valuation",
-    # "Análise Quant": "sections.Analise_quant",
+    "Valuation": "sections.Valuation",
+    "Análise Quant": "sections.Analise_quant",
 }
 
 module_path = routes.get(page)
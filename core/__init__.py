@@ -0,0 +1 @@
+"""Módulos de apoio compartilhados pelas seções do portfólio."""
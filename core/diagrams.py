@@ -0,0 +1,84 @@
+# core/diagrams.py
+# -------------------------------------------------------------
+# Renderização de diagramas Graphviz no servidor.
+#
+# O st.graphviz_chart manda o DOT para o navegador, que refaz o layout
+# a cada visita. Aqui o DOT é convertido UMA vez em SVG (binário `dot`),
+# guardado em memória e em disco pelo hash do conteúdo, e o SVG pronto
+# é servido direto. Se o `dot` não estiver instalado (ver packages.txt),
+# cai para o st.graphviz_chart de sempre.
+# -------------------------------------------------------------
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+
+import streamlit as st
+
+CACHE_DIR = os.path.join(".cache", "diagrams")
+DOT_TIMEOUT = 30  # segundos
+
+
+def dot_digest(dot: str) -> str:
+    """Hash do conteúdo DOT: muda o texto, muda o arquivo em cache."""
+    return hashlib.sha256(dot.encode("utf-8")).hexdigest()[:16]
+
+
+def _clean_svg(raw: str) -> str:
+    """Deixa o SVG do `dot` pronto para ir inline num bloco HTML do markdown."""
+    svg = raw[raw.index("<svg"):]
+    svg = re.sub(r"<!--.*?-->", "", svg, flags=re.S)
+    # Largura fluida: o viewBox mantém a proporção do desenho
+    svg = re.sub(r'<svg width="[^"]*" height="[^"]*"', '<svg width="100%"', svg, count=1)
+    # Linhas em branco encerrariam o bloco HTML no markdown
+    return "\n".join(line for line in svg.splitlines() if line.strip())
+
+
+@st.cache_resource(show_spinner=False)
+def _render_svg(digest: str, _dot: str) -> str | None:
+    path = os.path.join(CACHE_DIR, f"{digest}.svg")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    exe = shutil.which("dot")
+    if exe is None:
+        return None
+    try:
+        raw = subprocess.run(
+            [exe, "-Tsvg"],
+            input=_dot.encode("utf-8"),
+            capture_output=True,
+            timeout=DOT_TIMEOUT,
+            check=True,
+        ).stdout.decode("utf-8")
+        svg = _clean_svg(raw)
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None
+
+    # Cache em disco é só um bônus (sobrevive a reinícios); falha de escrita não importa
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(svg)
+    except OSError:
+        pass
+    return svg
+
+
+def render_svg(dot: str) -> str | None:
+    """SVG do diagrama (cacheado pelo hash do DOT) ou None se o Graphviz não estiver disponível."""
+    return _render_svg(dot_digest(dot), dot)
+
+
+def graphviz_chart(target, dot: str) -> None:
+    """Substituto do ``st.graphviz_chart`` que entrega o SVG já renderizado no servidor.
+
+    ``target`` pode ser o ``st``, um container ou um ``HtmlDoc`` da pré-renderização.
+    """
+    svg = render_svg(dot)
+    if svg is None:
+        target.graphviz_chart(dot, use_container_width=True)
+        return
+    target.markdown(f'<div style="overflow-x:auto">{svg}</div>', unsafe_allow_html=True)
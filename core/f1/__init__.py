@@ -0,0 +1 @@
+"""Subsistema de dados de Fórmula 1 (FastF1 → Parquet → página Dados & F1)."""
@@ -0,0 +1,176 @@
+# core/f1/compare.py
+# -------------------------------------------------------------
+# Motor de comparação de voltas/telemetria entre dois pilotos.
+#
+# A telemetria de cada volta vem com taxa de amostragem irregular, então
+# comparar dois pilotos exige alinhar tudo numa grade comum de distância.
+# Em vez de laços por linha no pandas, TODAS as voltas da sessão são
+# reamostradas de uma vez: cada volta ocupa o intervalo [g, g+1) de um
+# eixo "global" (g = índice da volta) e um único np.interp preenche a
+# matriz (n_voltas × n_pontos_da_grade) de cada canal.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.f1 import ingest
+
+GRID_STEP_M = 5.0       # resolução da grade de distância (metros)
+MIN_SAMPLES = 20        # voltas com menos amostras que isso são descartadas
+CHANNELS = ("speed", "throttle", "brake", "gear", "rpm")
+
+# Evita que o fim de uma volta encoste no início da seguinte no eixo global
+_SPAN = 1.0 - 1e-9
+
+
+def lap_grid(length_m: float, step: float = GRID_STEP_M) -> np.ndarray:
+    """Grade de distância [0, length_m] com passo ``step``."""
+    n = max(2, int(round(length_m / step)) + 1)
+    return np.linspace(0.0, float(length_m), n)
+
+
+def resample_laps(tel: pd.DataFrame, grid: np.ndarray, channels=CHANNELS):
+    """Reamostra todas as voltas de ``tel`` (tabela car_data) na grade de distância.
+
+    A distância de cada volta é normalizada (0 → 1) antes da interpolação, para
+    que todas terminem na linha de chegada mesmo com pequenos erros de integração.
+
+    Retorna ``(index, arrays)``: ``index`` tem uma linha por volta (driver,
+    lap_number, lap_length_m, samples) e ``arrays[canal]`` tem shape
+    (n_voltas, len(grid)); ``arrays["elapsed_s"]`` é o tempo desde o início da volta.
+    """
+    tel = tel.sort_values(["driver", "lap_number", "session_time_s"], kind="stable")
+    key = tel["driver"].astype(str) + "\x00" + tel["lap_number"].astype(str)
+    codes, _ = pd.factorize(key, sort=False)
+    codes = codes.astype("int64")
+
+    # Início/tamanho de cada grupo (os dados estão ordenados por grupo)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(codes)])
+    ends = starts + counts - 1
+
+    t = tel["session_time_s"].to_numpy(dtype="float64")
+    dist = tel["distance_m"].to_numpy(dtype="float64")
+    lap_len = dist[ends]
+
+    keep = (counts >= MIN_SAMPLES) & (lap_len > 0)
+    if keep.any():
+        median_len = np.median(lap_len[keep])
+        keep &= lap_len > 0.8 * median_len  # voltas incompletas (ex.: abandono)
+
+    index = pd.DataFrame({
+        "driver": tel["driver"].to_numpy()[starts],
+        "lap_number": tel["lap_number"].to_numpy()[starts].astype("int64"),
+        "lap_length_m": lap_len,
+        "samples": counts,
+    })[keep].reset_index(drop=True)
+
+    n_laps, n_grid = len(index), len(grid)
+    if n_laps == 0:
+        return index, {c: np.empty((0, n_grid)) for c in (*channels, "elapsed_s")}
+
+    # Eixo global: volta g ocupa [g, g + 1)
+    group_of_sample = np.repeat(np.arange(len(starts)), counts)
+    rel = dist / np.where(lap_len > 0, lap_len, 1.0)[group_of_sample]
+    x = group_of_sample + np.clip(rel, 0.0, 1.0) * _SPAN
+
+    kept_groups = np.flatnonzero(keep)
+    rel_grid = grid / grid[-1]
+    xq = (kept_groups[:, None] + rel_grid[None, :] * _SPAN).ravel()
+
+    t0 = t[starts][group_of_sample]
+    arrays = {"elapsed_s": np.interp(xq, x, t - t0).reshape(n_laps, n_grid)}
+    for c in channels:
+        values = tel[c].to_numpy(dtype="float64")
+        arrays[c] = np.interp(xq, x, values).reshape(n_laps, n_grid)
+    return index, arrays
+
+
+def compare_drivers(tel: pd.DataFrame, laps: pd.DataFrame, driver_a: str, driver_b: str,
+                    step: float = GRID_STEP_M) -> dict:
+    """Compara dois pilotos em todas as voltas em comum (e volta mais rápida × mais rápida).
+
+    Todas as diferenças são calculadas em lote sobre as matrizes reamostradas:
+    ``delta_s[i, k]`` = tempo de A − tempo de B no ponto ``grid[k]`` do par ``i``
+    (positivo = A atrás de B).
+    """
+    tel = tel[tel["driver"].isin([driver_a, driver_b])]
+    if tel.empty:
+        return {}
+    length = float(tel.groupby(["driver", "lap_number"])["distance_m"].max().median())
+    grid = lap_grid(length, step)
+    index, arrays = resample_laps(tel, grid)
+
+    # Tempo oficial e validade de cada volta (para escolher a volta mais rápida)
+    official = laps[["driver", "lap_number", "lap_time_s", "pit_in_s", "pit_out_s", "is_accurate"]]
+    index = index.merge(official, on=["driver", "lap_number"], how="left")
+    index["row"] = np.arange(len(index))
+    index["clean"] = index["is_accurate"].fillna(False).astype(bool) & index["pit_in_s"].isna() & index["pit_out_s"].isna()
+
+    # A telemetria não tem amostra exatamente na linha de chegada: reescala o tempo
+    # decorrido para que o fim da volta bata com o tempo oficial de cronometragem
+    elapsed = arrays["elapsed_s"] - arrays["elapsed_s"][:, :1]
+    measured = elapsed[:, -1]
+    official_time = index["lap_time_s"].to_numpy(dtype="float64")
+    scale = np.where(np.isfinite(official_time) & (measured > 0), official_time / np.where(measured > 0, measured, 1.0), 1.0)
+    arrays["elapsed_s"] = elapsed * scale[:, None]
+
+    a = index[index["driver"] == driver_a]
+    b = index[index["driver"] == driver_b]
+    if a.empty or b.empty:
+        return {}
+
+    common = a.merge(b, on="lap_number", suffixes=("_a", "_b"))
+    pairs = pd.DataFrame({
+        "label": "Volta " + common["lap_number"].astype(str),
+        "lap_a": common["lap_number"],
+        "lap_b": common["lap_number"],
+        "row_a": common["row_a"],
+        "row_b": common["row_b"],
+    })
+
+    fa = a[a["clean"]].dropna(subset=["lap_time_s"])
+    fb = b[b["clean"]].dropna(subset=["lap_time_s"])
+    if not fa.empty and not fb.empty:
+        best_a = fa.loc[fa["lap_time_s"].idxmin()]
+        best_b = fb.loc[fb["lap_time_s"].idxmin()]
+        fastest = pd.DataFrame([{
+            "label": "Mais rápida × mais rápida",
+            "lap_a": int(best_a["lap_number"]),
+            "lap_b": int(best_b["lap_number"]),
+            "row_a": int(best_a["row"]),
+            "row_b": int(best_b["row"]),
+        }])
+        pairs = pd.concat([fastest, pairs], ignore_index=True)
+
+    ia = pairs["row_a"].to_numpy(dtype="int64")
+    ib = pairs["row_b"].to_numpy(dtype="int64")
+    out = {"grid": grid, "pairs": pairs.drop(columns=["row_a", "row_b"])}
+    for c in ("elapsed_s", "speed", "throttle", "brake", "gear"):
+        out[f"{c}_a"] = arrays[c][ia]
+        out[f"{c}_b"] = arrays[c][ib]
+    out["delta_s"] = out["elapsed_s_a"] - out["elapsed_s_b"]
+    out["speed_diff"] = out["speed_a"] - out["speed_b"]
+    out["throttle_diff"] = out["throttle_a"] - out["throttle_b"]
+
+    # Resumo por par: diferença final e onde A ganhou/perdeu mais tempo
+    gain = np.diff(out["delta_s"], axis=1, prepend=0.0)
+    out["pairs"] = out["pairs"].assign(
+        gap_s=out["delta_s"][:, -1],
+        max_loss_at_m=grid[np.argmax(gain, axis=1)],
+        max_gain_at_m=grid[np.argmin(gain, axis=1)],
+        mean_speed_diff=out["speed_diff"].mean(axis=1),
+    )
+    return out
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def compare_session(season: int, event: str, session: str, driver_a: str, driver_b: str,
+                    step: float = GRID_STEP_M) -> dict:
+    """Comparação cacheada por (sessão, par de pilotos); lê só a telemetria dos dois."""
+    import pyarrow.dataset as ds
+
+    pair = ds.field("driver").isin([driver_a, driver_b])
+    tel = ingest.read_table("car_data", season, event, session, filters=pair)
+    laps = ingest.read_table("laps", season, event, session, filters=pair)
+    return compare_drivers(tel, laps, driver_a, driver_b, step)
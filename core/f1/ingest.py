@@ -0,0 +1,305 @@
+# core/f1/ingest.py
+# -------------------------------------------------------------
+# Ingestão de sessões de F1 via FastF1.
+#
+# Fluxo: FastF1 (cache em disco habilitado) → normalização das voltas,
+# telemetria do carro e posição → tabelas Parquet tipadas, particionadas
+# no estilo Hive:
+#
+#   data/f1/<tabela>/season=2024/event=bahrain-grand-prix/session=R/part-0.parquet
+#
+# Tabelas: sessions, results, laps, car_data, position.
+# A página Dados & F1 só lê essas tabelas — a API do FastF1 é chamada
+# apenas na importação de uma sessão nova.
+# -------------------------------------------------------------
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ======= CONFIG =======
+DATA_DIR = os.path.join("data", "f1")          # tabelas Parquet normalizadas
+CACHE_DIR = os.path.join(".cache", "fastf1")   # cache HTTP/bruto do próprio FastF1
+# ======================
+
+TABLES = ("sessions", "results", "laps", "car_data", "position")
+
+SCHEMAS = {
+    "sessions": pa.schema([
+        ("round", pa.int16()),
+        ("event_name", pa.string()),
+        ("session_name", pa.string()),
+        ("date", pa.timestamp("ms", tz="UTC")),
+    ]),
+    "results": pa.schema([
+        ("driver", pa.string()),
+        ("driver_number", pa.string()),
+        ("full_name", pa.string()),
+        ("team", pa.string()),
+        ("team_color", pa.string()),
+        ("position", pa.float32()),
+        ("grid_position", pa.float32()),
+        ("status", pa.string()),
+        ("points", pa.float32()),
+    ]),
+    "laps": pa.schema([
+        ("driver", pa.string()),
+        ("team", pa.string()),
+        ("lap_number", pa.int16()),
+        ("stint", pa.int8()),
+        ("compound", pa.string()),
+        ("tyre_life", pa.float32()),
+        ("lap_time_s", pa.float64()),
+        ("sector1_s", pa.float64()),
+        ("sector2_s", pa.float64()),
+        ("sector3_s", pa.float64()),
+        ("lap_start_s", pa.float64()),
+        ("lap_end_s", pa.float64()),
+        ("pit_in_s", pa.float64()),
+        ("pit_out_s", pa.float64()),
+        ("position", pa.float32()),
+        ("track_status", pa.string()),
+        ("is_personal_best", pa.bool_()),
+        ("is_accurate", pa.bool_()),
+        ("deleted", pa.bool_()),
+    ]),
+    "car_data": pa.schema([
+        ("driver", pa.string()),
+        ("lap_number", pa.int16()),
+        ("session_time_s", pa.float64()),
+        ("distance_m", pa.float32()),
+        ("speed", pa.float32()),
+        ("rpm", pa.float32()),
+        ("gear", pa.int8()),
+        ("throttle", pa.float32()),
+        ("brake", pa.bool_()),
+        ("drs", pa.int8()),
+    ]),
+    "position": pa.schema([
+        ("driver", pa.string()),
+        ("lap_number", pa.int16()),
+        ("session_time_s", pa.float64()),
+        ("x", pa.float32()),
+        ("y", pa.float32()),
+        ("z", pa.float32()),
+    ]),
+}
+
+
+# ---------- Utilidades ----------
+def slugify(text: str) -> str:
+    """'São Paulo Grand Prix' → 'sao-paulo-grand-prix' (nome de partição estável)."""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _seconds(col: pd.Series) -> np.ndarray:
+    """timedelta → segundos (float); NaT vira NaN."""
+    if col.isna().all():
+        return np.full(len(col), np.nan)
+    return pd.to_timedelta(col).dt.total_seconds().to_numpy(dtype="float64")
+
+
+def partition_path(table: str, season: int, event: str, session: str, root: str = DATA_DIR) -> str:
+    return os.path.join(root, table, f"season={int(season)}", f"event={event}", f"session={session}")
+
+
+def enable_cache(path: str = CACHE_DIR) -> None:
+    """Liga o cache em disco do FastF1 (evita baixar de novo a mesma sessão)."""
+    import fastf1
+
+    os.makedirs(path, exist_ok=True)
+    fastf1.Cache.enable_cache(path)
+
+
+def load_session(season: int, event, session: str):
+    """Carrega uma sessão pelo FastF1 (voltas, telemetria e resultados)."""
+    import fastf1
+
+    enable_cache()
+    ses = fastf1.get_session(int(season), event, session)
+    ses.load(laps=True, telemetry=True, weather=False, messages=False)
+    return ses
+
+
+# ---------- Normalização ----------
+def normalize_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({
+        "driver": laps["Driver"].astype(str).to_numpy(),
+        "team": laps["Team"].astype(str).to_numpy(),
+        "lap_number": pd.to_numeric(laps["LapNumber"]).to_numpy(),
+        "stint": pd.to_numeric(laps["Stint"]).to_numpy(),
+        "compound": laps["Compound"].astype("string").to_numpy(),
+        "tyre_life": pd.to_numeric(laps["TyreLife"]).to_numpy(),
+        "lap_time_s": _seconds(laps["LapTime"]),
+        "sector1_s": _seconds(laps["Sector1Time"]),
+        "sector2_s": _seconds(laps["Sector2Time"]),
+        "sector3_s": _seconds(laps["Sector3Time"]),
+        "lap_start_s": _seconds(laps["LapStartTime"]),
+        "lap_end_s": _seconds(laps["Time"]),
+        "pit_in_s": _seconds(laps["PitInTime"]),
+        "pit_out_s": _seconds(laps["PitOutTime"]),
+        "position": pd.to_numeric(laps["Position"]).to_numpy(),
+        "track_status": laps["TrackStatus"].astype("string").to_numpy(),
+        "is_personal_best": laps["IsPersonalBest"].fillna(False).astype(bool).to_numpy(),
+        "is_accurate": laps["IsAccurate"].fillna(False).astype(bool).to_numpy(),
+        "deleted": laps["Deleted"].fillna(False).astype(bool).to_numpy(),
+    })
+    out = out.dropna(subset=["lap_number"])
+    return out.sort_values(["driver", "lap_number"], kind="stable").reset_index(drop=True)
+
+
+def _assign_laps(session_time: np.ndarray, driver_laps: pd.DataFrame) -> np.ndarray:
+    """Número da volta de cada amostra (busca binária nos inícios de volta); -1 = fora de volta."""
+    driver_laps = driver_laps.dropna(subset=["lap_start_s"])
+    if driver_laps.empty:
+        return np.full(len(session_time), -1, dtype="int64")
+    starts = driver_laps["lap_start_s"].to_numpy()
+    ends = driver_laps["lap_end_s"].to_numpy()
+    numbers = driver_laps["lap_number"].to_numpy()
+    idx = np.searchsorted(starts, session_time, side="right") - 1
+    valid = idx >= 0
+    safe = np.where(valid, idx, 0)
+    valid &= ~(session_time > ends[safe])  # depois do fim da volta (NaN conta como válido)
+    return np.where(valid, numbers[safe], -1).astype("int64")
+
+
+def _lap_distance(lap_number: np.ndarray, t: np.ndarray, speed_kmh: np.ndarray) -> np.ndarray:
+    """Distância percorrida dentro de cada volta (integração trapezoidal de velocidade×tempo)."""
+    dt = np.diff(t, prepend=t[:1])
+    v = speed_kmh / 3.6
+    step = 0.5 * (v + np.concatenate([v[:1], v[:-1]])) * dt
+    new_lap = np.concatenate([[True], lap_number[1:] != lap_number[:-1]])
+    step[new_lap] = 0.0
+    total = np.cumsum(step)
+    # Subtrai o acumulado no início de cada volta (reinicia a distância em 0)
+    lap_offset = np.maximum.accumulate(np.where(new_lap, total, 0.0))
+    return total - lap_offset
+
+
+def _telemetry_frame(samples: dict, drivers: dict, laps: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    """Empilha a telemetria por piloto, atribuindo a volta a cada amostra."""
+    frames = []
+    for number, tel in samples.items():
+        driver = drivers.get(str(number))
+        if driver is None or tel is None or len(tel) == 0:
+            continue
+        t = _seconds(tel["SessionTime"])
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+        driver_laps = laps[laps["driver"] == driver].sort_values("lap_start_s")
+        lap_number = _assign_laps(t, driver_laps)
+        data = {"driver": driver, "lap_number": lap_number, "session_time_s": t}
+        for src, dst in columns.items():
+            data[dst] = pd.to_numeric(tel[src], errors="coerce").to_numpy()[order]
+        frame = pd.DataFrame(data)
+        frames.append(frame[frame["lap_number"] >= 0])
+    if not frames:
+        return pd.DataFrame(columns=["driver", "lap_number", "session_time_s", *columns.values()])
+    return pd.concat(frames, ignore_index=True)
+
+
+def normalize_car_data(car_data: dict, drivers: dict, laps: pd.DataFrame) -> pd.DataFrame:
+    cols = {"Speed": "speed", "RPM": "rpm", "nGear": "gear", "Throttle": "throttle", "Brake": "brake", "DRS": "drs"}
+    out = _telemetry_frame(car_data, drivers, laps, cols)
+    if not out.empty:
+        out = out.sort_values(["driver", "lap_number", "session_time_s"], kind="stable").reset_index(drop=True)
+        # Distância por piloto/volta, reiniciando a cada troca de (piloto, volta)
+        key = out["driver"].astype("category").cat.codes.to_numpy().astype("int64") * 10_000 + out["lap_number"].to_numpy()
+        out["distance_m"] = _lap_distance(key, out["session_time_s"].to_numpy(), out["speed"].fillna(0).to_numpy())
+        out["brake"] = out["brake"].fillna(0).astype(bool)
+        out[["gear", "drs"]] = out[["gear", "drs"]].fillna(0)
+    return out
+
+
+def normalize_position(pos_data: dict, drivers: dict, laps: pd.DataFrame) -> pd.DataFrame:
+    return _telemetry_frame(pos_data, drivers, laps, {"X": "x", "Y": "y", "Z": "z"})
+
+
+def normalize_results(results: pd.DataFrame) -> pd.DataFrame:
+    def col(name, default=None):
+        return results[name] if name in results else pd.Series(default, index=results.index)
+
+    return pd.DataFrame({
+        "driver": col("Abbreviation").astype(str).to_numpy(),
+        "driver_number": col("DriverNumber").astype(str).to_numpy(),
+        "full_name": col("FullName").astype("string").to_numpy(),
+        "team": col("TeamName").astype("string").to_numpy(),
+        "team_color": col("TeamColor").astype("string").to_numpy(),
+        "position": pd.to_numeric(col("Position"), errors="coerce").to_numpy(),
+        "grid_position": pd.to_numeric(col("GridPosition"), errors="coerce").to_numpy(),
+        "status": col("Status").astype("string").to_numpy(),
+        "points": pd.to_numeric(col("Points"), errors="coerce").to_numpy(),
+    })
+
+
+# ---------- Escrita / leitura ----------
+def write_table(df: pd.DataFrame, table: str, season: int, event: str, session: str, root: str = DATA_DIR) -> str:
+    """Grava uma partição com o schema tipado da tabela (escrita atômica)."""
+    schema = SCHEMAS[table]
+    arrow = pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+    folder = partition_path(table, season, event, session, root)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "part-0.parquet")
+    tmp = path + ".tmp"
+    pq.write_table(arrow, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def ingest_session(season: int, event, session: str, root: str = DATA_DIR, loader=load_session) -> dict:
+    """Baixa (ou lê do cache do FastF1) uma sessão e grava as cinco tabelas Parquet.
+
+    ``loader(season, event, session)`` deve devolver um objeto com a interface de
+    ``fastf1.core.Session`` — em testes, uma sessão de fixture carregada do disco.
+    """
+    ses = loader(season, event, session)
+    event_name = str(ses.event["EventName"])
+    event_slug = slugify(event_name)
+    code = str(session).upper()
+
+    laps = normalize_laps(ses.laps)
+    results = normalize_results(ses.results)
+    drivers = dict(zip(results["driver_number"], results["driver"]))
+    date = pd.Timestamp(ses.date)
+    tables = {
+        "sessions": pd.DataFrame({
+            "round": [int(ses.event["RoundNumber"])],
+            "event_name": [event_name],
+            "session_name": [str(ses.name)],
+            "date": [date.tz_localize("UTC") if date.tzinfo is None else date],
+        }),
+        "results": results,
+        "laps": laps,
+        "car_data": normalize_car_data(ses.car_data, drivers, laps),
+        "position": normalize_position(ses.pos_data, drivers, laps),
+    }
+    return {name: write_table(df, name, season, event_slug, code, root) for name, df in tables.items()}
+
+
+def read_table(table: str, season: int | None = None, event: str | None = None, session: str | None = None,
+               columns: list | None = None, filters=None, root: str = DATA_DIR) -> pd.DataFrame:
+    """Lê uma tabela filtrando por partição (só os arquivos necessários são abertos)."""
+    path = os.path.join(root, table)
+    if not os.path.isdir(path):
+        return pd.DataFrame(columns=(columns or SCHEMAS[table].names))
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    expr = filters
+    for name, value in (("season", season), ("event", event), ("session", session)):
+        if value is not None:
+            cond = ds.field(name) == (int(value) if name == "season" else value)
+            expr = cond if expr is None else expr & cond
+    return dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+
+def available_sessions(root: str = DATA_DIR) -> pd.DataFrame:
+    """Sessões já importadas (uma linha por season/event/session), em ordem cronológica."""
+    df = read_table("sessions", root=root)
+    if df.empty:
+        return pd.DataFrame(columns=["season", "event", "session", "round", "event_name", "session_name", "date"])
+    return df.sort_values(["season", "round", "date"]).reset_index(drop=True)
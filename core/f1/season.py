@@ -0,0 +1,302 @@
+# core/f1/season.py
+# -------------------------------------------------------------
+# Job em lote da temporada: classificação do campeonato, stints /
+# degradação de pneus e ranking de ritmo.
+#
+# Cada sessão importada é resumida num processo separado (as sessões
+# são independentes) e o resultado parcial fica gravado em disco:
+#
+#   data/f1/summary/parts/season=2024/<event>__<session>/{points,stints,pace}.parquet
+#
+# Depois as partes são juntadas nas tabelas compactas que a página lê:
+#
+#   data/f1/summary/season=2024/{standings,stints,pace}.parquet
+#
+# O manifest.json guarda a "assinatura" (tamanho + mtime) das partições de
+# origem; rodar de novo só reprocessa sessões novas ou reimportadas.
+#
+# Uso:  python -m core.f1.season 2024 [--workers 4] [--force]
+# -------------------------------------------------------------
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.f1 import ingest
+
+# ======= CONFIG =======
+SUMMARY_DIR = "summary"              # subpasta de DATA_DIR com os resumos
+POINTS_SESSIONS = ("R", "S")         # sessões que valem pontos no campeonato
+MIN_STINT_LAPS = 3                   # voltas limpas mínimas para ajustar a degradação
+# ======================
+
+# Colunas das partes por sessão (também usadas para devolver tabelas vazias tipadas)
+SESSION_INFO = ["round", "event", "event_name", "session"]
+PART_COLUMNS = {
+    "points": ["driver", "team", "position", "points", *SESSION_INFO],
+    "stints": ["driver", "stint", "team", "compound", "first_lap", "last_lap",
+               "laps", "slope_s_per_lap", "base_lap_s", "r2", *SESSION_INFO],
+    "pace": ["driver", "team", "laps", "median_lap_s", "best_lap_s", "gap_s", "rank", *SESSION_INFO],
+}
+
+
+# ---------- Caminhos / manifest ----------
+def summary_path(season: int, root: str = ingest.DATA_DIR) -> str:
+    return os.path.join(root, SUMMARY_DIR, f"season={int(season)}")
+
+
+def _part_dir(season: int, event: str, session: str, root: str) -> str:
+    return os.path.join(root, SUMMARY_DIR, "parts", f"season={int(season)}", f"{event}__{session}")
+
+
+def _signature(season: int, event: str, session: str, root: str) -> str:
+    """Identifica a versão importada de uma sessão (muda se ela for reimportada)."""
+    sig = []
+    for table in ("sessions", "results", "laps"):
+        path = os.path.join(ingest.partition_path(table, season, event, session, root), "part-0.parquet")
+        if os.path.exists(path):
+            stat = os.stat(path)
+            sig.append(f"{table}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(sig)
+
+
+def _load_manifest(season: int, root: str) -> dict:
+    path = os.path.join(summary_path(season, root), "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(season: int, manifest: dict, root: str) -> None:
+    folder = summary_path(season, root)
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, "manifest.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(folder, "manifest.json"))
+
+
+def _write(df: pd.DataFrame, path: str) -> None:
+    """Grava Parquet compacto (float32 onde der) de forma atômica."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = df.astype({c: "float32" for c in df.select_dtypes("float64").columns})
+    tmp = path + ".tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="zstd")
+    os.replace(tmp, path)
+
+
+# ---------- Resumos por sessão ----------
+def clean_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """Voltas representativas de ritmo: precisas, sem box, não deletadas e com pista verde."""
+    mask = (
+        laps["is_accurate"].fillna(False).astype(bool)
+        & ~laps["deleted"].fillna(False).astype(bool)
+        & laps["pit_in_s"].isna()
+        & laps["pit_out_s"].isna()
+        & (laps["track_status"].fillna("1") == "1")
+        & laps["lap_time_s"].notna()
+    )
+    return laps[mask]
+
+
+def stint_degradation(laps: pd.DataFrame) -> pd.DataFrame:
+    """Reta tempo_de_volta ~ idade_do_pneu por (piloto, stint), ajustada em lote.
+
+    Em vez de um ``np.polyfit`` por stint, as somas de mínimos quadrados
+    (Σx, Σy, Σx², Σxy, Σy²) são agregadas de uma vez com groupby.
+    """
+    clean = clean_laps(laps)
+    all_stints = laps.groupby(["driver", "stint"], as_index=False).agg(
+        team=("team", "first"),
+        compound=("compound", "first"),
+        first_lap=("lap_number", "min"),
+        last_lap=("lap_number", "max"),
+    )
+    if clean.empty:
+        return all_stints.assign(laps=0, slope_s_per_lap=np.nan, base_lap_s=np.nan, r2=np.nan)
+
+    x = clean["tyre_life"].astype("float64")
+    y = clean["lap_time_s"].astype("float64")
+    sums = pd.DataFrame({
+        "driver": clean["driver"], "stint": clean["stint"],
+        "n": 1.0, "sx": x, "sy": y, "sxx": x * x, "sxy": x * y, "syy": y * y,
+    }).groupby(["driver", "stint"], as_index=False).sum()
+
+    n = sums["n"].to_numpy()
+    cov = sums["sxy"].to_numpy() - sums["sx"].to_numpy() * sums["sy"].to_numpy() / n
+    var_x = sums["sxx"].to_numpy() - sums["sx"].to_numpy() ** 2 / n
+    var_y = sums["syy"].to_numpy() - sums["sy"].to_numpy() ** 2 / n
+    ok = (n >= MIN_STINT_LAPS) & (var_x > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(ok, cov / var_x, np.nan)
+        base = np.where(ok, (sums["sy"].to_numpy() - slope * sums["sx"].to_numpy()) / n, np.nan)
+        r2 = np.where(ok & (var_y > 0), cov ** 2 / (var_x * var_y), np.nan)
+
+    fits = pd.DataFrame({
+        "driver": sums["driver"], "stint": sums["stint"],
+        "laps": n.astype("int64"), "slope_s_per_lap": slope, "base_lap_s": base, "r2": r2,
+    })
+    out = all_stints.merge(fits, on=["driver", "stint"], how="left")
+    out["laps"] = out["laps"].fillna(0).astype("int64")
+    return out
+
+
+def pace_ranking(laps: pd.DataFrame) -> pd.DataFrame:
+    """Ritmo por piloto (mediana das voltas limpas) e distância para o melhor."""
+    clean = clean_laps(laps)
+    if clean.empty:
+        return pd.DataFrame(columns=["driver", "team", "laps", "median_lap_s", "best_lap_s", "gap_s", "rank"])
+    pace = clean.groupby("driver", as_index=False).agg(
+        team=("team", "first"),
+        laps=("lap_time_s", "size"),
+        median_lap_s=("lap_time_s", "median"),
+        best_lap_s=("lap_time_s", "min"),
+    )
+    pace["gap_s"] = pace["median_lap_s"] - pace["median_lap_s"].min()
+    pace["rank"] = pace["median_lap_s"].rank(method="min").astype("int64")
+    return pace.sort_values("rank").reset_index(drop=True)
+
+
+def summarize_session(season: int, event: str, session: str, root: str = ingest.DATA_DIR) -> str:
+    """Resume uma sessão e grava as partes em disco (roda dentro de um processo do pool)."""
+    meta = ingest.read_table("sessions", season, event, session, root=root)
+    results = ingest.read_table("results", season, event, session, root=root)
+    laps = ingest.read_table("laps", season, event, session, root=root)
+
+    info = {
+        "round": int(meta["round"].iloc[0]) if not meta.empty else 0,
+        "event": event,
+        "event_name": str(meta["event_name"].iloc[0]) if not meta.empty else event,
+        "session": session,
+    }
+    if session in POINTS_SESSIONS and not results.empty:
+        points = results[["driver", "team", "position", "points"]].assign(**info)
+    else:
+        points = pd.DataFrame(columns=PART_COLUMNS["points"])
+
+    folder = _part_dir(season, event, session, root)
+    _write(points, os.path.join(folder, "points.parquet"))
+    _write(stint_degradation(laps).assign(**info), os.path.join(folder, "stints.parquet"))
+    _write(pace_ranking(laps).assign(**info), os.path.join(folder, "pace.parquet"))
+    return folder
+
+
+# ---------- Agregação da temporada ----------
+def standings_progression(points: pd.DataFrame) -> pd.DataFrame:
+    """Pontos acumulados e posição no campeonato de cada piloto após cada rodada."""
+    cols = ["round", "event_name", "driver", "team", "points_round", "points_total", "position"]
+    if points.empty:
+        return pd.DataFrame(columns=cols)
+    per_round = points.groupby(["round", "driver"], as_index=False).agg(
+        points_round=("points", "sum"), team=("team", "last"), event_name=("event_name", "first"),
+    )
+    # Grade completa rodada × piloto: quem não pontuou numa rodada mantém o total
+    rounds = per_round[["round", "event_name"]].drop_duplicates("round")
+    drivers = per_round.groupby("driver", as_index=False)["team"].last()
+    full = rounds.merge(drivers, how="cross").merge(
+        per_round[["round", "driver", "points_round"]], on=["round", "driver"], how="left"
+    )
+    full["points_round"] = full["points_round"].fillna(0.0)
+    full = full.sort_values(["driver", "round"])
+    full["points_total"] = full.groupby("driver")["points_round"].cumsum()
+    full["position"] = full.groupby("round")["points_total"].rank(method="min", ascending=False).astype("int64")
+    return full.sort_values(["round", "position"])[cols].reset_index(drop=True)
+
+
+def _read_parts(season: int, name: str, keys: list, root: str) -> pd.DataFrame:
+    """Junta as partes de uma tabela; sem linhas, devolve a tabela vazia com as colunas esperadas."""
+    frames = []
+    for key in keys:
+        path = os.path.join(root, SUMMARY_DIR, "parts", f"season={int(season)}", key, f"{name}.parquet")
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path))
+    frames = [f for f in frames if not f.empty]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PART_COLUMNS[name])
+
+
+def run_season(season: int, root: str = ingest.DATA_DIR, workers: int | None = None, force: bool = False) -> dict:
+    """Processa a temporada: só sessões novas/alteradas vão para o pool; depois agrega tudo.
+
+    O manifest é salvo a cada sessão concluída: se uma sessão falhar, as outras
+    continuam e a próxima execução só refaz as que ficaram pendentes. As falhas
+    voltam em ``failed`` (chave da sessão → erro).
+    """
+    sessions = ingest.available_sessions(root)
+    sessions = sessions[sessions["season"] == int(season)]
+    manifest = {} if force else _load_manifest(season, root)
+
+    current = {
+        f"{r.event}__{r.session}": (str(r.event), str(r.session), _signature(season, r.event, r.session, root))
+        for r in sessions.itertuples()
+    }
+    pending = [(key, ev, ses, sig) for key, (ev, ses, sig) in current.items() if manifest.get(key) != sig]
+    # Sessões que sumiram da base saem do manifest (e da agregação)
+    manifest = {k: v for k, v in manifest.items() if k in current}
+    failed = {}
+
+    if pending:
+        n_workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {pool.submit(summarize_session, int(season), ev, ses, root): (key, sig)
+                       for key, ev, ses, sig in pending}
+            for future in as_completed(futures):
+                key, sig = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed[key] = f"{type(e).__name__}: {e}"
+                    manifest.pop(key, None)
+                    continue
+                manifest[key] = sig
+                _save_manifest(season, manifest, root)
+
+    keys = sorted(current)
+    tables = {
+        "standings": standings_progression(_read_parts(season, "points", keys, root)),
+        "stints": _read_parts(season, "stints", keys, root),
+        "pace": _read_parts(season, "pace", keys, root),
+    }
+    folder = summary_path(season, root)
+    for name, df in tables.items():
+        _write(df, os.path.join(folder, f"{name}.parquet"))
+    _save_manifest(season, manifest, root)
+    return {"processed": len(pending) - len(failed), "skipped": len(current) - len(pending),
+            "sessions": len(current), "failed": failed}
+
+
+def read_summary(season: int, table: str, root: str = ingest.DATA_DIR) -> pd.DataFrame:
+    """Lê uma tabela resumida da temporada (vazia se o job ainda não rodou)."""
+    path = os.path.join(summary_path(season, root), f"{table}.parquet")
+    return pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+
+
+def summarized_seasons(root: str = ingest.DATA_DIR) -> list:
+    folder = os.path.join(root, SUMMARY_DIR)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(int(name.split("=", 1)[1]) for name in os.listdir(folder) if name.startswith("season="))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumo da temporada de F1 (standings, stints, ritmo).")
+    parser.add_argument("season", type=int)
+    parser.add_argument("--workers", type=int, default=None, help="processos em paralelo (padrão: nº de CPUs)")
+    parser.add_argument("--force", action="store_true", help="reprocessa todas as sessões")
+    parser.add_argument("--root", default=ingest.DATA_DIR)
+    args = parser.parse_args()
+
+    print(f"[INFO] Resumindo a temporada {args.season}...")
+    stats = run_season(args.season, args.root, args.workers, args.force)
+    for key, error in sorted(stats["failed"].items()):
+        print(f"[ERRO] {args.season} {key.replace('__', ' ')}: {error}")
+    print(f"[OK] {stats['processed']} sessões processadas, {stats['skipped']} sem alteração.")
+
+
+if __name__ == "__main__":
+    main()
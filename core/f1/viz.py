@@ -0,0 +1,163 @@
+# core/f1/viz.py
+# -------------------------------------------------------------
+# Camada de visualização da página de F1 (mapa da pista e telemetria).
+#
+# Uma corrida inteira tem centenas de milhares de amostras por piloto;
+# mandar isso em traços SVG trava o navegador. Aqui:
+# - todos os traços usam WebGL (``go.Scattergl``);
+# - os dados são reduzidos NO SERVIDOR, por distância e pelo trecho
+#   (zoom) pedido, para no máximo ``MAX_POINTS`` pontos por traço;
+# - os arrays preparados ficam em cache como float32 — o Plotly os
+#   serializa como typed arrays binários (base64) em vez de listas JSON.
+# -------------------------------------------------------------
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from core.f1 import compare, ingest
+
+MAX_POINTS = 2000        # pontos por traço de telemetria (após o zoom)
+MAX_TRACK_POINTS = 6000  # pontos no mapa da pista
+TRACK_COLORSCALE = "Turbo"
+
+
+# ---------- Redução de pontos ----------
+def minmax_decimate(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Índices que preservam o mínimo e o máximo de ``y`` em cada faixa de ``x``.
+
+    Diferente de pegar 1 a cada N pontos, picos de velocidade e pontos de
+    frenagem continuam visíveis. ``x`` precisa estar em ordem crescente.
+    """
+    n = len(x)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+    span = x[-1] - x[0]
+    if span <= 0:
+        return np.linspace(0, n - 1, 2 * n_buckets).astype("int64")
+    bucket = np.minimum(((x - x[0]) / span * n_buckets).astype("int64"), n_buckets - 1)
+
+    # Ordena por (faixa, y): o primeiro e o último de cada faixa são o mín. e o máx.
+    order = np.lexsort((y, bucket))
+    b = bucket[order]
+    first = np.r_[True, b[1:] != b[:-1]]
+    last = np.r_[b[1:] != b[:-1], True]
+    keep = np.unique(np.r_[order[first], order[last], 0, n - 1])
+    return keep
+
+
+def window(x: np.ndarray, x_range: tuple | None) -> slice:
+    """Fatia de ``x`` (crescente) dentro do trecho ``x_range`` — o "zoom" pedido."""
+    if x_range is None:
+        return slice(0, len(x))
+    lo, hi = np.searchsorted(x, x_range[0], "left"), np.searchsorted(x, x_range[1], "right")
+    return slice(max(lo - 1, 0), min(hi + 1, len(x)))
+
+
+def prepare_line(x: np.ndarray, y: np.ndarray, x_range: tuple | None = None,
+                 max_points: int = MAX_POINTS) -> tuple:
+    """Recorta no trecho pedido, reduz e devolve ``(x, y)`` em float32."""
+    sl = window(x, x_range)
+    x, y = x[sl], y[sl]
+    idx = minmax_decimate(x, y, max(1, max_points // 2))
+    return x[idx].astype("float32"), y[idx].astype("float32")
+
+
+# ---------- Telemetria comparada ----------
+@st.cache_data(show_spinner=False, max_entries=256)
+def comparison_traces(season: int, event: str, session: str, driver_a: str, driver_b: str,
+                      pair: int, x_range: tuple | None = None, max_points: int = MAX_POINTS) -> dict:
+    """Arrays prontos (float32, já reduzidos) de um par de voltas para o gráfico de telemetria."""
+    comp = compare.compare_session(season, event, session, driver_a, driver_b)
+    grid = comp["grid"]
+    out = {}
+    for name in ("delta_s", "speed_a", "speed_b", "throttle_a", "throttle_b"):
+        out[name] = prepare_line(grid, comp[name][pair], x_range, max_points)
+    return out
+
+
+def telemetry_figure(traces: dict, driver_a: str, driver_b: str) -> go.Figure:
+    """Delta, velocidade e acelerador em três painéis com eixo de distância compartilhado."""
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.04, row_heights=[0.3, 0.45, 0.25])
+    x, y = traces["delta_s"]
+    fig.add_trace(go.Scattergl(x=x, y=y, name="Delta", mode="lines", line=dict(color="gray")), row=1, col=1)
+    for side, name in (("a", driver_a), ("b", driver_b)):
+        x, y = traces[f"speed_{side}"]
+        fig.add_trace(go.Scattergl(x=x, y=y, name=f"{name} · velocidade", mode="lines", legendgroup=name), row=2, col=1)
+        x, y = traces[f"throttle_{side}"]
+        fig.add_trace(go.Scattergl(x=x, y=y, name=f"{name} · acelerador", mode="lines", legendgroup=name), row=3, col=1)
+    fig.update_yaxes(title_text="Delta (s)", row=1, col=1)
+    fig.update_yaxes(title_text="km/h", row=2, col=1)
+    fig.update_yaxes(title_text="Acelerador (%)", row=3, col=1)
+    fig.update_xaxes(title_text="Distância na volta (m)", row=3, col=1)
+    fig.update_layout(height=650, margin=dict(t=20, b=40), legend_title="Piloto")
+    return fig
+
+
+# ---------- Mapa da pista ----------
+def _path_length(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return np.r_[0.0, np.cumsum(np.hypot(np.diff(x), np.diff(y)))]
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def track_arrays(season: int, event: str, session: str, driver: str, lap: int | None = None,
+                 max_points: int = MAX_TRACK_POINTS) -> dict:
+    """Posição (x, y) de um piloto colorida pela velocidade, reduzida pelo comprimento do traçado.
+
+    ``lap=None`` usa a sessão inteira. A velocidade vem da car_data, interpolada
+    nos instantes das amostras de posição.
+    """
+    import pyarrow.dataset as ds
+
+    cond = ds.field("driver") == driver
+    if lap is not None:
+        cond = cond & (ds.field("lap_number") == int(lap))
+    pos = ingest.read_table("position", season, event, session,
+                            columns=["session_time_s", "x", "y"], filters=cond)
+    tel = ingest.read_table("car_data", season, event, session,
+                            columns=["session_time_s", "speed"], filters=cond)
+    if pos.empty:
+        return {}
+    pos = pos.sort_values("session_time_s")
+    tel = tel.sort_values("session_time_s")
+
+    x = pos["x"].to_numpy(dtype="float64")
+    y = pos["y"].to_numpy(dtype="float64")
+    t = pos["session_time_s"].to_numpy(dtype="float64")
+    speed = (np.interp(t, tel["session_time_s"].to_numpy(dtype="float64"), tel["speed"].to_numpy(dtype="float64"))
+             if not tel.empty else np.full(len(t), np.nan))
+
+    # Uma amostra por trecho de traçado: o passo cresce com o tamanho do recorte
+    s = _path_length(x, y)
+    if len(s) > max_points and s[-1] > 0:
+        bucket = np.minimum((s / s[-1] * max_points).astype("int64"), max_points - 1)
+        idx = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    else:
+        idx = np.arange(len(s))
+    return {
+        "x": x[idx].astype("float32"),
+        "y": y[idx].astype("float32"),
+        "speed": speed[idx].astype("float32"),
+        "samples": len(pos),
+    }
+
+
+def track_figure(arrays: dict) -> go.Figure:
+    """Mapa da pista em WebGL, com a cor de cada ponto dada pela velocidade."""
+    fig = go.Figure(go.Scattergl(
+        x=arrays["x"],
+        y=arrays["y"],
+        mode="markers",
+        marker=dict(
+            size=4,
+            color=arrays["speed"],
+            colorscale=TRACK_COLORSCALE,
+            colorbar=dict(title="km/h"),
+        ),
+        hovertemplate="%{marker.color:.0f} km/h<extra></extra>",
+    ))
+    fig.update_xaxes(visible=False)
+    fig.update_yaxes(visible=False, scaleanchor="x", scaleratio=1)
+    fig.update_layout(height=550, margin=dict(t=10, b=10, l=10, r=10))
+    return fig
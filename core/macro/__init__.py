@@ -0,0 +1 @@
+"""Modelos sobre os indicadores macro do Brasil (assets/macro_br/merged_macro_br.csv)."""
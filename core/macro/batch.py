@@ -0,0 +1,236 @@
+# core/macro/batch.py
+# -------------------------------------------------------------
+# Estimação em lote de muitos sistemas VAR/VECM pequenos (todos os pares,
+# todos os subconjuntos de indicadores, ou o mesmo par em várias janelas).
+#
+# Cada par tem ~25 linhas e 2 séries: o custo está no overhead do Python,
+# não nas contas. Aqui os sistemas com o mesmo formato (nº de séries × nº
+# de anos) viram um tensor B × T × k e cada etapa do pipeline de
+# core/macro/pairs.py — Johansen, VECM, ADF, seleção de ordem, VAR e
+# previsão pela forma companheira — é UMA chamada empilhada do
+# ``numpy.linalg`` (core/macro/fastvar.py) para o grupo inteiro.
+#
+# As decisões são as mesmas de ``pairs.fit_pair`` (mesmos modelos, ordens e
+# previsões — conferido em tests/test_macro_batch.py); grupos em que alguma
+# matriz sai singular caem para o ajuste um a um.
+# -------------------------------------------------------------
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.macro import fastvar, pairs
+
+
+# ---------- Entradas ----------
+def all_pairs(columns: list) -> list:
+    return list(itertools.combinations(columns, 2))
+
+
+def all_subsets(columns: list, min_size: int = 2) -> list:
+    return [c for r in range(min_size, len(columns) + 1) for c in itertools.combinations(columns, r)]
+
+
+def frames_for(data: pd.DataFrame, systems: list) -> list:
+    """Um DataFrame (anos × séries, sem NaN) por sistema de ``systems`` (tuplas de colunas)."""
+    data = data.set_index("year") if "year" in data.columns else data
+    data = data.sort_index().apply(pd.to_numeric, errors="coerce")
+    return [data[list(cols)].dropna().astype(float) for cols in systems]
+
+
+# ---------- Pipeline em lote ----------
+def _var_stage(Y: np.ndarray, steps: int) -> list:
+    """Rota VAR (ADF → diferença seletiva → ordem por AIC → VAR → níveis) para B × T × k séries."""
+    B, T, k = Y.shape
+    out = [None] * B
+    try:
+        pv = fastvar.adf(Y.transpose(0, 2, 1).reshape(B * k, T), maxlag=min(8, int(T / 3)))["pvalue"]
+        masks = (pv.reshape(B, k) >= 0.05)
+    except Exception:
+        return out  # deixa para o ajuste um a um
+
+    for mask in {tuple(m) for m in masks}:
+        idx = np.flatnonzero((masks == np.array(mask)).all(axis=1))
+        m = np.array(mask)
+        X = Y[idx].copy()
+        if m.any():
+            X[:, 1:, m] = np.diff(X[:, :, m], axis=1)
+            X = X[:, 1:]
+        if X.shape[1] < pairs.MIN_OBS:
+            for b in idx:
+                out[b] = {"model": "", "short": True}
+            continue
+        max_p = min(pairs.MAX_P, max(1, X.shape[1] - 2))
+        try:
+            orders = np.clip(fastvar.var_select_order(X, max_p), 1, max_p)
+        except Exception:
+            orders = np.ones(len(idx), dtype=int)
+
+        for p in np.unique(orders):
+            sel = np.flatnonzero(orders == p)
+            fit = fastvar.var_fit(X[sel], int(p))
+            fc = fastvar.forecast(fit["coefs"], fit["intercept"], X[sel, -int(p):], steps)
+            bad = ~np.isfinite(fc).all(axis=(1, 2))
+            if bad.any():
+                # Fallback anti-NaN, como no ajuste um a um: refaz com p=1
+                fit1 = fastvar.var_fit(X[sel[bad]], 1)
+                fc[bad] = fastvar.forecast(fit1["coefs"], fit1["intercept"], X[sel[bad], -1:], steps)
+            # Volta a níveis: soma acumulada + último nível nas séries diferenciadas
+            levels = np.where(m, Y[idx[sel], -1][:, None, :] + np.cumsum(fc, axis=1), fc)
+            for j, b in enumerate(idx[sel]):
+                out[b] = {"model": "VAR", "p": int(1 if bad[j] else p), "diffed": m.copy(), "pred": levels[j]}
+    return out
+
+
+def _fit_group(Y: np.ndarray, steps: int) -> list:
+    """Ajusta um grupo B × T × k inteiro; ``None`` onde o lote não deu conta."""
+    B = Y.shape[0]
+    results = [None] * B
+    trace = fastvar.johansen_trace(Y)
+    coint = trace["trace"][:, 0] > trace["cv"][0, 1]
+
+    todo_var = np.flatnonzero(~coint)
+    if coint.any():
+        idx = np.flatnonzero(coint)
+        fit = fastvar.vecm_fit(Y[idx])
+        fc = fastvar.vecm_predict(fit, Y[idx], steps)
+        ok = np.isfinite(fc).all(axis=(1, 2)) & np.isfinite(fit["coefs"]).all(axis=(1, 2, 3))
+        for j, b in enumerate(idx):
+            if ok[j]:
+                results[b] = {"model": "VECM", "p": 2, "pred": fc[j]}
+        todo_var = np.sort(np.r_[todo_var, idx[~ok]])
+    if len(todo_var):
+        for b, res in zip(todo_var, _var_stage(Y[todo_var], steps)):
+            results[b] = res
+    for b in range(B):
+        if results[b] is not None:
+            results[b]["trace"] = float(trace["trace"][b, 0])
+            results[b]["cointegrated"] = bool(coint[b])
+    return results
+
+
+def fit_frames(frames: list, steps: int = pairs.FORECAST_YEARS) -> list:
+    """Ajusta todos os sistemas de ``frames`` (mesmas decisões de ``pairs.fit_pair``).
+
+    Sistemas com o mesmo (nº de anos, nº de séries) são empilhados e ajustados
+    juntos. Devolve, na ordem de entrada, dicts com ``model``, ``p``,
+    ``cointegrated``, ``trace``, ``pred`` (array steps × séries) e ``years``.
+    """
+    results = [None] * len(frames)
+    groups = {}
+    for i, f in enumerate(frames):
+        if len(f) >= pairs.MIN_OBS:
+            groups.setdefault(f.shape, []).append(i)
+        else:
+            results[i] = {"model": "", "short": True}
+
+    for idx in groups.values():
+        Y = np.stack([frames[i].to_numpy() for i in idx])
+        try:
+            with np.errstate(all="ignore"):
+                group = _fit_group(Y, steps)
+        except np.linalg.LinAlgError:
+            group = [None] * len(idx)
+        for i, res in zip(idx, group):
+            results[i] = res
+
+    for i, f in enumerate(frames):
+        if results[i] is None:
+            # O lote não resolveu (matriz singular etc.): ajuste individual
+            one = pairs.fit_pair(f, steps)
+            results[i] = {"model": one["model"], "cointegrated": one["cointegrated"],
+                          "pred": None if one["pred"] is None else one["pred"].to_numpy(), "short": one["short"]}
+        last = int(f.index.max())
+        results[i].update(columns=list(f.columns), years=list(range(last + 1, last + 1 + steps)))
+    return results
+
+
+def fit_systems(data: pd.DataFrame, systems: list, steps: int = pairs.FORECAST_YEARS) -> pd.DataFrame:
+    """Tabela (um sistema por linha) com modelo, ordem, traço e a previsão final de cada série."""
+    t0 = time.perf_counter()
+    results = fit_frames(frames_for(data, systems), steps)
+    elapsed = time.perf_counter() - t0
+    rows = []
+    for cols, res in zip(systems, results):
+        row = {"sistema": " × ".join(cols), "series": len(cols), "modelo": res.get("model") or "—",
+               "p": res.get("p"), "traco": res.get("trace")}
+        if res.get("pred") is not None:
+            row.update({f"{c} ({res['years'][-1]})": v for c, v in zip(cols, res["pred"][-1])})
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    table.attrs["elapsed_s"] = elapsed
+    return table
+
+
+def backtest(data: pd.DataFrame, systems: list, min_years: int = 15, steps: int = 1) -> pd.DataFrame:
+    """Previsão fora da amostra em janelas crescentes: cada (sistema, ano de corte) é um modelo.
+
+    Devolve uma linha por (sistema, corte, série) com previsto, observado e erro
+    ``steps`` anos à frente; todos os modelos saem de um só ``fit_frames``.
+    """
+    full = frames_for(data, systems)
+    frames, keys = [], []
+    for cols, f in zip(systems, full):
+        for end in range(min_years, len(f) - steps + 1):
+            frames.append(f.iloc[:end])
+            keys.append((cols, f, end))
+    t0 = time.perf_counter()
+    results = fit_frames(frames, steps)
+    elapsed = time.perf_counter() - t0
+
+    rows = []
+    for (cols, f, end), res in zip(keys, results):
+        if res.get("pred") is None:
+            continue
+        target = f.index[end + steps - 1]
+        for j, c in enumerate(cols):
+            pred = float(res["pred"][steps - 1, j])
+            obs = float(f[c].loc[target])
+            rows.append({"sistema": " × ".join(cols), "corte": int(f.index[end - 1]), "serie": c,
+                         "modelo": res["model"], "previsto": pred, "observado": obs, "erro": pred - obs})
+    table = pd.DataFrame(rows)
+    table.attrs.update(elapsed_s=elapsed, models=len(frames))
+    return table
+
+
+def main():
+    import os
+
+    path = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+    data = pd.read_csv(path)
+    cols = [c for c in data.columns if c != "year"]
+    systems = all_pairs(cols)
+
+    # Conferência: mesmas decisões e previsões do ajuste um a um
+    frames = frames_for(data, systems)
+    batch = fit_frames(frames)
+    diff = 0.0
+    for f, res in zip(frames, batch):
+        one = pairs.fit_pair(f)
+        assert one["model"] == res["model"], (list(f.columns), one["model"], res["model"])
+        diff = max(diff, float(np.abs(one["pred"].to_numpy() - res["pred"]).max()))
+    print(f"[OK] {len(frames)} pares iguais ao ajuste um a um (maior diferença {diff:.1e})")
+
+    t0 = time.perf_counter()
+    for f in frames:
+        pairs.fit_pair(f)
+    one_by_one = time.perf_counter() - t0
+    table = fit_systems(data, systems)
+    print(f"[INFO] pares: lote {table.attrs['elapsed_s'] * 1e3:.1f} ms × um a um {one_by_one * 1e3:.1f} ms")
+    table = fit_systems(data, all_subsets(cols))
+    print(f"[INFO] {len(table)} subconjuntos em {table.attrs['elapsed_s'] * 1e3:.1f} ms")
+    bt = backtest(data, systems, min_years=10)
+    print(f"[INFO] backtest: {bt.attrs['models']} modelos em {bt.attrs['elapsed_s'] * 1e3:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    common = np.cumsum(rng.standard_normal((500, 25, 1)), axis=1)
+    Y = common * rng.uniform(0.5, 1.5, (500, 1, 2)) + rng.standard_normal((500, 25, 2))
+    synthetic = [pd.DataFrame(y, index=range(2000, 2025), columns=["a", "b"]) for y in Y]
+    t0 = time.perf_counter()
+    fit_frames(synthetic)
+    print(f"[OK] 500 pares sintéticos em {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# core/macro/fastvar.py
+# -------------------------------------------------------------
+# Estimadores mínimos em NumPy puro para o caminho quente da página Macro:
+# ADF (com lag por AIC e p-valor de MacKinnon), teste do traço de Johansen,
+# VAR por MQO (com seleção de ordem por AIC) e VECM com constante no vetor
+# de cointegração — só o que analyze_pair usa (coeficientes, estatística do
+# traço e previsão de poucos passos).
+#
+# Tudo aceita um lote de séries empilhadas (B × T × k, ou B × T no ADF) e
+# resolve as regressões com ``numpy.linalg`` em pilha. Os resultados batem
+# com o statsmodels (tsa.stattools.adfuller, vecm.coint_johansen, VAR,
+# VECM) até o arredondamento numérico; tests/test_macro_fastvar.py refaz
+# essa conferência nos dados do merged e em séries aleatórias, e
+# ``python -m core.macro.fastvar`` mede o tempo de um lote.
+# -------------------------------------------------------------
+import math
+
+import numpy as np
+
+# ADF com constante (MacKinnon 1994, N = 1), mesmos coeficientes do statsmodels
+_TAU_MAX, _TAU_MIN, _TAU_STAR = 2.74, -18.83, -1.61
+_TAU_SMALLP = (2.1659, 1.4412, 0.038269)
+_TAU_LARGEP = (1.7339, 0.93202, -0.12745, -0.010368)
+
+# Críticos do traço de Johansen com constante (det_order=0), 90/95/99%,
+# por nº de séries sob teste (1..12) — Osterwald-Lenum, como em coint_tables
+TRACE_CV = (
+    (2.7055, 3.8415, 6.6349), (13.4294, 15.4943, 19.9349), (27.0669, 29.7961, 35.4628),
+    (44.4929, 47.8545, 54.6815), (65.8202, 69.8189, 77.8202), (91.109, 95.7542, 104.9637),
+    (120.3673, 125.6185, 135.9825), (153.6341, 159.529, 171.0905), (190.8714, 197.3772, 210.0366),
+    (232.103, 239.2468, 253.2526), (277.374, 285.1402, 300.2821), (326.5354, 334.9795, 351.215),
+)
+
+
+# ---------- Álgebra em lote ----------
+def _batch(a: np.ndarray, ndim: int) -> tuple:
+    """Garante o eixo de lote na frente; devolve (array, era_um_só)."""
+    a = np.asarray(a, dtype="float64")
+    return (a[None], True) if a.ndim == ndim - 1 else (a, False)
+
+
+def _ols(X: np.ndarray, Y: np.ndarray) -> tuple:
+    """MQO empilhado: X (B × n × m), Y (B × n × k) → (parâmetros B × m × k, resíduos).
+
+    Equações normais resolvidas em pilha (bem mais barato que SVD por sistema);
+    se alguma X'X for singular, o lote inteiro usa a pseudo-inversa.
+    """
+    XT = np.swapaxes(X, -1, -2)
+    try:
+        params = np.linalg.solve(XT @ X, XT @ Y)
+    except np.linalg.LinAlgError:
+        params = np.linalg.pinv(X, rcond=1e-15) @ Y
+    return params, Y - X @ params
+
+
+def _residualize(Y: np.ndarray, X: np.ndarray) -> np.ndarray:
+    return Y if X.shape[-1] == 0 else _ols(X, Y)[1]
+
+
+def _lagged(x: np.ndarray, lags: int, start: int) -> np.ndarray:
+    """[x_{t-1}, …, x_{t-lags}] para t = start..T-1, com ``x`` em B × T × k."""
+    T = x.shape[1]
+    return np.concatenate([x[:, start - j:T - j] for j in range(1, lags + 1)], axis=2) \
+        if lags else np.empty(x.shape[:1] + (T - start, 0))
+
+
+def _logdet(S: np.ndarray) -> np.ndarray:
+    return 2.0 * np.log(np.diagonal(np.linalg.cholesky(S), axis1=-2, axis2=-1)).sum(axis=-1)
+
+
+def _gen_eigh(A: np.ndarray, B: np.ndarray) -> tuple:
+    """Autovalores/vetores (decrescentes) de A·v = λ·B·v, com A simétrica e B positiva definida."""
+    L = np.linalg.cholesky(B)
+    Li = np.linalg.inv(L)
+    vals, W = np.linalg.eigh(Li @ A @ np.swapaxes(Li, -1, -2))
+    V = np.swapaxes(Li, -1, -2) @ W
+    return vals[..., ::-1], V[..., ::-1]
+
+
+# ---------- ADF ----------
+def _norm_cdf(z: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+
+
+def mackinnon_p(stat) -> np.ndarray:
+    """p-valor aproximado de MacKinnon (1994) para o ADF com constante."""
+    stat = np.asarray(stat, dtype="float64")
+    small = np.polynomial.polynomial.polyval(stat, _TAU_SMALLP)
+    large = np.polynomial.polynomial.polyval(stat, _TAU_LARGEP)
+    p = _norm_cdf(np.where(stat <= _TAU_STAR, small, large))
+    return np.where(stat > _TAU_MAX, 1.0, np.where(stat < _TAU_MIN, 0.0, p))
+
+
+def _adf_design(x: np.ndarray, lag: int) -> tuple:
+    """ΔX_t contra [nível x_{t-1}, Δx_{t-1..t-lag}] (sem constante), t a partir de ``lag``."""
+    dx = np.diff(x, axis=1)[..., None]
+    n = dx.shape[1]
+    level = x[:, lag:n, None]
+    return dx[:, lag:], np.concatenate([level, _lagged(dx, lag, lag)], axis=2)
+
+
+def adf(x, maxlag: int | None = None) -> dict:
+    """Dickey-Fuller aumentado com constante e lag escolhido por AIC (como ``adfuller(autolag="AIC")``).
+
+    ``x`` é uma série (n) ou um lote de séries do mesmo tamanho (B × n).
+    Devolve ``{"stat", "pvalue", "lag"}`` (escalares ou arrays de B).
+    Levanta ValueError quando a amostra não comporta ``maxlag``.
+    """
+    x, single = _batch(x, 2)
+    n = x.shape[1]
+    if maxlag is None:
+        maxlag = min(n // 2 - 2, int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0))))
+        if maxlag < 0:
+            raise ValueError("sample size is too short to use selected regression component")
+    elif maxlag > n // 2 - 2:
+        raise ValueError("maxlag must be less than (nobs/2 - 1 - ntrend)")
+    if np.any(x.max(axis=1) == x.min(axis=1)):
+        raise ValueError("Invalid input, x is constant")
+
+    # Seleção do lag: mesma amostra (a do maior lag) para todos os candidatos
+    y, Z = _adf_design(x, maxlag)
+    m = y.shape[1]
+    Z = np.concatenate([np.ones(Z.shape[:2] + (1,)), Z], axis=2)
+    aic = np.empty((x.shape[0], maxlag + 1))
+    for lag in range(maxlag + 1):
+        _, resid = _ols(Z[:, :, :lag + 2], y)
+        ssr = (resid[..., 0] ** 2).sum(axis=1)
+        aic[:, lag] = m * (np.log(2 * np.pi) + np.log(ssr / m) + 1) + 2 * (lag + 2)
+    best = aic.argmin(axis=1)
+
+    # Regressão final com o lag escolhido (amostra própria), agrupada por lag
+    stat = np.empty(x.shape[0])
+    for lag in np.unique(best):
+        idx = np.flatnonzero(best == lag)
+        y, Z = _adf_design(x[idx], int(lag))
+        Z = np.concatenate([Z, np.ones(Z.shape[:2] + (1,))], axis=2)
+        params, resid = _ols(Z, y)
+        dof = Z.shape[1] - Z.shape[2]
+        s2 = (resid[..., 0] ** 2).sum(axis=1) / dof
+        se = np.sqrt(s2 * np.linalg.inv(np.swapaxes(Z, 1, 2) @ Z)[:, 0, 0])
+        stat[idx] = params[:, 0, 0] / se
+    out = {"stat": stat, "pvalue": mackinnon_p(stat), "lag": best}
+    return {k: v[0].item() for k, v in out.items()} if single else out
+
+
+# ---------- Johansen ----------
+def johansen_trace(Y, k_ar_diff: int = 1) -> dict:
+    """Traço de Johansen com constante (``coint_johansen(det_order=0)``) para B × T × k séries.
+
+    Devolve ``{"eig", "trace", "cv"}``: autovalores decrescentes (B × k), a
+    estatística do traço para rank ≤ r (B × k) e os críticos 90/95/99% (k × 3).
+    """
+    Y, single = _batch(Y, 3)
+    k = Y.shape[2]
+    Y = Y - Y.mean(axis=1, keepdims=True)
+    dx = np.diff(Y, axis=1)
+    z = _lagged(dx, k_ar_diff, k_ar_diff)
+    z = z - z.mean(axis=1, keepdims=True)
+    d0 = dx[:, k_ar_diff:]
+    lx = Y[:, 1:Y.shape[1] - k_ar_diff]
+    r0 = _residualize(d0 - d0.mean(axis=1, keepdims=True), z)
+    rk = _residualize(lx - lx.mean(axis=1, keepdims=True), z)
+    t = r0.shape[1]
+    rkT = np.swapaxes(rk, 1, 2)
+    skk, sk0 = rkT @ rk / t, rkT @ r0 / t
+    s00 = np.swapaxes(r0, 1, 2) @ r0 / t
+    sig = sk0 @ np.linalg.solve(s00, np.swapaxes(sk0, 1, 2))
+    eig, _ = _gen_eigh(sig, skk)
+    eig = np.clip(eig, 0.0, 1.0 - 1e-15)
+    trace = -t * np.cumsum(np.log1p(-eig)[:, ::-1], axis=1)[:, ::-1]
+    cv = np.array([TRACE_CV[k - i - 1] for i in range(k)])
+    return {"eig": eig[0] if single else eig, "trace": trace[0] if single else trace, "cv": cv}
+
+
+def cointegrated(Y, k_ar_diff: int = 1, level: int = 1) -> np.ndarray:
+    """Rank ≥ 1 pelo traço (``level``: 0/1/2 = 90/95/99%); um bool por sistema do lote."""
+    res = johansen_trace(Y, k_ar_diff)
+    return np.atleast_2d(res["trace"])[:, 0] > res["cv"][0, level]
+
+
+# ---------- VAR ----------
+def var_fit(X, p: int) -> dict:
+    """VAR(p) com constante por MQO em B × T × k: ``coefs`` (B × p × k × k), ``intercept``, ``sigma_u``."""
+    X, single = _batch(X, 3)
+    B, T, k = X.shape
+    Z = np.concatenate([np.ones((B, T - p, 1)), _lagged(X, p, p)], axis=2)
+    params, resid = _ols(Z, X[:, p:])
+    df_resid = T - p - (k * p + 1)
+    sse = np.swapaxes(resid, 1, 2) @ resid
+    out = {
+        "coefs": params[:, 1:].reshape(B, p, k, k).swapaxes(2, 3),
+        "intercept": params[:, 0],
+        "sigma_u": sse / df_resid if df_resid else np.full_like(sse, np.nan),
+        "k_ar": p,
+    }
+    return {k_: (v[0] if isinstance(v, np.ndarray) else v) for k_, v in out.items()} if single else out
+
+
+def var_select_order(X, maxlags: int) -> np.ndarray:
+    """Ordem por AIC entre 0..maxlags, todas na mesma amostra (como ``VAR.select_order(maxlags).aic``)."""
+    X, single = _batch(X, 3)
+    B, T, k = X.shape
+    if maxlags > (T - k - 1) // (1 + k):
+        raise ValueError("maxlags is too large for the number of observations and the number of equations.")
+    nobs = T - maxlags
+    aic = np.empty((B, maxlags + 1))
+    for p in range(maxlags + 1):
+        Xp = X[:, maxlags - p:]
+        Z = np.concatenate([np.ones((B, nobs, 1)), _lagged(Xp, p, p)], axis=2)
+        _, resid = _ols(Z, Xp[:, p:])
+        df_resid = nobs - (k * p + 1)
+        ld = _logdet(np.swapaxes(resid, 1, 2) @ resid / nobs) if df_resid else np.full(B, -np.inf)
+        aic[:, p] = ld + 2.0 / nobs * (p * k * k + k)
+    order = aic.argmin(axis=1)
+    return order[0] if single else order
+
+
+def forecast(coefs: np.ndarray, const: np.ndarray, last: np.ndarray, steps: int) -> np.ndarray:
+    """y_t = c + Σ A_i·y_{t-i}, a partir das p últimas observações (B × p × k, ordem cronológica)."""
+    single = np.ndim(coefs) == 3
+    if single:
+        coefs, const, last = coefs[None], const[None], last[None]
+    p = coefs.shape[1]
+    hist = list(np.moveaxis(last[:, -p:], 1, 0))
+    out = []
+    for _ in range(steps):
+        y = const + sum(np.einsum("bij,bj->bi", coefs[:, i], hist[-1 - i]) for i in range(p))
+        hist.append(y)
+        out.append(y)
+    out = np.stack(out, axis=1)
+    return out[0] if single else out
+
+
+# ---------- VECM ----------
+def vecm_fit(Y, k_ar_diff: int = 1, rank: int = 1) -> dict:
+    """VECM por máxima verossimilhança com constante no vetor de cointegração (``deterministic="ci"``).
+
+    Devolve ``alpha`` (B × k × r), ``beta`` (B × k × r, primeiras r linhas = I),
+    ``rho`` (B × r, constante da relação), ``gamma`` (B × k × k·k_ar_diff),
+    ``sigma_u`` e a representação VAR em níveis (``coefs``, ``const``).
+    """
+    Y, single = _batch(Y, 3)
+    B, T, k = Y.shape
+    p = k_ar_diff + 1
+    dy = np.diff(Y, axis=1)
+    d0 = dy[:, p - 1:]
+    n = d0.shape[1]
+    y1 = np.concatenate([Y[:, p - 1:-1], np.ones((B, n, 1))], axis=2)
+    dX = _lagged(dy, k_ar_diff, p - 1)
+
+    r0, r1 = _residualize(d0, dX), _residualize(y1, dX)
+    r0T, r1T = np.swapaxes(r0, 1, 2), np.swapaxes(r1, 1, 2)
+    s00, s01, s11 = r0T @ r0 / n, r0T @ r1 / n, r1T @ r1 / n
+    s10 = np.swapaxes(s01, 1, 2)
+    _, V = _gen_eigh(s10 @ np.linalg.solve(s00, s01), s11)
+    beta = V[:, :, :rank]
+    beta = beta @ np.linalg.inv(beta[:, :rank])
+    alpha = s01 @ beta @ np.linalg.inv(np.swapaxes(beta, 1, 2) @ s11 @ beta)
+
+    ec = y1 @ beta @ np.swapaxes(alpha, 1, 2)                       # α·β'·y_{t-1} (n × k)
+    if k_ar_diff:
+        gammaT, temp = _ols(dX, d0 - ec)
+    else:
+        gammaT, temp = np.zeros((B, 0, k)), d0 - ec
+    gamma = np.swapaxes(gammaT, 1, 2)
+    sigma_u = np.swapaxes(temp, 1, 2) @ temp / n
+
+    # Representação VAR em níveis: A1 = I + Π + Γ1, Ai = Γi − Γi-1, Ap = −Γ_{p-1}
+    pi = alpha @ np.swapaxes(beta[:, :k], 1, 2)
+    G = gamma.reshape(B, k, k_ar_diff, k).swapaxes(1, 2)
+    coefs = np.zeros((B, p, k, k))
+    coefs[:, 0] = np.eye(k) + pi
+    if k_ar_diff:
+        coefs[:, 0] += G[:, 0]
+        coefs[:, 1:-1] = G[:, 1:] - G[:, :-1]
+        coefs[:, -1] = -G[:, -1]
+    rho = beta[:, k]
+    out = {"alpha": alpha, "beta": beta[:, :k], "rho": rho, "gamma": gamma, "sigma_u": sigma_u,
+           "coefs": coefs, "const": np.einsum("bkr,br->bk", alpha, rho), "k_ar": p}
+    return {k_: (v[0] if isinstance(v, np.ndarray) else v) for k_, v in out.items()} if single else out
+
+
+def vecm_predict(fit: dict, Y, steps: int) -> np.ndarray:
+    """Previsão em níveis do VECM ajustado em ``Y`` (mesmo lote)."""
+    Y = np.asarray(Y, dtype="float64")
+    return forecast(fit["coefs"], fit["const"], Y[..., -fit["k_ar"]:, :], steps)
+
+
+# ---------- Benchmark ----------
+def main():
+    import time
+
+    print("[INFO] Ajustando 500 pares sintéticos (25 anos × 2 séries)...")
+    rng = np.random.default_rng(1)
+    Y = np.cumsum(rng.standard_normal((500, 25, 2)), axis=1)
+    t0 = time.perf_counter()
+    johansen_trace(Y)
+    vecm_predict(vecm_fit(Y), Y, 3)
+    var = var_fit(Y, 2)
+    forecast(var["coefs"], var["intercept"], Y[:, -2:], 3)
+    print(f"[OK] 500 pares (Johansen + VECM + VAR(2)) em {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
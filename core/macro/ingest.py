@@ -0,0 +1,511 @@
+# core/macro/ingest.py
+# -------------------------------------------------------------
+# Ingestão assíncrona das séries macro (World Bank primeiro; BCB/IBGE
+# entram como novas fontes).
+#
+# - Fonte plugável: uma subclasse de ``Source`` diz quais URLs baixar
+#   (``requests``) e como transformar o corpo em DataFrame (``parse``).
+# - Todas as requisições de todas as fontes rodam juntas num event loop
+#   (asyncio), com limite de conexões simultâneas e de requisições por
+#   segundo POR HOST — uma fonte lenta não trava as outras e nenhum
+#   servidor recebe mais do que o combinado.
+# - O corpo chega em pedaços e o JSON é decodificado de forma incremental
+#   (``JsonStream``): cada registro sai assim que termina de chegar, sem
+#   montar a resposta inteira na memória.
+# - Falhas transitórias (conexão, timeout, HTTP 429/5xx) são repetidas com
+#   espera crescente; o resto vira erro da requisição, sem derrubar as demais.
+#
+# Só biblioteca padrão (asyncio + ssl): nada de cliente HTTP extra.
+# Testes com servidores falsos locais: tests/test_macro_ingest.py
+# -------------------------------------------------------------
+import argparse
+import asyncio
+import codecs
+import json
+import ssl
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+# ======= CONFIG =======
+MAX_PER_HOST = 4        # conexões simultâneas por host
+RATE_PER_HOST = 8.0     # requisições por segundo por host
+TIMEOUT_S = 30.0        # por requisição (conexão + download + parse)
+RETRIES = 2             # novas tentativas em falhas transitórias
+CHUNK_BYTES = 64 * 1024
+WB_URL = "https://api.worldbank.org/v2"
+# ======================
+
+USER_AGENT = "my-home-page-ingest/1.0"
+
+
+class HttpError(RuntimeError):
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} em {url}")
+        self.status = status
+
+
+def _transient(err: BaseException) -> bool:
+    if isinstance(err, HttpError):
+        return err.status == 429 or err.status >= 500
+    return isinstance(err, (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, OSError))
+
+
+# ---------- JSON incremental ----------
+class JsonStream:
+    """Decodifica um array JSON em pedaços e devolve os itens de um sub-array.
+
+    ``target`` é a posição, no array de topo, do array cujos itens interessam
+    (na API do World Bank: ``[metadados, [registro, registro, ...]]`` →
+    ``target=1``). Os demais elementos do topo ficam em ``head``.
+    """
+
+    def __init__(self, target: int = 1):
+        self.target = target
+        self.head = []
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._index = 0
+        self.done = False
+
+    def _skip_ws(self) -> None:
+        while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+            self._pos += 1
+
+    def _value(self, final: bool):
+        """Próximo valor completo do buffer, ou ``None`` se ainda falta chegar texto."""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        # Número no fim do buffer pode estar cortado: espera o próximo caractere
+        if end == len(self._buf) and not final:
+            return None
+        self._pos = end
+        return (value,)
+
+    def feed(self, data: bytes, final: bool = False) -> list:
+        """Acrescenta bytes e devolve os itens do sub-array que ficaram completos."""
+        self._buf = self._buf[self._pos:] + self._text.decode(data, final)
+        self._pos = 0
+        items = []
+        while not self.done:
+            self._skip_ws()
+            if self._pos >= len(self._buf):
+                break
+            ch = self._buf[self._pos]
+            if self._state == "start":
+                if ch != "[":
+                    raise ValueError(f"Esperava '[' no início do JSON, veio {ch!r}")
+                self._pos += 1
+                self._state = "elem"
+            elif self._state in ("elem", "sep"):
+                if ch == "]":
+                    self._pos += 1
+                    self.done = True
+                elif self._state == "sep":
+                    if ch != ",":
+                        raise ValueError(f"JSON inválido perto de {self._buf[self._pos:self._pos + 20]!r}")
+                    self._pos += 1
+                    self._state = "elem"
+                elif self._index == self.target and ch == "[":
+                    self._pos += 1
+                    self._state = "item"
+                else:
+                    got = self._value(final)
+                    if got is None:
+                        break
+                    self.head.append(got[0])
+                    self._index += 1
+                    self._state = "sep"
+            else:  # dentro do sub-array: "item" / "item_sep"
+                if ch == "]":
+                    self._pos += 1
+                    self._index += 1
+                    self._state = "sep"
+                elif self._state == "item_sep":
+                    if ch != ",":
+                        raise ValueError(f"JSON inválido perto de {self._buf[self._pos:self._pos + 20]!r}")
+                    self._pos += 1
+                    self._state = "item"
+                else:
+                    # Atalho: registros-objeto separados por "},{" — decodifica todos os
+                    # completos do buffer numa chamada só; se o corte cair dentro de
+                    # uma string (JSON inválido), segue item a item
+                    cut = self._buf.rfind("},{", self._pos)
+                    if cut > self._pos:
+                        try:
+                            items.extend(json.loads(f"[{self._buf[self._pos:cut + 1]}]"))
+                            self._pos = cut + 2
+                            continue
+                        except json.JSONDecodeError:
+                            pass
+                    got = self._value(final)
+                    if got is None:
+                        break
+                    items.append(got[0])
+                    self._state = "item_sep"
+        if final and not self.done:
+            raise ValueError("JSON terminou antes de fechar o array.")
+        return items
+
+
+# ---------- Limites por host ----------
+class HostLimit:
+    """Conexões simultâneas (semáforo) + espaçamento mínimo entre requisições."""
+
+    def __init__(self, max_conn: int = MAX_PER_HOST, rate: float = RATE_PER_HOST):
+        self._sem = asyncio.Semaphore(max_conn)
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+
+    async def __aenter__(self):
+        await self._sem.acquire()
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next)
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        self.active += 1
+        self.requests += 1
+        self.max_active = max(self.max_active, self.active)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._sem.release()
+
+
+# ---------- HTTP (GET com corpo em streaming) ----------
+async def _open(url: str):
+    parts = urlsplit(url)
+    tls = parts.scheme == "https"
+    port = parts.port or (443 if tls else 80)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if tls else None)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+        "Accept: application/json\r\nAccept-Encoding: identity\r\nConnection: close\r\n\r\n".encode("ascii"))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split()[1])
+    headers = {}
+    for line in head[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return reader, writer, status, headers
+
+
+async def stream_get(url: str, max_redirects: int = 3):
+    """Gerador assíncrono com os pedaços do corpo de um GET (segue redirecionamentos)."""
+    for _ in range(max_redirects + 1):
+        reader, writer, status, headers = await _open(url)
+        try:
+            if status in (301, 302, 303, 307, 308) and "location" in headers:
+                url = headers["location"]
+                continue
+            if status != 200:
+                raise HttpError(status, url)
+            if headers.get("transfer-encoding", "").lower() == "chunked":
+                while True:
+                    size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                    if size == 0:
+                        break
+                    yield await reader.readexactly(size)
+                    await reader.readline()
+            elif "content-length" in headers:
+                left = int(headers["content-length"])
+                while left:
+                    data = await reader.read(min(left, CHUNK_BYTES))
+                    if not data:
+                        raise asyncio.IncompleteReadError(b"", left)
+                    left -= len(data)
+                    yield data
+            else:
+                while data := await reader.read(CHUNK_BYTES):
+                    yield data
+            return
+        finally:
+            writer.close()
+    raise HttpError(status, url)
+
+
+# ---------- Fontes ----------
+class Source:
+    """Interface de uma fonte: quais URLs baixar e como ler cada resposta.
+
+    ``requests()`` devolve dicts com pelo menos ``key`` (nome do resultado) e
+    ``url``; ``parse(req, chunks)`` recebe os pedaços do corpo (gerador
+    assíncrono de bytes). Fontes paginadas devolvem em ``follow_up`` as
+    páginas que faltam (descobertas na primeira resposta) e juntam as partes
+    de cada ``key`` em ``finish``.
+    """
+
+    name = "fonte"
+
+    def requests(self) -> list:
+        raise NotImplementedError
+
+    async def parse(self, req: dict, chunks):
+        raise NotImplementedError
+
+    def follow_up(self, req: dict, parsed) -> list:
+        return []
+
+    def finish(self, key: str, parts: list):
+        return parts[0]
+
+
+class ColumnBuffer:
+    """Colunas NumPy pré-alocadas, preenchidas por posição (ano, valor, país).
+
+    Cada página escreve na sua faixa (``(página - 1) × per_page``), então as
+    páginas podem chegar em qualquer ordem ou ser refeitas num retry. Valores
+    não numéricos (raros) ficam à parte em ``raw`` para a validação apontar.
+    """
+
+    def __init__(self, capacity: int = 0):
+        self.year = np.full(capacity, np.nan)
+        self.value = np.full(capacity, np.nan)
+        self.country = np.full(capacity, -1, dtype="int32")
+        self.filled = np.zeros(capacity, dtype=bool)
+        self.countries = {}
+        self.raw = {}
+
+    def reserve(self, n: int) -> None:
+        cap = len(self.filled)
+        if n <= cap:
+            return
+        new = max(n, 2 * cap)
+        self.year = np.concatenate([self.year, np.full(new - cap, np.nan)])
+        self.value = np.concatenate([self.value, np.full(new - cap, np.nan)])
+        self.country = np.concatenate([self.country, np.full(new - cap, -1, dtype="int32")])
+        self.filled = np.concatenate([self.filled, np.zeros(new - cap, dtype=bool)])
+
+    def put(self, i: int, item: dict) -> None:
+        if i >= len(self.filled):
+            self.reserve(i + 1)
+        try:
+            self.year[i] = float(item.get("date"))
+        except (TypeError, ValueError):
+            pass  # fica NaN: a validação acusa o ano inválido
+        v = item.get("value")
+        if v is not None:
+            try:
+                self.value[i] = float(v)
+            except (TypeError, ValueError):
+                self.raw[i] = v
+        c = item.get("countryiso3code") or (item.get("country") or {}).get("id", "")
+        self.country[i] = self.countries.setdefault(c, len(self.countries))
+        self.filled[i] = True
+
+    def put_many(self, start: int, items: list) -> None:
+        """``put`` de uma página/lote inteiro com atribuição vetorizada das colunas."""
+        end = start + len(items)
+        self.reserve(end)
+        try:
+            year = np.array([it.get("date") for it in items], dtype="float64")
+            value = np.array([it.get("value") for it in items], dtype="float64")  # None → NaN
+        except (TypeError, ValueError):
+            for i, item in enumerate(items, start):  # algum campo fora do padrão: linha a linha
+                self.put(i, item)
+            return
+        self.year[start:end] = year
+        self.value[start:end] = value
+        countries = self.countries
+        self.country[start:end] = [
+            countries.setdefault(c, len(countries))
+            for c in (it.get("countryiso3code") or (it.get("country") or {}).get("id", "") for it in items)]
+        self.filled[start:end] = True
+
+    @property
+    def nbytes(self) -> int:
+        return self.year.nbytes + self.value.nbytes + self.country.nbytes + self.filled.nbytes
+
+    def frame(self) -> pd.DataFrame:
+        idx = np.flatnonzero(self.filled)
+        value = self.value[idx]
+        if self.raw:
+            pos = np.searchsorted(idx, list(self.raw))
+            value = value.astype(object)
+            value[pos] = list(self.raw.values())
+        return pd.DataFrame({
+            "year": self.year[idx],
+            "value": value,
+            "country": pd.Categorical.from_codes(self.country[idx], categories=list(self.countries) or [""]),
+        })
+
+
+class WorldBankSource(Source):
+    """Indicadores na API v2 do Banco Mundial (JSON), com paginação.
+
+    ``indicators`` mapeia nome → código (ex.: "FP.CPI.TOTL.ZG"); ``country``
+    aceita um código, vários separados por ";" ou "all". A primeira página
+    de cada indicador traz o total de linhas: as colunas são alocadas uma vez
+    e as demais páginas vão em paralelo, cada uma direto na sua faixa. O
+    resultado é um DataFrame ``year``/``value``/``country`` com os valores
+    como vieram (a validação fica com core/macro/quality.py).
+    """
+
+    name = "worldbank"
+
+    def __init__(self, country: str, indicators: dict, start_year: int, end_year: int,
+                 base_url: str = WB_URL, per_page: int = 1000):
+        self.country = country
+        self.indicators = dict(indicators)
+        self.start_year, self.end_year = int(start_year), int(end_year)
+        self.base_url = base_url.rstrip("/")
+        self.per_page = per_page
+        self._buffers = {}
+
+    def _request(self, name: str, code: str, page: int) -> dict:
+        query = urlencode({"format": "json", "date": f"{self.start_year}:{self.end_year}",
+                           "per_page": self.per_page, "page": page})
+        return {"key": name, "code": code, "page": page,
+                "url": f"{self.base_url}/country/{self.country}/indicator/{code}?{query}"}
+
+    def requests(self) -> list:
+        return [self._request(name, code, 1) for name, code in self.indicators.items()]
+
+    async def parse(self, req: dict, chunks) -> dict:
+        stream = JsonStream(target=1)
+        buf = None
+        offset = (req["page"] - 1) * self.per_page
+        n = 0
+        async for data in chunks:
+            items = stream.feed(data)
+            if buf is None and stream.head:
+                buf = self._buffer(req["key"], stream.head[0])
+            if items:
+                buf.put_many(offset + n, items)
+                n += len(items)
+        stream.feed(b"", final=True)
+        meta = stream.head[0] if stream.head and isinstance(stream.head[0], dict) else {}
+        if "message" in meta:
+            # A API devolve erros como [{"message": [...]}] com HTTP 200
+            raise ValueError(f"World Bank: {meta['message']}")
+        if buf is None:
+            buf = self._buffer(req["key"], meta)
+        return {"pages": int(meta.get("pages") or 1), "total": int(meta.get("total") or 0), "rows": n}
+
+    def _buffer(self, key: str, meta) -> ColumnBuffer:
+        total = int(meta.get("total") or 0) if isinstance(meta, dict) else 0
+        buf = self._buffers.setdefault(key, ColumnBuffer(total))
+        buf.reserve(total)
+        return buf
+
+    def follow_up(self, req: dict, parsed: dict) -> list:
+        if req["page"] != 1:
+            return []
+        return [self._request(req["key"], req["code"], page) for page in range(2, parsed["pages"] + 1)]
+
+    def finish(self, key: str, parts: list) -> pd.DataFrame:
+        buf = self._buffers.pop(key, None) or ColumnBuffer()
+        return buf.frame()
+
+
+# ---------- Execução ----------
+async def _fetch(source: Source, req: dict, limit: HostLimit, timeout: float, retries: int) -> dict:
+    out = {"data": None, "error": None, "attempts": 0, "elapsed_s": 0.0}
+    t0 = time.perf_counter()
+    for attempt in range(retries + 1):
+        out["attempts"] = attempt + 1
+        try:
+            async with limit:
+                out["data"] = await asyncio.wait_for(source.parse(req, stream_get(req["url"])), timeout)
+            out["error"] = None
+            break
+        except Exception as e:
+            out["error"] = f"{type(e).__name__}: {e}"
+            if not _transient(e) or attempt == retries:
+                break
+            await asyncio.sleep(0.5 * 2 ** attempt)
+    out["elapsed_s"] = time.perf_counter() - t0
+    return out
+
+
+async def run_async(sources: list, max_per_host: int = MAX_PER_HOST, rate: float = RATE_PER_HOST,
+                    timeout: float = TIMEOUT_S, retries: int = RETRIES) -> dict:
+    limits = {}
+    tasks = {}
+    parts = {}
+    t0 = time.perf_counter()
+
+    def submit(source: Source, req: dict) -> None:
+        limit = limits.setdefault(urlsplit(req["url"]).netloc, HostLimit(max_per_host, rate))
+        tasks[asyncio.ensure_future(_fetch(source, req, limit, timeout, retries))] = (source, req)
+        parts.setdefault((id(source), req["key"]), (source, req["key"], []))
+
+    for source in sources:
+        for req in source.requests():
+            submit(source, req)
+    # Páginas seguintes entram na fila assim que a primeira resposta diz quantas são
+    while tasks:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            source, req = tasks.pop(task)
+            out = task.result()
+            out["done_s"] = time.perf_counter() - t0
+            parts[(id(source), req["key"])][2].append(out)
+            if out["error"] is None:
+                for extra in source.follow_up(req, out["data"]):
+                    submit(source, extra)
+
+    results = []
+    for source, key, outs in parts.values():
+        errors = [o["error"] for o in outs if o["error"]]
+        data = None
+        if not errors:
+            try:
+                data = source.finish(key, [o["data"] for o in outs])
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+        results.append({"source": source.name, "key": key, "data": data, "error": errors[0] if errors else None,
+                        "pages": len(outs), "attempts": sum(o["attempts"] for o in outs),
+                        "elapsed_s": max(o["done_s"] for o in outs)})
+    hosts = {h: {"requests": l.requests, "max_active": l.max_active} for h, l in limits.items()}
+    return {"results": results, "hosts": hosts}
+
+
+def run(sources: list, **kwargs) -> dict:
+    """Baixa todas as requisições de ``sources`` e devolve ``{"results": [...], "hosts": {...}}``.
+
+    Um resultado por ``key`` (páginas já juntadas), com ``source``, ``key``,
+    ``data`` (DataFrame ou None), ``error``, ``pages``, ``attempts`` e ``elapsed_s``.
+    """
+    return asyncio.run(run_async(sources, **kwargs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão assíncrona dos indicadores macro.")
+    parser.add_argument("--country", default="BR")
+    parser.add_argument("--code", action="append", help="código do indicador no World Bank (repetível)")
+    parser.add_argument("--start", type=int, default=2000)
+    parser.add_argument("--end", type=int, default=time.localtime().tm_year)
+    args = parser.parse_args()
+
+    codes = {c: c for c in (args.code or ["FP.CPI.TOTL.ZG", "NY.GDP.MKTP.KD.ZG"])}
+    print(f"[INFO] Baixando {len(codes)} indicador(es) de {args.country}...")
+    out = run([WorldBankSource(args.country, codes, args.start, args.end)])
+    for r in out["results"]:
+        if r["error"]:
+            print(f"[ERRO] {r['key']}: {r['error']}")
+        else:
+            print(f"[OK] {r['key']}: {len(r['data'])} linhas em {r['elapsed_s']:.2f} s ({r['attempts']} tentativa(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# core/macro/pairs.py
+# -------------------------------------------------------------
+# Ajuste dos pares da página Macro (Johansen → VECM, ou VAR com diferença
+# seletiva via ADF), separado da renderização.
+#
+# Os estimadores padrão são os de core/macro/fastvar.py (NumPy puro, sem o
+# import do statsmodels); ``engine="statsmodels"`` refaz tudo com os
+# objetos do statsmodels, como referência.
+#
+# ``fit_pair`` é uma função pura: recebe o par já limpo (anos × 2 séries)
+# e devolve um dict com a previsão, o sistema para os cenários e as
+# mensagens que a página deve mostrar. Por ser determinística na entrada,
+# dá para compartilhar a execução entre sessões simultâneas
+# (``fit_pair_shared``, via core/singleflight.py) e rodá-la num processo
+# separado (core/offload.py) trocando só arrays.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+from core import offload, singleflight
+from core.macro import fastvar, scenarios
+
+FORECAST_YEARS = 3
+MIN_OBS = 8      # abaixo disso o ajuste/forecast fica frágil
+MAX_P = 4
+
+# "numpy" = estimadores mínimos de core/macro/fastvar.py (caminho rápido);
+# "statsmodels" = objetos completos do statsmodels (referência, import pesado).
+ENGINES = ("numpy", "statsmodels")
+ENGINE = "numpy"
+
+
+# ---------- ADF ----------
+def run_adf(x: pd.Series, engine: str = ENGINE) -> dict:
+    """ADF com lag por AIC (maxlag = min(8, n/3)); NaN quando a série não permite o teste."""
+    x = pd.to_numeric(x, errors="coerce").dropna()
+    try:
+        maxlag = min(8, int(len(x) / 3))
+        if engine == "numpy":
+            res = fastvar.adf(x.to_numpy(), maxlag=maxlag)
+            return {"stat": float(res["stat"]), "pvalue": float(res["pvalue"])}
+        from statsmodels.tsa.stattools import adfuller
+
+        stat, pval, *_ = adfuller(x, autolag="AIC", maxlag=maxlag)
+        return {"stat": float(stat), "pvalue": float(pval)}
+    except Exception:
+        return {"stat": np.nan, "pvalue": np.nan}
+
+
+def _adf_pvalues(X: pd.DataFrame, engine: str = ENGINE) -> dict:
+    """p-valor do ADF de cada coluna; no NumPy, todas as colunas num único lote."""
+    if engine == "numpy" and not X.isna().any().any():
+        try:
+            res = fastvar.adf(X.to_numpy(dtype="float64").T, maxlag=min(8, int(len(X) / 3)))
+            return dict(zip(X.columns, map(float, res["pvalue"])))
+        except Exception:
+            pass  # alguma coluna não comporta o teste: cai para uma a uma
+    return {col: run_adf(X[col], engine)["pvalue"] for col in X.columns}
+
+
+# ---------- Ajustes ----------
+def johansen_ok(tmp: pd.DataFrame, engine: str = ENGINE) -> bool:
+    """Traço de Johansen (det_order=0, k_ar_diff=1) acima do crítico de 5% → rank ≥ 1."""
+    try:
+        if engine == "numpy":
+            return bool(fastvar.cointegrated(tmp.to_numpy(dtype="float64"))[0])
+        from statsmodels.tsa.vector_ar.vecm import coint_johansen
+
+        cj = coint_johansen(tmp.values, det_order=0, k_ar_diff=1)
+        return float(cj.lr1[0]) > float(cj.cvt[0, 1])
+    except Exception:
+        return False
+
+
+def _future_years(tmp: pd.DataFrame, steps: int) -> list:
+    last_year = int(tmp.index.max())
+    return list(range(last_year + 1, last_year + 1 + steps))
+
+
+def fit_vecm(tmp: pd.DataFrame, steps: int = FORECAST_YEARS, engine: str = ENGINE) -> tuple:
+    """VECM(k_ar_diff=1, deterministic='ci'). Devolve ``(previsão em níveis, sistema)``."""
+    if engine == "numpy":
+        Y = tmp.to_numpy(dtype="float64")
+        res = fastvar.vecm_fit(Y)
+        if not np.all(np.isfinite(res["coefs"])):
+            raise np.linalg.LinAlgError("VECM sem solução numérica")
+        fc = fastvar.vecm_predict(res, Y, steps)
+        system = scenarios.from_coefs("VECM", res["coefs"], res["const"], res["sigma_u"], tmp)
+    else:
+        from statsmodels.tsa.vector_ar.vecm import VECM
+
+        res = VECM(tmp, k_ar_diff=1, deterministic="ci").fit()
+        fc = res.predict(steps=steps)
+        system = scenarios.from_vecm(res, tmp)
+    pred = pd.DataFrame(fc, columns=tmp.columns, index=_future_years(tmp, steps)).astype(float)
+    return pred, system
+
+
+def _levels(tmp: pd.DataFrame, fc: np.ndarray, diffed: dict, steps: int) -> pd.DataFrame:
+    """Previsão do VAR de volta em níveis (soma acumulada nas séries diferenciadas)."""
+    pred = pd.DataFrame(index=_future_years(tmp, steps), columns=tmp.columns, dtype=float)
+    for j, col in enumerate(tmp.columns):
+        if diffed.get(col, False):
+            pred[col] = float(tmp[col].iloc[-1]) + np.cumsum(fc[:, j])
+        else:
+            pred[col] = fc[:, j]
+    return pred
+
+
+def _select_order(X: pd.DataFrame, max_p: int, engine: str) -> int:
+    try:
+        if engine == "numpy":
+            p = int(fastvar.var_select_order(X.to_numpy(), max_p))
+        else:
+            from statsmodels.tsa.api import VAR
+
+            sel = VAR(X).select_order(max_p)
+            p = int(sel.aic) if sel.aic is not None else 1
+    except Exception:
+        p = 1
+    return max(1, min(max_p, int(p)))
+
+
+def _var_forecast(X: pd.DataFrame, p: int, steps: int, engine: str) -> tuple:
+    """Ajusta o VAR(p) e prevê ``steps`` passos; devolve ``(previsão, coefs, intercepto, Σ)``."""
+    if engine == "numpy":
+        res = fastvar.var_fit(X.to_numpy(), p)
+        fc = fastvar.forecast(res["coefs"], res["intercept"], X.to_numpy()[-p:], steps)
+        return fc, res["coefs"], res["intercept"], res["sigma_u"]
+    from statsmodels.tsa.api import VAR
+
+    res = VAR(X).fit(p)
+    fc = res.forecast(y=X.values[-res.k_ar:], steps=steps)
+    return fc, res.coefs, res.intercept, res.sigma_u
+
+
+def fit_var(tmp: pd.DataFrame, steps: int = FORECAST_YEARS, engine: str = ENGINE) -> tuple:
+    """VAR com diferença só nas séries que o ADF não rejeita; ordem por AIC até ``MAX_P``.
+
+    Devolve ``(previsão em níveis, sistema)`` ou ``(None, None)`` se a amostra
+    ficar curta após a diferenciação.
+    """
+    X = tmp.copy()
+    diffed = {}
+    pvalues = _adf_pvalues(X, engine)
+    for col in X.columns:
+        need_diff = (not np.isnan(pvalues[col])) and (pvalues[col] >= 0.05)
+        diffed[col] = bool(need_diff)
+        if need_diff:
+            X[col] = X[col].diff()
+    X = X.dropna().astype(float)
+    if X.shape[0] < MIN_OBS:
+        return None, None
+
+    max_p = min(MAX_P, max(1, X.shape[0] - 2))
+    p = _select_order(X, max_p, engine)
+    fc, coefs, const, sigma = _var_forecast(X, p, steps, engine)
+    pred = _levels(tmp, fc, diffed, steps)
+    # Fallback anti-NaN (numérico/colinearidade): refaz com p=1
+    if pred.isna().any().any():
+        fc, coefs, const, sigma = _var_forecast(X, 1, steps, engine)
+        pred = _levels(tmp, fc, diffed, steps)
+    return pred, scenarios.from_coefs("VAR", coefs, const, sigma, tmp, diffed)
+
+
+def fit_pair(tmp: pd.DataFrame, steps: int = FORECAST_YEARS, engine: str = ENGINE) -> dict:
+    """Pipeline completo de um par: Johansen decide entre VECM e VAR (com fallback).
+
+    Chaves do resultado: ``cointegrated`` (o teste apontou VECM), ``model``
+    ("VECM", "VAR" ou ""), ``pred``, ``system``, ``vecm_error``,
+    ``var_error`` e ``short`` (amostra curta após diferenciar).
+    """
+    out = {"cointegrated": johansen_ok(tmp, engine), "model": "", "pred": None, "system": None,
+           "vecm_error": None, "var_error": None, "short": False}
+    if out["cointegrated"]:
+        try:
+            out["pred"], out["system"] = fit_vecm(tmp, steps, engine)
+            out["model"] = "VECM"
+            return out
+        except Exception as e:
+            out["vecm_error"] = str(e)
+    try:
+        pred, system = fit_var(tmp, steps, engine)
+    except Exception as e:
+        out["var_error"] = str(e)
+        return out
+    if pred is None:
+        out["short"] = True
+        return out
+    out.update(pred=pred, system=system, model="VAR")
+    return out
+
+
+# ---------- Execução fora do processo do servidor ----------
+def _fit_arrays(values: np.ndarray, years: np.ndarray, columns: list, steps: int) -> dict:
+    """``fit_pair`` no processo filho: entra e sai só com arrays/tipos simples."""
+    out = fit_pair(pd.DataFrame(values, index=pd.Index(years, name="year"), columns=columns), steps)
+    pred = out.pop("pred")
+    out["pred"] = None if pred is None else pred.to_numpy()
+    return out
+
+
+def fit_pair_pooled(tmp: pd.DataFrame, steps: int = FORECAST_YEARS) -> dict:
+    """``fit_pair`` num processo do pool (core/offload.py); mesmo formato de resultado.
+
+    Pode levantar ``offload.PoolBusy`` (fila cheia) ou ``TimeoutError``.
+    """
+    out = offload.run(_fit_arrays, tmp.to_numpy(dtype="float64"), tmp.index.to_numpy(), list(tmp.columns), steps)
+    if out["pred"] is not None:
+        out["pred"] = pd.DataFrame(out["pred"], columns=tmp.columns, index=_future_years(tmp, steps))
+    return out
+
+
+# Sessões simultâneas com o mesmo par (mesmos dados) dividem um único ajuste,
+# que roda no pool de processos para não segurar o GIL do servidor.
+# O resultado é compartilhado entre os chamadores: trate-o como somente leitura.
+fit_pair_shared = singleflight.shared("macro.fit_pair")(fit_pair_pooled)
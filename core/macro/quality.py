@@ -0,0 +1,185 @@
+# core/macro/quality.py
+# -------------------------------------------------------------
+# Checagens de qualidade (DQ) na ingestão dos indicadores macro.
+#
+# Cada indicador tem um "contrato" (``CONTRATOS``): faixa de valores
+# plausíveis e maior salto ano a ano esperado. ``validate`` recebe os
+# registros crus da fonte (ano e valor como vieram) e faz, em operações
+# vetorizadas do pandas/NumPy:
+#   - esquema: colunas presentes, ano inteiro dentro da janela, valor numérico;
+#   - duplicidade de ano;
+#   - faixa (fora dela → erro, a linha não entra na base);
+#   - anos faltando no meio da série e saltos acima do contrato (avisos).
+#
+# Só as partições novas são avaliadas: anos que não existiam na versão
+# anterior (core/macro/snapshots.py) ou cujo valor mudou. O resultado vai
+# para um relatório JSON ao lado do merged, que a página Macro apenas lê.
+# -------------------------------------------------------------
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ======= CONFIG =======
+REPORT_FILE = os.path.join("assets", "macro_br", "quality_macro_br.json")
+MERGED_FILE = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+MIN_YEAR = 1960
+# ======================
+
+# Faixa plausível (mín, máx) e maior salto ano a ano esperado (p.p.)
+CONTRATOS = {
+    "Inflação (CPI, % a.a.)": {"min": -10.0, "max": 100.0, "max_jump": 10.0},
+    "PIB real — crescimento (% a.a.)": {"min": -15.0, "max": 15.0, "max_jump": 10.0},
+    "Desemprego (% força de trabalho)": {"min": 0.0, "max": 40.0, "max_jump": 5.0},
+    "Conta Corrente (% do PIB)": {"min": -20.0, "max": 20.0, "max_jump": 5.0},
+    "Juros reais (% a.a.)": {"min": -50.0, "max": 150.0, "max_jump": 20.0},
+}
+
+SEVERIDADES = ("erro", "aviso", "info")
+
+
+def _issues(check: str, severity: str, years, values, detail: str) -> list:
+    return [{"check": check, "severity": severity, "year": None if pd.isna(y) else int(y),
+             "value": None if v is None or pd.isna(v) else float(v), "detail": detail}
+            for y, v in zip(years, values)]
+
+
+def validate(name: str, raw: pd.DataFrame, previous: pd.Series | None = None,
+             last_year: int | None = None) -> tuple:
+    """Valida os registros crus de um indicador (colunas ``year`` e ``value``).
+
+    ``previous`` é a série da versão atual (ano → valor); linhas iguais a ela
+    não são reavaliadas. Devolve ``(série limpa, seção do relatório)``: a série
+    traz as linhas válidas (novas e antigas) e a seção, os problemas achados.
+    """
+    last_year = last_year or datetime.now().year
+    previous = pd.Series(dtype=float) if previous is None else previous
+    section = {"indicator": name, "rows": int(len(raw)), "new": 0, "dropped": 0, "issues": [],
+               "checked_at": datetime.now().isoformat(timespec="seconds")}
+
+    missing = [c for c in ("year", "value") if c not in raw.columns]
+    if missing:
+        section["issues"] += _issues("esquema", "erro", [None], [None], f"colunas ausentes: {', '.join(missing)}")
+        return pd.Series(dtype=float, name=name), section
+
+    years = pd.to_numeric(raw["year"], errors="coerce").to_numpy(dtype="float64")
+    values = pd.to_numeric(raw["value"], errors="coerce").to_numpy(dtype="float64")
+    null = raw["value"].isna().to_numpy()
+
+    # Esquema: ano inteiro na janela; valor numérico e finito (nulo = ainda não publicado)
+    bad_year = ~np.isfinite(years) | (years % 1 != 0) | (years < MIN_YEAR) | (years > last_year)
+    bad_value = ~null & ~np.isfinite(values)
+    valid = ~bad_year & ~bad_value & ~null
+    dup = valid & pd.Series(np.where(valid, years, np.nan)).duplicated(keep="last").to_numpy()
+    keep = valid & ~dup
+
+    # Partições novas: ano inexistente na versão anterior ou valor diferente
+    prev = previous.reindex(years[keep]).to_numpy(dtype="float64")
+    is_new = np.zeros(len(raw), dtype=bool)
+    is_new[keep] = ~(prev == values[keep])
+    is_new |= ~keep & ~null   # linha inválida sempre entra no relatório
+    section["new"] = int(is_new.sum())
+
+    section["issues"] += _issues("esquema", "erro", years[bad_year & is_new], values[bad_year & is_new],
+                                 "ano ausente, não inteiro ou fora da janela")
+    section["issues"] += _issues("esquema", "erro", years[bad_value & is_new], [None] * int((bad_value & is_new).sum()),
+                                 "valor não numérico")
+    section["issues"] += _issues("duplicidade", "erro", years[dup & is_new], values[dup & is_new],
+                                 "ano repetido (mantida a última ocorrência)")
+    pending = null & ~bad_year & ~np.isin(years, previous.index)
+    if pending.any():
+        section["issues"] += _issues("completude", "info", years[pending], values[pending], "sem valor publicado")
+
+    contrato = CONTRATOS.get(name, {})
+    lo, hi = contrato.get("min", -np.inf), contrato.get("max", np.inf)
+    out_range = keep & is_new & ((values < lo) | (values > hi))
+    section["issues"] += _issues("faixa", "erro", years[out_range], values[out_range], f"fora da faixa [{lo:g}, {hi:g}]")
+    keep &= ~out_range
+    section["dropped"] = int((is_new & ~keep).sum())
+
+    # Série resultante: versão anterior atualizada com as linhas válidas
+    fresh = pd.Series(values[keep], index=years[keep].astype(int))
+    series = fresh.combine_first(previous).sort_index().astype(float).rename(name)
+    checked = set(fresh.index[is_new[keep]])
+
+    # Saltos: o ano novo e o seguinte (a diferença com ele também mudou)
+    if len(series) > 1:
+        jump = series.diff().abs()
+        idx = series.index.to_numpy()
+        touched = np.isin(idx, list(checked)) | np.isin(idx - 1, list(checked))
+        big = touched & (jump.to_numpy() > contrato.get("max_jump", np.inf))
+        section["issues"] += _issues("salto", "aviso", idx[big], series.to_numpy()[big],
+                                     f"variação anual acima de {contrato.get('max_jump', np.inf):g} p.p.")
+
+        # Anos faltando no meio da série, ao lado de uma partição nova
+        gap = np.diff(idx) > 1
+        for a, b in zip(idx[:-1][gap], idx[1:][gap]):
+            if a in checked or b in checked:
+                section["issues"] += _issues("completude", "aviso", range(a + 1, b), [None] * (b - a - 1),
+                                             "ano faltando no meio da série")
+    return series, section
+
+
+# ---------- Relatório ----------
+def summarize(section: dict) -> dict:
+    counts = {s: 0 for s in SEVERIDADES}
+    for issue in section["issues"]:
+        counts[issue["severity"]] += 1
+    return counts
+
+
+def load_report(path: str = REPORT_FILE) -> dict:
+    if not os.path.exists(path):
+        return {"indicators": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_report(sections: list, path: str = REPORT_FILE, version: int | None = None,
+                 dataset: str | None = None) -> dict:
+    """Grava o relatório; indicadores sem partições novas mantêm a seção anterior."""
+    report = load_report(path)
+    for sec in sections:
+        if not sec["new"] and sec["indicator"] in report["indicators"]:
+            continue
+        sec["summary"] = summarize(sec)
+        report["indicators"][sec["indicator"]] = sec
+    report.update(generated=datetime.now().isoformat(timespec="seconds"), version=version, dataset=dataset)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return report
+
+
+def report_table(report: dict) -> pd.DataFrame:
+    """Uma linha por problema (para exibir na página)."""
+    rows = [{"indicador": name, **issue} for name, sec in report.get("indicators", {}).items()
+            for issue in sec["issues"]]
+    return pd.DataFrame(rows, columns=["indicador", "check", "severity", "year", "value", "detail"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida um CSV merged de indicadores macro e grava o relatório de qualidade.")
+    parser.add_argument("csv", nargs="?", default=MERGED_FILE)
+    parser.add_argument("--out", default=REPORT_FILE)
+    args = parser.parse_args()
+
+    from core.macro import snapshots
+
+    data = pd.read_csv(args.csv)
+    sections = []
+    for col in [c for c in data.columns if c != "year"]:
+        _, sec = validate(col, data[["year", col]].rename(columns={col: "value"}))
+        sections.append(sec)
+        print(f"[INFO] {col}: {sec['rows']} linhas, {summarize(sec)}")
+    write_report(sections, args.out, dataset=snapshots.token(snapshots.column_hashes(data)))
+    print(f"[OK] Relatório salvo em {args.out}")
+
+
+if __name__ == "__main__":
+    main()
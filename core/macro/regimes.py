@@ -0,0 +1,184 @@
+# core/macro/regimes.py
+# -------------------------------------------------------------
+# Detecção de regimes macroeconômicos nos indicadores anuais do merged.
+#
+# 1) Matriz de features montada UMA vez (e cacheada por indicador, pela
+#    versão de conteúdo de core/macro/snapshots.py): para cada indicador,
+#    o nível, a variação ano a ano (Δ) e ``lags`` defasagens de Δ — tudo
+#    padronizado (z-score).
+# 2) Para cada subconjunto de indicadores × nº de regimes, ajusta uma
+#    mistura gaussiana (scikit-learn). Os ajustes são independentes e vão
+#    para um pool de processos; cada processo recebe a matriz uma vez só.
+# 3) Os rótulos saem "no estilo HMM": as probabilidades da mistura passam
+#    por um Viterbi com transição "grudenta" (``stay``), de modo que um ano
+#    isolado não troca de regime à toa.
+# -------------------------------------------------------------
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.metrics import silhouette_score
+from sklearn.mixture import GaussianMixture
+
+# ======= CONFIG =======
+MACRO_FILE = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+# ======================
+
+N_REGIMES = (2, 3, 4)
+STAY = 0.8           # probabilidade de continuar no mesmo regime de um ano para o outro
+MIN_SUBSET = 2
+
+
+# ---------- Features ----------
+def _indicator_blocks(s: pd.Series, lags: int) -> dict:
+    """Nível, Δ e defasagens de Δ de um indicador (ainda sem padronizar)."""
+    delta = s.diff()
+    blocks = {f"{s.name}|nivel": s, f"{s.name}|delta": delta}
+    for lag in range(1, lags + 1):
+        blocks[f"{s.name}|delta_l{lag}"] = delta.shift(lag)
+    return blocks
+
+
+def _standardize(blocks: dict) -> pd.DataFrame:
+    feats = pd.DataFrame(blocks).dropna()
+    return (feats - feats.mean()) / feats.std(ddof=0).replace(0, 1.0)
+
+
+def build_features(df: pd.DataFrame, lags: int = 1) -> pd.DataFrame:
+    """Matriz (anos × features) padronizada: nível, Δ e defasagens de Δ por indicador.
+
+    As colunas seguem o padrão ``"<indicador>|nivel"``, ``"<indicador>|delta"`` e
+    ``"<indicador>|delta_l1"``...; anos sem todas as features são descartados.
+    """
+    data = df.set_index("year").sort_index().apply(pd.to_numeric, errors="coerce")
+    blocks = {}
+    for col in data.columns:
+        blocks.update(_indicator_blocks(data[col], lags))
+    return _standardize(blocks)
+
+
+@st.cache_data(show_spinner=False)
+def cached_blocks(_series: pd.Series, name: str, version: str, lags: int) -> dict:
+    """Blocos de um indicador, cacheados por (indicador, versão do conteúdo, lags).
+
+    ``version`` é o hash da série (core/macro/snapshots.py); a série em si
+    não entra na chave.
+    """
+    return _indicator_blocks(_series.rename(name), lags)
+
+
+def cached_features(df: pd.DataFrame, versions: dict, lags: int = 1) -> pd.DataFrame:
+    """``build_features`` montado a partir dos blocos cacheados de cada indicador.
+
+    ``versions`` mapeia indicador → hash de conteúdo: numa atualização dos
+    dados, só os indicadores cujo hash mudou são refeitos.
+    """
+    data = df.set_index("year").sort_index().apply(pd.to_numeric, errors="coerce")
+    blocks = {}
+    for col in data.columns:
+        blocks.update(cached_blocks(data[col], col, versions[col], lags))
+    return _standardize(blocks)
+
+
+def indicators(features: pd.DataFrame) -> list:
+    return list(dict.fromkeys(c.split("|")[0] for c in features.columns))
+
+
+def subsets(names: list, min_size: int = MIN_SUBSET) -> list:
+    """Todos os subconjuntos de indicadores com pelo menos ``min_size`` elementos."""
+    return [combo for r in range(min_size, len(names) + 1) for combo in itertools.combinations(names, r)]
+
+
+# ---------- Rotulagem com persistência ----------
+def viterbi(log_prob: np.ndarray, stay: float = STAY) -> np.ndarray:
+    """Sequência de regimes mais provável dado ``log_prob`` (anos × regimes) e transição grudenta."""
+    n, k = log_prob.shape
+    if k == 1:
+        return np.zeros(n, dtype=int)
+    trans = np.full((k, k), (1 - stay) / (k - 1))
+    np.fill_diagonal(trans, stay)
+    log_trans = np.log(trans)
+    score = log_prob[0] - np.log(k)
+    back = np.zeros((n, k), dtype=int)
+    for t in range(1, n):
+        cand = score[:, None] + log_trans
+        back[t] = cand.argmax(axis=0)
+        score = cand.max(axis=0) + log_prob[t]
+    path = np.empty(n, dtype=int)
+    path[-1] = score.argmax()
+    for t in range(n - 1, 0, -1):
+        path[t - 1] = back[t, path[t]]
+    return path
+
+
+# ---------- Ajustes ----------
+_worker = {}
+
+
+def _init_worker(features: pd.DataFrame) -> None:
+    _worker["features"] = features
+
+
+def _fit_one(subset: tuple, k: int, stay: float, seed: int, features: pd.DataFrame | None = None) -> dict:
+    # No pool as features vêm do initializer; no próprio processo, por argumento
+    feats = _worker["features"] if features is None else features
+    cols = [c for c in feats.columns if c.split("|")[0] in subset]
+    X = feats[cols].to_numpy()
+    gmm = GaussianMixture(k, covariance_type="diag", n_init=5, reg_covar=1e-3, random_state=seed).fit(X)
+    # Verossimilhança de cada ano em cada regime (emissões do "HMM")
+    log_prob = np.log(np.clip(gmm.predict_proba(X), 1e-300, None)) + gmm.score_samples(X)[:, None]
+    labels = viterbi(log_prob, stay)
+    used = len(np.unique(labels))
+    return {
+        "subset": subset,
+        "k": k,
+        "regimes_used": used,
+        "bic": float(gmm.bic(X)),
+        "silhouette": float(silhouette_score(X, labels)) if 1 < used < len(X) else np.nan,
+        "labels": labels,
+    }
+
+
+def fit_all(features: pd.DataFrame, subset_list: list | None = None, ks=N_REGIMES, stay: float = STAY,
+            workers: int | None = None, seed: int = 0) -> pd.DataFrame:
+    """Ajusta todos os (subconjunto, k) e devolve uma linha por modelo, do melhor para o pior.
+
+    A ordem usa a silhueta (comparável entre subconjuntos com nº de features
+    diferente); o BIC desempata. Com ``workers=1`` roda no próprio processo.
+    """
+    subset_list = subset_list or subsets(indicators(features))
+    tasks = [(s, k) for s in subset_list for k in ks if k < len(features)]
+    workers = workers or os.cpu_count() or 1
+    args = ([s for s, _ in tasks], [k for _, k in tasks], [stay] * len(tasks), [seed] * len(tasks))
+
+    if workers == 1:
+        rows = [_fit_one(*a, features=features) for a in zip(*args)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features,)) as pool:
+            rows = list(pool.map(_fit_one, *args, chunksize=max(1, len(tasks) // (workers * 4))))
+    table = pd.DataFrame(rows)
+    return table.sort_values(["silhouette", "bic"], ascending=[False, True], na_position="last").reset_index(drop=True)
+
+
+# ---------- Leitura dos regimes ----------
+def profile(df: pd.DataFrame, years, labels: np.ndarray, columns: list) -> pd.DataFrame:
+    """Média de cada indicador (nível original) por regime, com nº de anos."""
+    data = df.set_index("year").loc[list(years), columns].apply(pd.to_numeric, errors="coerce")
+    out = data.groupby(np.asarray(labels)).mean()
+    out.insert(0, "anos", pd.Series(np.asarray(labels)).value_counts().sort_index().to_numpy())
+    return out
+
+
+def name_regimes(df: pd.DataFrame, years, labels: np.ndarray, columns: list, top: int = 2) -> dict:
+    """Nome curto de cada regime: os indicadores mais afastados da média histórica (↑ acima / ↓ abaixo)."""
+    data = df.set_index("year").loc[list(years), columns].apply(pd.to_numeric, errors="coerce")
+    z = ((data - data.mean()) / data.std(ddof=0).replace(0, 1.0)).groupby(np.asarray(labels)).mean()
+    names = {}
+    for regime, row in z.iterrows():
+        best = row.abs().sort_values(ascending=False).index[:top]
+        parts = [f"{'↑' if row[c] > 0 else '↓'} {c.split(' (')[0].split(' —')[0]}" for c in best]
+        names[regime] = " · ".join(parts)
+    return names
@@ -0,0 +1,149 @@
+# core/macro/scenarios.py
+# -------------------------------------------------------------
+# Cenários condicionais ("e se os juros reais subirem 2 p.p.?") sobre os
+# sistemas VAR/VECM ajustados em analyze_pair (página Macro).
+#
+# Todo sistema vira uma forma companheira linear em NÍVEIS:
+#   s_t = F·s_{t-1} + c + E·ε_t        y_t = L·s_t
+# - VECM: usa a representação VAR em níveis (``var_rep``) + constante α·ρ;
+# - VAR com séries diferenciadas: o estado ganha o último nível de cada
+#   série diferenciada (y_t = y_{t-1} + Δy_t), então a reconstrução de
+#   níveis também faz parte de F.
+#
+# Como tudo é linear, um cenário = base + choque × resposta unitária. As
+# respostas unitárias (uma por duração do choque) saem de uma pilha de
+# matrizes Ψ_h = L·F^h·E calculada uma vez; a grade inteira
+# (tamanhos × durações × horizontes) é um único broadcast, sem reajustar nada.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+
+# ---------- Sistemas ----------
+def from_vecm(res, levels: pd.DataFrame) -> dict:
+    """Sistema a partir de um ``VECMResults`` (statsmodels) ajustado em ``levels``."""
+    coefs = np.asarray(res.var_rep)
+    k = coefs.shape[1]
+    const = np.zeros(k)
+    if getattr(res, "det_coef_coint", None) is not None and np.size(res.det_coef_coint):
+        const = const + res.alpha @ np.asarray(res.det_coef_coint)[0]
+    if getattr(res, "det_coef", None) is not None and np.size(res.det_coef):
+        const = const + np.asarray(res.det_coef)[:, 0]
+    return from_coefs("VECM", coefs, const, np.asarray(res.sigma_u), levels)
+
+
+def from_var(res, levels: pd.DataFrame, diffed: dict) -> dict:
+    """Sistema a partir de um ``VARResults`` ajustado nas séries (algumas diferenciadas) de ``levels``."""
+    return from_coefs("VAR", np.asarray(res.coefs), np.asarray(res.intercept), np.asarray(res.sigma_u),
+                      levels, diffed)
+
+
+def from_coefs(kind: str, coefs: np.ndarray, const: np.ndarray, sigma: np.ndarray, levels: pd.DataFrame,
+               diffed: dict | None = None) -> dict:
+    """Sistema a partir dos coeficientes crus (p × k × k), constante e Σ dos resíduos.
+
+    ``diffed`` marca as séries que o modelo viu em primeira diferença (VAR);
+    sem ele, o modelo está em níveis (VECM via representação VAR).
+    """
+    cols = list(levels.columns)
+    mask = np.array([bool((diffed or {}).get(c, False)) for c in cols])
+    # Mesmo dado que o modelo viu: diferença só onde o ADF pediu
+    x = levels.copy()
+    for j, c in enumerate(cols):
+        if mask[j]:
+            x[c] = x[c].diff()
+    x = x.dropna()
+    return _build(kind, np.asarray(coefs), np.asarray(const), np.asarray(sigma), mask, levels, x.to_numpy())
+
+
+def _build(kind: str, coefs: np.ndarray, const: np.ndarray, sigma: np.ndarray, diffed: np.ndarray,
+           levels: pd.DataFrame, x_hist: np.ndarray) -> dict:
+    p, k, _ = coefs.shape
+    d = np.flatnonzero(diffed)
+    n = k * p + len(d)
+
+    F = np.zeros((n, n))
+    F[:k, :k * p] = np.hstack(coefs)
+    F[k:k * p, :k * (p - 1)] = np.eye(k * (p - 1))
+    # Nível das diferenciadas: y_t = y_{t-1} + Δy_t
+    F[k * p:, :k * p] = F[d, :k * p]
+    F[k * p:, k * p:] = np.eye(len(d))
+    c = np.zeros(n)
+    c[:k] = const
+    c[k * p:] = const[d]
+    E = np.zeros((n, k))
+    E[:k] = np.eye(k)
+    E[k * p + np.arange(len(d)), d] = 1.0
+    L = np.zeros((k, n))
+    for j in range(k):
+        L[j, j if not diffed[j] else k * p + int(np.searchsorted(d, j))] = 1.0
+
+    # Estado no fim da amostra: p últimas observações (em ordem decrescente) + últimos níveis
+    lagged = x_hist[::-1][:p].ravel()
+    state = np.r_[lagged, levels.to_numpy()[-1, d]]
+    return {"kind": kind, "columns": list(levels.columns), "last_year": int(levels.index.max()),
+            "F": F, "c": c, "E": E, "L": L, "sigma": sigma, "state": state}
+
+
+# ---------- Previsões ----------
+def baseline(system: dict, steps: int) -> np.ndarray:
+    """Previsão sem choque (steps × k), em níveis."""
+    s, out = system["state"], []
+    for _ in range(steps):
+        s = system["F"] @ s + system["c"]
+        out.append(system["L"] @ s)
+    return np.array(out)
+
+
+def impulse_stack(system: dict, steps: int) -> np.ndarray:
+    """Ψ_h = L·F^h·E para h = 0..steps-1 (steps × k × k): efeito em t+h de uma inovação em t."""
+    F, E, L = system["F"], system["E"], system["L"]
+    out = np.empty((steps, L.shape[0], E.shape[1]))
+    M = E
+    for h in range(steps):
+        out[h] = L @ M
+        M = F @ M
+    return out
+
+
+def unit_responses(system: dict, var: int, durations, steps: int) -> np.ndarray:
+    """Desvio em relação à base (durações × steps × k) quando ``var`` fica +1 acima da base por m anos.
+
+    A inovação de ``var`` carrega as demais pela covariância dos resíduos
+    (g = Σ·e_v / σ_vv); os tamanhos de choque em cada ano são escolhidos para
+    manter ``var`` exatamente +1 durante ``m`` anos (sistema triangular), e
+    depois a série volta a seguir a dinâmica do modelo.
+    """
+    sigma = system["sigma"]
+    g = sigma[:, var] / sigma[var, var]
+    psi_g = impulse_stack(system, steps) @ g                      # (steps, k): resposta a u=1 em t=1
+    # K[h, s] = resposta em h+1 a um choque aplicado em s+1 (zero se s > h)
+    lag = np.arange(steps)[:, None] - np.arange(steps)[None, :]
+    K = np.where((lag >= 0)[..., None], psi_g[np.clip(lag, 0, None)], 0.0)   # (steps, steps, k)
+
+    durations = [int(m) for m in durations]
+    U = np.zeros((len(durations), steps))
+    T = K[:, :, var]
+    for i, m in enumerate(durations):
+        m = min(m, steps)
+        U[i, :m] = np.linalg.solve(T[:m, :m], np.ones(m))
+    return np.einsum("ms,hsk->mhk", U, K)
+
+
+def scenario_grid(system: dict, var: int, shocks, durations, steps: int) -> dict:
+    """Todos os cenários (choques × durações) de uma vez: ``paths`` tem forma (S, M, steps, k)."""
+    shocks = np.asarray(shocks, dtype="float64")
+    base = baseline(system, steps)
+    resp = unit_responses(system, var, durations, steps)
+    paths = base[None, None] + shocks[:, None, None, None] * resp[None]
+    return {"baseline": base, "responses": resp, "paths": paths, "shocks": shocks,
+            "durations": list(durations), "years": list(range(system["last_year"] + 1, system["last_year"] + 1 + steps))}
+
+
+def grid_frame(system: dict, grid: dict) -> pd.DataFrame:
+    """Grade em formato longo: uma linha por (choque, duração, ano, série)."""
+    S, M, H, k = grid["paths"].shape
+    idx = pd.MultiIndex.from_product([grid["shocks"], grid["durations"], grid["years"], system["columns"]],
+                                     names=["choque", "duracao", "ano", "serie"])
+    dev = grid["paths"] - grid["baseline"][None, None]
+    return pd.DataFrame({"valor": grid["paths"].ravel(), "desvio": dev.ravel()}, index=idx).reset_index()
@@ -0,0 +1,235 @@
+# core/macro/snapshots.py
+# -------------------------------------------------------------
+# Versões dos indicadores macro com endereçamento por conteúdo.
+#
+#   data/macro/snapshots/
+#     objects/ab/abcd….csv  → uma série (year,value) por arquivo, nome = sha256 do conteúdo
+#     versions/000001.json  → manifesto da versão: hash de cada indicador + diff da anterior
+#     HEAD                  → nº da versão atual
+#
+# - A série de cada indicador é serializada de forma canônica (anos
+#   crescentes, valores com ``repr``, sem linhas vazias), então o mesmo
+#   conteúdo sempre dá o mesmo hash — e o mesmo objeto em disco.
+# - ``commit`` só cria versão quando algum indicador mudou, e o manifesto
+#   registra linha a linha o que entrou, saiu ou mudou de valor.
+# - Os hashes servem de versão por indicador para os caches da página
+#   Macro (``column_hashes``/``token``): uma atualização que só mexe em um
+#   indicador invalida apenas o que depende dele.
+# - Escritas atômicas (arquivo temporário + ``os.replace``); o HEAD é o
+#   último a ser gravado, então uma atualização interrompida não vale.
+# -------------------------------------------------------------
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ======= CONFIG =======
+SNAPSHOT_DIR = os.path.join("data", "macro", "snapshots")
+MERGED_FILE = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+# ======================
+
+
+# ---------- Conteúdo canônico ----------
+def _as_series(s) -> pd.Series:
+    """Série ``year → valor`` numérica, ordenada e sem valores ausentes."""
+    s = pd.to_numeric(pd.Series(s), errors="coerce").dropna()
+    s.index = s.index.astype(int)
+    return s.sort_index().astype(float)
+
+
+def series_bytes(s) -> bytes:
+    s = _as_series(s)
+    lines = ["year,value"] + [f"{y},{v!r}" for y, v in zip(s.index, s.to_numpy().tolist())]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def series_hash(s) -> str:
+    return hashlib.sha256(series_bytes(s)).hexdigest()
+
+
+def _wide(df: pd.DataFrame) -> pd.DataFrame:
+    return df.set_index("year") if "year" in df.columns else df
+
+
+def column_hashes(df: pd.DataFrame) -> dict:
+    """Hash de conteúdo de cada indicador de um DataFrame largo (coluna ``year`` ou índice de anos)."""
+    return {col: series_hash(s) for col, s in _wide(df).items()}
+
+
+def token(hashes: dict, columns=None) -> str:
+    """Versão curta de um conjunto de indicadores (muda só se algum deles mudar)."""
+    columns = sorted(hashes) if columns is None else sorted(columns)
+    joined = "\n".join(f"{c}={hashes[c]}" for c in columns)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:16]
+
+
+def diff_series(old, new) -> dict:
+    """Diferenças linha a linha: anos que entraram, saíram e que mudaram de valor."""
+    old = _as_series(old) if old is not None else pd.Series(dtype=float)
+    new = _as_series(new) if new is not None else pd.Series(dtype=float)
+    common = old.index.intersection(new.index)
+    moved = common[old.loc[common].to_numpy() != new.loc[common].to_numpy()]
+    return {
+        "added": [int(y) for y in new.index.difference(old.index)],
+        "removed": [int(y) for y in old.index.difference(new.index)],
+        "changed": [{"year": int(y), "old": float(old[y]), "new": float(new[y])} for y in moved],
+    }
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+# ---------- Base de versões ----------
+class SnapshotStore:
+    """Versões dos indicadores em ``root``; ``commit`` grava, ``load``/``manifest`` leem."""
+
+    def __init__(self, root: str = SNAPSHOT_DIR):
+        self.root = root
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.csv")
+
+    def _version_path(self, version: int) -> str:
+        return os.path.join(self.root, "versions", f"{version:06d}.json")
+
+    @property
+    def head(self) -> int:
+        """Versão atual (0 = base vazia)."""
+        try:
+            with open(os.path.join(self.root, "HEAD"), encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def manifest(self, version: int | None = None) -> dict:
+        version = self.head if version is None else int(version)
+        if version == 0:
+            return {"version": 0, "indicators": {}, "changes": {}}
+        with open(self._version_path(version), encoding="utf-8") as f:
+            return json.load(f)
+
+    def log(self) -> list:
+        return [self.manifest(v) for v in range(1, self.head + 1)]
+
+    def read_series(self, digest: str) -> pd.Series:
+        s = pd.read_csv(self._object_path(digest), index_col="year")["value"]
+        s.index = s.index.astype(int)
+        return s.astype(float)
+
+    def load(self, version: int | None = None) -> pd.DataFrame:
+        """DataFrame largo (``year`` + um indicador por coluna) de uma versão."""
+        man = self.manifest(version)
+        cols = {name: self.read_series(info["hash"]) for name, info in man["indicators"].items()}
+        if not cols:
+            return pd.DataFrame(columns=["year"])
+        return pd.DataFrame(cols).sort_index().rename_axis("year").reset_index()
+
+    def changed_since(self, version: int, until: int | None = None) -> list:
+        """Indicadores cujo conteúdo difere entre ``version`` e ``until`` (padrão: HEAD)."""
+        a = self.manifest(version)["indicators"]
+        b = self.manifest(until)["indicators"]
+        return sorted(n for n in set(a) | set(b)
+                      if a.get(n, {}).get("hash") != b.get(n, {}).get("hash"))
+
+    def diff(self, a: int, b: int | None = None) -> dict:
+        """Diff linha a linha de cada indicador alterado entre as versões ``a`` e ``b``."""
+        ma, mb = self.manifest(a)["indicators"], self.manifest(b)["indicators"]
+        out = {}
+        for name in self.changed_since(a, b):
+            old = self.read_series(ma[name]["hash"]) if name in ma else None
+            new = self.read_series(mb[name]["hash"]) if name in mb else None
+            out[name] = diff_series(old, new)
+        return out
+
+    def commit(self, df: pd.DataFrame, source: str = "", codes: dict | None = None) -> dict:
+        """Grava uma nova versão se algum indicador de ``df`` (largo) mudou.
+
+        Indicadores ausentes de ``df`` continuam com o conteúdo da versão
+        anterior (um download que falhou não apaga a série). Devolve o
+        manifesto da nova versão ou, sem mudanças, o da versão atual.
+        """
+        parent = self.manifest()
+        indicators = dict(parent["indicators"])
+        changes = {}
+        for name, s in _wide(df).items():
+            s = _as_series(s)
+            if s.empty:
+                continue
+            payload = series_bytes(s)
+            digest = hashlib.sha256(payload).hexdigest()
+            old = indicators.get(name)
+            if old is not None and old["hash"] == digest:
+                continue
+            if not os.path.exists(self._object_path(digest)):
+                _write_atomic(self._object_path(digest), payload)
+            changes[name] = diff_series(self.read_series(old["hash"]) if old else None, s)
+            changes[name]["status"] = "changed" if old else "added"
+            indicators[name] = {"hash": digest, "rows": int(len(s)),
+                                "first": int(s.index[0]), "last": int(s.index[-1])}
+            if codes and name in codes:
+                indicators[name]["code"] = codes[name]
+        if not changes:
+            return parent
+
+        version = parent["version"] + 1
+        man = {
+            "version": version,
+            "parent": parent["version"],
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "dataset": token({n: i["hash"] for n, i in indicators.items()}),
+            "indicators": indicators,
+            "changes": changes,
+        }
+        _write_atomic(self._version_path(version), json.dumps(man, ensure_ascii=False, indent=2).encode("utf-8"))
+        _write_atomic(os.path.join(self.root, "HEAD"), f"{version}\n".encode("utf-8"))
+        return man
+
+
+def summarize(man: dict) -> str:
+    """Uma linha por indicador alterado (para logs e para a página)."""
+    lines = []
+    for name, ch in man.get("changes", {}).items():
+        lines.append(f"{name}: {ch['status']} (+{len(ch['added'])} / -{len(ch['removed'])} / ~{len(ch['changed'])})")
+    return "\n".join(lines) or "sem mudanças"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versões dos indicadores macro (snapshots por conteúdo).")
+    parser.add_argument("--root", default=SNAPSHOT_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="registra um CSV merged como nova versão (se mudou)")
+    imp.add_argument("csv", nargs="?", default=MERGED_FILE)
+    sub.add_parser("log", help="lista as versões")
+    dif = sub.add_parser("diff", help="diff linha a linha entre duas versões")
+    dif.add_argument("a", type=int)
+    dif.add_argument("b", type=int, nargs="?")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.cmd == "import":
+        print(f"[INFO] Registrando {args.csv} em {args.root}...")
+        before = store.head
+        man = store.commit(pd.read_csv(args.csv), source=args.csv)
+        if man["version"] == before:
+            print(f"[OK] Nenhum indicador mudou; versão atual continua {before}.")
+        else:
+            print(f"[OK] Versão {man['version']} ({man['dataset']}):\n{summarize(man)}")
+    elif args.cmd == "log":
+        for man in store.log():
+            print(f"[INFO] v{man['version']} {man['created']} {man['dataset']} — {len(man['changes'])} indicador(es) alterado(s)")
+    else:
+        print(json.dumps(store.diff(args.a, args.b), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# core/offload.py
+# -------------------------------------------------------------
+# Pool de processos compartilhado para tarefas pesadas de CPU (ajuste dos
+# pares VAR/VECM da página Macro, core/macro/pairs.py).
+#
+# O Streamlit roda todas as sessões em threads de UM processo; um ajuste
+# longo segura o GIL e atrasa até as páginas estáticas dos outros
+# visitantes. Aqui a tarefa vai para um processo filho e a thread da sessão
+# só espera o resultado (sem segurar o GIL).
+#
+# - Pool limitado (``POOL_WORKERS``), criado na primeira tarefa e mantido
+#   enquanto o servidor estiver no ar. Usa o contexto padrão da plataforma
+#   (fork no Linux, como o pool de core/macro/regimes.py): com "spawn" o
+#   filho reexecutaria o script da página, que o Streamlit registra como
+#   ``__main__``.
+# - Fila limitada: no máximo ``MAX_PENDING`` tarefas em andamento/esperando;
+#   acima disso ``run`` falha na hora com ``PoolBusy`` em vez de enfileirar.
+# - Timeout por tarefa (``TASK_TIMEOUT_S``): quem espera recebe TimeoutError
+#   e o pool é descartado com os processos encerrados (um filho preso não
+#   devolve a vaga nem o worker); a próxima tarefa sobe um pool novo. Tarefas
+#   de outras sessões no mesmo pool falham com BrokenProcessPool.
+# - Entradas e saídas devem ser arrays/tipos simples (baratos de serializar).
+#
+# Desative com LPB_OFFLOAD=0 (tudo roda na própria thread, como antes).
+# -------------------------------------------------------------
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# ======= CONFIG =======
+OFFLOAD_ENABLED = os.environ.get("LPB_OFFLOAD", "1") != "0"
+POOL_WORKERS = int(os.environ.get("LPB_POOL_WORKERS", min(2, os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get("LPB_POOL_MAX_PENDING", 4 * POOL_WORKERS))
+TASK_TIMEOUT_S = float(os.environ.get("LPB_POOL_TIMEOUT", 60))
+# ======================
+
+class PoolBusy(RuntimeError):
+    """A fila do pool está cheia; a tarefa não foi enviada."""
+
+
+_lock = threading.Lock()
+_pool = None
+_stats = {"pending": 0, "submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "rejected": 0,
+          "inline": 0, "restarts": 0}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+        return _pool
+
+
+def _discard_pool(old: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """Descarta um pool quebrado ou travado; o próximo ``run`` cria outro.
+
+    Com ``terminate`` encerra também os processos filhos (uma tarefa presa
+    não termina sozinha com ``shutdown``).
+    """
+    global _pool
+    with _lock:
+        if _pool is old:
+            _pool = None
+            _stats["restarts"] += 1
+    if terminate:
+        for proc in list((old._processes or {}).values()):
+            proc.terminate()
+    old.shutdown(wait=False, cancel_futures=True)
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _lock:
+        _stats[key] += n
+
+
+def _reserve() -> None:
+    with _lock:
+        if _stats["pending"] >= MAX_PENDING:
+            _stats["rejected"] += 1
+            raise PoolBusy(f"Fila de ajustes cheia ({MAX_PENDING} tarefas); tente novamente em instantes.")
+        _stats["pending"] += 1
+
+
+def run(fn, *args, timeout: float | None = TASK_TIMEOUT_S):
+    """Executa ``fn(*args)`` num processo do pool e espera o resultado.
+
+    ``fn`` precisa ser importável no nível do módulo (vai por pickle).
+    Levanta ``PoolBusy`` com a fila cheia e ``TimeoutError`` se passar de ``timeout``.
+    """
+    if not OFFLOAD_ENABLED:
+        _count("inline")
+        return fn(*args)
+    _reserve()
+    pool = _get_pool()
+    try:
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # Um processo morreu numa tarefa anterior: recria o pool e tenta de novo
+            _discard_pool(pool)
+            pool = _get_pool()
+            future = pool.submit(fn, *args)
+    except BaseException:
+        _count("pending", -1)
+        raise
+    _count("submitted")
+    # A vaga só volta quando o processo termina (mesmo se quem esperava desistiu)
+    future.add_done_callback(lambda _f: _count("pending", -1))
+
+    try:
+        result = future.result(timeout=timeout)
+    except FutureTimeout:
+        _count("timeouts")
+        _discard_pool(pool, terminate=True)
+        raise TimeoutError(f"Tarefa {getattr(fn, '__name__', fn)} passou de {timeout:g} s.") from None
+    except BrokenProcessPool:
+        _count("failed")
+        _discard_pool(pool)
+        raise
+    except BaseException:
+        _count("failed")
+        raise
+    _count("completed")
+    return result
+
+
+def stats() -> dict:
+    """Contadores do pool desde a subida do servidor, com a fila atual."""
+    with _lock:
+        out = dict(_stats)
+    out["max_pending"] = MAX_PENDING
+    out["workers"] = POOL_WORKERS if OFFLOAD_ENABLED else 0
+    return out
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown)
@@ -0,0 +1,267 @@
+# core/prerender.py
+# -------------------------------------------------------------
+# Pré-renderização das páginas de conteúdo estático
+# (Home, Currículo e Governança de Dados).
+#
+# Cada página descreve o seu conteúdo numa função ``build(doc)`` que usa
+# a mesma API do Streamlit (markdown, columns, container, expander...).
+# - Modo ao vivo: ``build(st)`` desenha elemento a elemento, como antes.
+# - Modo pré-renderizado (padrão): ``build(HtmlDoc())`` roda UMA vez por
+#   processo, gera um único documento markdown/HTML e cada visita só
+#   reenvia esse payload pronto (um ``st.markdown`` por bloco).
+#
+# Desative com a variável de ambiente LPB_PRERENDER=0 (útil ao editar
+# textos, já que o cache só é refeito quando o servidor reinicia).
+# -------------------------------------------------------------
+import base64
+import html
+import importlib
+import io
+import os
+import sys
+import textwrap
+import threading
+
+import streamlit as st
+
+PRERENDER_ENABLED = os.environ.get("LPB_PRERENDER", "1") != "0"
+
+# Páginas que podem ser pré-renderizadas na subida do servidor.
+STATIC_PAGES = ("sections.Home", "sections.Curriculo", "sections.Governanca_dados")
+
+# Aproximação visual dos componentes nativos do Streamlit
+_GAPS = {"small": "1rem", "medium": "2rem", "large": "4rem"}
+_BORDER_STYLE = "border:1px solid rgba(128,128,128,0.3);border-radius:0.5rem;padding:1rem;margin-bottom:1rem"
+_CAPTION_STYLE = "font-size:0.875rem;opacity:0.6"
+_ALERT_STYLES = {
+    "info": "background:rgba(28,131,225,0.1);border-radius:0.5rem;padding:1rem;margin-bottom:1rem",
+    "success": "background:rgba(33,195,84,0.1);border-radius:0.5rem;padding:1rem;margin-bottom:1rem",
+}
+
+_warming = threading.local()
+
+
+def _md(body: str) -> str:
+    """Normaliza um texto markdown do jeito que o ``st.markdown`` faz (dedent + strip)."""
+    return textwrap.dedent(str(body)).strip()
+
+
+def _wrap(opening: str, inner: str, closing: str) -> str:
+    # Linhas em branco entre as tags garantem que o markdown interno seja interpretado
+    return f"{opening}\n\n{inner}\n\n{closing}"
+
+
+def _image_data_uri(path: str, width: int | None) -> str:
+    """Reduz a imagem para a largura exibida (2x para telas retina) e gera um data URI."""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        if width:
+            img.thumbnail((width * 2, width * 4))
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG", optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _escape_cell(value) -> str:
+    return html.escape(str(value)).replace("|", "\\|").replace("\n", " ")
+
+
+class _Block:
+    """Bloco aninhado (colunas, container, expander) composto no momento da renderização."""
+
+    def __init__(self, opening: str, children: list, closing: str, wraps: list | None = None):
+        self.opening = opening
+        self.children = children
+        self.closing = closing
+        self.wraps = wraps or [None] * len(children)
+
+    def to_markdown(self) -> str:
+        parts = []
+        for child, wrap in zip(self.children, self.wraps):
+            inner = child.to_markdown()
+            parts.append(_wrap(wrap[0], inner, wrap[1]) if wrap else inner)
+        return _wrap(self.opening, "\n\n".join(parts), self.closing)
+
+
+class HtmlDoc:
+    """Imita a API do ``st`` usada nas páginas estáticas, acumulando markdown/HTML.
+
+    Elementos interativos (download, checkbox, graphviz) viram segmentos "ao vivo" que
+    continuam sendo enviados pelo Streamlit; só podem aparecer no nível raiz.
+    """
+
+    def __init__(self, nested: bool = False):
+        self._nested = nested
+        self._parts: list = []
+
+    # ---------- Texto ----------
+    def markdown(self, body, unsafe_allow_html: bool = False, **kwargs) -> None:
+        self._parts.append(_md(body))
+
+    def write(self, body) -> None:
+        self.markdown(body)
+
+    def title(self, body) -> None:
+        self._parts.append(f"# {body}")
+
+    def header(self, body) -> None:
+        self._parts.append(f"## {body}")
+
+    def subheader(self, body) -> None:
+        self._parts.append(f"### {body}")
+
+    def caption(self, body) -> None:
+        self._parts.append(_wrap(f'<div style="{_CAPTION_STYLE}">', _md(body), "</div>"))
+
+    def divider(self) -> None:
+        self._parts.append("---")
+
+    def info(self, body, **kwargs) -> None:
+        self._parts.append(_wrap(f'<div style="{_ALERT_STYLES["info"]}">', _md(body), "</div>"))
+
+    def success(self, body, **kwargs) -> None:
+        self._parts.append(_wrap(f'<div style="{_ALERT_STYLES["success"]}">', _md(body), "</div>"))
+
+    def table(self, data) -> None:
+        rows = list(data)
+        if not rows:
+            return
+        cols = list(rows[0].keys())
+        lines = [
+            "| " + " | ".join(_escape_cell(c) for c in cols) + " |",
+            "|" + "|".join(" --- " for _ in cols) + "|",
+        ]
+        lines += ["| " + " | ".join(_escape_cell(r.get(c, "")) for c in cols) + " |" for r in rows]
+        self._parts.append("\n".join(lines))
+
+    def image(self, image: str, width: int | None = None, **kwargs) -> None:
+        size = f' width="{width}"' if width else ""
+        self._parts.append(f'<img src="{_image_data_uri(image, width)}"{size}>')
+
+    # ---------- Layout ----------
+    def columns(self, spec, gap: str = "small", **kwargs) -> list:
+        weights = [1] * spec if isinstance(spec, int) else list(spec)
+        children = [HtmlDoc(nested=True) for _ in weights]
+        opening = f'<div style="display:flex;flex-wrap:wrap;gap:{_GAPS.get(gap, "1rem")}">'
+        wraps = [(f'<div style="flex:{w} 1 16rem;min-width:0">', "</div>") for w in weights]
+        self._parts.append(_Block(opening, children, "</div>", wraps))
+        return children
+
+    def container(self, border: bool = False, **kwargs) -> "HtmlDoc":
+        child = HtmlDoc(nested=True)
+        opening = f'<div style="{_BORDER_STYLE}">' if border else "<div>"
+        self._parts.append(_Block(opening, [child], "</div>"))
+        return child
+
+    def expander(self, label: str, expanded: bool = False, **kwargs) -> "HtmlDoc":
+        child = HtmlDoc(nested=True)
+        opening = (
+            f'<details{" open" if expanded else ""} style="{_BORDER_STYLE}">'
+            f"<summary>{html.escape(label)}</summary>"
+        )
+        self._parts.append(_Block(opening, [child], "</details>"))
+        return child
+
+    # ---------- Elementos ao vivo ----------
+    def _live(self, name: str, args: tuple, kwargs: dict) -> None:
+        if self._nested:
+            raise ValueError(f"st.{name} não pode ficar dentro de um bloco pré-renderizado.")
+        self._parts.append(("live", name, args, kwargs))
+
+    def graphviz_chart(self, *args, **kwargs) -> None:
+        self._live("graphviz_chart", args, kwargs)
+
+    def download_button(self, *args, **kwargs) -> bool:
+        self._live("download_button", args, kwargs)
+        return False
+
+    def checkbox(self, *args, **kwargs) -> bool:
+        self._live("checkbox", args, kwargs)
+        return False
+
+    # ---------- Saída ----------
+    def to_markdown(self) -> str:
+        return "\n\n".join(p.to_markdown() if isinstance(p, _Block) else p for p in self._parts)
+
+    def segments(self) -> tuple:
+        """Agrupa o documento em segmentos ``("html", texto)`` e ``("live", nome, args, kwargs)``."""
+        out, buffer = [], []
+        for part in self._parts:
+            if isinstance(part, tuple):
+                if buffer:
+                    out.append(("html", "\n\n".join(buffer)))
+                    buffer = []
+                out.append(part)
+            else:
+                buffer.append(part.to_markdown() if isinstance(part, _Block) else part)
+        if buffer:
+            out.append(("html", "\n\n".join(buffer)))
+        return tuple(out)
+
+
+@st.cache_resource(show_spinner=False)
+def _prerender(page_id: str, _build) -> tuple:
+    """Roda ``build`` contra um HtmlDoc uma única vez por processo (cache compartilhado)."""
+    doc = HtmlDoc()
+    _build(doc)
+    return doc.segments()
+
+
+def emit(segments, target=None) -> None:
+    """Envia os segmentos pré-renderizados: um markdown por bloco estático."""
+    target = target or st
+    for segment in segments:
+        if segment[0] == "html":
+            target.markdown(segment[1], unsafe_allow_html=True)
+        else:
+            _, name, args, kwargs = segment
+            getattr(target, name)(*args, **kwargs)
+
+
+def render_static(page_id: str, build, target=None) -> None:
+    """Desenha uma página (ou trecho) estática, pré-renderizada quando habilitado."""
+    warming = getattr(_warming, "active", False)
+    if not PRERENDER_ENABLED:
+        if not warming:
+            build(target or st)
+        return
+    segments = _prerender(page_id, build)
+    if not warming:
+        emit(segments, target)
+
+
+def render_lazy_tabs(page_id: str, tabs: dict, key: str, target=None) -> str:
+    """Abas "preguiçosas": diferente do ``st.tabs``, só a aba selecionada é montada e enviada.
+
+    ``tabs`` mapeia rótulo → ``build(doc)``. Cada aba vira uma entrada própria no cache
+    de pré-renderização, criada na primeira vez em que é aberta. Retorna o rótulo ativo.
+    """
+    labels = list(tabs)
+    if getattr(_warming, "active", False):
+        # No aquecimento só a aba padrão (a primeira) entra no cache
+        selected = labels[0]
+    else:
+        selected = (target or st).radio(
+            "Seção", labels, key=key, horizontal=True, label_visibility="collapsed"
+        )
+    render_static(f"{page_id}/{selected}", tabs[selected], target)
+    return selected
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up(module_names: tuple = STATIC_PAGES) -> bool:
+    """Importa as páginas estáticas na subida do servidor só para preencher o cache.
+
+    Durante o aquecimento ``render_static`` monta os fragmentos mas não desenha nada.
+    """
+    if not PRERENDER_ENABLED:
+        return False
+    _warming.active = True
+    try:
+        for name in module_names:
+            if name not in sys.modules:
+                importlib.import_module(name)
+    finally:
+        _warming.active = False
+    return True
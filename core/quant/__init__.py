@@ -0,0 +1 @@
+"""Análise quantitativa: dados de preços, backtests e alocação de carteiras."""
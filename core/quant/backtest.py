@@ -0,0 +1,223 @@
+# core/quant/backtest.py
+# -------------------------------------------------------------
+# Motor de backtest vetorizado sobre um painel de preços (datas × ativos).
+#
+# Sinais, posições, PnL, custos e drawdown são operações de array inteiro
+# (nada de laço por dia ou por ativo). Para varrer parâmetros:
+# - os indicadores que não dependem da combinação (médias móveis,
+#   retornos acumulados) são calculados uma vez por janela e reaproveitados;
+# - as combinações são enviadas em blocos a um pool de processos, e cada
+#   processo recebe o painel uma única vez (no initializer).
+# -------------------------------------------------------------
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from core import rolling
+
+TRADING_DAYS = 252
+BLOCK_SIZE = 32          # combinações por tarefa enviada ao pool
+
+
+# ---------- Indicadores (com cache por janela) ----------
+class Indicators:
+    """Indicadores de um painel, memorizados por janela (reaproveitados na varredura)."""
+
+    def __init__(self, close: np.ndarray):
+        self.close = np.asarray(close, dtype="float32")
+        self.returns = np.zeros_like(self.close)
+        self.returns[1:] = self.close[1:] / self.close[:-1] - 1.0
+        self.log_close = np.log(self.close)
+        # Soma acumulada calculada uma vez: cada nova média móvel custa uma subtração.
+        # Ativos listados depois dos outros começam com NaN: a soma ignora esses
+        # dias e a contagem de preços válidos marca as janelas incompletas.
+        valid = np.isfinite(self.close)
+        self._csum = np.cumsum(np.where(valid, self.close, 0.0), axis=0, dtype="float64")
+        self._count = np.cumsum(valid, axis=0, dtype="int64")
+        self.sma = lru_cache(maxsize=256)(self._sma)
+        self.zscore = lru_cache(maxsize=64)(self._zscore)
+
+    def _sma(self, window: int) -> np.ndarray:
+        out = np.full(self.close.shape, np.nan, dtype="float32")
+        out[window - 1] = self._csum[window - 1] / window
+        out[window:] = (self._csum[window:] - self._csum[:-window]) / window
+        count = self._count[window - 1:].copy()
+        count[1:] -= self._count[:-window]
+        out[window - 1:][count < window] = np.nan
+        return out
+
+    def _zscore(self, window: int) -> np.ndarray:
+        return rolling.rolling_zscore(self.close, window, ddof=0)
+
+    def momentum(self, lookback: int) -> np.ndarray:
+        out = np.full(self.close.shape, np.nan, dtype="float32")
+        out[lookback:] = self.log_close[lookback:] - self.log_close[:-lookback]
+        return out
+
+
+# ---------- Estratégias: parâmetros → posição alvo em {-1, 0, 1} ----------
+def signal_ma_cross(ind: Indicators, fast: int, slow: int) -> np.ndarray:
+    """Comprado quando a média curta está acima da longa, vendido no contrário."""
+    if fast >= slow:
+        return np.full(ind.close.shape, np.nan, dtype="float32")
+    return np.sign(ind.sma(int(fast)) - ind.sma(int(slow)))
+
+
+def signal_momentum(ind: Indicators, lookback: int, top: float = 0.2) -> np.ndarray:
+    """Cross-section: compra o ``top`` de maior retorno no período e vende o ``top`` de menor."""
+    mom = ind.momentum(int(lookback))
+    ranks = pd.DataFrame(mom).rank(axis=1, pct=True).to_numpy(dtype="float32")
+    pos = np.where(ranks >= 1 - top, 1.0, np.where(ranks <= top, -1.0, 0.0)).astype("float32")
+    pos[np.isnan(mom)] = np.nan
+    return pos
+
+
+def signal_mean_reversion(ind: Indicators, window: int, entry_z: float) -> np.ndarray:
+    """Vende quando o preço está ``entry_z`` desvios acima da média móvel e compra abaixo."""
+    z = ind.zscore(int(window))
+    pos = np.where(z > entry_z, -1.0, np.where(z < -entry_z, 1.0, 0.0)).astype("float32")
+    pos[np.isnan(z)] = np.nan
+    return pos
+
+
+STRATEGIES = {
+    "ma_cross": {
+        "label": "Cruzamento de médias móveis",
+        "signal": signal_ma_cross,
+        "defaults": {"fast": 20, "slow": 100},
+        "valid": lambda p: p["fast"] < p["slow"],
+    },
+    "momentum": {
+        "label": "Momentum (cross-section)",
+        "signal": signal_momentum,
+        "defaults": {"lookback": 126},
+    },
+    "mean_reversion": {
+        "label": "Reversão à média (z-score)",
+        "signal": signal_mean_reversion,
+        "defaults": {"window": 20, "entry_z": 1.5},
+    },
+}
+
+
+# ---------- PnL ----------
+def portfolio_returns(positions: np.ndarray, returns: np.ndarray, cost_bps: float = 5.0) -> tuple:
+    """Retorno diário líquido e giro de uma ou várias carteiras (eixos finais: datas × ativos).
+
+    A posição decidida no fechamento de ``t`` ganha o retorno de ``t+1`` (sem
+    olhar o futuro). Cada carteira é igualmente ponderada entre os ativos e
+    normalizada pela exposição bruta; o custo incide sobre o giro. Retorno
+    NaN (ativo ainda sem preço) conta como zero, para não contaminar a carteira.
+    """
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+    weights = np.array(positions, dtype="float32")  # cópia; daqui em diante tudo é in-place
+    weights[np.isnan(weights)] = 0.0
+    gross = np.abs(weights).sum(axis=-1, keepdims=True)
+    gross[gross == 0] = 1.0  # sem posição no dia → pesos continuam zero
+    weights /= gross
+
+    shape = weights.shape[:-1]
+    gross_ret = np.zeros(shape, dtype="float32")
+    # Produto linha a linha (pesos de t-1 × retornos de t) sem materializar o produto inteiro
+    gross_ret[..., 1:] = np.einsum("...tn,tn->...t", weights[..., :-1, :], returns[1:])
+    turnover = np.zeros(shape, dtype="float32")
+    turnover[..., 1] = np.abs(weights[..., 0, :]).sum(axis=-1)
+    change = np.diff(weights[..., :-1, :], axis=-2)
+    turnover[..., 2:] = np.abs(change, out=change).sum(axis=-1)
+    return gross_ret - turnover * np.float32(cost_bps / 1e4), turnover
+
+
+def equity_curve(daily: np.ndarray) -> np.ndarray:
+    return np.cumprod(1.0 + daily, axis=-1)
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    return equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+
+def stats(daily: np.ndarray, turnover: np.ndarray) -> dict:
+    """Métricas anualizadas (funciona para uma série ou um bloco de séries no último eixo)."""
+    daily = np.asarray(daily, dtype="float64")
+    equity = equity_curve(daily)
+    years = daily.shape[-1] / TRADING_DAYS
+    vol = daily.std(axis=-1) * np.sqrt(TRADING_DAYS)
+    mean = daily.mean(axis=-1) * TRADING_DAYS
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "cagr": equity[..., -1] ** (1.0 / years) - 1.0,
+            "vol": vol,
+            "sharpe": np.where(vol > 0, mean / vol, np.nan),
+            "max_drawdown": drawdown(equity).min(axis=-1),
+            "turnover": turnover.mean(axis=-1) * TRADING_DAYS,
+            "hit_rate": (daily > 0).sum(axis=-1) / np.maximum((daily != 0).sum(axis=-1), 1),
+        }
+
+
+def run(close, strategy: str, params: dict, cost_bps: float = 5.0, ind: Indicators | None = None) -> dict:
+    """Backtest de uma combinação: séries diárias + métricas."""
+    ind = ind or Indicators(np.asarray(close))
+    positions = STRATEGIES[strategy]["signal"](ind, **params)
+    daily, turnover = portfolio_returns(positions, ind.returns, cost_bps)
+    equity = equity_curve(daily)
+    return {
+        "daily": daily,
+        "equity": equity,
+        "drawdown": drawdown(equity),
+        "positions": positions,
+        "stats": {k: float(v) for k, v in stats(daily, turnover).items()},
+    }
+
+
+# ---------- Varredura de parâmetros ----------
+_worker = {}
+
+
+def _init_worker(close: np.ndarray) -> None:
+    # Cada processo recebe o painel uma vez e monta os próprios indicadores
+    _worker["ind"] = Indicators(close)
+
+
+def _evaluate_block(strategy: str, combos: list, cost_bps: float, ind: Indicators | None = None) -> list:
+    # No pool os indicadores vêm do initializer; no próprio processo, por argumento
+    # (nada de estado global compartilhado entre sessões do servidor)
+    ind = ind or _worker["ind"]
+    signal = STRATEGIES[strategy]["signal"]
+    rows = []
+    for params in combos:
+        daily, turnover = portfolio_returns(signal(ind, **params), ind.returns, cost_bps)
+        rows.append({**params, **{k: float(v) for k, v in stats(daily, turnover).items()}})
+    return rows
+
+
+def parameter_grid(grid: dict, valid=None) -> list:
+    """Produto cartesiano das grades, descartando combinações que ``valid`` rejeitar."""
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    return [c for c in combos if valid is None or valid(c)]
+
+
+def sweep(close, strategy: str, grid: dict, cost_bps: float = 5.0, workers: int | None = None,
+          block_size: int = BLOCK_SIZE) -> pd.DataFrame:
+    """Avalia todas as combinações de ``grid`` e devolve uma linha de métricas por combinação.
+
+    Com ``workers=1`` roda no próprio processo (útil em servidores com 1 CPU).
+    """
+    close = np.ascontiguousarray(np.asarray(close, dtype="float32"))
+    combos = parameter_grid(grid, STRATEGIES[strategy].get("valid"))
+    blocks = [combos[i:i + block_size] for i in range(0, len(combos), block_size)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(blocks) == 1:
+        ind = Indicators(close)
+        rows = [row for block in blocks for row in _evaluate_block(strategy, block, cost_bps, ind)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(close,)) as pool:
+            # Blocos consecutivos compartilham janelas → chunksize mantém o cache de cada processo útil
+            chunks = pool.map(_evaluate_block, [strategy] * len(blocks), blocks, [cost_bps] * len(blocks),
+                              chunksize=max(1, len(blocks) // (workers * 4)))
+            rows = [row for chunk in chunks for row in chunk]
+    return pd.DataFrame(rows)
@@ -0,0 +1,88 @@
+# core/quant/data.py
+# -------------------------------------------------------------
+# Painéis de preços para a Análise Quant.
+#
+# Fonte local: uma pasta com um CSV por ativo (``<TICKER>.csv`` com as
+# colunas date, open, high, low, close, volume — só ``date`` e ``close``
+# são obrigatórias). Os arquivos são alinhados num painel "largo"
+# (datas × tickers) de float32.
+#
+# Sem arquivos, a página usa um painel sintético (passeio aleatório
+# geométrico com fator de mercado), o mesmo gerador usado para criar
+# arquivos de exemplo.
+# -------------------------------------------------------------
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+# ======= CONFIG =======
+PRICES_DIR = os.path.join("data", "quant", "prices")
+# ======================
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def synthetic_panel(n_tickers: int = 50, n_days: int = 2520, seed: int = 42,
+                    start: str = "2015-01-02") -> dict:
+    """Painel OHLCV sintético: ``{campo: DataFrame(datas × tickers)}``.
+
+    Retornos com um fator de mercado comum + ruído próprio e drift/vol
+    diferentes por ativo, o suficiente para estratégias terem o que achar.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=n_days)
+    tickers = [f"SYN{i:03d}" for i in range(n_tickers)]
+
+    beta = rng.uniform(0.5, 1.5, n_tickers)
+    vol = rng.uniform(0.01, 0.03, n_tickers)
+    drift = rng.normal(0.0003, 0.0003, n_tickers)
+    market = rng.normal(0.0002, 0.01, n_days)
+    rets = drift + market[:, None] * beta + rng.standard_normal((n_days, n_tickers)) * vol
+    close = 50.0 * np.exp(np.cumsum(rets, axis=0))
+
+    spread = np.abs(rng.standard_normal((n_days, n_tickers))) * vol * close
+    open_ = close * np.exp(rng.standard_normal((n_days, n_tickers)) * vol / 3)
+    panel = {
+        "open": open_,
+        "high": np.maximum(open_, close) + spread / 2,
+        "low": np.minimum(open_, close) - spread / 2,
+        "close": close,
+        "volume": rng.lognormal(13, 0.5, (n_days, n_tickers)).round(),
+    }
+    return {k: pd.DataFrame(v.astype("float32"), index=dates, columns=tickers) for k, v in panel.items()}
+
+
+def write_price_files(panel: dict, folder: str = PRICES_DIR) -> list:
+    """Grava um CSV por ticker (útil para gerar dados de exemplo/fixtures)."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for ticker in panel["close"].columns:
+        df = pd.DataFrame({field: panel[field][ticker] for field in FIELDS if field in panel})
+        path = os.path.join(folder, f"{ticker}.csv")
+        df.to_csv(path, index_label="date", float_format="%.6g")
+        paths.append(path)
+    return paths
+
+
+def load_price_files(folder: str = PRICES_DIR, fields=FIELDS) -> dict:
+    """Lê os CSVs da pasta e alinha num painel ``{campo: DataFrame(datas × tickers)}``.
+
+    Datas sem negociação de um ativo são preenchidas com o último preço (volume 0).
+    """
+    frames = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.csv"))):
+        ticker = os.path.splitext(os.path.basename(path))[0].upper()
+        frames[ticker] = pd.read_csv(path, parse_dates=["date"], index_col="date").sort_index()
+    if not frames:
+        return {}
+
+    panel = {}
+    for field in fields:
+        if not all(field in df.columns for df in frames.values()):
+            continue
+        wide = pd.concat({t: df[field] for t, df in frames.items()}, axis=1).sort_index()
+        wide = wide.fillna(0.0) if field == "volume" else wide.ffill()
+        panel[field] = wide.astype("float32")
+    return panel
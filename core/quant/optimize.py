@@ -0,0 +1,262 @@
+# core/quant/optimize.py
+# -------------------------------------------------------------
+# Alocação de carteiras: média-variância, mínima variância e paridade de risco.
+#
+# - A covariância é estimada com encolhimento de Ledoit-Wolf (scikit-learn)
+#   e cacheada por (universo, janela, versão dos dados): mexer em restrições
+#   ou na aversão a risco não reestima nada.
+# - Os solvers são iterativos e aceitam um ponto de partida; a última
+#   solução de cada (universo, método) fica guardada no dicionário ``warm``
+#   que a página passa (um por sessão, em ``st.session_state``, com no
+#   máximo ``WARM_MAX`` entradas) e vira o chute inicial da próxima chamada
+#   (warm start). Restrição que muda pouco → poucas iterações.
+# - A fronteira eficiente sai numa varredura única sobre a aversão a risco:
+#   cada ponto parte do conjunto ativo do ponto vizinho (continuação em λ),
+#   sobre a mesma estimativa cacheada, e as métricas são calculadas em lote.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.covariance import LedoitWolf
+
+TRADING_DAYS = 252
+TOL = 1e-10
+MIN_OBS = 20         # observações completas mínimas para estimar a covariância
+WARM_MAX = 8         # soluções guardadas por sessão (as mais antigas saem primeiro)
+
+METHODS = {
+    "mean_variance": "Média-variância",
+    "min_variance": "Mínima variância",
+    "risk_parity": "Paridade de risco",
+}
+
+# ---------- Estimativas (cacheadas) ----------
+@st.cache_data(show_spinner=False, max_entries=32)
+def estimate(_returns: pd.DataFrame, universe: tuple, window: int, version) -> dict:
+    """Retorno esperado e covariância anualizados das últimas ``window`` observações.
+
+    O cache é chaveado por ``universe``, ``window`` e ``version`` (assinatura dos
+    dados); ``_returns`` não é hasheado. Com menos de ``MIN_OBS`` dias em que
+    todos os ativos têm retorno, devolve só ``error`` (mensagem para a página).
+    """
+    rets = _returns[list(universe)].iloc[-window:].dropna(axis=0, how="any").to_numpy(dtype="float64")
+    if len(rets) < MIN_OBS:
+        counts = _returns[list(universe)].iloc[-window:].notna().sum()
+        short = ", ".join(counts[counts < MIN_OBS].index.astype(str)) or "o universo inteiro"
+        return {"tickers": list(universe), "n_obs": len(rets),
+                "error": f"Só {len(rets)} dia(s) com retorno de todos os ativos na janela (mínimo {MIN_OBS}). "
+                         f"Pouco histórico: {short}."}
+    lw = LedoitWolf().fit(rets)
+    cov = lw.covariance_ * TRADING_DAYS
+    return {
+        "tickers": list(universe),
+        "mu": rets.mean(axis=0) * TRADING_DAYS,
+        "cov": cov,
+        "shrinkage": float(lw.shrinkage_),
+        "n_obs": len(rets),
+        "error": None,
+    }
+
+
+# ---------- Warm start (por sessão) ----------
+def _recall(warm: dict | None, key: tuple):
+    if warm is None or key not in warm:
+        return None
+    warm[key] = warm.pop(key)  # mais recente vai para o fim
+    return warm[key]
+
+
+def _remember(warm: dict | None, key: tuple, value: np.ndarray) -> None:
+    if warm is None:
+        return
+    warm.pop(key, None)
+    warm[key] = value
+    while len(warm) > WARM_MAX:
+        warm.pop(next(iter(warm)))
+
+
+# ---------- Projeção no simplex com teto ----------
+def project_capped_simplex(v: np.ndarray, cap: float = 1.0, iters: int = 60) -> np.ndarray:
+    """Projeta cada linha de ``v`` em {w : Σw = 1, 0 ≤ w ≤ cap} (bissecção no deslocamento)."""
+    v = np.atleast_2d(v)
+    n = v.shape[1]
+    if cap * n < 1 - 1e-12:
+        raise ValueError(f"Teto de {cap:.0%} por ativo é pequeno demais para {n} ativos.")
+    lo = (v.min(axis=1) - cap)[:, None]
+    hi = v.max(axis=1)[:, None]
+    for _ in range(iters):
+        tau = (lo + hi) / 2
+        total = np.clip(v - tau, 0.0, cap).sum(axis=1, keepdims=True)
+        lo = np.where(total > 1, tau, lo)
+        hi = np.where(total > 1, hi, tau)
+    return np.clip(v - (lo + hi) / 2, 0.0, cap)
+
+
+# ---------- Solvers ----------
+def _start_point(c: np.ndarray, q_diag: np.ndarray, cap: float, w0: np.ndarray | None) -> np.ndarray:
+    """Ponto viável para o conjunto ativo: a solução anterior (projetada) ou um vértice guloso."""
+    if w0 is not None and len(w0) == len(c):
+        return project_capped_simplex(np.asarray(w0, dtype="float64"), cap)[0]
+    # Sem histórico: enche até o teto os ativos de melhor ganho marginal
+    w = np.zeros(len(c))
+    left = 1.0
+    for i in np.argsort(-(c - 0.5 * q_diag * min(cap, 1.0))):
+        w[i] = min(cap, left)
+        left -= w[i]
+        if left <= 0:
+            break
+    return w
+
+
+def _active_set_qp(Q: np.ndarray, c: np.ndarray, cap: float, w0: np.ndarray | None = None,
+                   tol: float = TOL, max_iter: int | None = None) -> tuple:
+    """min ½·wᵀQw − cᵀw  com  Σw = 1  e  0 ≤ w ≤ cap  (método primal de conjunto ativo).
+
+    Cada iteração resolve o sistema KKT só das variáveis livres; partindo de uma
+    solução próxima, o conjunto ativo já está quase certo e bastam poucas iterações.
+    Devolve ``(pesos, iterações)``.
+    """
+    n = len(c)
+    w = _start_point(c, np.diag(Q), cap, w0)
+    # -1 = preso em 0, +1 = preso no teto, 0 = livre
+    state = np.where(w <= tol, -1, np.where(w >= cap - tol, 1, 0))
+    if not (state == 0).any():
+        # Precisa de ao menos uma variável livre para o multiplicador do orçamento
+        pos = np.flatnonzero(w > 0)
+        state[pos[np.argmin(w[pos])]] = 0
+
+    it = 0
+    for it in range(1, (max_iter or 10 * n + 100) + 1):
+        free = np.flatnonzero(state == 0)
+        g = Q @ w - c
+        k = len(free)
+        kkt = np.zeros((k + 1, k + 1))
+        kkt[:k, :k] = Q[np.ix_(free, free)]
+        kkt[:k, k] = kkt[k, :k] = 1.0
+        sol = np.linalg.solve(kkt, np.r_[-g[free], 0.0])
+        p = sol[:k]
+
+        if np.abs(p).max() <= tol:
+            # Ponto estacionário no conjunto atual: confere o sinal dos multiplicadores
+            nu = -float(np.mean(g[free]))
+            mult = np.where(state == -1, g + nu, np.where(state == 1, -(g + nu), np.inf))
+            j = int(np.argmin(mult))
+            if mult[j] >= -tol:
+                break
+            state[j] = 0
+            continue
+
+        # Passo até a primeira restrição que bloqueia
+        wf = w[free]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(p < 0, wf / -p, np.where(p > 0, (cap - wf) / p, np.inf))
+        j = int(np.argmin(ratio))
+        alpha = min(1.0, float(ratio[j]))
+        w[free] = wf + alpha * p
+        if alpha < 1.0:
+            i = free[j]
+            state[i] = -1 if p[j] < 0 else 1
+            w[i] = 0.0 if p[j] < 0 else cap
+    np.clip(w, 0.0, cap, out=w)
+    return w / w.sum(), it
+
+
+def mean_variance(est: dict, risk_aversion: float, cap: float = 1.0, w0: np.ndarray | None = None,
+                  **kw) -> tuple:
+    """max μᵀw − (λ/2)·wᵀΣw com Σw = 1 e 0 ≤ w ≤ cap. Devolve ``(pesos 1 × N, iterações)``."""
+    w, it = _active_set_qp(risk_aversion * est["cov"], est["mu"], cap, w0, **kw)
+    return w[None, :], it
+
+
+def min_variance(est: dict, cap: float = 1.0, w0: np.ndarray | None = None, **kw) -> tuple:
+    """Mínima variância = média-variância sem o termo de retorno."""
+    w, it = _active_set_qp(est["cov"], np.zeros_like(est["mu"]), cap, w0, **kw)
+    return w[None, :], it
+
+
+def risk_parity(est: dict, budget: np.ndarray | None = None, w0: np.ndarray | None = None,
+                max_iter: int = 100, tol: float = 1e-10) -> tuple:
+    """Pesos com contribuições de risco proporcionais a ``budget`` (iguais por padrão).
+
+    Newton no problema convexo  min ½·yᵀΣy − Σ bᵢ·log yᵢ  (y > 0) e normalização
+    final; a solução anterior serve de ponto de partida. Devolve ``(pesos 1 × N, iterações)``.
+    """
+    cov = est["cov"]
+    n = cov.shape[0]
+    b = np.full(n, 1.0 / n) if budget is None else np.asarray(budget, dtype="float64") / np.sum(budget)
+    if w0 is not None and np.shape(w0)[-1] == n and np.all(np.ravel(w0) > 0):
+        # Reescala o chute para a escala natural do problema (yᵀΣy = Σb = 1)
+        y = np.ravel(w0) / np.sqrt(np.ravel(w0) @ cov @ np.ravel(w0))
+    else:
+        y = 1.0 / np.sqrt(np.diag(cov)) / n
+    it = 0
+    for it in range(1, max_iter + 1):
+        sy = cov @ y
+        grad = sy - b / y
+        hess = cov + np.diag(b / y ** 2)
+        delta = np.linalg.solve(hess, grad)
+        # Passo que mantém y estritamente positivo
+        alpha = 1.0
+        neg = delta > 0
+        if neg.any():
+            alpha = min(1.0, 0.95 * float(np.min(y[neg] / delta[neg])))
+        y = y - alpha * delta
+        if float(grad @ delta) < tol:
+            break
+    return (y / y.sum())[None, :], it
+
+
+# ---------- Interface da página ----------
+def solve(est: dict, method: str, risk_aversion: float = 5.0, cap: float = 1.0, warm: dict | None = None) -> dict:
+    """Resolve ``method`` partindo da última solução do mesmo universo guardada em ``warm``."""
+    key = (tuple(est["tickers"]), method)
+    w0 = _recall(warm, key)
+    if method == "mean_variance":
+        w, iters = mean_variance(est, risk_aversion, cap, w0)
+    elif method == "min_variance":
+        w, iters = min_variance(est, cap, w0)
+    elif method == "risk_parity":
+        w, iters = risk_parity(est, w0=w0)
+    else:
+        raise ValueError(f"Método desconhecido: {method}")
+    w = w[0]
+    _remember(warm, key, w)
+    return {"weights": pd.Series(w, index=est["tickers"]), "iterations": iters, "warm": w0 is not None,
+            **portfolio_stats(est, w)}
+
+
+def portfolio_stats(est: dict, w: np.ndarray) -> dict:
+    w = np.atleast_2d(w)
+    ret = w @ est["mu"]
+    vol = np.sqrt(np.einsum("kn,nm,km->k", w, est["cov"], w))
+    out = {"ret": ret, "vol": vol, "sharpe": np.where(vol > 0, ret / vol, np.nan)}
+    return {k: float(v[0]) if len(v) == 1 else v for k, v in out.items()}
+
+
+def risk_contributions(est: dict, w: np.ndarray) -> np.ndarray:
+    """Fração do risco total de cada ativo: wᵢ·(Σw)ᵢ / wᵀΣw."""
+    w = np.ravel(w)
+    rc = w * (est["cov"] @ w)
+    return rc / rc.sum()
+
+
+def frontier(est: dict, cap: float = 1.0, points: int = 30, warm: dict | None = None) -> pd.DataFrame:
+    """Fronteira eficiente numa varredura só, da maior para a menor aversão a risco.
+
+    Cada ponto parte da solução do ponto vizinho (continuação em λ), e a
+    varredura inteira parte da fronteira anterior do mesmo universo.
+    """
+    lams = np.geomspace(1000.0, 0.1, points)
+    key = (tuple(est["tickers"]), "frontier")
+    previous = _recall(warm, key)
+    if previous is None or previous.shape != (points, len(est["mu"])):
+        previous = None
+    weights = np.empty((points, len(est["mu"])))
+    w = None
+    for k, lam in enumerate(lams):
+        start = previous[k] if previous is not None else w
+        w, _ = _active_set_qp(lam * est["cov"], est["mu"], cap, start)
+        weights[k] = w
+    _remember(warm, key, weights)
+    stats = portfolio_stats(est, weights)
+    return pd.DataFrame({"risk_aversion": lams, "ret": stats["ret"], "vol": stats["vol"], "sharpe": stats["sharpe"]})
@@ -0,0 +1,275 @@
+# core/quant/store.py
+# -------------------------------------------------------------
+# Base local de preços em formato colunar com arquivos mapeados em memória.
+#
+#   data/quant/store/
+#     meta.json        → campos, dicionário de tickers, nº de linhas, capacidade e geração
+#     dates.<g>.bin    → int64 (dias desde 1970-01-01), uma entrada por pregão
+#     close.<g>.bin... → float32, matriz (capacidade_datas × capacidade_tickers)
+#
+# Um arquivo por campo (open/high/low/close/volume). As matrizes são
+# "data-major": cada pregão é uma linha contígua, então
+# - recortar um intervalo de datas é uma fatia (view) do memmap, sem cópia;
+# - um ticker ou uma faixa contígua de tickers também vira view (com stride);
+#   uma lista arbitrária de tickers copia só essas colunas dentro do recorte;
+# - a atualização diária acrescenta linhas no fim (append-only). A linha só
+#   passa a valer quando o meta.json é regravado (escrita atômica), então uma
+#   atualização interrompida não corrompe a base.
+# - Quando a capacidade cresce, o layout muda (largura da linha): os arquivos
+#   novos vão para a geração ``<g>+1``, o meta.json passa a apontar para ela
+#   (ponto de confirmação) e só então a geração anterior é apagada. Um leitor
+#   nunca mapeia arquivos de um layout com o meta.json de outro.
+# -------------------------------------------------------------
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.quant import data
+
+# ======= CONFIG =======
+STORE_DIR = os.path.join("data", "quant", "store")
+# ======================
+
+DTYPE = "float32"
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _to_days(dates) -> np.ndarray:
+    return (pd.DatetimeIndex(dates).values.astype("datetime64[D]") - _EPOCH).astype("int64")
+
+
+class PriceStore:
+    """Acesso aos arquivos da base; abra com ``PriceStore(root)`` ou crie com ``PriceStore.create``."""
+
+    def __init__(self, root: str = STORE_DIR, mode: str = "r"):
+        self.root = root
+        self.mode = mode
+        self._maps = {}
+        self.refresh()
+
+    # ---------- Criação ----------
+    @classmethod
+    def create(cls, tickers, root: str = STORE_DIR, fields=data.FIELDS,
+               row_capacity: int = 4096, ticker_capacity: int | None = None) -> "PriceStore":
+        tickers = [str(t).upper() for t in tickers]
+        if len(set(tickers)) != len(tickers):
+            raise ValueError("Tickers duplicados.")
+        os.makedirs(root, exist_ok=True)
+        meta = {
+            "fields": list(fields),
+            "tickers": tickers,
+            "n_rows": 0,
+            "row_capacity": int(row_capacity),
+            "ticker_capacity": int(ticker_capacity or max(len(tickers), 1) * 2),
+            "dtype": DTYPE,
+            "generation": 1,
+        }
+        cls._allocate(root, meta)
+        cls._write_meta(root, meta)
+        return cls(root, mode="r+")
+
+    @staticmethod
+    def _path(root: str, name: str, generation: int) -> str:
+        # Geração 0 = bases criadas antes das gerações (arquivos sem sufixo)
+        return os.path.join(root, f"{name}.bin" if not generation else f"{name}.{generation}.bin")
+
+    @classmethod
+    def _allocate(cls, root: str, meta: dict, old: "PriceStore | None" = None) -> None:
+        """Cria os arquivos da geração do meta (copiando o conteúdo de ``old``, se houver)."""
+        rows, cols, gen = meta["row_capacity"], meta["ticker_capacity"], meta["generation"]
+        for field in meta["fields"]:
+            path = cls._path(root, field, gen)
+            tmp = path + ".tmp"
+            arr = np.memmap(tmp, dtype=DTYPE, mode="w+", shape=(rows, cols))
+            arr[:] = np.nan
+            if old is not None and old.n_rows:
+                src = old._maps[field]
+                arr[: old.n_rows, : src.shape[1]] = src[: old.n_rows]
+            arr.flush()
+            del arr
+            os.replace(tmp, path)
+        path = cls._path(root, "dates", gen)
+        tmp = path + ".tmp"
+        arr = np.memmap(tmp, dtype="int64", mode="w+", shape=(rows,))
+        if old is not None and old.n_rows:
+            arr[: old.n_rows] = old._dates[: old.n_rows]
+        arr.flush()
+        del arr
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_meta(root: str, meta: dict) -> None:
+        path = os.path.join(root, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def exists(root: str = STORE_DIR) -> bool:
+        return os.path.exists(os.path.join(root, "meta.json"))
+
+    # ---------- Abertura ----------
+    def refresh(self, _retries: int = 3) -> None:
+        """(Re)lê o meta.json e remapeia os arquivos (ex.: depois de um append por outro processo)."""
+        with open(os.path.join(self.root, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        gen = meta.get("generation", 0)
+        shape = (meta["row_capacity"], meta["ticker_capacity"])
+        try:
+            maps = {
+                field: np.memmap(self._path(self.root, field, gen), dtype=DTYPE, mode=self.mode, shape=shape)
+                for field in meta["fields"]
+            }
+            dates = np.memmap(self._path(self.root, "dates", gen), dtype="int64", mode=self.mode,
+                              shape=(meta["row_capacity"],))
+        except FileNotFoundError:
+            # Outro processo trocou de geração entre a leitura do meta e a abertura: relê
+            if _retries <= 0:
+                raise
+            return self.refresh(_retries - 1)
+        self.meta, self._maps, self._dates = meta, maps, dates
+        self._index = {t: i for i, t in enumerate(meta["tickers"])}
+
+    @property
+    def n_rows(self) -> int:
+        return self.meta["n_rows"]
+
+    @property
+    def tickers(self) -> list:
+        return list(self.meta["tickers"])
+
+    @property
+    def fields(self) -> list:
+        return list(self.meta["fields"])
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex((_EPOCH + self._dates[: self.n_rows]).astype("datetime64[ns]"))
+
+    # ---------- Leitura ----------
+    def rows(self, start=None, end=None) -> slice:
+        """Fatia de linhas do intervalo [start, end] (busca binária no índice de datas)."""
+        days = self._dates[: self.n_rows]
+        lo = 0 if start is None else int(np.searchsorted(days, _to_days([start])[0], "left"))
+        hi = self.n_rows if end is None else int(np.searchsorted(days, _to_days([end])[0], "right"))
+        return slice(lo, hi)
+
+    def columns(self, tickers=None):
+        """Índices das colunas: ``slice`` quando contíguos (mantém a view), senão array."""
+        n = len(self.meta["tickers"])
+        if tickers is None:
+            return slice(0, n)
+        try:
+            idx = np.array([self._index[str(t).upper()] for t in tickers], dtype="int64")
+        except KeyError as e:
+            raise KeyError(f"Ticker fora da base: {e.args[0]}") from None
+        if len(idx) and np.all(np.diff(idx) == 1):
+            return slice(int(idx[0]), int(idx[-1]) + 1)
+        return idx
+
+    def get(self, field: str, start=None, end=None, tickers=None) -> np.ndarray:
+        """Matriz (datas × tickers) do campo. Sem cópia quando os tickers são contíguos."""
+        rows, cols = self.rows(start, end), self.columns(tickers)
+        block = self._maps[field][rows]
+        return block[:, cols] if isinstance(cols, slice) else np.take(block, cols, axis=1)
+
+    def frame(self, field: str, start=None, end=None, tickers=None) -> pd.DataFrame:
+        rows, cols = self.rows(start, end), self.columns(tickers)
+        names = self.meta["tickers"][cols] if isinstance(cols, slice) else [self.meta["tickers"][i] for i in cols]
+        return pd.DataFrame(self.get(field, start, end, tickers), index=self.dates[rows], columns=names, copy=False)
+
+    # ---------- Escrita (append-only) ----------
+    def _ensure_capacity(self, n_rows: int, n_tickers: int) -> None:
+        if n_rows <= self.meta["row_capacity"] and n_tickers <= self.meta["ticker_capacity"]:
+            return
+        old_gen = self.meta.get("generation", 0)
+        meta = dict(self.meta, generation=old_gen + 1)
+        while meta["row_capacity"] < n_rows:
+            meta["row_capacity"] *= 2
+        while meta["ticker_capacity"] < n_tickers:
+            meta["ticker_capacity"] *= 2
+        self._allocate(self.root, meta, old=self)
+        self._write_meta(self.root, meta)   # ponto de confirmação da nova geração
+        self.refresh()
+        for name in [*meta["fields"], "dates"]:
+            try:
+                os.remove(self._path(self.root, name, old_gen))
+            except OSError:
+                pass  # já removido (ou ainda mapeado em outro processo no Windows)
+
+    def append(self, panel: dict) -> int:
+        """Acrescenta pregões novos: ``panel`` = ``{campo: DataFrame(datas × tickers)}``.
+
+        Só datas posteriores à última gravada são aceitas (append-only); tickers
+        novos ganham uma coluna (histórico anterior fica NaN). Retorna o nº de linhas novas.
+        """
+        if self.mode == "r":
+            raise PermissionError("Base aberta só para leitura; use mode='r+'.")
+        close = panel["close"]
+        if len(close.index) == 0:
+            return 0
+        days = _to_days(close.index)
+        if np.any(np.diff(days) <= 0):
+            raise ValueError("As datas do bloco precisam ser crescentes e sem repetição.")
+        if self.n_rows and days[0] <= self._dates[self.n_rows - 1]:
+            raise ValueError("A base é append-only: só datas posteriores ao último pregão gravado.")
+
+        new = [str(t).upper() for t in close.columns if str(t).upper() not in self._index]
+        tickers = self.meta["tickers"] + new
+        start, stop = self.n_rows, self.n_rows + len(days)
+        self._ensure_capacity(stop, len(tickers))
+
+        cols = np.array([tickers.index(str(t).upper()) for t in close.columns], dtype="int64")
+        for field in self.meta["fields"]:
+            if field not in panel:
+                continue
+            values = panel[field].reindex(index=close.index, columns=close.columns).to_numpy(dtype=DTYPE)
+            self._maps[field][start:stop, cols] = values
+            self._maps[field].flush()
+        self._dates[start:stop] = days
+        self._dates.flush()
+
+        # Ponto de confirmação: só agora as linhas novas passam a existir
+        meta = dict(self.meta, tickers=tickers, n_rows=stop)
+        self._write_meta(self.root, meta)
+        self.meta = meta
+        self._index = {t: i for i, t in enumerate(tickers)}
+        return len(days)
+
+
+def sync_from_files(folder: str = data.PRICES_DIR, root: str = STORE_DIR) -> int:
+    """Cria a base a partir dos CSVs (se não existir) e acrescenta os pregões novos.
+
+    Retorna o nº de linhas acrescentadas (0 se já estava em dia).
+    """
+    panel = data.load_price_files(folder)
+    if not panel:
+        return 0
+    if not PriceStore.exists(root):
+        store = PriceStore.create(panel["close"].columns, root, fields=list(panel),
+                                  row_capacity=max(4096, 2 * len(panel["close"])))
+    else:
+        store = PriceStore(root, mode="r+")
+    if store.n_rows:
+        last = store.dates[-1]
+        panel = {k: v[v.index > last] for k, v in panel.items()}
+    return store.append(panel)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cria/atualiza a base local de preços a partir dos CSVs.")
+    parser.add_argument("--prices", default=data.PRICES_DIR, help="pasta com um CSV por ticker")
+    parser.add_argument("--root", default=STORE_DIR)
+    args = parser.parse_args()
+
+    print(f"[INFO] Sincronizando {args.prices} → {args.root}...")
+    added = sync_from_files(args.prices, args.root)
+    store = PriceStore(args.root)
+    print(f"[OK] {added} pregão(ões) novo(s); base com {store.n_rows} pregões × {len(store.tickers)} tickers.")
+
+
+if __name__ == "__main__":
+    main()
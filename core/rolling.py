@@ -0,0 +1,321 @@
+# core/rolling.py
+# -------------------------------------------------------------
+# Estatísticas móveis sobre arrays 2-D (tempo × séries).
+#
+# Versão em lote: somas acumuladas (cumsum) das séries centralizadas — cada
+# janela custa uma subtração, então o custo é O(T·N) qualquer que seja a
+# janela. Centralizar cada coluna antes de acumular evita o cancelamento
+# numérico de E[x²] − E[x]² em séries de nível alto (preços, índices).
+#
+# Valores ausentes seguem a regra do ``pandas.rolling``: a janela só gera
+# resultado com pelo menos ``min_periods`` observações válidas (padrão =
+# janela cheia).
+#
+# Versão incremental (``RollingWindow``): um buffer circular com média/M2 de
+# Welford atualizados em O(1) por observação que entra e que sai — para
+# séries que recebem um ponto novo por vez (pregão do dia, dado do ano).
+#
+#   python -m core.rolling   → compara o tempo com ``pandas.rolling``
+# -------------------------------------------------------------
+import time
+
+import numpy as np
+import pandas as pd
+
+
+# ---------- Núcleo em lote ----------
+def _as_2d(x) -> np.ndarray:
+    x = np.asarray(x)
+    return x[:, None] if x.ndim == 1 else x
+
+
+def _out_dtype(*arrays) -> np.dtype:
+    # float32 entra → float32 sai (painéis de preço); o resto vira float64
+    return np.result_type(*(a.dtype for a in arrays), np.float32)
+
+
+def _window_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Soma móvel de ``x`` ao longo do eixo 0 (soma acumulada + uma subtração)."""
+    c = np.cumsum(x, axis=0)
+    out = np.empty_like(c)
+    out[:window] = c[:window]
+    np.subtract(c[window:], c[:-window], out=out[window:])
+    return out
+
+
+def _moments(a: np.ndarray, b: np.ndarray | None, window: int, min_periods: int | None,
+             second: bool = True) -> tuple:
+    """Contagem, médias e co-momentos centrais por janela (float64).
+
+    Devolve ``(n, mean_a, mean_b, m_aa, m_bb, m_ab)``; sem ``b`` os termos de ``b`` são ``None``.
+    Posições com menos de ``min_periods`` observações válidas ficam com n = NaN.
+    Com ``second=False`` só a contagem e as médias são calculadas.
+    """
+    if window < 1:
+        raise ValueError("A janela precisa ser >= 1.")
+    min_periods = window if min_periods is None else min_periods
+    a = _as_2d(a).astype("float64")
+    mask = np.isfinite(a)
+    if b is not None:
+        b = np.broadcast_to(_as_2d(b), a.shape).astype("float64")
+        mask &= np.isfinite(b)
+    complete = bool(mask.all())
+
+    def centered(x):
+        # Desloca cada coluna pela sua média (só para estabilidade numérica)
+        if complete:
+            shift = x.mean(axis=0)
+            x -= shift
+            return x, shift
+        valid = mask.any(axis=0)
+        shift = np.zeros(x.shape[1])
+        x[~mask] = 0.0
+        shift[valid] = x.sum(axis=0)[valid] / mask.sum(axis=0)[valid]
+        x -= shift
+        x[~mask] = 0.0
+        return x, shift
+
+    if complete:
+        # Sem ausências a contagem só depende da posição na série
+        n = np.minimum(np.arange(1, a.shape[0] + 1, dtype="float64"), window)[:, None]
+    else:
+        n = _window_sum(mask.astype("float64"), window)
+    n = np.where(n < max(min_periods, 1), np.nan, n)
+
+    xa, shift_a = centered(a)
+    sa = _window_sum(xa, window)
+    mean_a = sa / n
+    mean_a += shift_a
+    if not second:
+        return n, mean_a, None, None, None, None
+    m_aa = _window_sum(xa * xa, window)
+    m_aa -= sa * sa / n
+    if b is None:
+        return n, mean_a, None, m_aa, None, None
+    xb, shift_b = centered(b.copy())
+    sb = _window_sum(xb, window)
+    m_bb = _window_sum(xb * xb, window)
+    m_bb -= sb * sb / n
+    m_ab = _window_sum(xa * xb, window)
+    m_ab -= sa * sb / n
+    mean_b = sb / n
+    mean_b += shift_b
+    return n, mean_a, mean_b, m_aa, m_bb, m_ab
+
+
+def _shape_like(out: np.ndarray, x, dtype) -> np.ndarray:
+    return (out[:, 0] if np.ndim(x) == 1 else out).astype(dtype, copy=False)
+
+
+# ---------- API em lote ----------
+def rolling_mean(x, window: int, min_periods: int | None = None) -> np.ndarray:
+    """Média móvel por coluna."""
+    x = np.asarray(x)
+    _, mean, *_ = _moments(x, None, window, min_periods, second=False)
+    return _shape_like(mean, x, _out_dtype(x))
+
+
+def rolling_var(x, window: int, ddof: int = 1, min_periods: int | None = None) -> np.ndarray:
+    """Variância móvel por coluna (``ddof=1`` como o pandas; ``ddof=0`` populacional)."""
+    x = np.asarray(x)
+    n, _, _, m_aa, _, _ = _moments(x, None, window, min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.where(n - ddof > 0, np.maximum(m_aa, 0.0) / (n - ddof), np.nan)
+    return _shape_like(var, x, _out_dtype(x))
+
+
+def rolling_std(x, window: int, ddof: int = 1, min_periods: int | None = None) -> np.ndarray:
+    return np.sqrt(rolling_var(x, window, ddof, min_periods))
+
+
+def rolling_zscore(x, window: int, ddof: int = 1, min_periods: int | None = None) -> np.ndarray:
+    """Distância do valor atual à média da janela, em desvios-padrão da janela."""
+    x = np.asarray(x)
+    n, mean, _, m_aa, _, _ = _moments(x, None, window, min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(np.where(n - ddof > 0, np.maximum(m_aa, 0.0) / (n - ddof), np.nan))
+        z = (_as_2d(x) - mean) / std
+    return _shape_like(z, x, _out_dtype(x))
+
+
+def rolling_cov(a, b, window: int, ddof: int = 1, min_periods: int | None = None) -> np.ndarray:
+    """Covariância móvel entre colunas de ``a`` e ``b`` (``b`` 1-D é comparado com todas as colunas)."""
+    a, b = np.asarray(a), np.asarray(b)
+    n, _, _, _, _, m_ab = _moments(a, b, window, min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = np.where(n - ddof > 0, m_ab / (n - ddof), np.nan)
+    return _shape_like(cov, a, _out_dtype(a, b))
+
+
+def rolling_corr(a, b, window: int, min_periods: int | None = None) -> np.ndarray:
+    """Correlação móvel de Pearson (mesmas observações válidas nas duas séries)."""
+    a, b = np.asarray(a), np.asarray(b)
+    n, _, _, m_aa, m_bb, m_ab = _moments(a, b, window, min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.where(n > 1, m_ab / np.sqrt(np.maximum(m_aa, 0.0) * np.maximum(m_bb, 0.0)), np.nan)
+    return _shape_like(np.clip(corr, -1.0, 1.0), a, _out_dtype(a, b))
+
+
+def rolling_beta(y, x, window: int, min_periods: int | None = None) -> np.ndarray:
+    """Beta móvel de cada coluna de ``y`` contra ``x`` (ex.: retornos dos ativos × mercado)."""
+    y, x = np.asarray(y), np.asarray(x)
+    n, _, _, _, m_xx, m_xy = _moments(y, x, window, min_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where((n > 1) & (m_xx > 0), m_xy / m_xx, np.nan)
+    return _shape_like(beta, y, _out_dtype(y, x))
+
+
+# ---------- API incremental ----------
+class RollingWindow:
+    """Estatísticas da última janela de ``n_series`` séries, atualizadas a cada ``push``.
+
+    Cada observação que entra (e a que sai do buffer circular) atualiza média
+    e M2 pelo método de Welford — O(1) por série, sem reler a janela. Com
+    ``benchmark`` em ``push``, mantém também o co-momento para ``corr``/``beta``.
+    NaN é ignorado (conta como observação ausente).
+    """
+
+    def __init__(self, window: int, n_series: int = 1):
+        if window < 1:
+            raise ValueError("A janela precisa ser >= 1.")
+        self.window = window
+        self.shape = (n_series,)
+        self._buf = np.full((window, n_series), np.nan)
+        self._bench = np.full(window, np.nan)
+        self._pos = 0
+        self.seen = 0
+        # Momentos de cada série
+        self.n = np.zeros(n_series)
+        self._mean = np.zeros(n_series)
+        self._m2 = np.zeros(n_series)
+        # Momentos dos pares (série, benchmark) — só observações válidas nos dois
+        self._np = np.zeros(n_series)
+        self._mx = np.zeros(n_series)
+        self._mb = np.zeros(n_series)
+        self._mxx = np.zeros(n_series)
+        self._mbb = np.zeros(n_series)
+        self._cxb = np.zeros(n_series)
+
+    @staticmethod
+    def _step(n, mean, m2, x, ok, sign):
+        # sign=+1 acrescenta x, sign=-1 remove x (Welford nos dois sentidos)
+        n += np.where(ok, sign, 0)
+        safe = np.where(n > 0, n, 1.0)
+        delta = np.where(ok, x - mean, 0.0)
+        mean += np.where(ok & (n > 0), sign * delta / safe, 0.0)
+        m2 += np.where(ok, sign * delta * np.where(ok, x - mean, 0.0), 0.0)
+        empty = n == 0
+        mean[empty] = 0.0
+        m2[empty] = 0.0
+
+    def _pair_step(self, x, b, ok, sign):
+        self._np += np.where(ok, sign, 0)
+        safe = np.where(self._np > 0, self._np, 1.0)
+        dx = np.where(ok, x - self._mx, 0.0)
+        db = np.where(ok, b - self._mb, 0.0)
+        self._mx += np.where(ok, sign * dx / safe, 0.0)
+        self._mb += np.where(ok, sign * db / safe, 0.0)
+        new_dx = np.where(ok, x - self._mx, 0.0)
+        new_db = np.where(ok, b - self._mb, 0.0)
+        self._mxx += sign * dx * new_dx
+        self._mbb += sign * db * new_db
+        self._cxb += sign * dx * new_db
+        empty = self._np == 0
+        for arr in (self._mx, self._mb, self._mxx, self._mbb, self._cxb):
+            arr[empty] = 0.0
+
+    def push(self, values, benchmark: float | None = None) -> None:
+        """Acrescenta uma observação por série (e, se houver, do benchmark)."""
+        x = np.broadcast_to(np.asarray(values, dtype="float64"), self.shape)
+        b = np.nan if benchmark is None else float(benchmark)
+
+        if self.seen >= self.window:
+            old, old_b = self._buf[self._pos], self._bench[self._pos]
+            self._step(self.n, self._mean, self._m2, old, np.isfinite(old), -1)
+            self._pair_step(old, old_b, np.isfinite(old) & np.isfinite(old_b), -1)
+
+        self._buf[self._pos] = x
+        self._bench[self._pos] = b
+        self._step(self.n, self._mean, self._m2, x, np.isfinite(x), +1)
+        self._pair_step(x, b, np.isfinite(x) & np.isfinite(b), +1)
+        self._pos = (self._pos + 1) % self.window
+        self.seen += 1
+
+    def extend(self, rows, benchmark=None) -> None:
+        """``push`` de várias linhas (tempo × séries) em ordem."""
+        rows = _as_2d(np.asarray(rows, dtype="float64"))
+        bench = [None] * len(rows) if benchmark is None else benchmark
+        for row, b in zip(rows, bench):
+            self.push(row, b)
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.where(self.n > 0, self._mean, np.nan)
+
+    def var(self, ddof: int = 1) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.n - ddof > 0, np.maximum(self._m2, 0.0) / (self.n - ddof), np.nan)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        return np.sqrt(self.var(ddof))
+
+    def zscore(self, ddof: int = 1) -> np.ndarray:
+        """z-score da observação mais recente de cada série."""
+        last = self._buf[(self._pos - 1) % self.window]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (last - self.mean) / self.std(ddof)
+
+    def cov(self, ddof: int = 1) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self._np - ddof > 0, self._cxb / (self._np - ddof), np.nan)
+
+    def corr(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Com um único par na janela os M2 são só resíduo de arredondamento: NaN, como no lote
+            corr = self._cxb / np.sqrt(np.maximum(self._mxx, 0.0) * np.maximum(self._mbb, 0.0))
+            return np.where(self._np > 1, np.clip(corr, -1.0, 1.0), np.nan)
+
+    def beta(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((self._np > 1) & (self._mbb > 0), self._cxb / self._mbb, np.nan)
+
+
+# ---------- Benchmark ----------
+def benchmark(n_days: int = 2520, n_series: int = 500, windows=(20, 60, 252), repeat: int = 3,
+              seed: int = 0) -> pd.DataFrame:
+    """Tempo (ms) destas funções × ``pandas.rolling`` num painel largo, e o maior erro absoluto."""
+    rng = np.random.default_rng(seed)
+    panel = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_days, n_series)), axis=0))
+    market = rng.normal(0, 0.01, n_days)
+    df, mkt = pd.DataFrame(panel), pd.Series(market)
+
+    def timed(fn):
+        best = np.inf
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best * 1e3, np.asarray(out, dtype="float64")
+
+    rows = []
+    for w in windows:
+        cases = {
+            "mean": (lambda: rolling_mean(panel, w), lambda: df.rolling(w).mean()),
+            "var": (lambda: rolling_var(panel, w), lambda: df.rolling(w).var()),
+            "zscore": (lambda: rolling_zscore(panel, w),
+                       lambda: (df - df.rolling(w).mean()) / df.rolling(w).std()),
+            "corr": (lambda: rolling_corr(panel, market, w), lambda: df.rolling(w).corr(mkt)),
+            "beta": (lambda: rolling_beta(panel, market, w),
+                     lambda: df.rolling(w).cov(mkt).div(mkt.rolling(w).var(), axis=0)),
+        }
+        for name, (ours, theirs) in cases.items():
+            t_ours, a = timed(ours)
+            t_pd, b = timed(theirs)
+            rows.append({"stat": name, "window": w, "kernel_ms": t_ours, "pandas_ms": t_pd,
+                         "speedup": t_pd / t_ours, "max_abs_err": float(np.nanmax(np.abs(a - b)))})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print("[INFO] Estatísticas móveis × pandas.rolling (2520 × 500, float64)...")
+    print(benchmark().to_string(index=False, float_format=lambda v: f"{v:.3g}"))
@@ -0,0 +1,36 @@
+# core/serve.py
+# -------------------------------------------------------------
+# Sobe o servidor do Streamlit com o processo já aquecendo.
+#
+# Com ``streamlit run app.py`` nada do app roda até a primeira sessão (ou
+# o primeiro /_stcore/script-health-check): o primeiro visitante pagava o
+# aquecimento inteiro atrás do spinner. Aqui o aquecimento de
+# core/warmup.py começa numa thread assim que o processo sobe, em paralelo
+# ao bootstrap do servidor; o app.py e o script-health-check esperam pelo
+# mesmo lock, então o health check só responde "ok" com os caches prontos.
+#
+# Uso (mesmos argumentos do ``streamlit run``):
+#   python -m core.serve [--server.port 8501 ...]
+# -------------------------------------------------------------
+import os
+import sys
+
+from core import warmup
+
+# ======= CONFIG =======
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+# ======================
+
+
+def main():
+    from streamlit.web import cli
+
+    if warmup.start_background() is not None:
+        print(f"[INFO] Aquecimento iniciado em segundo plano ({', '.join(warmup.WARM_PAGES)})")
+    # O servidor precisa da thread principal (sinais); o aquecimento segue na outra
+    sys.argv = ["streamlit", "run", APP_FILE, *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# core/singleflight.py
+# -------------------------------------------------------------
+# "Single-flight": chamadas simultâneas com a mesma entrada esperam UMA
+# execução em andamento em vez de repetir o cálculo.
+#
+# O Streamlit roda cada sessão numa thread do mesmo processo; quando vários
+# visitantes abrem a mesma página ao mesmo tempo, todos chegariam juntos às
+# mesmas funções caras (ex.: Johansen/VECM/VAR da página Macro). Aqui o
+# primeiro chamador ("líder") executa, os demais bloqueiam num Event e
+# recebem o mesmo resultado (ou a mesma exceção).
+#
+# Não é cache: terminada a execução, a chave sai da tabela. Para reaproveitar
+# resultados entre reruns continue usando ``st.cache_data``.
+# -------------------------------------------------------------
+import functools
+import hashlib
+import pickle
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(*args, **kwargs) -> str:
+    """Impressão digital estável das entradas (DataFrames/arrays pelo conteúdo)."""
+    h = hashlib.sha1()
+
+    def feed(obj):
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+            h.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        elif isinstance(obj, np.ndarray):
+            h.update(str((obj.dtype, obj.shape)).encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, (list, tuple)):
+            h.update(b"(")
+            for item in obj:
+                feed(item)
+            h.update(b")")
+        elif isinstance(obj, dict):
+            for k in sorted(obj, key=repr):
+                feed(k)
+                feed(obj[k])
+        else:
+            h.update(pickle.dumps(obj))
+
+    feed(args)
+    feed(kwargs)
+    return h.hexdigest()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class Group:
+    """Tabela de execuções em andamento de um grupo de funções, com métricas."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0          # chamadas recebidas
+        self.executions = 0     # execuções de fato
+        self.coalesced = 0      # chamadas que esperaram outra execução
+        self.errors = 0
+        self.max_waiters = 0
+        self.busy_s = 0.0       # tempo total de execução (só líderes)
+        self.saved_s = 0.0      # tempo de execução poupado pelos que esperaram
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+
+        if not leader:
+            t0 = time.perf_counter()
+            call.event.wait()
+            with self._lock:
+                self.saved_s += time.perf_counter() - t0
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        t0 = time.perf_counter()
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.busy_s += time.perf_counter() - t0
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "group": self.name,
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesced_pct": self.coalesced / self.calls if self.calls else 0.0,
+                "in_flight": len(self._calls),
+                "max_waiters": self.max_waiters,
+                "errors": self.errors,
+                "busy_s": self.busy_s,
+                "waited_s": self.saved_s,
+            }
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def group(name: str) -> Group:
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = Group(name)
+        return _groups[name]
+
+
+def shared(name: str, key=fingerprint):
+    """Decorador: chamadas simultâneas com a mesma ``key(*args, **kwargs)`` dividem uma execução."""
+    def decorate(fn):
+        g = group(name)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return g.do(key(*args, **kwargs), fn, *args, **kwargs)
+
+        wrapper.group = g
+        return wrapper
+
+    return decorate
+
+
+def metrics() -> pd.DataFrame:
+    """Uma linha por grupo com chamadas, execuções e quantas foram coalescidas."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return pd.DataFrame([g.stats() for g in groups])
@@ -0,0 +1 @@
+"""Modelos de valuation (DCF determinístico e simulação de Monte Carlo)."""
@@ -0,0 +1,158 @@
+# core/valuation/dcf.py
+# -------------------------------------------------------------
+# Fluxo de caixa descontado (FCFF → valor da firma → preço por ação),
+# escrito para rodar sobre ARRAYS de premissas.
+#
+# Toda premissa pode ser um escalar ou um array; as formas são combinadas
+# por broadcasting do NumPy e o eixo dos anos é sempre o último. Assim,
+# uma grade de sensibilidade, um tornado ou um cubo com dezenas de
+# milhares de cenários saem de UMA chamada de ``dcf`` — sem laço célula
+# a célula.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+# Caso base usado pela página (valores em R$ milhões, exceto ações e taxas)
+BASE_CASE = {
+    "revenue0": 10_000.0,       # receita do último ano
+    "growth": 0.08,             # crescimento anual da receita no período explícito
+    "margin": 0.18,             # margem EBIT
+    "tax_rate": 0.34,           # IR + CSLL
+    "reinvestment": 0.04,       # capex líquido + capital de giro (% da receita)
+    "wacc": 0.13,
+    "terminal_growth": 0.04,    # perpetuidade (Gordon)
+    "exit_multiple": 8.0,       # EV/EBIT de saída (método alternativo)
+    "net_debt": 3_000.0,
+    "shares": 500.0,            # milhões de ações
+}
+
+# Nomes amigáveis para a interface
+LABELS = {
+    "growth": "Crescimento da receita",
+    "margin": "Margem EBIT",
+    "tax_rate": "Alíquota de IR",
+    "reinvestment": "Reinvestimento (% receita)",
+    "wacc": "WACC",
+    "terminal_growth": "Crescimento na perpetuidade",
+    "exit_multiple": "Múltiplo EV/EBIT de saída",
+}
+
+TERMINAL_METHODS = ("gordon", "multiple")
+
+
+def _col(x) -> np.ndarray:
+    """Premissa como array com um eixo extra no fim (o eixo dos anos)."""
+    return np.asarray(x, dtype="float64")[..., None]
+
+
+def dcf(revenue0, growth, margin, wacc, terminal_growth=0.04, exit_multiple=8.0,
+        tax_rate=0.34, reinvestment=0.04, net_debt=0.0, shares=1.0,
+        years: int = 5, terminal: str = "gordon") -> dict:
+    """Avalia o DCF para todas as combinações (por broadcasting) das premissas.
+
+    Retorna um dicionário de arrays com a forma comum das premissas:
+    ``ev`` (valor da firma), ``equity``, ``price``, ``pv_fcf`` (valor presente do
+    período explícito) e ``pv_terminal``. Com ``terminal="gordon"`` cenários em que
+    ``wacc <= terminal_growth`` ficam como NaN.
+    """
+    if terminal not in TERMINAL_METHODS:
+        raise ValueError(f"terminal deve ser um de {TERMINAL_METHODS}")
+    t = np.arange(1, years + 1, dtype="float64")
+
+    g, w = _col(growth), _col(wacc)
+    revenue = _col(revenue0) * (1.0 + g) ** t
+    ebit = revenue * _col(margin)
+    fcf = ebit * (1.0 - _col(tax_rate)) - revenue * _col(reinvestment)
+    discount = (1.0 + w) ** -t
+    pv_fcf = (fcf * discount).sum(axis=-1)
+
+    if terminal == "gordon":
+        gt = np.asarray(terminal_growth, dtype="float64")
+        spread = np.asarray(wacc, dtype="float64") - gt
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tv = np.where(spread > 0, fcf[..., -1] * (1.0 + gt) / spread, np.nan)
+    else:
+        tv = ebit[..., -1] * np.asarray(exit_multiple, dtype="float64")
+    pv_terminal = tv * discount[..., -1]
+
+    ev = pv_fcf + pv_terminal
+    equity = ev - np.asarray(net_debt, dtype="float64")
+    price = equity / np.asarray(shares, dtype="float64")
+    return {"ev": ev, "equity": equity, "price": price, "pv_fcf": pv_fcf, "pv_terminal": pv_terminal}
+
+
+def cash_flows(base: dict, years: int = 5) -> pd.DataFrame:
+    """Projeção ano a ano do caso base (para a tabela da página)."""
+    t = np.arange(1, years + 1)
+    revenue = base["revenue0"] * (1 + base["growth"]) ** t
+    ebit = revenue * base["margin"]
+    fcf = ebit * (1 - base["tax_rate"]) - revenue * base["reinvestment"]
+    return pd.DataFrame({
+        "ano": t,
+        "receita": revenue,
+        "ebit": ebit,
+        "fcff": fcf,
+        "fator_desconto": (1 + base["wacc"]) ** -t,
+        "vp_fcff": fcf * (1 + base["wacc"]) ** -t,
+    })
+
+
+def sensitivity_grid(base: dict, row: str, row_values, col: str, col_values,
+                     output: str = "price", **kwargs) -> pd.DataFrame:
+    """Tabela ``row × col`` de ``output`` variando duas premissas (uma chamada de ``dcf``)."""
+    params = dict(base)
+    params[row] = np.asarray(row_values, dtype="float64")[:, None]
+    params[col] = np.asarray(col_values, dtype="float64")[None, :]
+    values = dcf(**params, **kwargs)[output]
+    return pd.DataFrame(values, index=pd.Index(row_values, name=row), columns=pd.Index(col_values, name=col))
+
+
+def tornado(base: dict, ranges: dict, output: str = "price", **kwargs) -> pd.DataFrame:
+    """Impacto de mover cada premissa para o seu mínimo/máximo, mantendo as demais no caso base.
+
+    Os 2·k cenários (k = nº de premissas) são empilhados num único vetor e
+    avaliados juntos. Ordenado pela amplitude, do maior impacto para o menor.
+    """
+    names = list(ranges)
+    k = len(names)
+    params = {name: np.full(2 * k, float(value)) for name, value in base.items()}
+    for i, name in enumerate(names):
+        low, high = ranges[name]
+        params[name][2 * i] = low
+        params[name][2 * i + 1] = high
+    values = dcf(**params, **kwargs)[output].reshape(k, 2)
+    base_value = float(dcf(**base, **kwargs)[output])
+
+    out = pd.DataFrame({
+        "premissa": names,
+        "low_input": [ranges[n][0] for n in names],
+        "high_input": [ranges[n][1] for n in names],
+        "low": values[:, 0],
+        "high": values[:, 1],
+    })
+    out["base"] = base_value
+    out["amplitude"] = (out["high"] - out["low"]).abs()
+    return out.sort_values("amplitude", ascending=False).reset_index(drop=True)
+
+
+def scenario_cube(base: dict, grids: dict, output: str = "price", **kwargs) -> np.ndarray:
+    """Fatorial completo das premissas em ``grids`` — array com um eixo por premissa.
+
+    Cada grade ganha o seu próprio eixo (como ``np.ix_``), então
+    ``len(g1) × len(g2) × ...`` cenários são avaliados numa única passada.
+    """
+    params = dict(base)
+    n = len(grids)
+    for axis, (name, values) in enumerate(grids.items()):
+        shape = [1] * n
+        shape[axis] = -1
+        params[name] = np.asarray(values, dtype="float64").reshape(shape)
+    return np.broadcast_to(dcf(**params, **kwargs)[output], tuple(len(v) for v in grids.values()))
+
+
+def cube_frame(cube: np.ndarray, grids: dict, output: str = "price") -> pd.DataFrame:
+    """Achata o cubo de cenários numa tabela longa (uma linha por cenário)."""
+    mesh = np.meshgrid(*grids.values(), indexing="ij")
+    frame = pd.DataFrame({name: m.reshape(-1) for name, m in zip(grids, mesh)})
+    frame[output] = cube.reshape(-1)
+    return frame
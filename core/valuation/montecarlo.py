@@ -0,0 +1,178 @@
+# core/valuation/montecarlo.py
+# -------------------------------------------------------------
+# Simulação de Monte Carlo do DCF (core/valuation/dcf.py).
+#
+# - As premissas sorteadas (crescimento, margem, WACC e crescimento na
+#   perpetuidade) são CORRELACIONADAS: a covariância vem de choques macro
+#   estimados no histórico do merged_macro_br.csv (PIB, juros reais e
+#   inflação) mais uma parcela idiossincrática de cada premissa.
+# - Os sorteios são feitos em blocos (chunks) vetorizados; cada bloco é
+#   avaliado numa chamada de ``dcf`` e descartado.
+# - Percentis e histograma são agregados num "sketch" de memória fixa
+#   (histograma de bins fixos + momentos), então milhões de sorteios não
+#   ficam guardados em memória.
+# -------------------------------------------------------------
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.valuation import dcf
+
+# ======= CONFIG =======
+MACRO_FILE = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+CHUNK_SIZE = 200_000
+SKETCH_BINS = 4000
+# ======================
+
+INPUTS = ("growth", "margin", "wacc", "terminal_growth")
+
+# Séries do merged usadas como drivers (em % a.a. no CSV)
+MACRO_DRIVERS = {
+    "gdp": "PIB real — crescimento (% a.a.)",
+    "real_rate": "Juros reais (% a.a.)",
+    "inflation": "Inflação (CPI, % a.a.)",
+}
+
+# Quanto cada premissa anda (em p.p.) para 1 p.p. de choque no driver macro
+DEFAULT_LOADINGS = {
+    "growth": {"gdp": 1.0},
+    "margin": {"gdp": 0.3},
+    "wacc": {"real_rate": 0.2, "inflation": 0.5},
+    "terminal_growth": {"inflation": 0.2},
+}
+
+# Desvio-padrão próprio de cada premissa (fração), independente do ciclo macro
+DEFAULT_IDIOSYNCRATIC = {"growth": 0.02, "margin": 0.02, "wacc": 0.005, "terminal_growth": 0.003}
+
+
+# ---------- Covariância das premissas ----------
+def macro_covariance(path: str = MACRO_FILE) -> pd.DataFrame:
+    """Covariância (em fração, não em %) dos drivers macro no histórico anual."""
+    df = pd.read_csv(path)
+    data = df[[MACRO_DRIVERS[k] for k in MACRO_DRIVERS]].apply(pd.to_numeric, errors="coerce").dropna()
+    data.columns = list(MACRO_DRIVERS)
+    return (data / 100.0).cov()
+
+
+def input_covariance(macro_cov: pd.DataFrame, loadings: dict = DEFAULT_LOADINGS,
+                     idiosyncratic: dict = DEFAULT_IDIOSYNCRATIC) -> pd.DataFrame:
+    """Σ = L·Σ_macro·Lᵀ + D — covariância conjunta das premissas sorteadas."""
+    drivers = list(macro_cov.columns)
+    L = np.array([[loadings.get(i, {}).get(d, 0.0) for d in drivers] for i in INPUTS])
+    D = np.diag([idiosyncratic.get(i, 0.0) ** 2 for i in INPUTS])
+    cov = L @ macro_cov.to_numpy() @ L.T + D
+    return pd.DataFrame(cov, index=list(INPUTS), columns=list(INPUTS))
+
+
+def correlation(cov: pd.DataFrame) -> pd.DataFrame:
+    sd = np.sqrt(np.diag(cov.to_numpy()))
+    return cov / np.outer(sd, sd)
+
+
+# ---------- Agregação em streaming ----------
+class StreamingSketch:
+    """Histograma de bins fixos + média/variância combinadas bloco a bloco.
+
+    As bordas são fixadas a partir do primeiro bloco (com folga); valores fora
+    delas entram em contadores de cauda. A memória não depende do nº de sorteios.
+    """
+
+    def __init__(self, bins: int = SKETCH_BINS):
+        self.bins = bins
+        self.edges = None
+        self.counts = np.zeros(bins, dtype="int64")
+        self.under = self.over = self.invalid = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype="float64").ravel()
+        finite = np.isfinite(values)
+        self.invalid += int((~finite).sum())
+        values = values[finite]
+        if values.size == 0:
+            return
+
+        if self.edges is None:
+            lo, hi = np.quantile(values, [0.0005, 0.9995])
+            pad = max(hi - lo, 1e-9) * 0.5
+            self.edges = np.linspace(lo - pad, hi + pad, self.bins + 1)
+        self.under += int((values < self.edges[0]).sum())
+        self.over += int((values > self.edges[-1]).sum())
+        self.counts += np.histogram(values, bins=self.edges)[0]
+
+        # Média e variância por combinação de blocos (Chan et al.)
+        n, mean = values.size, values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float("nan")
+
+    def _cdf_points(self) -> tuple:
+        # CDF nas bordas: cauda inferior concentrada entre min e a 1ª borda, idem na superior
+        xs = np.r_[self.min, self.edges, self.max]
+        cdf = np.r_[0, self.under + np.r_[0, np.cumsum(self.counts)], self.count] / self.count
+        xs, idx = np.unique(np.maximum.accumulate(xs), return_index=True)
+        return xs, cdf[idx]
+
+    def quantile(self, q):
+        """Percentis aproximados (interpolação linear dentro de cada bin)."""
+        q = np.atleast_1d(np.asarray(q, dtype="float64"))
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        xs, cdf = self._cdf_points()
+        return np.interp(q, cdf, xs)
+
+    def cdf(self, x) -> float:
+        """Fração aproximada dos sorteios menores ou iguais a ``x``."""
+        if self.count == 0:
+            return float("nan")
+        xs, cdf = self._cdf_points()
+        return float(np.interp(x, xs, cdf))
+
+    def histogram(self, bins: int = 80) -> tuple:
+        """Histograma reduzido (agrupa bins vizinhos) para exibição: ``(centros, contagens)``."""
+        if self.edges is None:
+            return np.array([]), np.array([])
+        factor = max(1, self.bins // bins)
+        usable = (self.bins // factor) * factor
+        counts = self.counts[:usable].reshape(-1, factor).sum(axis=1)
+        edges = self.edges[:usable + 1:factor]
+        return (edges[:-1] + edges[1:]) / 2, counts
+
+
+# ---------- Simulação ----------
+def simulate(base: dict, n_draws: int, cov: pd.DataFrame, chunk_size: int = CHUNK_SIZE,
+             seed: int | None = None, sketch: StreamingSketch | None = None, **opts):
+    """Gera ``(sorteios_feitos, sketch)`` a cada bloco concluído.
+
+    As premissas de ``INPUTS`` são sorteadas de uma normal multivariada centrada
+    no caso base (fator de Cholesky aplicado a normais padrão); as demais ficam fixas.
+    """
+    rng = np.random.default_rng(seed)
+    sketch = sketch or StreamingSketch()
+    chol = np.linalg.cholesky(cov.loc[list(INPUTS), list(INPUTS)].to_numpy())
+    center = np.array([base[name] for name in INPUTS])
+
+    done = 0
+    while done < n_draws:
+        n = min(chunk_size, n_draws - done)
+        draws = center + rng.standard_normal((n, len(INPUTS))) @ chol.T
+        params = dict(base)
+        for j, name in enumerate(INPUTS):
+            params[name] = draws[:, j]
+        sketch.update(dcf.dcf(**params, **opts)["price"])
+        done += n
+        yield done, sketch
@@ -0,0 +1,167 @@
+# core/warmup.py
+# -------------------------------------------------------------
+# Aquecimento do processo antes de atender o primeiro visitante.
+#
+# Depois de um deploy, a primeira visita à Macro Economia pagava sozinha
+# os imports pesados, a leitura do CSV e todos os ajustes. Aqui isso é
+# feito UMA vez por processo — numa thread assim que o servidor sobe
+# (``python -m core.serve``, ver core/serve.py) ou, com ``streamlit run``,
+# na primeira execução do app.py:
+#   1) importa os módulos pesados (NumPy, pandas, Plotly, scikit-learn e os
+#      estimadores de core/macro — o statsmodels não está mais no caminho
+#      quente, então fica de fora);
+#   2) carrega o merged macro e calcula as versões por indicador;
+#   3) executa as páginas de ``WARM_PAGES`` em "modo bare" (numa thread sem
+#      contexto de sessão): os elementos não são desenhados, os widgets
+#      devolvem o valor padrão e os caches (``st.cache_*``, pool de
+#      processos, single-flight) ficam preenchidos para as visões padrão.
+#
+# Com ``server.scriptHealthCheckEnabled`` (.streamlit/config.toml), o
+# endpoint /_stcore/script-health-check roda o app.py no próprio servidor;
+# apontando o health check do deploy para ele, o servidor só entra no ar
+# com os caches prontos. Sessões (e health checks) que chegam durante o
+# aquecimento esperam por ele (lock) em vez de refazer o trabalho.
+#
+# Desative com LPB_WARMUP=0; escolha as páginas com LPB_WARMUP_PAGES
+# (módulos separados por vírgula).
+# -------------------------------------------------------------
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+# ======= CONFIG =======
+WARMUP_ENABLED = os.environ.get("LPB_WARMUP", "1") != "0"
+WARM_PAGES = tuple(p for p in os.environ.get("LPB_WARMUP_PAGES", "sections.Macro_economia").split(",") if p)
+MACRO_FILE = os.path.join("assets", "macro_br", "merged_macro_br.csv")
+# ======================
+
+HEAVY_MODULES = (
+    "numpy",
+    "pandas",
+    "plotly.express",
+    "plotly.graph_objects",
+    "sklearn.mixture",
+    "sklearn.metrics",
+    "core.macro.fastvar",
+    "core.macro.pairs",
+    "core.macro.batch",
+    "core.macro.regimes",
+    "core.macro.scenarios",
+    "core.macro.snapshots",
+)
+
+_lock = threading.Lock()
+_state = {"done": False, "elapsed_s": None, "steps": {}, "errors": {}}
+
+
+def _step(name: str, fn) -> None:
+    t0 = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        # Aquecimento nunca derruba o app: a página paga o custo na primeira visita
+        _state["errors"][name] = f"{type(e).__name__}: {e}"
+    _state["steps"][name] = time.perf_counter() - t0
+
+
+def _import_heavy() -> None:
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
+def _load_macro() -> None:
+    import pandas as pd
+
+    from core.macro import snapshots
+
+    snapshots.column_hashes(pd.read_csv(MACRO_FILE).dropna(how="all", axis=1))
+
+
+class _BareModeFilter(logging.Filter):
+    """Descarta o aviso de "sem ScriptRunContext" vindo das threads de aquecimento."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not record.threadName.startswith("warmup:")
+
+
+def _quiet_streamlit() -> None:
+    logger = logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context")
+    if not any(isinstance(f, _BareModeFilter) for f in logger.filters):
+        logger.addFilter(_BareModeFilter())
+
+
+def run_bare(module_name: str) -> None:
+    """Executa uma página numa thread sem contexto de sessão (nada é desenhado)."""
+    errors = []
+
+    def target():
+        try:
+            if module_name in sys.modules:
+                importlib.reload(sys.modules[module_name])
+            else:
+                importlib.import_module(module_name)
+        except BaseException as e:  # inclui o StopException do st.stop()
+            errors.append(e)
+
+    _quiet_streamlit()
+    thread = threading.Thread(target=target, name=f"warmup:{module_name}", daemon=True)
+    thread.start()
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
+def run(pages: tuple = WARM_PAGES) -> dict:
+    """Aquece o processo (uma vez só); chamadas concorrentes esperam a primeira terminar."""
+    if not WARMUP_ENABLED:
+        return status()
+    with _lock:
+        if _state["done"]:
+            return status()
+        t0 = time.perf_counter()
+        _step("imports", _import_heavy)
+        _step("dados macro", _load_macro)
+        for page in pages:
+            _step(page, lambda page=page: run_bare(page))
+        _state["elapsed_s"] = time.perf_counter() - t0
+        _state["done"] = True
+    return status()
+
+
+def start_background(pages: tuple = WARM_PAGES) -> threading.Thread | None:
+    """Dispara ``run`` numa thread (na subida do servidor, antes da primeira sessão)."""
+    if not WARMUP_ENABLED or _state["done"]:
+        return None
+    thread = threading.Thread(target=run, args=(pages,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def status() -> dict:
+    return {"enabled": WARMUP_ENABLED, "done": _state["done"], "elapsed_s": _state["elapsed_s"],
+            "steps": dict(_state["steps"]), "errors": dict(_state["errors"])}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mede o aquecimento: 1ª execução (fria) × execução seguinte.")
+    parser.add_argument("--pages", default=",".join(WARM_PAGES))
+    args = parser.parse_args()
+    pages = tuple(p for p in args.pages.split(",") if p)
+
+    out = run(pages)
+    print(f"[INFO] Aquecimento em {out['elapsed_s']:.2f} s")
+    for name, secs in out["steps"].items():
+        print(f"[INFO]   {name}: {secs:.2f} s" + (f" — ERRO {out['errors'][name]}" if name in out["errors"] else ""))
+    for page in pages:
+        t0 = time.perf_counter()
+        run_bare(page)
+        print(f"[OK] {page} depois do aquecimento: {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
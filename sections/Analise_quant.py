@@ -0,0 +1,251 @@
+# =========================================================
+# Análise Quant — backtests vetorizados
+# =========================================================
+# O motor fica em core/quant/backtest.py: sinais, posições, PnL, custos e
+# drawdown são operações de array sobre o painel inteiro, e a varredura de
+# parâmetros roda num pool de processos.
+
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+from core.quant import backtest, data, optimize, store
+
+st.set_page_config(page_title="Análise Quant", page_icon="📐", layout="wide")
+st.title("📐 Análise Quant — Backtests")
+st.markdown(
+    """
+**O que esta página faz?**
+- Testa estratégias clássicas (médias móveis, momentum e reversão à média) sobre um painel de ações.
+- Calcula posições, retorno, custos de transação e drawdown de uma vez para todos os ativos e dias.
+- Varre **centenas de combinações de parâmetros** em paralelo e mostra onde a estratégia funciona (e onde não).
+- Monta carteiras de **média-variância**, **mínima variância** e **paridade de risco**, com a fronteira eficiente.
+    """
+)
+st.caption(
+    "Os preços vêm da base local em `data/quant/store/` (arquivos mapeados em memória, criada a partir dos CSVs "
+    "de `data/quant/prices/`). Sem base, a página usa um painel sintético — os resultados são ilustrativos."
+)
+
+
+# ---------- Dados (cacheados) ----------
+def versao_base() -> float:
+    meta = os.path.join(store.STORE_DIR, "meta.json")
+    return os.path.getmtime(meta) if os.path.exists(meta) else 0.0
+
+
+@st.cache_resource(show_spinner=False)
+def abrir_base(versao: float) -> store.PriceStore | None:
+    # Os memmaps ficam abertos entre reruns; ``versao`` muda quando um append regrava o meta.json
+    return store.PriceStore() if versao else None
+
+
+@st.cache_data(show_spinner=False)
+def carregar_sintetico(n_ativos: int, anos: int, semente: int) -> pd.DataFrame:
+    return data.synthetic_panel(n_ativos, anos * backtest.TRADING_DAYS, semente)["close"]
+
+
+tem_csv = bool(glob.glob(os.path.join(data.PRICES_DIR, "*.csv")))
+if tem_csv and not store.PriceStore.exists():
+    with st.spinner("Montando a base local a partir dos CSVs…"):
+        store.sync_from_files()
+base = abrir_base(versao_base())
+
+fontes = (["Base local"] if base is not None and base.n_rows else []) + ["Sintético"]
+fonte = st.radio("Fonte dos preços", fontes, horizontal=True)
+if fonte == "Sintético":
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        n_ativos = st.slider("Ativos", 10, 500, 100, step=10)
+    with c2:
+        anos = st.slider("Anos de pregões", 2, 20, 10)
+    with c3:
+        semente = st.number_input("Semente", value=42, step=1)
+    precos = carregar_sintetico(n_ativos, anos, int(semente))
+else:
+    datas = base.dates
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        inicio, fim = st.select_slider(
+            "Período", options=[int(a) for a in datas.year.unique()], value=(int(datas.year.min()), int(datas.year.max()))
+        )
+    with c2:
+        st.write("")
+        if tem_csv and st.button("Atualizar com os CSVs", use_container_width=True):
+            novos = store.sync_from_files()
+            st.toast(f"{novos} pregão(ões) novo(s) acrescentado(s).")
+            base = abrir_base(versao_base())
+    # Recorte por período = fatia do memmap: só as linhas do intervalo são lidas do disco
+    precos = base.frame("close", f"{inicio}-01-01", f"{fim}-12-31")
+
+st.caption(f"{precos.shape[1]} ativos × {precos.shape[0]:,} pregões ({precos.index.min():%Y-%m-%d} a {precos.index.max():%Y-%m-%d}).")
+st.divider()
+
+# ---------- Estratégia ----------
+st.subheader("⚙️ Estratégia")
+nomes = list(backtest.STRATEGIES)
+estrategia = st.selectbox("Estratégia", nomes, format_func=lambda k: backtest.STRATEGIES[k]["label"])
+c1, c2, c3 = st.columns(3)
+if estrategia == "ma_cross":
+    with c1:
+        rapida = st.slider("Média curta (dias)", 5, 100, 20)
+    with c2:
+        lenta = st.slider("Média longa (dias)", 20, 400, 100)
+    params = {"fast": rapida, "slow": lenta}
+elif estrategia == "momentum":
+    with c1:
+        params = {"lookback": st.slider("Janela do momentum (dias)", 10, 252, 126)}
+else:
+    with c1:
+        janela = st.slider("Janela do z-score (dias)", 5, 120, 20)
+    with c2:
+        entrada = st.slider("Entrada (|z| acima de)", 0.5, 3.0, 1.5, 0.1)
+    params = {"window": janela, "entry_z": entrada}
+with c3:
+    custo = st.number_input("Custo por giro (bps)", min_value=0.0, value=5.0, step=1.0)
+
+valido = backtest.STRATEGIES[estrategia].get("valid")
+if valido and not valido(params):
+    st.warning("A média curta precisa ser menor que a longa.")
+    st.stop()
+
+res = backtest.run(precos.to_numpy(), estrategia, params, custo)
+m = res["stats"]
+k1, k2, k3, k4, k5 = st.columns(5)
+k1.metric("Retorno anual (CAGR)", f"{m['cagr']:.1%}")
+k2.metric("Volatilidade", f"{m['vol']:.1%}")
+k3.metric("Sharpe", f"{m['sharpe']:.2f}")
+k4.metric("Drawdown máximo", f"{m['max_drawdown']:.1%}")
+k5.metric("Giro anual", f"{m['turnover']:.1f}x")
+
+fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.7, 0.3])
+fig.add_trace(go.Scatter(x=precos.index, y=res["equity"], name="Patrimônio"), row=1, col=1)
+fig.add_trace(go.Scatter(x=precos.index, y=res["drawdown"], name="Drawdown", fill="tozeroy", line=dict(color="indianred")), row=2, col=1)
+fig.update_yaxes(title_text="Patrimônio (R$1 inicial)", row=1, col=1)
+fig.update_yaxes(title_text="Drawdown", tickformat=".0%", row=2, col=1)
+fig.update_layout(height=550, showlegend=False, margin=dict(t=20, b=40))
+st.plotly_chart(fig, use_container_width=True)
+
+st.divider()
+
+# ---------- Varredura de parâmetros ----------
+st.subheader("🔍 Varredura de parâmetros")
+if estrategia == "ma_cross":
+    grade = {"fast": list(range(5, 105, 5)), "slow": list(range(20, 420, 20))}
+elif estrategia == "momentum":
+    grade = {"lookback": list(range(10, 260, 5))}
+else:
+    grade = {"window": list(range(5, 125, 5)), "entry_z": [round(z, 2) for z in np.arange(0.5, 3.01, 0.25)]}
+
+combos = len(backtest.parameter_grid(grade, valido))
+workers = os.cpu_count() or 1
+st.caption(f"{combos:,} combinações · {workers} processo(s) em paralelo.")
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def varrer(_precos: np.ndarray, chave: tuple, estrategia: str, grade: dict, custo: float) -> tuple:
+    inicio = time.perf_counter()
+    tabela = backtest.sweep(_precos, estrategia, grade, custo, workers=workers)
+    return tabela, time.perf_counter() - inicio
+
+
+if st.button("Rodar varredura", type="primary", use_container_width=True):
+    chave = (fonte, precos.shape, str(precos.index[-1]), float(precos.iloc[-1].sum()))
+    with st.spinner("Avaliando combinações…"):
+        tabela, duracao = varrer(precos.to_numpy(), chave, estrategia, grade, custo)
+    st.success(f"{len(tabela):,} backtests em {duracao:.1f} s.")
+
+    nomes_param = list(grade)
+    if len(nomes_param) == 2:
+        mapa = tabela.pivot(index=nomes_param[1], columns=nomes_param[0], values="sharpe")
+        fig = px.imshow(mapa, color_continuous_scale="RdYlGn", color_continuous_midpoint=0, aspect="auto", origin="lower")
+        fig.update_layout(coloraxis_colorbar_title="Sharpe", margin=dict(t=20, b=40))
+    else:
+        fig = px.bar(tabela, x=nomes_param[0], y="sharpe")
+        fig.update_layout(yaxis_title="Sharpe", margin=dict(t=20, b=40))
+    st.plotly_chart(fig, use_container_width=True)
+
+    melhores = tabela.sort_values("sharpe", ascending=False).head(10)
+    st.dataframe(melhores.round(4), hide_index=True, use_container_width=True)
+    st.caption("Cuidado com overfitting: o melhor ponto da grade raramente é o melhor fora da amostra.")
+
+st.divider()
+
+# ---------- Alocação de carteira ----------
+st.subheader("🧮 Alocação de carteira")
+st.caption(
+    "Covariância com encolhimento de Ledoit-Wolf, cacheada por universo e janela; cada otimização parte "
+    "da solução anterior, então mexer nos controles abaixo não recalcula tudo do zero."
+)
+tickers = list(precos.columns)
+universo = st.multiselect("Universo", tickers, default=tickers[:min(30, len(tickers))])
+c1, c2, c3, c4 = st.columns(4)
+with c1:
+    janela_cov = st.slider("Janela de estimação (pregões)", 63, min(1260, len(precos) - 1), min(252, len(precos) - 1), step=21)
+with c2:
+    metodo = st.radio("Método", list(optimize.METHODS), format_func=optimize.METHODS.get)
+with c3:
+    aversao = st.slider("Aversão a risco (λ)", 0.5, 50.0, 5.0, 0.5, disabled=metodo != "mean_variance")
+with c4:
+    teto = st.slider("Peso máximo por ativo", 0.01, 1.0, 0.20, 0.01, disabled=metodo == "risk_parity")
+
+if len(universo) < 2:
+    st.info("Escolha pelo menos dois ativos.")
+    st.stop()
+if teto * len(universo) < 1:
+    st.warning(f"Com {len(universo)} ativos, o peso máximo precisa ser de pelo menos {1 / len(universo):.1%}.")
+    st.stop()
+
+versao = (fonte, precos.shape, str(precos.index[-1]), float(precos.iloc[-1].sum()))
+estimativa = optimize.estimate(precos.pct_change().iloc[1:], tuple(universo), janela_cov, versao)
+if estimativa["error"]:
+    st.warning(estimativa["error"])
+    st.stop()
+# Soluções anteriores desta sessão (warm start); nada é compartilhado entre visitantes
+warm = st.session_state.setdefault("otimizacao_warm", {})
+inicio = time.perf_counter()
+carteira = optimize.solve(estimativa, metodo, aversao, teto, warm)
+fronteira = optimize.frontier(estimativa, teto, warm=warm)
+duracao_ms = (time.perf_counter() - inicio) * 1e3
+
+k1, k2, k3, k4 = st.columns(4)
+k1.metric("Retorno esperado", f"{carteira['ret']:.1%}")
+k2.metric("Volatilidade", f"{carteira['vol']:.1%}")
+k3.metric("Sharpe (sem taxa livre)", f"{carteira['sharpe']:.2f}")
+k4.metric("Ativos com peso", f"{int((carteira['weights'] > 1e-4).sum())}")
+st.caption(
+    f"Otimização + fronteira em {duracao_ms:.0f} ms · {carteira['iterations']} iteração(ões)"
+    f"{' partindo da solução anterior' if carteira['warm'] else ''} · encolhimento {estimativa['shrinkage']:.2f}"
+    f" · {estimativa['n_obs']} observações."
+)
+
+col1, col2 = st.columns(2)
+with col1:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=fronteira["vol"], y=fronteira["ret"], mode="lines", name="Fronteira eficiente"))
+    fig.add_trace(go.Scatter(
+        x=np.sqrt(np.diag(estimativa["cov"])), y=estimativa["mu"], mode="markers", name="Ativos",
+        text=estimativa["tickers"], marker=dict(size=6, opacity=0.5),
+    ))
+    fig.add_trace(go.Scatter(x=[carteira["vol"]], y=[carteira["ret"]], mode="markers", name="Carteira",
+                             marker=dict(size=14, symbol="star", color="gold", line=dict(width=1, color="black"))))
+    fig.update_layout(xaxis_title="Volatilidade anual", yaxis_title="Retorno anual", xaxis_tickformat=".0%",
+                      yaxis_tickformat=".0%", height=420, margin=dict(t=20, b=40), legend=dict(orientation="h"))
+    st.plotly_chart(fig, use_container_width=True)
+with col2:
+    pesos = pd.DataFrame({
+        "Peso": carteira["weights"],
+        "Contribuição ao risco": optimize.risk_contributions(estimativa, carteira["weights"].to_numpy()),
+    })
+    pesos = pesos[pesos["Peso"] > 1e-4].sort_values("Peso", ascending=False).head(25)
+    fig = px.bar(pesos, barmode="group", orientation="v")
+    fig.update_layout(yaxis_tickformat=".0%", xaxis_title=None, yaxis_title=None, height=420,
+                      margin=dict(t=20, b=40), legend=dict(orientation="h", title=None))
+    st.plotly_chart(fig, use_container_width=True)
@@ -3,12 +3,9 @@
 Código desenvolvido por Lucas Pereira Brito em 15/08/2025
 """
 
-import streamlit as st
 from pathlib import Path
 
-# ---------- Cabeçalho ----------
-st.markdown("## 📄 Currículo Online")
-st.divider()
+from core.prerender import render_static
 
 
 def _resolve_pdf():
@@ -20,29 +17,35 @@ def _resolve_pdf():
 
 pdf_path = _resolve_pdf()
 
-# ---------- Breve introdução  ----------
-st.markdown(
-    """
+
+def build(doc) -> None:
+    """Monta o currículo em ``doc`` (``st`` ao vivo ou documento pré-renderizado)."""
+    # ---------- Cabeçalho ----------
+    doc.markdown("## 📄 Currículo Online")
+    doc.divider()
+
+
+    # ---------- Breve introdução  ----------
+    doc.markdown(
+        """
 ## *Lucas Pereira Brito*
 *Data Analyst SR*
 """)
 
-# Criando colunas
-col1, col2 = st.columns([2,2])
-with col1:
-    st.markdown("📍 São Paulo, SP")
-    st.markdown("📱 +55 11 95203-7792")
-with col2:
-    st.markdown("📧 [brito.luucas@hotmail.com](mailto:brito.luucas@hotmail.com)")
-    st.markdown("🔗 [linkedin.com/in/lucaspereirabrito](https://www.linkedin.com/in/lucaspereirabrito)")
+    # Criando colunas
+    col1, col2 = doc.columns([2,2])
+    col1.markdown("📍 São Paulo, SP")
+    col1.markdown("📱 +55 11 95203-7792")
+    col2.markdown("📧 [brito.luucas@hotmail.com](mailto:brito.luucas@hotmail.com)")
+    col2.markdown("🔗 [linkedin.com/in/lucaspereirabrito](https://www.linkedin.com/in/lucaspereirabrito)")
 
 
-st.divider()
+    doc.divider()
 
-# ---------- Apresentação (Resumo) ----------
-st.markdown("### 🧑‍💼 Apresentação")
-st.markdown(
-    """
+    # ---------- Apresentação (Resumo) ----------
+    doc.markdown("### 🧑‍💼 Apresentação")
+    doc.markdown(
+        """
 Engenheiro apaixonado por dados e analytics, com mais de **5 anos de experiência** no setor financeiro.
 
 Atuação em **pipelines de dados**, **governança**, **modelos preditivos**, **IA generativa** e **speech analytics** para clientes *PF* e *PJ*.
@@ -53,16 +56,16 @@ Sólido conhecimento de negócio, especialmente em **produtos bancários**, **cr
 
 Movido pela *paixão por dados* e pelo desejo de contribuir para o mercado financeiro, explorando áreas como **crédito**, *assets*, *experiência do cliente* — sempre usando dados para gerar *produtividade* e transformar dados em valor.
 """.strip()
-)
+    )
 
-st.divider()
+    doc.divider()
 
-# ---------- Experiências (primeiro bloco após apresentação) ----------
-st.markdown("### 💼 Experiências Profissionais")
-# Experiência atual
-st.markdown("🏦 *Itaú Unibanco — Data Analyst SR*  \n*04/2024 – Presente*")
-with st.expander("Detalhes da experiência", expanded=True):
-    st.markdown(
+    # ---------- Experiências (primeiro bloco após apresentação) ----------
+    doc.markdown("### 💼 Experiências Profissionais")
+    # Experiência atual
+    doc.markdown("🏦 *Itaú Unibanco — Data Analyst SR*  \n*04/2024 – Presente*")
+    exp = doc.expander("Detalhes da experiência", expanded=True)
+    exp.markdown(
         """
 - Criação de insights e recomendações com IA para apoiar gerentes PJ na gestão de carteira.
 - Co-liderança da migração analítica on-premises (SAS/SQL) → AWS (Glue, Athena), com padronização de queries e pipelines para preservar séries históricas.
@@ -73,10 +76,10 @@ with st.expander("Detalhes da experiência", expanded=True):
         """.strip()
     )
 
-# Experiência anterior
-st.markdown("🏦 *Itaú Unibanco — Analista de Dados e Analytics PL*  \n*06/2022 – 03/2024*")
-with st.expander("Detalhes da experiência", expanded=False):
-    st.markdown(
+    # Experiência anterior
+    doc.markdown("🏦 *Itaú Unibanco — Analista de Dados e Analytics PL*  \n*06/2022 – 03/2024*")
+    exp = doc.expander("Detalhes da experiência", expanded=False)
+    exp.markdown(
         """
         - Definição de *métricas operacionais* (tempo de atendimento, tempo de silêncio, NPS) para a central PF.  
         - Construção de *consultas/ETLs (SQL/Spark)* para painéis operacionais e relatórios periódicos.  
@@ -85,123 +88,120 @@ with st.expander("Detalhes da experiência", expanded=False):
         """
     )
 
-st.markdown("🏦 *Itaú Unibanco — Analista de CX JR*  \n*10/2020 – 05/2022*")
-with st.expander("Detalhes da experiência", expanded=False):
-    st.markdown(
+    doc.markdown("🏦 *Itaú Unibanco — Analista de CX JR*  \n*10/2020 – 05/2022*")
+    exp = doc.expander("Detalhes da experiência", expanded=False)
+    exp.markdown(
     """
 - Análises de *texto* de chamados PJ/PF para identificar padrões (limite, renegociação, acesso a canais).  
 - Relatórios temáticos para squads melhorarem *TMA, TME e tempo de espera*.  
 - *Scripts simples (Python/SQL)* para acelerar consolidações de dados.  
 - Materiais de *storytelling* para comunicar descobertas de discoverys.
 """
-)
+    )
 
-st.markdown("🏦 *Itaú Unibanco — Estagiário de CX JR*  \n*10/2019 – 09/2020*")
-with st.expander("Detalhes da experiência", expanded=False):
-    st.markdown(
+    doc.markdown("🏦 *Itaú Unibanco — Estagiário de CX JR*  \n*10/2019 – 09/2020*")
+    exp = doc.expander("Detalhes da experiência", expanded=False)
+    exp.markdown(
         """
     - Sustentação de *alertas* e *modelos de machine learning* focados em texto.  
     - Suporte a estudos analíticos para *aprimoramento de processos*.
     """
     )
 
-st.divider()
-
-# ---------- Conquistas ----------
-st.markdown("### 🏆 Conquistas-Chave")
-
-achievements = [
-    {
-        "title": "4× PRAD",
-        "desc": "Reconhecimento por alta performance no Banco Itaú.",
-    },
-    {
-        "title": "Jornada do Cliente",
-        "desc": (
-            "Mapeamento de jornada para ofertas de crédito imobiliário, combinando "
-            "dados transacionais e insights de atendimento para gerar abordagens "
-            "mais relevantes."
-        ),
-    },
-    {
-        "title": "Redução de Fraude",
-        "desc": "Biometria de voz + backoffice, mais de R$ 50MM de retorno.",
-    },
-    {
-        "title": "Governança de Dados",
-        "desc": (
-            "Estruturação de ambientes, padrões e qualidade, aliando a migração "
-            "on-premises → AWS e Tableau → QuickSight."
-        ),
-    },
-]
-
-cards_per_row = 2
-for start in range(0, len(achievements), cards_per_row):
-    row = achievements[start : start + cards_per_row]
-    columns = st.columns(len(row), gap="large")
-    for column, card in zip(columns, row):
-        with column:
-            with st.container(border=True):
-                st.markdown(f"#### :blue[{card['title']}]")
-                st.write(card["desc"])
-
-st.divider()
-
-# ---------- Habilidades ----------
-st.markdown("### 🧰 Habilidades")
-cA, cB = st.columns(2)
-with cA:
-    st.subheader("Linguagens & Dados")
-    st.markdown("- *SQL* — 🔵🔵🔵")
-    st.markdown("- *Python* — 🔵🔵🔵")
-    st.markdown("- *Spark* — 🔵🔵⚪")
-    st.markdown("- *VBA* — 🔵⚪⚪")
-
-    st.subheader("Plataformas & Dataviz")
-    st.markdown("- *AWS (Athena, S3, Glue, QuickSight)* — 🔵🔵🔵")
-    st.markdown("- *Hadoop* — 🔵🔵⚪")
-    st.markdown("- *SQL Server* — 🔵⚪⚪")
-    st.markdown("- *SAS* — 🔵🔵⚪")
-    st.markdown("- *Git* — 🔵⚪⚪")
-    st.markdown("- *Tableau* — 🔵🔵🔵")
-    st.markdown("- *Power BI* — 🔵🔵⚪")
-
-with cB:
-    st.subheader("IA & Analytics")
-    st.markdown("- *NLP*")
-    st.markdown("- *IA (RAG)*")
-    st.markdown("- *ML (incl. deep learning)*")
-    st.markdown("- *Speech Analysis*")
-
-    st.subheader("Conhecimentos & Práticas")
-    st.markdown("- *ETL, ELT*")
-    st.markdown("- *Data Quality*")
-    st.markdown("- *Data Governance*")
-    st.markdown("- *Estruturar time de dados*")
-    st.markdown("- *Data Storytelling*")
-    st.markdown("- *Mentoria*")
-    st.markdown("- *Comunicação*")
-
-st.divider()
-
-# ---------- Educação ----------
-st.markdown("### 🎓 Educação")
-st.markdown(
-    """
+    doc.divider()
+
+    # ---------- Conquistas ----------
+    doc.markdown("### 🏆 Conquistas-Chave")
+
+    achievements = [
+        {
+            "title": "4× PRAD",
+            "desc": "Reconhecimento por alta performance no Banco Itaú.",
+        },
+        {
+            "title": "Jornada do Cliente",
+            "desc": (
+                "Mapeamento de jornada para ofertas de crédito imobiliário, combinando "
+                "dados transacionais e insights de atendimento para gerar abordagens "
+                "mais relevantes."
+            ),
+        },
+        {
+            "title": "Redução de Fraude",
+            "desc": "Biometria de voz + backoffice, mais de R$ 50MM de retorno.",
+        },
+        {
+            "title": "Governança de Dados",
+            "desc": (
+                "Estruturação de ambientes, padrões e qualidade, aliando a migração "
+                "on-premises → AWS e Tableau → QuickSight."
+            ),
+        },
+    ]
+
+    cards_per_row = 2
+    for start in range(0, len(achievements), cards_per_row):
+        row = achievements[start : start + cards_per_row]
+        columns = doc.columns(len(row), gap="large")
+        for column, card in zip(columns, row):
+            box = column.container(border=True)
+            box.markdown(f"#### :blue[{card['title']}]")
+            box.write(card["desc"])
+
+    doc.divider()
+
+    # ---------- Habilidades ----------
+    doc.markdown("### 🧰 Habilidades")
+    cA, cB = doc.columns(2)
+    cA.subheader("Linguagens & Dados")
+    cA.markdown("- *SQL* — 🔵🔵🔵")
+    cA.markdown("- *Python* — 🔵🔵🔵")
+    cA.markdown("- *Spark* — 🔵🔵⚪")
+    cA.markdown("- *VBA* — 🔵⚪⚪")
+
+    cA.subheader("Plataformas & Dataviz")
+    cA.markdown("- *AWS (Athena, S3, Glue, QuickSight)* — 🔵🔵🔵")
+    cA.markdown("- *Hadoop* — 🔵🔵⚪")
+    cA.markdown("- *SQL Server* — 🔵⚪⚪")
+    cA.markdown("- *SAS* — 🔵🔵⚪")
+    cA.markdown("- *Git* — 🔵⚪⚪")
+    cA.markdown("- *Tableau* — 🔵🔵🔵")
+    cA.markdown("- *Power BI* — 🔵🔵⚪")
+
+    cB.subheader("IA & Analytics")
+    cB.markdown("- *NLP*")
+    cB.markdown("- *IA (RAG)*")
+    cB.markdown("- *ML (incl. deep learning)*")
+    cB.markdown("- *Speech Analysis*")
+
+    cB.subheader("Conhecimentos & Práticas")
+    cB.markdown("- *ETL, ELT*")
+    cB.markdown("- *Data Quality*")
+    cB.markdown("- *Data Governance*")
+    cB.markdown("- *Estruturar time de dados*")
+    cB.markdown("- *Data Storytelling*")
+    cB.markdown("- *Mentoria*")
+    cB.markdown("- *Comunicação*")
+
+    doc.divider()
+
+    # ---------- Educação ----------
+    doc.markdown("### 🎓 Educação")
+    doc.markdown(
+        """
 - *FGV* — Finanças Internacionais e Macroeconomia
 - *FIAP (MBA)* — Business Intelligence e Analytics  
 - *FEI (Graduação)* — Engenharia Mecânica  
 - *IFSP (Técnico Integrado)* — Mecânica
 """
-)
+    )
 
-st.divider()
+    doc.divider()
 
-# ---------- Certificações ----------
-st.markdown("### 🪪 Certificações")
-st.markdown(
-    """
+    # ---------- Certificações ----------
+    doc.markdown("### 🪪 Certificações")
+    doc.markdown(
+        """
 - *AWS Cloud Practitioner*  
 - *Vox2You* — Treinamento de Oratória 
 - *Green Belt Lean Six Sigma* 
@@ -216,21 +216,24 @@ st.markdown(
 - *Practitioner - Leadership D*
 - *Mineração de Dados com Python e NLTK (IA Expert Academy)*
 """
-)
-
-st.divider()
-# ---------- Botão para baixar o PDF ----------
-# Botão de download do PDF.
-if pdf_path.exists():
-    st.download_button(
-        label="⬇️ Baixar currículo (PDF)",
-        data=pdf_path.read_bytes(),
-        file_name=pdf_path.name,
-        mime="application/pdf",
-        use_container_width=True,
     )
-else:
-    st.info("PDF do currículo não encontrado em assets/.")
+
+    doc.divider()
+    # ---------- Botão para baixar o PDF ----------
+    # Botão de download do PDF.
+    if pdf_path.exists():
+        doc.download_button(
+            label="⬇️ Baixar currículo (PDF)",
+            data=pdf_path.read_bytes(),
+            file_name=pdf_path.name,
+            mime="application/pdf",
+            use_container_width=True,
+        )
+    else:
+        doc.info("PDF do currículo não encontrado em assets/.")
+
+
+render_static("curriculo", build)
 
 # Fim do arquivo Curriculo.py
 # -------------------------------------------------------------
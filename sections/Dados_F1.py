@@ -1,65 +1,228 @@
-# streamlit run em_breve.py
+# =========================================================
+# Dados & Fórmula 1 — sessões importadas com FastF1
+# =========================================================
+# A página só lê as tabelas Parquet geradas por core/f1/ingest.py;
+# a API do FastF1 é chamada apenas ao importar uma sessão nova.
+
+import pandas as pd
+import plotly.express as px
 import streamlit as st
-import time
-import random
 
-st.set_page_config(page_title="Em breve", page_icon="⏳", layout="wide")
+from core.f1 import compare, ingest, season, viz
 
-# Estado
-if "tentativas" not in st.session_state:
-    st.session_state.tentativas = 0
+st.set_page_config(page_title="Dados & F1", page_icon="🏎️", layout="wide")
+st.title("🏎️ Dados & Fórmula 1")
+st.markdown(
+    """
+**O que esta página faz?**
+- Importa sessões oficiais (treinos, classificação, sprint e corrida) pela biblioteca **FastF1**.
+- Guarda voltas, telemetria e posição em tabelas **Parquet** locais (nada é baixado de novo a cada visita).
+- Resume a temporada (campeonato, degradação de pneus e ritmo) num job em lote que só reprocessa sessões novas.
+- Mostra resultado da sessão, a evolução dos tempos de volta, o mapa da pista e a comparação de telemetria entre dois pilotos.
+    """
+)
 
-MAX_TENTATIVAS = 4
 
-st.title("🚧 Opa! Esta sessão deu ruim (por enquanto) 😅")
+# ---------- Leitura (cacheada) ----------
+@st.cache_data(show_spinner=False)
+def carregar_sessoes() -> pd.DataFrame:
+    return ingest.available_sessions()
 
-# Botão (trava após 4)
-botao_travado = st.session_state.tentativas >= MAX_TENTATIVAS
-btn_label = "Tentar desbloquear 🔓" if not botao_travado else "Botão travado 🔒"
 
-col1, col2 = st.columns([1.2, 1])
-with col1:
-    clicou = st.button(btn_label, use_container_width=True, disabled=botao_travado)
-with col2:
-    st.metric("Tentativas", st.session_state.tentativas)
+@st.cache_data(show_spinner=False)
+def carregar_resumo(temporada: int, tabela: str) -> pd.DataFrame:
+    return season.read_summary(temporada, tabela)
 
-# Área fixa para mensagem SEMPRE abaixo do botão
-msg_area = st.container()
 
-# Processa clique (até 4 loops)
-if clicou and not botao_travado:
-    with st.spinner("Consultando a IA… e chamando os duendes da nuvem…"):
-        time.sleep(0.3)
-    st.session_state.tentativas += 1
+@st.cache_data(show_spinner=False)
+def carregar_tabela(tabela: str, season: int, event: str, session: str) -> pd.DataFrame:
+    return ingest.read_table(tabela, season, event, session)
 
-# Mensagens por tentativa (4 loops), depois trava e mostra "quebrou"
-mensagens = [
-    "❌ **Não foi dessa vez.** Essa opção bugou aqui… tente outra do lado!",
-    "⚙️ **Ainda estou fazendo…** prometo que vai ficar bom assim que o GPT 6 sair.",
-    "🧱 **Ainda estou fazendo… ainda!** (sim, continuo fazendo 🙃)",
-    "🕹️ **Mini-jogo do Desbloqueio:** você quase conseguiu, mas… ainda estou fazendo.",
-]
-feedbacks = [
-    "🧃 Derrubei meu suco no teclado. Tenta de novo!",
-    "🧠 A IA disse: *quase!*",
-    "🧩 Peça faltando detectada.",
-    "🛰️ Erro 202 — Aceito, mas processando…",
-]
 
-# Decide qual texto mostrar (sempre abaixo do botão)
-with msg_area:
-    if st.session_state.tentativas == 0:
-        st.info("👉 Aperte o botão para tentar desbloquear. Se der errado, tente outra página 😉")
-    elif st.session_state.tentativas < MAX_TENTATIVAS:
-        idx = st.session_state.tentativas - 1
-        st.markdown(mensagens[idx])
-        st.caption(random.choice(feedbacks))
-    else:
-        st.error("💥 **Ah não, você quebrou…** Brincadeira! 😄 Ainda estou fazendo. Explore as outras páginas por enquanto.")
-
-# Barrinha simbólica discreta
-progresso = min(st.session_state.tentativas, MAX_TENTATIVAS) / MAX_TENTATIVAS
-st.progress(int(progresso * 100), text="Carregando o futuro… (versão humana quase IA)")
+sessoes = carregar_sessoes()
+
+# ---------- Importação ----------
+with st.expander("⬇️ Importar sessão (FastF1)", expanded=sessoes.empty):
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        ano = st.number_input("Temporada", min_value=2018, max_value=2030, value=2024, step=1)
+    with c2:
+        evento = st.text_input("Evento (nome ou rodada)", value="Bahrain")
+    with c3:
+        tipo = st.selectbox("Sessão", ["R", "Q", "S", "SQ", "FP1", "FP2", "FP3"])
+    st.caption("A primeira importação baixa os dados da API (pode levar alguns minutos); depois tudo vem do cache local.")
+
+    if st.button("Importar sessão", use_container_width=True):
+        with st.spinner("Baixando e normalizando a sessão…"):
+            try:
+                ingest.ingest_session(int(ano), int(evento) if evento.strip().isdigit() else evento.strip(), tipo)
+            except Exception as e:
+                st.error(f"Não foi possível importar a sessão: {e}")
+            else:
+                carregar_sessoes.clear()
+                carregar_tabela.clear()
+                st.rerun()
+
+if sessoes.empty:
+    st.info("Nenhuma sessão importada ainda. Use o painel acima para trazer a primeira.")
+    st.stop()
 
 st.divider()
-st.markdown("👉 **Dica:** pode navegar pelas outras páginas enquanto isso. Obrigado pela paciência! 🙏")
+
+# ---------- Escolha da sessão ----------
+rotulos = [
+    f"{r.season} · R{int(r['round']):02d} {r.event_name} — {r.session_name}"
+    for _, r in sessoes.iterrows()
+]
+escolha = st.selectbox("📌 Sessão", range(len(rotulos)), index=len(rotulos) - 1, format_func=lambda i: rotulos[i])
+sel = sessoes.iloc[escolha]
+chave = (int(sel["season"]), str(sel["event"]), str(sel["session"]))
+
+resultados = carregar_tabela("results", *chave)
+voltas = carregar_tabela("laps", *chave)
+
+# ---------- Resultado ----------
+st.subheader("🏁 Resultado")
+if resultados.empty:
+    st.warning("Sessão sem resultados publicados.")
+else:
+    tabela = resultados.sort_values("position")[["position", "driver", "full_name", "team", "grid_position", "status", "points"]]
+    tabela.columns = ["Pos.", "Piloto", "Nome", "Equipe", "Grid", "Status", "Pontos"]
+    st.dataframe(tabela, hide_index=True, use_container_width=True)
+
+# ---------- Temporada ----------
+st.subheader(f"📈 Temporada {chave[0]}")
+if st.button("Atualizar resumo da temporada", help="Processa em paralelo só as sessões novas desde a última execução."):
+    with st.spinner("Resumindo as sessões da temporada…"):
+        stats = season.run_season(chave[0])
+    carregar_resumo.clear()
+    st.success(f"{stats['processed']} sessões processadas, {stats['skipped']} sem alteração.")
+    if stats["failed"]:
+        st.warning("Falharam (serão refeitas na próxima atualização): " + ", ".join(k.replace("__", " ") for k in sorted(stats["failed"])))
+
+standings = carregar_resumo(chave[0], "standings")
+if standings.empty:
+    st.info("Resumo da temporada ainda não gerado — use o botão acima (ou `python -m core.f1.season <ano>`).")
+else:
+    aba_camp, aba_ritmo, aba_pneus = st.tabs(["🏆 Campeonato", "🚀 Ritmo", "🛞 Degradação"])
+    with aba_camp:
+        fig = px.line(standings, x="round", y="points_total", color="driver", markers=True, hover_data=["event_name", "position"])
+        fig.update_layout(xaxis_title="Rodada", yaxis_title="Pontos acumulados", legend_title="Piloto", margin=dict(t=20, b=40))
+        st.plotly_chart(fig, use_container_width=True)
+    with aba_ritmo:
+        ritmo = carregar_resumo(chave[0], "pace")
+        if not ritmo.empty:
+            ritmo = ritmo[(ritmo["event"] == chave[1]) & (ritmo["session"] == chave[2])]
+        if ritmo.empty:
+            st.info("Sessão ainda não incluída no resumo.")
+        else:
+            tabela = ritmo[["rank", "driver", "team", "median_lap_s", "best_lap_s", "gap_s", "laps"]].round(3)
+            tabela.columns = ["#", "Piloto", "Equipe", "Mediana (s)", "Melhor (s)", "Gap (s)", "Voltas limpas"]
+            st.dataframe(tabela, hide_index=True, use_container_width=True)
+    with aba_pneus:
+        stints = carregar_resumo(chave[0], "stints")
+        if not stints.empty:
+            stints = stints[(stints["event"] == chave[1]) & (stints["session"] == chave[2])].dropna(subset=["slope_s_per_lap"])
+        if stints.empty:
+            st.info("Sem stints longos o bastante para estimar a degradação.")
+        else:
+            fig = px.bar(stints, x="driver", y="slope_s_per_lap", color="compound", barmode="group", hover_data=["stint", "laps", "r2"])
+            fig.update_layout(xaxis_title="Piloto", yaxis_title="Degradação (s/volta)", legend_title="Composto", margin=dict(t=20, b=40))
+            st.plotly_chart(fig, use_container_width=True)
+    st.caption("Degradação = inclinação da reta tempo de volta × idade do pneu, só com voltas limpas.")
+
+# ---------- Tempos de volta ----------
+st.subheader("⏱️ Tempos de volta")
+if voltas.empty:
+    st.warning("Sessão sem voltas cronometradas.")
+    st.stop()
+
+pilotos = sorted(voltas["driver"].unique())
+padrao = resultados.sort_values("position")["driver"].head(3).tolist() if not resultados.empty else pilotos[:3]
+escolhidos = st.multiselect("Pilotos", pilotos, default=[p for p in padrao if p in pilotos])
+
+# Voltas de entrada/saída de box e voltas imprecisas distorcem a escala do gráfico
+limpas = voltas[
+    voltas["driver"].isin(escolhidos)
+    & voltas["is_accurate"]
+    & voltas["pit_in_s"].isna()
+    & voltas["pit_out_s"].isna()
+].dropna(subset=["lap_time_s"])
+
+if limpas.empty:
+    st.info("Selecione ao menos um piloto com voltas válidas.")
+else:
+    fig = px.line(
+        limpas,
+        x="lap_number",
+        y="lap_time_s",
+        color="driver",
+        markers=True,
+        hover_data={"compound": True, "tyre_life": True},
+    )
+    fig.update_layout(
+        xaxis_title="Volta",
+        yaxis_title="Tempo de volta (s)",
+        legend_title="Piloto",
+        margin=dict(t=20, b=40),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption("Fonte: FastF1 (dados oficiais de cronometragem da F1). Voltas de box e imprecisas foram omitidas.")
+
+# ---------- Mapa da pista ----------
+st.subheader("🗺️ Mapa da pista")
+c1, c2 = st.columns(2)
+with c1:
+    piloto_mapa = st.selectbox("Piloto", pilotos, key="piloto_mapa")
+with c2:
+    voltas_piloto = sorted(voltas.loc[voltas["driver"] == piloto_mapa, "lap_number"].dropna().astype(int).unique())
+    volta_mapa = st.selectbox("Volta", [None, *voltas_piloto], format_func=lambda v: "Sessão inteira" if v is None else f"Volta {v}", key="volta_mapa")
+
+mapa = viz.track_arrays(*chave, piloto_mapa, volta_mapa)
+if mapa:
+    st.plotly_chart(viz.track_figure(mapa), use_container_width=True)
+    st.caption(f"{len(mapa['x']):,} de {mapa['samples']:,} amostras de posição desenhadas (WebGL), coloridas pela velocidade.")
+else:
+    st.info("Sem dados de posição para esse piloto.")
+
+# ---------- Comparação de telemetria ----------
+st.subheader("🆚 Comparação de pilotos")
+c1, c2 = st.columns(2)
+with c1:
+    piloto_a = st.selectbox("Piloto A", pilotos, index=pilotos.index(padrao[0]) if padrao and padrao[0] in pilotos else 0)
+with c2:
+    restantes = [p for p in pilotos if p != piloto_a]
+    if not restantes:
+        st.info("A sessão precisa de pelo menos dois pilotos para comparar.")
+        st.stop()
+    piloto_b = st.selectbox(
+        "Piloto B", restantes, index=restantes.index(padrao[1]) if len(padrao) > 1 and padrao[1] in restantes else 0
+    )
+
+# Todas as voltas do par são reamostradas e comparadas de uma vez (cache por sessão + par)
+comp = compare.compare_session(*chave, piloto_a, piloto_b)
+if not comp or comp["pairs"].empty:
+    st.info("Sem telemetria suficiente para comparar esses pilotos.")
+    st.stop()
+
+pares = comp["pairs"]
+i = st.selectbox("Volta", range(len(pares)), format_func=lambda k: pares["label"].iloc[k])
+par = pares.iloc[i]
+grade = comp["grid"]
+
+m1, m2, m3 = st.columns(3)
+m1.metric(f"Diferença ({piloto_a} − {piloto_b})", f"{par['gap_s']:+.3f} s")
+m2.metric(f"{piloto_a} perde mais tempo em", f"{par['max_loss_at_m']:.0f} m")
+m3.metric(f"{piloto_a} ganha mais tempo em", f"{par['max_gain_at_m']:.0f} m")
+
+# Zoom no servidor: só o trecho escolhido é enviado, reduzido a no máximo viz.MAX_POINTS
+comprimento = float(grade[-1])
+trecho = st.slider("Trecho da volta (m)", 0.0, comprimento, (0.0, comprimento), step=50.0)
+tracos = viz.comparison_traces(*chave, piloto_a, piloto_b, int(i), trecho)
+st.plotly_chart(viz.telemetry_figure(tracos, piloto_a, piloto_b), use_container_width=True)
+
+with st.expander("📋 Diferença volta a volta"):
+    resumo = pares[["label", "lap_a", "lap_b", "gap_s", "mean_speed_diff"]].copy()
+    resumo.columns = ["Par", f"Volta {piloto_a}", f"Volta {piloto_b}", "Diferença (s)", "Vel. média A − B (km/h)"]
+    st.dataframe(resumo.round(3), hide_index=True, use_container_width=True)
+st.caption("Delta positivo = piloto A atrás do piloto B naquele ponto da volta.")
@@ -1,6 +1,9 @@
 import streamlit as st
 from textwrap import dedent
 
+from core.diagrams import graphviz_chart
+from core.prerender import render_lazy_tabs, render_static
+
 # --------------------------------------
 # Página única de Streamlit (para usar dentro de uma sessão/app maior)
 # --------------------------------------
@@ -10,58 +13,51 @@ st.set_page_config(
     layout="wide",
 )
 
-st.title("🧭 Arquitetura & Governança de Dados — Visão Prática")
-st.caption(
-    "As explicações foram feitas com base em minha experiência prática em projetos de dados e especializações na área."
-)
 
-# Hero / Intro
-with st.container():
-    col1, col2 = st.columns([1.2, 1])
-    with col1:
-        st.subheader("O que essa página está falando?")
-        st.write(
-            """
+def build_intro(doc) -> None:
+    """Cabeçalho da página em ``doc`` (``st`` ao vivo ou documento pré-renderizado)."""
+    doc.title("🧭 Arquitetura & Governança de Dados — Visão Prática")
+    doc.caption(
+        "As explicações foram feitas com base em minha experiência prática em projetos de dados e especializações na área."
+    )
+
+    # Hero / Intro
+    box = doc.container()
+    col1, col2 = box.columns([1.2, 1])
+    col1.subheader("O que essa página está falando?")
+    col1.write(
+        """
             **Objetivo:** alinhar conceitos de arquitetura de dados, papéis & responsabilidades
             e pilares de governança e como isso tudo flui para que **times de negócio e tecnologia** consigam **construir, operar
             e consumir** dados com segurança, confiabilidade e velocidade.
-            """
-        )
-        st.markdown(
-            "- 🔒 **Confiabilidade** (qualidade, segurança, compliance)\n"
-            "- ⚡ **Velocidade** (plataforma self-service, automação)\n"
-            "- 📈 **Valor** (dados como produto, orientado a domínios)"
-        )
-    with col2:
-        st.info(
-            """
+    """
+    )
+    col1.markdown(
+        "- 🔒 **Confiabilidade** (qualidade, segurança, compliance)\n"
+        "- ⚡ **Velocidade** (plataforma self-service, automação)\n"
+        "- 📈 **Valor** (dados como produto, orientado a domínios)"
+    )
+    col2.info(
+        """
             **Escopo da página**\n
             1) Plataforma & Arquitetura (DWH → Data Lake → Data Mesh)  
             2) Camadas (Bronze/Silver/Gold) × (SOR/SOT/SPEC)  
             3) Papéis & Responsabilidades ao longo do ciclo de dados  
             4) Governança (catálogo, qualidade, segurança, LGPD, contratos de dados)  
             5) Fluxo end‑to‑end (app móvel → backend → dados → ML → BI)
-            """
-        )
-
-# Navegação em abas
-aba1, aba2, aba3, aba4, aba5 = st.tabs([
-    "🏗️ Plataforma & Arquitetura",
-    "🪙 Camadas & SOR/SOT/SPEC",
-    "👥 Papéis & Responsabilidades",
-    "🛡️ Governança de Dados",
-    "🔀 Fluxo end‑to‑end (exemplo prático)",
-])
+    """
+    )
+
 
 # --------------------------------------
 # ABA 1 — Plataforma & Arquitetura
 # --------------------------------------
-with aba1:
-    st.markdown("## 🏗️ Plataforma de Dados & Evolução da Arquitetura")
+def build_aba1(doc) -> None:
+    doc.markdown("## 🏗️ Plataforma de Dados & Evolução da Arquitetura")
 
-    with st.expander("📦 Data Warehouse (DW) — a base histórica"):
-        st.write(
-            """
+    exp = doc.expander("📦 Data Warehouse (DW) — a base histórica")
+    exp.write(
+        """
             **Ideia central:** consolidar dados **estruturados** em um repositório único, estável e consistente
             para **análises corporativas** (ex.: risco de crédito, rentabilidade, P&L, ALM).  
             **Características:** schema‑on‑write, modelagem dimensional (star/snowflake), forte **governança central**,
@@ -71,12 +67,12 @@ with aba1:
             e indicadores corporativos.  
             **Limites:** menos flexível para dados semiestruturados/não estruturados, tempo maior para incorporar
             novas fontes, custos de escala.
-            """
-        )
+    """
+    )
 
-    with st.expander("🌊 Data Lake — flexibilidade e escala"):
-        st.write(
-            """
+    exp = doc.expander("🌊 Data Lake — flexibilidade e escala")
+    exp.write(
+        """
             **Ideia central:** armazenar grandes volumes de dados **em qualquer formato** (estruturado, semi, não
             estruturado) com **schema‑on‑read**, permitindo exploração, ciência de dados e ML com custo mais baixo.  
             **Características:** storage barato, múltiplos formatos (CSV, Parquet, JSON, logs, eventos), integração
@@ -85,12 +81,12 @@ with aba1:
             **Forças:** alta **flexibilidade**, barata **escala**, ótimo para descoberta e ML.  
             **Limites:** se não houver governança, vira **“data swamp”** (qualidade/linhagem incertas, duplicidade,
             dificuldade de achar a “versão oficial” dos dados).
-            """
-        )
+    """
+    )
 
-    with st.expander("🧩 Data Mesh — dados como produto, orientado a domínios (foco)"):
-        st.write(
-            """
+    exp = doc.expander("🧩 Data Mesh — dados como produto, orientado a domínios (foco)")
+    exp.write(
+        """
             **Ideia central:** descentralizar a produção/posse dos dados para os **domínios de negócio** (Finanças,
             Crédito, Comercial, Riscos, Operações), tratando **dados como produtos** com donos, SLAs, contratos,
             observabilidade e catálogos; ao mesmo tempo, manter **governança e plataformas** **centralizadas** para
@@ -113,26 +109,26 @@ with aba1:
             apenas “entregar extrações”. Isso **reduz atrito**, acelera time‑to‑value e melhora a qualidade sistêmica.
 
             **Limites:** requer **cultura de produto**, maturidade técnica (automação, testes, CI/CD) e governança bem robusta para garantir que os dados não tenham duplicidade e principalmente estejam disponíveis com qualidade e segurança, para todos.
-            """
-        )
+    """
+    )
 
-    st.markdown("---")
-    st.subheader("🔗 Como tudo se conecta na prática")
-    st.markdown(
+    doc.markdown("---")
+    doc.subheader("🔗 Como tudo se conecta na prática")
+    doc.markdown(
         """
         - **DW e Data Lake** convivem: o lake dá **escala/flexibilidade**; o DW (ou **camada Gold**) entrega **verdades
           corporativas** para relatórios críticos.  
         - O **Data Mesh** organiza **quem faz o quê**: domínios **possuem** produtos de dados; a **plataforma** provê
           automação e governança; a **área central** regula padrões e segurança.
-        """
+    """
     )
-    st.markdown("Links úteis:")
-    st.markdown("- [Explicação do Data Mesh](https://medium.com/data-hackers/data-mesh-indo-al%C3%A9m-do-data-lake-e-data-warehouse-465d57539d89)")
-    st.markdown("- [Explicação do Data lake](https://azure.microsoft.com/pt-br/resources/cloud-computing-dictionary/what-is-a-data-lake)")
+    doc.markdown("Links úteis:")
+    doc.markdown("- [Explicação do Data Mesh](https://medium.com/data-hackers/data-mesh-indo-al%C3%A9m-do-data-lake-e-data-warehouse-465d57539d89)")
+    doc.markdown("- [Explicação do Data lake](https://azure.microsoft.com/pt-br/resources/cloud-computing-dictionary/what-is-a-data-lake)")
 
-    st.subheader("Opinião pessoal")
+    doc.subheader("Opinião pessoal")
 
-    st.write(
+    doc.write(
         """
         - O modelo de data mesh é bastante interessante, mas exige **maturidade técnica e cultural**. Para evitar que os dados sejam tratados de forma paralela (como em planilhas Excel ou relatórios fora do fluxo oficial), é fundamental observar três pontos principais:
 
@@ -141,17 +137,17 @@ with aba1:
         3. **Governança:** este é o ponto mais crítico. É necessário um time dedicado e ferramentas que automatizem processos de governança, evitando que o ambiente se torne um “data swamp”.
 
         Por fim, o aspecto mais importante é a **responsabilidade sobre o dado**. É essencial definir claramente quem é o responsável pela informação, pois dados sem um “dono” definido tendem a ser menos confiáveis, dificultando a tomada de decisão baseada em informações seguras.
-        """
+    """
     )
 
 
 # --------------------------------------
 # ABA 2 — Camadas & SOR/SOT/SPEC
 # --------------------------------------
-with aba2:
-    st.markdown("## 🪙 Camadas de Dados × Fontes de Verdade")
+def build_aba2(doc) -> None:
+    doc.markdown("## 🪙 Camadas de Dados × Fontes de Verdade")
 
-    st.markdown(
+    doc.markdown(
         """
         **Glossário rápido**  
 
@@ -164,10 +160,10 @@ with aba2:
           oficial, carteira ativa). Geralmente **Gold**/**DW**.  
         - **SPEC — Specialized:** **marts**/visões **especializadas** para casos de uso (BI, APIs de dados, sandboxes),
           com otimizações de desempenho e formas de acesso sob demanda.
-        """
+    """
     )
 
-    st.markdown("### Mapeamento prático")
+    doc.markdown("### Mapeamento prático")
 
     # Dados da tabela
     dados = [
@@ -198,9 +194,9 @@ with aba2:
     ]
 
     # Tabela
-    st.table(dados)
+    doc.table(dados)
 
-    st.markdown(
+    doc.markdown(
         """
         **Ligação com visualizações e databases**  
 
@@ -209,31 +205,32 @@ with aba2:
         - **Gold/SOT** é a referência **corporativa** (indicadores oficiais).  
         - **Silver** serve para **reuso** e manutenção de coerência.  
         - **Bronze** garante **rastreabilidade** e auditoria.
-        """
+    """
     )
 
-    st.subheader("Opinião pessoal")
+    doc.subheader("Opinião pessoal")
 
-    st.write("""
+    doc.write("""
         - Na prática, as camadas de dados nem sempre seguem rigidamente o padrão Bronze → Silver → Gold. Muitas vezes, há confusão quando camadas Gold são criadas sobre outras Gold, o que pode dificultar a rastreabilidade dos dados e gerar dependências entre áreas que não deveriam existir. Isso ocorre porque o uso da informação pode acontecer em diferentes momentos do ciclo de vida do dado.
         - Entre todas as camadas, a SOT (Source of Truth) é a mais relevante no dia a dia, pois serve como referência oficial para todos os produtos de dados, garantindo consistência e confiança.
         - Já a camada SPEC é onde o valor do dado é extraído, transformando a matéria-prima em impacto real para o negócio, por meio de visões especializadas e produtos direcionados.
     """)
 
+
 # --------------------------------------
 # ABA 3 — Papéis & Responsabilidades
 # --------------------------------------
-with aba3:
-    st.markdown("## 👥 Quem faz o quê no ciclo de dados")
+def build_aba3(doc) -> None:
+    doc.markdown("## 👥 Quem faz o quê no ciclo de dados")
 
-    st.markdown(
+    doc.markdown(
         """
         **Visão geral humanizada**: do **app** que capta eventos/solicitações, ao **modelo de ML** em produção,
         passando por **engenharia de dados** e **BI** — cada papel tem um foco e um **entregável concreto**.
-        """
+    """
     )
 
-    st.table([
+    doc.table([
     {
         "Papel": "Desenvolvedor(a) Front-end",
         "Foco": "Transformar necessidades do usuário em telas simples e rápidas de usar. Menos cliques, menos fricção, mais clareza — para qualquer pessoa conseguir fazer o que precisa sem se perder.",
@@ -282,23 +279,25 @@ with aba3:
         "Entregáveis": "Dashboards, semantic layer, guias de uso",
         "KPIs": "Adoção, tempo de resposta, acurácia percebida",
     },
-]
-)
+    ]
+    )
 
-    st.subheader("Opinião pessoal")
+    doc.subheader("Opinião pessoal")
 
-    st.write("""
+    doc.write("""
         Nem todas as empresas possuem essa granularidade de papéis; algumas empresas ou setores contam apenas com o analista de dados, que acaba sendo um faz-tudo, assumindo o papel de todos. Ao fazer isso, cria-se um gargalo enorme, pois o analista de dados não tem a expertise necessária e acaba fazendo fluxos confusos e impossíveis de replicar, gerando um ambiente onde a documentação se torna inviável devido ao volume de demandas que recaem sobre esse profissional.
 
         Outro ponto é como o analista de dados coexiste com o engenheiro de analytics. Eu acredito que, no futuro, todos os analistas de dados irão se tornar engenheiros de analytics, pois o engenheiro de analytics traduz o problema de negócio em dados com maior maestria e tecnicidade. Porém, como é uma profissão super recente, ainda vão existir casos onde os dois papéis se divergem. Então, o engenheiro de analytics acaba cuidando do pipeline de dados (se tornando um engenheiro de dados) e o analista de dados cuida da parte de BI, virando o construtor dos painéis e deixando de lado a análise dos dados para se tornar um construtor.
     """)
+
+
 # --------------------------------------
 # ABA 4 — Governança de Dados
 # --------------------------------------
-with aba4:
-    st.markdown("## 🛡️ Governança: manter dados úteis, seguros e auditáveis")
+def build_aba4(doc) -> None:
+    doc.markdown("## 🛡️ Governança: manter dados úteis, seguros e auditáveis")
 
-    st.markdown(
+    doc.markdown(
         """
         **Pilares práticos**  
         - **Catálogo & metadados:** localização, dicionário, dono, propósito, ciclo de vida.  
@@ -308,17 +307,20 @@ with aba4:
         - **Linhagem (lineage):** rastreabilidade fim‑a‑fim (who‑touched‑what‑when).  
         - **Observabilidade:** saúde dos pipelines (atrasos, falhas, volume anômalo, custo).  
         - **Gestão de custos:** partições, formatos colunares (ex.: Parquet), políticas de ciclo de vida.
-        """
+    """
     )
 
-    st.markdown("### RACI resumido (exemplo por domínio: Finanças)")
-    st.table([
+    doc.markdown("### RACI resumido (exemplo por domínio: Finanças)")
+    doc.table([
         {"Atividade": "Definir métrica oficial (ex.: Margem Financeira)", "R": "Data Steward Finanças", "A": "Data Owner Finanças", "C": "BI/Analytics", "I": "Governança Central"},
         {"Atividade": "Pipeline Bronze→Silver", "R": "Eng. de Dados", "A": "Data Owner Finanças", "C": "Governança Central", "I": "BI/Analytics"},
         {"Atividade": "Publicar Produto de Dados (SPEC)", "R": "Data Steward Finanças", "A": "Data Owner Finanças", "C": "BI/Segurança", "I": "Demais domínios"},
         {"Atividade": "Controle de acesso LGPD", "R": "Segurança/Privacidade", "A": "Governança Central", "C": "Data Steward", "I": "Usuários finais"},
     ])
 
+
+def checklist_aba4() -> None:
+    """Checklist interativo da aba 4: fica fora da pré-renderização (os checkboxes são widgets)."""
     with st.expander("Checklist de prontidão de um Produto de Dados (use no dia a dia)"):
         st.checkbox("Definições e dicionário publicados no catálogo")
         st.checkbox("Contratos de dados (schema + regras) versionados e testados")
@@ -327,12 +329,13 @@ with aba4:
         st.checkbox("Regras LGPD aplicadas (mínimo privilégio, mascaramento, retenção)")
         st.checkbox("Custos monitorados (partições, formatos colunares, ciclo de vida)")
 
+
 # --------------------------------------
 # ABA 5 — Fluxo end‑to‑end (exemplo prático)
 # --------------------------------------
-with aba5:
-    st.markdown("## 🔀 Exemplo prático: app móvel → backend → dados → ML → BI")
-    st.caption("Fluxograma simplificado com os papéis principais em cada etapa.")
+def build_aba5(doc) -> None:
+    doc.markdown("## 🔀 Exemplo prático: app móvel → backend → dados → ML → BI")
+    doc.caption("Fluxograma simplificado com os papéis principais em cada etapa.")
 
     dot = dedent(
         r"""
@@ -384,13 +387,14 @@ with aba5:
           serving -> apps;
           spec -> apps;
         }
-        """
+    """
     )
 
-    st.graphviz_chart(dot, use_container_width=True)
+    # SVG renderizado uma vez no servidor (cache pelo hash do DOT)
+    graphviz_chart(doc, dot)
 
-    st.markdown("### Descrição do fluxo")
-    st.markdown(
+    doc.markdown("### Descrição do fluxo")
+    doc.markdown(
         """
         1. **Usuário usa o app** (ex.: solicitação de limite/transferência). O **Front‑end** instrumenta eventos.  
         2. **Back‑end/APIs** validam regras e persistem no **banco transacional (SOR)**.  
@@ -399,11 +403,31 @@ with aba5:
         4. A camada **SPEC** expõe **marts** e **serviços** para BI, APIs de dados e casos especializados.  
         5. **Cientistas de Dados** criam features e modelos; **Eng. de ML** publica em produção (serving/monitoramento).  
         6. **Dashboards** e **Apps** consomem **SPEC** e/ou **inferências** do modelo com governança, qualidade e custo sob controle.
-        """
+    """
     )
 
-st.markdown("---")
-st.success(
-    "Dica final: comece pequeno (um domínio, um produto de dados), publique contratos, monitore qualidade/custos e \n"
-    "evolua para o modelo federado com governança central — **velocidade com segurança**."
-)
+
+def build_fim(doc) -> None:
+    """Fecho da página, abaixo das abas."""
+    doc.markdown("---")
+    doc.success(
+        "Dica final: comece pequeno (um domínio, um produto de dados), publique contratos, monitore qualidade/custos e \n"
+        "evolua para o modelo federado com governança central — **velocidade com segurança**."
+    )
+
+
+# Navegação em abas "preguiçosas": só a aba visível é montada e enviada;
+# cada aba é pré-renderizada na primeira vez em que é aberta.
+ABAS = {
+    "🏗️ Plataforma & Arquitetura": build_aba1,
+    "🪙 Camadas & SOR/SOT/SPEC": build_aba2,
+    "👥 Papéis & Responsabilidades": build_aba3,
+    "🛡️ Governança de Dados": build_aba4,
+    "🔀 Fluxo end‑to‑end (exemplo prático)": build_aba5,
+}
+
+render_static("governanca/intro", build_intro)
+aba = render_lazy_tabs("governanca", ABAS, key="governanca_aba")
+if ABAS[aba] is build_aba4:
+    checklist_aba4()
+render_static("governanca/fim", build_fim)
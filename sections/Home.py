@@ -1,7 +1,13 @@
-"""Home page layout built only with native Streamlit components."""
+"""Home page layout built only with native Streamlit components.
+
+The content is described once in ``build`` and pre-rendered by
+``core.prerender`` into a single cached payload.
+"""
 
 import streamlit as st
 
+from core.prerender import render_static
+
 
 if "page" not in st.session_state:
     st.session_state["page"] = "home"
@@ -17,21 +23,6 @@ def navigate_to(page_id: str) -> None:
     st.rerun()
 
 
-left, right = st.columns([2, 3], gap="small")
-with left:
-    st.image("assets/avatar.png", width=180)
-with right:
-    st.title("Olá! Eu me chamo Lucas")
-    st.write(
-        "Sou um engenheiro mecânico no mundo financeiro, com experiência em dados "
-        "e análises, apaixonado por Macroeconomia, Mercado Financeiro, Dados, Fórmula 1 e "
-        "Tecnologia. Este site é um espaço onde compartilho um pouco dessas paixões: "
-        "projetos, análises e, claro, o meu Currículo. A ideia é mostrar ideias em "
-        "diferentes estágios e a busca pela evolução constante."
-    )
-
-st.divider()
-
 cards = [
     {
         "title": "Currículo",
@@ -40,8 +31,8 @@ cards = [
         "emoji": ":page_facing_up:",
     },
     {
-        "title": "Dados & Fórmula 1 (Em Breve)",
-        "desc": "Em breve, esta seção apresentará projetos de dados relacionados à Fórmula 1, utilizando a biblioteca FastF1 para análises de standings, telemetria e comparações.",
+        "title": "Dados & Fórmula 1",
+        "desc": "Projetos de dados relacionados à Fórmula 1, utilizando a biblioteca FastF1 para análises de standings, telemetria e comparações.",
         "id": "dados_f1",
         "emoji": ":bar_chart: :checkered_flag:",
     },
@@ -57,16 +48,46 @@ cards = [
         "id": "macro",
         "emoji": ":bar_chart: :earth_americas:",
     },
+    {
+        "title": "Valuation",
+        "desc": "Modelo de fluxo de caixa descontado com sensibilidade, tornado e milhares de cenários calculados de uma vez.",
+        "id": "valuation",
+        "emoji": ":moneybag:",
+    },
+    {
+        "title": "Análise Quant",
+        "desc": "Backtests vetorizados de estratégias quantitativas e varredura de parâmetros em paralelo.",
+        "id": "quant",
+        "emoji": ":triangular_ruler:",
+    },
 ]
 
-st.subheader("Temas para explorar. Utilize o menu no canto esquerdo da página.")
-cards_per_row = 2
-for start in range(0, len(cards), cards_per_row):
-    row = cards[start : start + cards_per_row]
-    columns = st.columns(len(row), gap="large")
-    for column, card in zip(columns, row):
-        with column:
-            with st.container(border=True):
-                st.markdown(f"### {card['emoji']}  {card['title']}")
-                st.write(card["desc"])
-                
+
+
+def build(doc) -> None:
+    """Lay out the Home page on ``doc`` (``st`` itself or a pre-render document)."""
+    left, right = doc.columns([2, 3], gap="small")
+    left.image("assets/avatar.png", width=180)
+    right.title("Olá! Eu me chamo Lucas")
+    right.write(
+        "Sou um engenheiro mecânico no mundo financeiro, com experiência em dados "
+        "e análises, apaixonado por Macroeconomia, Mercado Financeiro, Dados, Fórmula 1 e "
+        "Tecnologia. Este site é um espaço onde compartilho um pouco dessas paixões: "
+        "projetos, análises e, claro, o meu Currículo. A ideia é mostrar ideias em "
+        "diferentes estágios e a busca pela evolução constante."
+    )
+
+    doc.divider()
+
+    doc.subheader("Temas para explorar. Utilize o menu no canto esquerdo da página.")
+    cards_per_row = 2
+    for start in range(0, len(cards), cards_per_row):
+        row = cards[start : start + cards_per_row]
+        columns = doc.columns(len(row), gap="large")
+        for column, card in zip(columns, row):
+            box = column.container(border=True)
+            box.markdown(f"### {card['emoji']}  {card['title']}")
+            box.write(card["desc"])
+
+
+render_static("home", build)
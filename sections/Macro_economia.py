@@ -3,22 +3,26 @@
 # =========================================================
 
 import os  # Biblioteca padrão do Python para manipulação de caminhos e diretórios
+import json  # Leitura do manifesto de versões dos dados
 import pandas as pd  # Pandas: principal biblioteca para manipulação e análise de dados em formato tabular (DataFrames)
 import numpy as np  # Numpy: biblioteca para cálculos numéricos eficientes (vetores, matrizes, funções matemáticas)
 import streamlit as st  # Streamlit: framework para criar aplicações web interativas de forma simples e rápida (dashboard/data apps)
 import plotly.express as px  # Plotly Express: módulo simplificado do Plotly para criar gráficos interativos com poucas linhas de código
 import plotly.graph_objects as go  # Plotly Graph Objects: módulo mais detalhado/flexível do Plotly, que permite customizar gráficos interativos em maior profundidade
 
-# Importa bibliotecas estatísticas específicas para séries temporais
-from statsmodels.tsa.stattools import adfuller  # Teste de estacionariedade ADF
-from statsmodels.tsa.api import VAR             # Modelo VAR
-from statsmodels.tsa.vector_ar.vecm import coint_johansen, VECM  # Cointegração e modelo VECM
+# Estimadores VAR/VECM/ADF em NumPy, ajuste dos pares, pipeline de regimes
+# macroeconômicos (features cacheadas + misturas gaussianas) e motor de
+# cenários sobre os sistemas ajustados
+from core import offload, singleflight
+from core.macro import batch, fastvar, pairs, quality, regimes, scenarios, snapshots
 
 
 # ======= CONFIG =======
 # AVISO: Se sua estrutura de projeto for diferente, estou saindo da estrutura.
 DATA_DIR = os.path.join("assets", "macro_br")
 MERGED_FILE = os.path.join(DATA_DIR, "merged_macro_br.csv")
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest_macro_br.json")
+QUALITY_FILE = os.path.join(DATA_DIR, "quality_macro_br.json")
 # ======================
 
 # Configuração da página Streamlit:
@@ -64,6 +68,40 @@ dfm = dfm.copy()
 dfm = dfm.sort_values("year")
 dfm = dfm.dropna(how="all", axis=1)  # remove colunas totalmente vazias
 
+# Versão de conteúdo de cada indicador (hash da série, core/macro/snapshots.py).
+# Os caches abaixo usam essas versões no lugar da data do arquivo: uma
+# atualização que só mexe em um indicador só refaz o que depende dele.
+versoes_ind = snapshots.column_hashes(dfm)
+
+# Manifesto da última atualização (utils/baixar_indicadores_macro.py): só é
+# mostrado se descreve exatamente os dados carregados.
+if os.path.exists(MANIFEST_FILE):
+    with open(MANIFEST_FILE, encoding="utf-8") as f:
+        manifesto = json.load(f)
+    if manifesto.get("dataset") == snapshots.token(versoes_ind):
+        alterados = ", ".join(manifesto.get("changes", {})) or "nenhum"
+        st.caption(f"Dados: versão {manifesto['version']} ({manifesto['created']}) — alterados nesta versão: {alterados}")
+
+# Relatório de qualidade gravado na ingestão (core/macro/quality.py): a página
+# só lê o JSON, as checagens não são refeitas aqui.
+relatorio_dq = quality.load_report(QUALITY_FILE)
+if relatorio_dq["indicators"]:
+    resumo_dq = pd.DataFrame(
+        [{"indicador": nome, "linhas": sec["rows"], "novas na última carga": sec["new"],
+          "descartadas": sec["dropped"], **sec["summary"], "checado em": sec["checked_at"]}
+         for nome, sec in relatorio_dq["indicators"].items()]
+    )
+    n_erros = int(resumo_dq["erro"].sum())
+    with st.expander(f"🩺 Qualidade dos dados — {n_erros} erro(s), {int(resumo_dq['aviso'].sum())} aviso(s)"):
+        st.caption(
+            "Checagens da ingestão: esquema, duplicidade, faixa plausível, anos faltando e saltos "
+            "acima do esperado. Linhas com erro não entram na base."
+        )
+        st.dataframe(resumo_dq, hide_index=True, use_container_width=True)
+        problemas_dq = quality.report_table(relatorio_dq)
+        if not problemas_dq.empty:
+            st.dataframe(problemas_dq, hide_index=True, use_container_width=True)
+
 # Lista de indicadores disponíveis (todas as colunas menos "year").
 # Usada para popular o selectbox que escolhe o indicador principal.
 indicadores_disponiveis = [c for c in dfm.columns if c != "year"]
@@ -340,8 +378,9 @@ def run_adf_show(x: pd.Series):
     x = pd.to_numeric(x, errors="coerce").dropna()
     try:
         # Executa o teste ADF com critério de seleção de defasagens baseado no AIC
-        # O adfuller retorna: estatística do teste, p-valor e outros resultados
-        stat, pval, *_ = adfuller(x, autolag="AIC")
+        # (mesmo resultado do adfuller do statsmodels, em NumPy puro — core/macro/fastvar.py)
+        res = fastvar.adf(x.to_numpy())
+        stat, pval = res["stat"], res["pvalue"]
         # Retorna os resultados principais (estatística e p-valor) já convertidos para float
         return {"stat": float(stat), "pvalue": float(round(pval, 4))}
     except Exception as e:
@@ -431,25 +470,6 @@ with right:
 
 
 
-# Função para rodar o teste ADF (Augmented Dickey-Fuller)
-def run_adf(x: pd.Series) -> dict:
-    # Converte a série para numérico (caso venha com strings) e remove valores ausentes
-    x = pd.to_numeric(x, errors="coerce").dropna()
-    try:
-        # Executa o teste ADF com:
-        # - autolag="AIC": escolhe o número ótimo de defasagens usando critério AIC
-        # - maxlag = mínimo entre 8 e 1/3 do tamanho da série (evita sobreajuste em séries curtas)
-        stat, pval, *_ = adfuller(x, autolag="AIC", maxlag=min(8, int(len(x) / 3)))
-        
-        # Retorna estatística do teste e p-valor como floats
-        return {"stat": float(stat), "pvalue": float(pval)}
-    except Exception:
-        # Caso o teste não rode (ex.: série muito curta, problemas de dados),
-        # retorna NaN para facilitar o tratamento na visualização
-        return {"stat": np.nan, "pvalue": np.nan}
-
-
-
 # Função simples de limpeza de dados
 def simple_clean(df: pd.DataFrame, cols: list,
                  anos_excluir=(2008, 2009, 2020),  # anos fixos a remover (choques conhecidos)
@@ -526,138 +546,64 @@ def analyze_pair(df: pd.DataFrame, a: str, b: str, apply_cleaning: bool):
         st.warning(f"Dados insuficientes para {a} vs {b}."); return
 
 
-    # Decisão por VECM (teste de cointegração de Johansen)
-
-    vecm_ok = False
+    # Ajuste (Johansen → VECM, ou VAR com diferença seletiva) em core/macro/pairs.py.
+    # Visitantes simultâneos com o mesmo par esperam um único ajuste em andamento
+    # em vez de repeti-lo (single-flight); o resultado é somente leitura.
+    # O ajuste em si roda num processo do pool (core/offload.py), fora da thread da sessão.
+    forecast_years = pairs.FORECAST_YEARS
     try:
-        # coint_johansen espera um array numpy; det_order=0: sem determinístico em nível;
-        # k_ar_diff=1: 1 defasagem nas diferenças (config simples)
-        cj = coint_johansen(tmp.values, det_order=0, k_ar_diff=1)
-        # Regra prática: usa a estatística "trace" (lr1) e compara com crítico de 5% (cvt[:,1])
-        # Se lr1[0] > cvt[0,1] => pelo menos 1 relação de cointegração (rank >= 1)
-        vecm_ok = float(cj.lr1[0]) > float(cj.cvt[0, 1])  # trace > crítico 5%
-    except Exception:
-        # Se algo falhar no Johansen, cai para a rota VAR
-        vecm_ok = False
-
-    # Horizonte de previsão (anos à frente)
-    forecast_years = 3
-    pred_df, modelo_usado = None, ""
+        ajuste = pairs.fit_pair_shared(tmp, forecast_years)
+    except (offload.PoolBusy, TimeoutError) as e:
+        st.error(f"Ajuste de {a} vs {b} indisponível agora: {e}"); return
+    pred_df, modelo_usado = ajuste["pred"], ajuste["model"]
+    # Sistema linear (forma companheira) do modelo ajustado — usado pelo motor de cenários
+    sistema = ajuste["system"]
 
     # ============
     #   VECM
     # ============
-    if vecm_ok:
+    if ajuste["cointegrated"]:
         # Cabeçalho para a seção VECM
         st.subheader(f"🔹 VECM — {a} vs {b}")
         # Mostra um "snippet" do código usado, para transparência pedagógica
         with st.expander("📦 Código usado (VECM)", expanded=False):
             st.code(
-                "model = VECM(df_pair, k_ar_diff=1, deterministic='ci')\n"
-                "res = model.fit()\n"
-                "fc = res.predict(steps=3)\n", language="python")
-        try:
-            # Ajuste do VECM:
-            # - k_ar_diff=1: 1 defasagem nas diferenças
-            # - deterministic='ci': intercepto apenas no vetor de cointegração (forma comum)
-            model = VECM(tmp, k_ar_diff=1, deterministic="ci")
-            res = model.fit()
-            # Previsão out-of-sample para N passos (anos)
-            fc = res.predict(steps=forecast_years)
-
-            # Constrói índice futuro com base no último ano observado
-            last_year = int(tmp.index.max())
-            fut_years = list(range(last_year + 1, last_year + 1 + forecast_years))
-
-            # DataFrame de previsões com mesmas colunas e index dos anos futuros
-            pred_df = pd.DataFrame(fc, columns=tmp.columns, index=fut_years).astype(float)
-            modelo_usado = "VECM"
-        except Exception as e:
-            # Em caso de erro no ajuste/predict do VECM, informa e habilita fallback para VAR
-            st.error(f"Erro no VECM: {e}")
-            vecm_ok = False
+                "# core/macro/pairs.py → fit_vecm (estimadores em NumPy, core/macro/fastvar.py)\n"
+                "Y = df_pair.to_numpy(dtype='float64')\n"
+                "if fastvar.cointegrated(Y)[0]:          # traço de Johansen, 5%\n"
+                "    res = fastvar.vecm_fit(Y)           # k_ar_diff=1, constante no vetor de cointegração\n"
+                "    fc = fastvar.vecm_predict(res, Y, steps=3)\n", language="python")
+            st.caption(
+                "Referência (conferida nos testes até ~1e-8): "
+                "`VECM(df_pair, k_ar_diff=1, deterministic='ci').fit().predict(steps=3)` do statsmodels."
+            )
+        if ajuste["vecm_error"]:
+            # Erro no ajuste/predict do VECM: informa (o ajuste já caiu para o VAR)
+            st.error(f"Erro no VECM: {ajuste['vecm_error']}")
 
     # ============
     #   VAR
     # ============
-    if not vecm_ok:
+    if modelo_usado != "VECM":
         # Cabeçalho para a seção VAR (rota padrão se não houver cointegração)
         st.subheader(f"🔹 VAR — {a} vs {b}")
         # Mostra um "snippet" do código usado, para transparência pedagógica
         with st.expander("📦 Código usado (VAR)", expanded=False):
             st.code(
-                "sel = VAR(X).select_order(4)\n"
-                "p = sel.aic or 1\n"
-                "model = VAR(X).fit(p)\n"
-                "fc = model.forecast(model.endog[-p:], steps=3)\n", language="python")
-        try:
-            X = tmp.copy()
-            # Estratégia: diferenciar variáveis individualmente apenas se o ADF indicar não-estacionariedade
-            diffed = {}
-            for col in X.columns:
-                adf = run_adf(X[col])  # roda ADF coluna a coluna
-                # need_diff=True se p-valor >= 0.05 (não rejeita raiz unitária)
-                need_diff = (not np.isnan(adf["pvalue"])) and (adf["pvalue"] >= 0.05)
-                diffed[col] = bool(need_diff)
-                # Aplica a primeira diferença apenas na(s) série(s) não estacionária(s)
-                if need_diff: X[col] = X[col].diff()
-
-            # Remove linhas iniciais perdidas pela diferença e garante float
-            X = X.dropna().astype(float)
-            # Checagem de tamanho mínimo de amostra após diferenciação
-            if X.shape[0] < 8:
-                st.warning("Amostra ficou curta após a diferenciação."); return
-
-            # Define p máximo com bom senso: não exagerar em séries curtas
-            max_p = min(4, max(1, X.shape[0] - 2))
-            try:
-                # Seleciona ordem via critério AIC até p máximo
-                sel = VAR(X).select_order(max_p)
-                # Alguns objetos retornam p diretamente em sel.aic; se None, usa 1
-                p = int(sel.aic) if sel.aic is not None else 1
-            except Exception:
-                # Se falhar a seleção de ordem, usa p=1
-                p = 1
-            # Garante que p está no intervalo [1, max_p]
-            p = max(1, min(max_p, int(p)))
-
-            # Ajusta o VAR com p defasagens
-            model = VAR(X).fit(p)
-
-            # Forecast para N passos à frente, usando as últimas p observações
-            fc = model.forecast(y=X.values[-model.k_ar:], steps=forecast_years)
-            fc_df = pd.DataFrame(fc, columns=X.columns)
-
-            # Reconstrói níveis para as séries que foram diferenciadas
-            last_year = int(tmp.index.max())
-            fut_years = list(range(last_year + 1, last_year + 1 + forecast_years))
-            pred_df = pd.DataFrame(index=fut_years, columns=tmp.columns, dtype=float)
-            for col in tmp.columns:
-                if diffed.get(col, False):
-                    # Se a série foi diferenciada: soma cumulativa às previsões + último nível observado
-                    base = float(tmp[col].iloc[-1])
-                    pred_df[col] = base + fc_df[col].cumsum().values
-                else:
-                    # Se não foi diferenciada: previsão já está em nível
-                    pred_df[col] = fc_df[col].values
-
-            # Fallback anti-NaN:
-            # Em caso raro de NaN nas previsões (por numérico/colinearidade),
-            # tenta refitar com p=1 e refaz reconstrução
-            if pred_df.isna().any().any():
-                model = VAR(X).fit(1)
-                fc = model.forecast(y=X.values[-1:], steps=forecast_years)
-                fc_df = pd.DataFrame(fc, columns=X.columns)
-                for col in tmp.columns:
-                    if diffed.get(col, False):
-                        base = float(tmp[col].iloc[-1])
-                        pred_df[col] = base + fc_df[col].cumsum().values
-                    else:
-                        pred_df[col] = fc_df[col].values
-
-        except Exception as e:
+                "# core/macro/pairs.py → fit_var (estimadores em NumPy, core/macro/fastvar.py)\n"
+                "# X = séries do par, diferenciadas quando o ADF não rejeita raiz unitária\n"
+                "p = max(1, int(fastvar.var_select_order(X, 4)))   # AIC\n"
+                "res = fastvar.var_fit(X, p)\n"
+                "fc = fastvar.forecast(res['coefs'], res['intercept'], X[-p:], steps=3)\n", language="python")
+            st.caption(
+                "Referência (conferida nos testes até ~1e-8): "
+                "`VAR(X).select_order(4)`, `VAR(X).fit(p).forecast(X[-p:], steps=3)` do statsmodels."
+            )
+        if ajuste["short"]:
+            st.warning("Amostra ficou curta após a diferenciação."); return
+        if ajuste["var_error"]:
             # Qualquer erro no pipeline VAR: informa e encerra
-            st.error(f"Erro no VAR: {e}"); return
+            st.error(f"Erro no VAR: {ajuste['var_error']}"); return
 
 
     # ---------- Plot + Conclusão ----------
@@ -733,9 +679,235 @@ def analyze_pair(df: pd.DataFrame, a: str, b: str, apply_cleaning: bool):
         # Se algo falhar no cálculo/formatação, apenas ignora silenciosamente (não quebra a UI)
         pass
 
+    # Devolve o sistema ajustado (ou None) para o motor de cenários
+    return sistema
+
 
 # Chama a função principal para pares de variáveis de interesse,
-# usando a flag de limpeza definida anteriormente no session_state
-analyze_pair(dfm, "PIB real — crescimento (% a.a.)", "Desemprego (% força de trabalho)", st.session_state.apply_cleaning)
-analyze_pair(dfm, "Inflação (CPI, % a.a.)", "Juros reais (% a.a.)", st.session_state.apply_cleaning)
-analyze_pair(dfm, "Conta Corrente (% do PIB)", "PIB real — crescimento (% a.a.)", st.session_state.apply_cleaning)
+# usando a flag de limpeza definida anteriormente no session_state.
+# Cada chamada devolve o sistema ajustado, que alimenta a seção de cenários.
+pares = [
+    ("PIB real — crescimento (% a.a.)", "Desemprego (% força de trabalho)"),
+    ("Inflação (CPI, % a.a.)", "Juros reais (% a.a.)"),
+    ("Conta Corrente (% do PIB)", "PIB real — crescimento (% a.a.)"),
+]
+sistemas = {}
+for a, b in pares:
+    sistema = analyze_pair(dfm, a, b, st.session_state.apply_cleaning)
+    if sistema is not None:
+        sistemas[f"{a} × {b}"] = sistema
+
+# Métricas do single-flight: quantas chamadas esperaram um ajuste já em andamento
+# (acumuladas desde a subida do servidor, somando todas as sessões)
+with st.expander("⚙️ Ajustes compartilhados entre visitantes", expanded=False):
+    metricas = singleflight.metrics()
+    if metricas.empty:
+        st.caption("Nenhum ajuste executado ainda.")
+    else:
+        st.dataframe(metricas.round(3), hide_index=True, use_container_width=True)
+        st.caption(
+            "**calls** = pedidos de ajuste · **executions** = ajustes de fato · "
+            "**coalesced** = pedidos que aguardaram um ajuste idêntico em andamento em vez de repeti-lo."
+        )
+    pool = offload.stats()
+    st.caption(
+        f"Pool de processos: {pool['workers']} worker(s) · {pool['pending']}/{pool['max_pending']} na fila · "
+        f"{pool['completed']} concluídos · {pool['timeouts']} timeouts · {pool['rejected']} recusados (fila cheia)."
+    )
+
+
+# =============================================================
+# Todos os pares (ou subconjuntos) de indicadores num lote só
+# =============================================================
+# core/macro/batch.py empilha os sistemas com o mesmo formato num tensor
+# (sistemas × anos × séries) e roda cada etapa do pipeline acima — Johansen,
+# VECM, ADF, ordem do VAR, VAR e previsão — como uma chamada em lote do
+# numpy.linalg. Usa a base sem limpeza.
+st.markdown("---")
+st.header("📋 Todos os pares de uma vez")
+
+indicadores_lote = [c for c in dfm.columns if c != "year"]
+c1, c2 = st.columns(2)
+with c1:
+    escopo_lote = st.radio("Sistemas", ["Pares", "Todos os subconjuntos"], horizontal=True)
+with c2:
+    corte_lote = st.slider("Backtest a partir de (anos de histórico)", 10, 20, 15)
+
+
+@st.cache_data(show_spinner=False)
+def ajustar_lote(versao: str, escopo: str, corte: int) -> tuple:
+    # versao = token do conteúdo de todos os indicadores: só refaz o lote
+    # quando algum indicador muda (ou o escopo/corte escolhido)
+    sistemas_ = batch.all_pairs(indicadores_lote) if escopo == "Pares" else batch.all_subsets(indicadores_lote)
+    # Backtest: cada (sistema, ano de corte) é um modelo — todos ajustados juntos
+    return batch.fit_systems(dfm, sistemas_), batch.backtest(dfm, sistemas_, min_years=corte)
+
+
+with st.spinner("Ajustando todos os sistemas…"):
+    tabela_lote, bt = ajustar_lote(snapshots.token(versoes_ind), escopo_lote, corte_lote)
+st.dataframe(tabela_lote.round(2), hide_index=True, use_container_width=True)
+st.caption(
+    f"{len(tabela_lote)} sistemas em {tabela_lote.attrs['elapsed_s'] * 1e3:.0f} ms · "
+    f"backtest com {bt.attrs['models']} modelos em {bt.attrs['elapsed_s'] * 1e3:.0f} ms "
+    "(tempos do último ajuste; o resultado fica em cache até os dados mudarem)."
+)
+with st.expander("Erro de previsão 1 ano à frente (backtest em janela crescente)", expanded=False):
+    if bt.empty:
+        st.caption("Histórico curto demais para o corte escolhido.")
+    else:
+        rmse = (bt.assign(erro2=bt["erro"] ** 2)
+                  .groupby(["sistema", "serie"])["erro2"].mean().pow(0.5)
+                  .unstack("serie"))
+        st.dataframe(rmse.round(2), use_container_width=True)
+        st.caption("Raiz do erro quadrático médio (p.p.) de cada série em cada sistema; menor = melhor.")
+
+
+# =============================================================
+# Cenários condicionais ("e se…?") sobre os sistemas ajustados
+# =============================================================
+# O motor fica em core/macro/scenarios.py: cada VAR/VECM vira uma forma
+# companheira linear; a grade inteira de choques × durações × anos sai de uma
+# única operação vetorizada, sem reajustar o modelo por cenário.
+st.markdown("---")
+st.header("🎛️ Cenários: e se um indicador mudar?")
+
+if not sistemas:
+    st.info("Nenhum sistema VAR/VECM disponível para simular cenários.")
+else:
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        par_cenario = st.selectbox("Sistema", list(sistemas))
+    sistema = sistemas[par_cenario]
+    with c2:
+        serie_choque = st.selectbox("Indicador que recebe o choque", sistema["columns"])
+    with c3:
+        horizonte = st.slider("Horizonte (anos)", 3, 15, 8)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        faixa = st.slider("Faixa de choques (p.p.)", -5.0, 5.0, (-3.0, 3.0), 0.5)
+    with c2:
+        choque = st.slider("Choque em destaque (p.p.)", faixa[0], faixa[1], min(max(2.0, faixa[0]), faixa[1]), 0.1)
+
+    # Grade: choques de 0,1 em 0,1 p.p. × durações de 1 ano até o horizonte inteiro
+    choques = np.round(np.arange(faixa[0], faixa[1] + 1e-9, 0.1), 2)
+    duracoes = list(range(1, horizonte + 1))
+    v = sistema["columns"].index(serie_choque)
+    grade = scenarios.scenario_grid(sistema, v, choques, duracoes, horizonte)
+    st.caption(
+        f"{len(choques) * len(duracoes):,} cenários ({len(choques)} choques × {len(duracoes)} durações) "
+        f"× {horizonte} anos, calculados de uma vez sobre o {sistema['kind']} ajustado."
+    )
+
+    # Caminhos do choque em destaque para algumas durações (1 ano, metade e horizonte todo)
+    i = int(np.argmin(np.abs(choques - choque)))
+    anos = [str(a) for a in grade["years"]]
+    for j, col in enumerate(sistema["columns"]):
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=anos, y=grade["baseline"][:, j], name="Base (sem choque)",
+                                 line=dict(color="gray", dash="dash")))
+        for m in sorted({1, max(1, horizonte // 2), horizonte}):
+            fig.add_trace(go.Scatter(x=anos, y=grade["paths"][i, m - 1, :, j], mode="lines+markers",
+                                     name=f"{choques[i]:+.1f} p.p. por {m} ano(s)"))
+        fig.update_layout(title=col, xaxis_title="Ano", yaxis=dict(ticksuffix="%"),
+                          legend=dict(orientation="h", y=-0.2), margin=dict(t=50, b=40), height=380)
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Mapa: desvio da outra série no fim do horizonte para toda a grade
+    outra = [c for c in sistema["columns"] if c != serie_choque][0]
+    j = sistema["columns"].index(outra)
+    desvio = grade["paths"][:, :, -1, j] - grade["baseline"][-1, j]
+    fig = px.imshow(desvio.T, x=choques, y=duracoes, origin="lower", aspect="auto",
+                    color_continuous_scale="RdBu_r", color_continuous_midpoint=0,
+                    labels=dict(x=f"Choque em {serie_choque} (p.p.)", y="Duração do choque (anos)", color="Δ p.p."))
+    fig.update_layout(title=f"Desvio de {outra} em {grade['years'][-1]} (vs. base)", margin=dict(t=50, b=40))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        "Leitura: o indicador escolhido fica acima (ou abaixo) da base pelo tamanho do choque durante a duração "
+        "indicada; o outro reage pela dinâmica estimada e pela correlação dos resíduos. Modelos com 25 anos "
+        "de dados anuais — trate como ilustração, não previsão."
+    )
+    # Grade completa em formato longo (choque, duração, ano, série) para quem quiser explorar fora da página
+    st.download_button(
+        "Baixar grade de cenários (CSV)",
+        scenarios.grid_frame(sistema, grade).to_csv(index=False).encode("utf-8"),
+        file_name="cenarios_macro.csv", mime="text/csv",
+    )
+
+
+# =============================================================
+# Regimes macroeconômicos (misturas gaussianas + suavização estilo HMM)
+# =============================================================
+# O pipeline fica em core/macro/regimes.py: a matriz de features (nível, Δ e
+# defasagens de Δ de cada indicador) é montada uma vez e cacheada; depois
+# testamos vários subconjuntos de indicadores e números de regimes em paralelo.
+
+st.markdown("---")
+st.header("🧭 Regimes macroeconômicos")
+st.markdown(
+    "Em vez de olhar pares de séries, aqui agrupamos os **anos** em regimes parecidos "
+    "(ex.: juros altos com inflação alta × crescimento com juros em queda). "
+    "Cada combinação de indicadores e de nº de regimes vira um modelo; o melhor (maior silhueta) aparece primeiro."
+)
+
+# Controles do pipeline (todos entram na chave do cache)
+c1, c2, c3 = st.columns(3)
+with c1:
+    ks_regimes = st.multiselect("Nº de regimes testados", [2, 3, 4, 5], default=list(regimes.N_REGIMES))
+with c2:
+    lags_regimes = st.radio("Defasagens de Δ nas features", [1, 2], horizontal=True)
+with c3:
+    # Quanto maior, mais difícil o regime mudar de um ano para o outro
+    stay_regimes = st.slider("Persistência do regime", 0.5, 0.95, regimes.STAY, 0.05)
+
+
+@st.cache_data(show_spinner=False)
+def ajustar_regimes(versao: str, lags: int, ks: tuple, stay: float) -> tuple:
+    # versao = token do conteúdo de todos os indicadores; a matriz de features
+    # é montada com blocos cacheados por indicador (só os alterados são refeitos)
+    feats = regimes.cached_features(dfm, versoes_ind, lags)
+    # No próprio processo: poucos ajustes pequenos; um pool a cada cache miss
+    # custaria mais para subir do que os ajustes em si
+    return feats, regimes.fit_all(feats, ks=ks, stay=stay, workers=1)
+
+
+if not ks_regimes:
+    st.info("Escolha ao menos um número de regimes.")
+else:
+    with st.spinner("Ajustando modelos de regime…"):
+        feats, modelos = ajustar_regimes(snapshots.token(versoes_ind), lags_regimes, tuple(sorted(ks_regimes)), stay_regimes)
+
+    # Rótulo amigável de cada modelo para o seletor
+    def _nome_modelo(i: int) -> str:
+        m = modelos.iloc[i]
+        curtos = [s.split(" (")[0].split(" —")[0] for s in m["subset"]]
+        return f"{' + '.join(curtos)} · {m['k']} regimes · silhueta {m['silhouette']:.2f}"
+
+    escolhido = st.selectbox("Modelo", range(min(15, len(modelos))), format_func=_nome_modelo)
+    modelo = modelos.iloc[escolhido]
+    colunas_ind = [c for c in dfm.columns if c != "year"]
+    nomes = regimes.name_regimes(dfm, feats.index, modelo["labels"], colunas_ind)
+    rotulos = pd.DataFrame({"year": feats.index.astype(int), "Regime": [nomes[r] for r in modelo["labels"]]})
+
+    # Linha do tempo: crescimento do PIB de cada ano, colorido pelo regime atribuído
+    pib = "PIB real — crescimento (% a.a.)"
+    linha = rotulos.merge(dfm[["year", pib]], on="year", how="left")
+    linha["year"] = linha["year"].astype(str)
+    fig = px.bar(linha, x="year", y=pib, color="Regime")
+    fig.update_layout(xaxis_title="Ano", yaxis=dict(ticksuffix="%"), legend=dict(orientation="h", y=1.1, x=0),
+                      margin=dict(t=40, b=40))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Perfil médio de cada regime (níveis originais dos indicadores)
+    perfil = regimes.profile(dfm, feats.index, modelo["labels"], colunas_ind)
+    perfil.index = [nomes[r] for r in perfil.index]
+    st.dataframe(perfil.round(2), use_container_width=True)
+    st.caption(
+        f"{len(modelos)} modelos ajustados ({feats.shape[0]} anos × {feats.shape[1]} features). "
+        "Silhueta perto de 1 = regimes bem separados; perto de 0 = fronteiras difusas."
+    )
+    with st.expander("Todos os modelos"):
+        st.dataframe(
+            modelos.drop(columns="labels").assign(subset=lambda d: d["subset"].map(" + ".join)).round(3),
+            hide_index=True, use_container_width=True,
+        )
@@ -0,0 +1,239 @@
+# =========================================================
+# Valuation — Fluxo de Caixa Descontado (DCF)
+# =========================================================
+# Toda a matemática fica em core/valuation/dcf.py e roda sobre arrays:
+# a grade de sensibilidade, o tornado e o cubo de cenários são, cada um,
+# uma única chamada vetorizada do modelo.
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from core.valuation import dcf, montecarlo
+
+st.set_page_config(page_title="Valuation — DCF", page_icon="💰", layout="wide")
+st.title("💰 Valuation — Fluxo de Caixa Descontado")
+st.markdown(
+    """
+**O que esta página faz?**
+- Projeta o **fluxo de caixa livre da firma (FCFF)** de uma empresa hipotética e traz tudo a valor presente pelo **WACC**.
+- Calcula o valor terminal por **perpetuidade (Gordon)** ou por **múltiplo de saída (EV/EBIT)**.
+- Mostra **sensibilidade** (WACC × crescimento), um **gráfico de tornado** e um **cubo** com dezenas de milhares de cenários.
+- Roda um **Monte Carlo** com premissas correlacionadas, usando juros reais, inflação e PIB do Brasil como motores do risco.
+    """
+)
+
+# ---------- Premissas ----------
+st.subheader("🧮 Premissas")
+base = dict(dcf.BASE_CASE)
+c1, c2, c3, c4 = st.columns(4)
+with c1:
+    base["revenue0"] = st.number_input("Receita do último ano (R$ mi)", min_value=1.0, value=base["revenue0"], step=500.0)
+    base["growth"] = st.number_input("Crescimento da receita (% a.a.)", value=base["growth"] * 100, step=0.5) / 100
+with c2:
+    base["margin"] = st.number_input("Margem EBIT (%)", value=base["margin"] * 100, step=0.5) / 100
+    base["tax_rate"] = st.number_input("Alíquota de IR (%)", min_value=0.0, max_value=100.0, value=base["tax_rate"] * 100, step=1.0) / 100
+with c3:
+    base["reinvestment"] = st.number_input("Reinvestimento (% da receita)", value=base["reinvestment"] * 100, step=0.5) / 100
+    base["wacc"] = st.number_input("WACC (% a.a.)", min_value=0.1, value=base["wacc"] * 100, step=0.25) / 100
+with c4:
+    base["net_debt"] = st.number_input("Dívida líquida (R$ mi)", value=base["net_debt"], step=250.0)
+    base["shares"] = st.number_input("Ações (milhões)", min_value=0.001, value=base["shares"], step=10.0)
+
+c1, c2, c3 = st.columns(3)
+with c1:
+    anos = st.slider("Anos de projeção explícita", 3, 15, 5)
+with c2:
+    metodo = st.radio("Valor terminal", dcf.TERMINAL_METHODS, horizontal=True,
+                      format_func=lambda m: "Perpetuidade (Gordon)" if m == "gordon" else "Múltiplo EV/EBIT")
+with c3:
+    if metodo == "gordon":
+        base["terminal_growth"] = st.number_input("Crescimento na perpetuidade (% a.a.)", value=base["terminal_growth"] * 100, step=0.25) / 100
+    else:
+        base["exit_multiple"] = st.number_input("Múltiplo EV/EBIT de saída", min_value=0.0, value=base["exit_multiple"], step=0.5)
+
+opts = {"years": anos, "terminal": metodo}
+
+# ---------- Resultado do caso base ----------
+res = {k: float(v) for k, v in dcf.dcf(**base, **opts).items()}
+if not np.isfinite(res["price"]):
+    st.error("WACC precisa ser maior que o crescimento na perpetuidade.")
+    st.stop()
+
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("Valor da firma (EV)", f"R$ {res['ev']:,.0f} mi")
+m2.metric("Valor do equity", f"R$ {res['equity']:,.0f} mi")
+m3.metric("Preço justo por ação", f"R$ {res['price']:,.2f}")
+m4.metric("Peso do valor terminal", f"{res['pv_terminal'] / res['ev']:.0%}")
+
+with st.expander("📋 Projeção ano a ano", expanded=False):
+    fluxo = dcf.cash_flows(base, anos)
+    fluxo.columns = ["Ano", "Receita", "EBIT", "FCFF", "Fator de desconto", "VP do FCFF"]
+    st.dataframe(fluxo.round(2), hide_index=True, use_container_width=True)
+
+st.divider()
+
+# ---------- Sensibilidade ----------
+st.subheader("🌡️ Sensibilidade do preço")
+if metodo == "gordon":
+    col_nome, col_valores = "terminal_growth", np.round(np.linspace(base["terminal_growth"] - 0.02, base["terminal_growth"] + 0.02, 9), 4)
+else:
+    col_nome, col_valores = "exit_multiple", np.round(np.linspace(max(base["exit_multiple"] - 4, 0), base["exit_multiple"] + 4, 9), 2)
+wacc_valores = np.round(np.linspace(base["wacc"] - 0.03, base["wacc"] + 0.03, 13), 4)
+grade = dcf.sensitivity_grid(base, "wacc", wacc_valores, col_nome, col_valores, **opts)
+
+fig = px.imshow(
+    grade.to_numpy(),
+    x=[f"{v:.2%}" if col_nome == "terminal_growth" else f"{v:.1f}x" for v in col_valores],
+    y=[f"{v:.2%}" for v in wacc_valores],
+    color_continuous_scale="RdYlGn",
+    text_auto=".2f",
+    aspect="auto",
+)
+fig.update_layout(xaxis_title=dcf.LABELS[col_nome], yaxis_title="WACC", coloraxis_colorbar_title="R$/ação", margin=dict(t=20, b=40))
+st.plotly_chart(fig, use_container_width=True)
+
+# ---------- Tornado ----------
+st.subheader("🌪️ Tornado — o que mais move o preço")
+faixas = {
+    "growth": (base["growth"] - 0.03, base["growth"] + 0.03),
+    "margin": (base["margin"] - 0.03, base["margin"] + 0.03),
+    "tax_rate": (base["tax_rate"] - 0.04, base["tax_rate"] + 0.04),
+    "reinvestment": (base["reinvestment"] - 0.02, base["reinvestment"] + 0.02),
+    "wacc": (base["wacc"] - 0.02, base["wacc"] + 0.02),
+}
+if metodo == "gordon":
+    faixas["terminal_growth"] = (base["terminal_growth"] - 0.01, base["terminal_growth"] + 0.01)
+else:
+    faixas["exit_multiple"] = (max(base["exit_multiple"] - 2, 0), base["exit_multiple"] + 2)
+
+tor = dcf.tornado(base, faixas, **opts).iloc[::-1]
+rotulos = [dcf.LABELS[p] for p in tor["premissa"]]
+fig = go.Figure()
+fig.add_trace(go.Bar(y=rotulos, x=tor["low"] - res["price"], base=res["price"], orientation="h", name="Premissa no mínimo"))
+fig.add_trace(go.Bar(y=rotulos, x=tor["high"] - res["price"], base=res["price"], orientation="h", name="Premissa no máximo"))
+fig.add_vline(x=res["price"], line_dash="dash")
+fig.update_layout(barmode="overlay", xaxis_title="Preço por ação (R$)", legend=dict(orientation="h", y=1.05), margin=dict(t=40, b=40))
+st.plotly_chart(fig, use_container_width=True)
+st.caption("Cada barra move uma premissa por vez (±3 p.p. em crescimento/margem, ±2 p.p. no WACC...) mantendo as outras no caso base.")
+
+# ---------- Cubo de cenários ----------
+st.subheader("🧊 Cubo de cenários")
+n = st.slider("Pontos por premissa (crescimento × margem × WACC × terminal)", 5, 30, 15)
+grids = {
+    "growth": np.linspace(base["growth"] - 0.04, base["growth"] + 0.04, n),
+    "margin": np.linspace(base["margin"] - 0.04, base["margin"] + 0.04, n),
+    "wacc": np.linspace(base["wacc"] - 0.03, base["wacc"] + 0.03, n),
+}
+if metodo == "gordon":
+    grids["terminal_growth"] = np.linspace(base["terminal_growth"] - 0.015, base["terminal_growth"] + 0.015, n)
+else:
+    grids["exit_multiple"] = np.linspace(max(base["exit_multiple"] - 3, 0), base["exit_multiple"] + 3, n)
+
+inicio = time.perf_counter()
+cubo = dcf.scenario_cube(base, grids, **opts)
+duracao_ms = (time.perf_counter() - inicio) * 1000
+
+precos = cubo[np.isfinite(cubo)].ravel()
+p5, p50, p95 = np.percentile(precos, [5, 50, 95])
+k1, k2, k3 = st.columns(3)
+k1.metric("Percentil 5", f"R$ {p5:,.2f}")
+k2.metric("Mediana", f"R$ {p50:,.2f}")
+k3.metric("Percentil 95", f"R$ {p95:,.2f}")
+
+fig = px.histogram(x=precos, nbins=80)
+fig.add_vline(x=res["price"], line_dash="dash", annotation_text="caso base")
+fig.update_layout(xaxis_title="Preço por ação (R$)", yaxis_title="Cenários", margin=dict(t=20, b=40))
+st.plotly_chart(fig, use_container_width=True)
+st.caption(f"{cubo.size:,} cenários avaliados em {duracao_ms:.1f} ms (uma chamada vetorizada do modelo).")
+
+st.divider()
+
+# ---------- Monte Carlo ----------
+st.subheader("🎲 Monte Carlo")
+st.markdown(
+    """
+As premissas **crescimento, margem, WACC e perpetuidade** são sorteadas juntas, com correlação.
+Os choques de **PIB, juros reais e inflação** do histórico (`merged_macro_br.csv`) entram pelo
+"repasse" escolhido abaixo e somam-se a uma incerteza própria de cada premissa.
+A simulação roda em blocos: os percentis vão sendo atualizados na tela a cada bloco concluído.
+    """
+)
+
+
+@st.cache_data(show_spinner=False)
+def carregar_cov_macro() -> pd.DataFrame:
+    if not os.path.exists(montecarlo.MACRO_FILE):
+        return pd.DataFrame(0.0, index=list(montecarlo.MACRO_DRIVERS), columns=list(montecarlo.MACRO_DRIVERS))
+    return montecarlo.macro_covariance()
+
+
+c1, c2, c3, c4 = st.columns(4)
+with c1:
+    n_sorteios = st.select_slider("Sorteios", [100_000, 500_000, 1_000_000, 2_000_000, 5_000_000], value=1_000_000,
+                                  format_func=lambda v: f"{v:,}")
+with c2:
+    repasse_juros = st.slider("Repasse juros reais → WACC", 0.0, 1.0, montecarlo.DEFAULT_LOADINGS["wacc"]["real_rate"], 0.05)
+with c3:
+    repasse_inflacao = st.slider("Repasse inflação → WACC", 0.0, 1.0, montecarlo.DEFAULT_LOADINGS["wacc"]["inflation"], 0.05)
+with c4:
+    repasse_pib = st.slider("Repasse PIB → crescimento", 0.0, 2.0, montecarlo.DEFAULT_LOADINGS["growth"]["gdp"], 0.1)
+
+if not os.path.exists(montecarlo.MACRO_FILE):
+    st.warning(f"Arquivo `{montecarlo.MACRO_FILE}` não encontrado: só a incerteza própria das premissas será usada.")
+
+cargas = {k: dict(v) for k, v in montecarlo.DEFAULT_LOADINGS.items()}
+cargas["wacc"].update(real_rate=repasse_juros, inflation=repasse_inflacao)
+cargas["growth"]["gdp"] = repasse_pib
+cov = montecarlo.input_covariance(carregar_cov_macro(), cargas)
+
+with st.expander("🔗 Correlação e desvio-padrão das premissas sorteadas", expanded=False):
+    desvios = pd.Series(np.sqrt(np.diag(cov.to_numpy())), index=cov.index)
+    tabela = montecarlo.correlation(cov).round(2)
+    tabela.index = tabela.columns = [dcf.LABELS[c] for c in cov.columns]
+    st.dataframe(tabela, use_container_width=True)
+    st.caption(" · ".join(f"{dcf.LABELS[k]}: ±{v:.2%}" for k, v in desvios.items()))
+
+assinatura = (tuple(sorted(base.items())), anos, metodo, n_sorteios, repasse_juros, repasse_inflacao, repasse_pib)
+progresso = st.empty()
+painel = st.empty()
+
+
+def mostrar_sketch(sketch: montecarlo.StreamingSketch, feitos: int) -> None:
+    """Redesenha métricas + histograma a partir do sketch (chamado a cada bloco)."""
+    p5, p50, p95 = sketch.quantile([0.05, 0.50, 0.95])
+    with painel.container():
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Percentil 5", f"R$ {p5:,.2f}")
+        k2.metric("Mediana", f"R$ {p50:,.2f}")
+        k3.metric("Percentil 95", f"R$ {p95:,.2f}")
+        k4.metric("Prob. acima do caso base", f"{1 - sketch.cdf(res['price']):.0%}")
+        centros, contagens = sketch.histogram(80)
+        fig = go.Figure(go.Bar(x=centros, y=contagens, marker_line_width=0))
+        fig.add_vline(x=res["price"], line_dash="dash", annotation_text="caso base")
+        fig.update_layout(xaxis_title="Preço por ação (R$)", yaxis_title="Sorteios", bargap=0, margin=dict(t=20, b=40))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(
+            f"{feitos:,} sorteios · média R$ {sketch.mean:,.2f} · desvio R$ {sketch.std:,.2f} · "
+            f"{sketch.invalid:,} cenários inválidos (WACC ≤ perpetuidade) descartados."
+        )
+
+
+if st.button("Rodar simulação", type="primary", use_container_width=True):
+    barra = progresso.progress(0.0, text="Simulando…")
+    inicio = time.perf_counter()
+    for feitos, sketch in montecarlo.simulate(base, n_sorteios, cov, **opts):
+        barra.progress(feitos / n_sorteios, text=f"{feitos:,} de {n_sorteios:,} sorteios")
+        mostrar_sketch(sketch, feitos)
+    barra.progress(1.0, text=f"{n_sorteios:,} sorteios em {time.perf_counter() - inicio:.1f} s")
+    # O sketch tem tamanho fixo (alguns KB), então dá para guardá-lo na sessão
+    st.session_state["mc_resultado"] = (assinatura, sketch)
+elif st.session_state.get("mc_resultado", (None,))[0] == assinatura:
+    mostrar_sketch(st.session_state["mc_resultado"][1], n_sorteios)
+else:
+    st.info("Ajuste as premissas e clique em **Rodar simulação**.")
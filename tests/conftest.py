@@ -0,0 +1,75 @@
+# tests/conftest.py
+# -------------------------------------------------------------
+# Testes rodam da raiz do repositório (``python -m pytest``); aqui só
+# garantimos que os pacotes ``core``/``utils`` sejam importáveis mesmo
+# quando o pytest é chamado direto, e ficam as fixtures compartilhadas.
+# -------------------------------------------------------------
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+F1_FIXTURE_DIR = os.path.join(ROOT, "tests", "fixtures", "f1", "2024_bahrain_R")
+F1_TIME_COLS = ("LapTime", "Sector1Time", "Sector2Time", "Sector3Time", "LapStartTime", "Time", "PitInTime", "PitOutTime")
+
+
+def load_f1_fixture(season, event, session, event_name=None, round_number=None):
+    """Sessão de fixture com a interface de ``fastf1.core.Session`` (sem rede)."""
+    def read(name):
+        return pd.read_csv(os.path.join(F1_FIXTURE_DIR, name), dtype={"DriverNumber": str, "TrackStatus": str})
+
+    def telemetry(name):
+        df = read(name)
+        df["SessionTime"] = pd.to_timedelta(df["SessionTime"], unit="s")
+        return {num: part.drop(columns="DriverNumber") for num, part in df.groupby("DriverNumber")}
+
+    with open(os.path.join(F1_FIXTURE_DIR, "session.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    laps = read("laps.csv")
+    for col in F1_TIME_COLS:
+        laps[col] = pd.to_timedelta(laps[col], unit="s")
+    return SimpleNamespace(
+        event={"EventName": event_name or meta["EventName"], "RoundNumber": round_number or meta["RoundNumber"]},
+        name=meta["Name"],
+        date=pd.Timestamp(meta["Date"]),
+        laps=laps,
+        results=read("results.csv"),
+        car_data=telemetry("car_data.csv"),
+        pos_data=telemetry("pos_data.csv"),
+    )
+
+
+@pytest.fixture
+def f1_loader():
+    return load_f1_fixture
+
+
+@pytest.fixture(scope="session")
+def macro_panel() -> pd.DataFrame:
+    """Painel anual (coluna ``year``) com séries cointegradas (a, b), estacionárias
+    (c, e), um passeio aleatório (d) e uma série que começa mais tarde (e)."""
+    rng = np.random.default_rng(11)
+    years = np.arange(1995, 2024)
+    n = len(years)
+    common = np.cumsum(rng.standard_normal(n))
+    stat = np.zeros(n)
+    for t in range(1, n):
+        stat[t] = 0.4 * stat[t - 1] + rng.standard_normal()
+    df = pd.DataFrame({
+        "year": years,
+        "a": 5 + common + 0.5 * rng.standard_normal(n),
+        "b": 2 + 0.8 * common + 0.5 * rng.standard_normal(n),
+        "c": 3 + stat,
+        "d": np.cumsum(rng.standard_normal(n)),
+        "e": 1 + 0.5 * stat + rng.standard_normal(n),
+    })
+    df.loc[:3, "e"] = np.nan           # começa mais tarde: outro formato de grupo
+    return df
@@ -0,0 +1,58 @@
+# tests/test_f1_ingest.py
+# -------------------------------------------------------------
+# Ingestão de uma sessão de fixture (tests/fixtures/f1/...): nada de rede,
+# o ``f1_loader`` (conftest.py) monta um objeto com a interface de
+# ``fastf1.core.Session`` a partir de CSVs pequenos (2 pilotos × 3 voltas).
+# -------------------------------------------------------------
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+from core.f1 import ingest
+
+@pytest.fixture
+def ingested(tmp_path, f1_loader):
+    paths = ingest.ingest_session(2024, "Bahrain", "r", root=str(tmp_path), loader=f1_loader)
+    return tmp_path, paths
+
+
+def test_writes_one_partition_per_table(ingested):
+    root, paths = ingested
+    assert set(paths) == set(ingest.TABLES)
+    for table, path in paths.items():
+        expected = os.path.join(str(root), table, "season=2024", "event=bahrain-grand-prix", "session=R", "part-0.parquet")
+        assert path == expected and os.path.exists(path)
+        assert not os.path.exists(path + ".tmp")
+
+
+def test_parquet_schemas_match(ingested):
+    _, paths = ingested
+    for table, path in paths.items():
+        assert pq.read_schema(path).remove_metadata() == ingest.SCHEMAS[table]
+
+
+def test_rows_and_lap_assignment(ingested):
+    root, _ = ingested
+    laps = ingest.read_table("laps", season=2024, root=str(root))
+    assert len(laps) == 6
+    assert laps.groupby("driver")["lap_time_s"].first().to_dict() == {"HAM": 92.0, "VER": 90.0}
+
+    car = ingest.read_table("car_data", season=2024, event="bahrain-grand-prix", session="R", root=str(root))
+    assert set(car["lap_number"]) == {1, 2, 3}
+    ver = car[car["driver"] == "VER"]
+    # Amostras a cada 15 s, volta de 90 s: 6 por volta; a distância reinicia a cada volta
+    assert ver.groupby("lap_number").size().tolist() == [6, 6, 6]
+    lap2 = ver[ver["lap_number"] == 2]["distance_m"].to_numpy()
+    assert lap2[0] == 0.0 and lap2[-1] == pytest.approx(5 * 15 * 60.0)
+
+    pos = ingest.read_table("position", root=str(root))
+    assert len(pos) == len(car)
+
+
+def test_available_sessions(ingested):
+    root, _ = ingested
+    sessions = ingest.available_sessions(str(root))
+    row = sessions.iloc[0]
+    assert (row["season"], row["event"], row["session"]) == (2024, "bahrain-grand-prix", "R")
+    assert row["event_name"] == "Bahrain Grand Prix" and row["round"] == 1
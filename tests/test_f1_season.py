@@ -0,0 +1,72 @@
+# tests/test_f1_season.py
+# -------------------------------------------------------------
+# Job da temporada sobre duas sessões de fixture (mesmos dados, eventos
+# diferentes): agregação, manifest incremental e falha isolada por sessão.
+# -------------------------------------------------------------
+import functools
+import json
+import os
+
+import pytest
+
+from core.f1 import ingest, season
+
+
+def _ingest(root, loader, name, round_number):
+    load = functools.partial(loader, event_name=name, round_number=round_number)
+    ingest.ingest_session(2024, name, "R", root=root, loader=load)
+    return f"{ingest.slugify(name)}__R"
+
+
+def _manifest(root):
+    with open(os.path.join(season.summary_path(2024, root), "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _break_laps(root, event):
+    path = os.path.join(ingest.partition_path("laps", 2024, event, "R", root), "part-0.parquet")
+    with open(path, "wb") as f:
+        f.write(b"isto nao e parquet")
+
+
+@pytest.fixture
+def two_races(tmp_path, f1_loader):
+    root = str(tmp_path)
+    keys = [_ingest(root, f1_loader, "Bahrain Grand Prix", 1), _ingest(root, f1_loader, "Saudi Arabian Grand Prix", 2)]
+    return root, keys
+
+
+def test_aggregates_the_season(two_races):
+    root, keys = two_races
+    stats = season.run_season(2024, root, workers=2)
+    assert stats == {"processed": 2, "skipped": 0, "sessions": 2, "failed": {}}
+
+    standings = season.read_summary(2024, "standings", root)
+    final = standings[standings["round"] == 2].set_index("driver")["points_total"].to_dict()
+    assert final == {"VER": 50.0, "HAM": 36.0}
+    assert set(season.read_summary(2024, "pace", root)["event"]) == {k.split("__")[0] for k in keys}
+    assert sorted(_manifest(root)) == sorted(keys)
+
+    assert season.run_season(2024, root, workers=2)["skipped"] == 2
+
+
+def test_failed_session_keeps_the_others(two_races, f1_loader):
+    root, (ok_key, bad_key) = two_races
+    _break_laps(root, bad_key.split("__")[0])
+
+    stats = season.run_season(2024, root, workers=2)
+    assert stats["processed"] == 1 and list(stats["failed"]) == [bad_key]
+    assert list(_manifest(root)) == [ok_key]
+    standings = season.read_summary(2024, "standings", root)
+    assert set(standings["round"]) == {1}
+
+    # Reimportada, só a sessão que falhou volta para o pool
+    _ingest(root, f1_loader, "Saudi Arabian Grand Prix", 2)
+    stats = season.run_season(2024, root, workers=2)
+    assert (stats["processed"], stats["skipped"], stats["failed"]) == (1, 1, {})
+
+
+def test_empty_parts_keep_their_columns(tmp_path):
+    for name, columns in season.PART_COLUMNS.items():
+        df = season._read_parts(2024, name, [], str(tmp_path))
+        assert df.empty and list(df.columns) == columns
@@ -0,0 +1,76 @@
+# tests/test_macro_batch.py
+# -------------------------------------------------------------
+# Ajuste em lote (core/macro/batch.py) contra o ajuste um a um de
+# core/macro/pairs.py: mesmo modelo e mesmas previsões em todos os
+# subconjuntos de um painel de teste (e do merged, se existir).
+# -------------------------------------------------------------
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.macro import batch, pairs
+
+MERGED = os.path.join(os.path.dirname(__file__), "..", "assets", "macro_br", "merged_macro_br.csv")
+
+
+def _assert_same_as_one_by_one(data: pd.DataFrame, systems: list) -> set:
+    frames = batch.frames_for(data, systems)
+    models = set()
+    for f, res in zip(frames, batch.fit_frames(frames)):
+        one = pairs.fit_pair(f)
+        assert res["model"] == one["model"], list(f.columns)
+        models.add(one["model"])
+        if one["pred"] is None:
+            assert res.get("pred") is None
+            continue
+        np.testing.assert_allclose(res["pred"], one["pred"].to_numpy(), rtol=1e-8, atol=1e-8,
+                                   err_msg=str(list(f.columns)))
+        assert res["years"] == list(one["pred"].index)
+    return models
+
+
+def test_all_subsets_match_fit_pair(macro_panel):
+    cols = [c for c in macro_panel.columns if c != "year"]
+    systems = batch.all_subsets(cols)
+    assert len(systems) == 2 ** len(cols) - len(cols) - 1
+    models = _assert_same_as_one_by_one(macro_panel, systems)
+    assert {"VAR", "VECM"} <= models       # o painel exercita as duas rotas
+
+
+@pytest.mark.skipif(not os.path.exists(MERGED), reason="merged macro ausente")
+def test_merged_subsets_match_fit_pair():
+    data = pd.read_csv(MERGED)
+    cols = [c for c in data.columns if c != "year"]
+    _assert_same_as_one_by_one(data, batch.all_subsets(cols))
+
+
+def test_fit_systems_table(macro_panel):
+    systems = batch.all_pairs(["a", "b", "c"])
+    table = batch.fit_systems(macro_panel, systems)
+    assert list(table["sistema"]) == ["a × b", "a × c", "b × c"]
+    one = pairs.fit_pair(batch.frames_for(macro_panel, [("a", "b")])[0])
+    assert table.loc[0, "modelo"] == one["model"]
+    assert table.loc[0, f"a ({one['pred'].index[-1]})"] == pytest.approx(one["pred"]["a"].iloc[-1])
+    assert table.attrs["elapsed_s"] >= 0
+
+
+def test_backtest_matches_expanding_fit_pair(macro_panel):
+    systems = [("a", "b"), ("c", "d")]
+    bt = batch.backtest(macro_panel, systems, min_years=20)
+    assert bt.attrs["models"] == 2 * (len(macro_panel) - 20)
+    for cols in systems:
+        f = batch.frames_for(macro_panel, [cols])[0]
+        for end in (20, len(f) - 1):
+            one = pairs.fit_pair(f.iloc[:end], 1)
+            rows = bt[(bt["sistema"] == " × ".join(cols)) & (bt["corte"] == int(f.index[end - 1]))]
+            assert set(rows["modelo"]) == {one["model"]}
+            np.testing.assert_allclose(rows["previsto"], one["pred"].iloc[0].to_numpy(), rtol=1e-8, atol=1e-8)
+            np.testing.assert_allclose(rows["observado"], f.iloc[end].to_numpy())
+
+
+def test_short_systems_are_flagged():
+    df = pd.DataFrame({"year": range(2015, 2021), "x": np.arange(6.0), "y": np.arange(6.0) ** 2})
+    res = batch.fit_frames(batch.frames_for(df, [("x", "y")]))[0]
+    assert res["model"] == "" and res["short"]
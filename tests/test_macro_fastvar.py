@@ -0,0 +1,103 @@
+# tests/test_macro_fastvar.py
+# -------------------------------------------------------------
+# Estimadores em NumPy puro (core/macro/fastvar.py) conferidos contra o
+# statsmodels, que continua sendo a referência (só nos testes): pares do
+# merged (se existir) e pares cointegrados aleatórios.
+# -------------------------------------------------------------
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.macro import fastvar
+
+pytest.importorskip("statsmodels")
+from statsmodels.tsa.api import VAR  # noqa: E402
+from statsmodels.tsa.stattools import adfuller  # noqa: E402
+from statsmodels.tsa.vector_ar.vecm import VECM, coint_johansen  # noqa: E402
+
+MERGED = os.path.join(os.path.dirname(__file__), "..", "assets", "macro_br", "merged_macro_br.csv")
+TOL = 1e-8
+STEPS = 3
+
+
+def _samples(seed: int = 0, n_random: int = 10) -> list:
+    samples = []
+    if os.path.exists(MERGED):
+        df = pd.read_csv(MERGED).set_index("year").apply(pd.to_numeric, errors="coerce")
+        cols = list(df.columns)
+        for i in range(len(cols)):
+            for j in range(i + 1, len(cols)):
+                samples.append(df[[cols[i], cols[j]]].dropna().to_numpy())
+    rng = np.random.default_rng(seed)
+    for _ in range(n_random):
+        e = rng.standard_normal((25, 2))
+        common = np.cumsum(rng.standard_normal(25))
+        samples.append(np.column_stack([common + e[:, 0], 0.5 * common + e[:, 1]]))
+    return samples
+
+
+def _compare(Y: np.ndarray) -> dict:
+    """Maior diferença absoluta contra o statsmodels, por estimador, num sistema."""
+    err = {}
+    with warnings.catch_warnings():
+        # Avisos de amostra curta/convergência do statsmodels só neste bloco
+        warnings.simplefilter("ignore")
+        maxlag = min(8, int(len(Y) / 3))
+        refs = [adfuller(col, autolag="AIC", maxlag=maxlag) for col in Y.T]
+        cj = coint_johansen(Y, det_order=0, k_ar_diff=1)
+        maxlags = min(4, max(1, len(Y) - 2))
+        ref_p = max(1, int(VAR(Y).select_order(maxlags).aic))
+        p = max(1, int(fastvar.var_select_order(Y, maxlags)))
+        ref_var = VAR(Y).fit(p)
+        ref_vecm = VECM(Y, k_ar_diff=1, deterministic="ci").fit()
+        ref_vecm_fc = ref_vecm.predict(steps=STEPS)
+
+    got = [fastvar.adf(col, maxlag=maxlag) for col in Y.T]
+    err["adf_stat"] = max(abs(r[0] - g["stat"]) for r, g in zip(refs, got))
+    err["adf_pvalue"] = max(abs(r[1] - g["pvalue"]) for r, g in zip(refs, got))
+    err["johansen_trace"] = np.abs(cj.lr1 - fastvar.johansen_trace(Y)["trace"]).max()
+    err["var_order"] = abs(p - ref_p)
+    var = fastvar.var_fit(Y, p)
+    err["var_coefs"] = np.abs(ref_var.coefs - var["coefs"]).max()
+    err["var_forecast"] = np.abs(ref_var.forecast(Y[-p:], STEPS)
+                                 - fastvar.forecast(var["coefs"], var["intercept"], Y[-p:], STEPS)).max()
+    vecm = fastvar.vecm_fit(Y)
+    err["vecm_coefs"] = np.abs(np.asarray(ref_vecm.var_rep) - vecm["coefs"]).max()
+    err["vecm_sigma"] = np.abs(ref_vecm.sigma_u - vecm["sigma_u"]).max()
+    err["vecm_forecast"] = np.abs(ref_vecm_fc - fastvar.vecm_predict(vecm, Y, STEPS)).max()
+    return err
+
+
+@pytest.fixture(scope="module")
+def errors():
+    per_system = [_compare(Y) for Y in _samples()]
+    return {name: max(e[name] for e in per_system) for name in per_system[0]}
+
+
+@pytest.mark.parametrize("name", ["adf_stat", "adf_pvalue", "johansen_trace", "var_coefs", "var_forecast",
+                                  "vecm_coefs", "vecm_sigma", "vecm_forecast"])
+def test_matches_statsmodels(errors, name):
+    assert errors[name] < TOL
+
+
+def test_same_var_order_as_statsmodels(errors):
+    assert errors["var_order"] == 0
+
+
+def test_warning_filters_are_restored():
+    before = list(warnings.filters)
+    _compare(_samples(n_random=1)[-1])
+    assert warnings.filters == before
+
+
+def test_batch_equals_one_by_one():
+    rng = np.random.default_rng(3)
+    Y = np.cumsum(rng.standard_normal((6, 30, 2)), axis=1)
+    batch = fastvar.vecm_predict(fastvar.vecm_fit(Y), Y, 3)
+    for b in range(len(Y)):
+        one = fastvar.vecm_predict(fastvar.vecm_fit(Y[b]), Y[b], 3)
+        np.testing.assert_allclose(batch[b], one, atol=1e-10)
+    np.testing.assert_allclose(fastvar.johansen_trace(Y)["trace"][2], fastvar.johansen_trace(Y[2])["trace"], atol=1e-10)
@@ -0,0 +1,173 @@
+# tests/test_macro_ingest.py
+# -------------------------------------------------------------
+# Runner assíncrono da ingestão macro contra um servidor HTTP local que
+# imita a API do Banco Mundial (paginação, corpo em pedaços pequenos,
+# 503 transitório e JSON quebrado), mais o parse em escala.
+# -------------------------------------------------------------
+import asyncio
+import json
+import time
+import tracemalloc
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from core.macro import ingest
+
+
+def _fake_rows(code: str, n: int = 25) -> list:
+    return [{"indicator": {"id": code}, "countryiso3code": "BRA", "date": str(2024 - i),
+             "value": None if i == 0 else round(i * 0.5, 3)} for i in range(n)]
+
+
+def _fake_page(code: str, page: int = 1, per_page: int = 1000, n: int = 25) -> bytes:
+    rows = _fake_rows(code, n)
+    meta = {"page": page, "pages": -(-n // per_page), "per_page": str(per_page), "total": n}
+    return json.dumps([meta, rows[(page - 1) * per_page: page * per_page]]).encode("utf-8")
+
+
+async def _fake_server(delay: float, flaky: dict, state: dict):
+    """Servidor HTTP local que imita a API (com ``page``/``per_page``): corpo picado em pedaços."""
+
+    async def handle(reader, writer):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        parts = urlsplit(request.split()[1])
+        code = parts.path.split("/indicator/")[1]
+        query = parse_qs(parts.query)
+        page, per_page = int(query.get("page", ["1"])[0]), int(query.get("per_page", ["1000"])[0])
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        try:
+            await asyncio.sleep(delay)
+            if flaky.get(code, 0) > 0:
+                flaky[code] -= 1
+                writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+            elif code == "BAD.JSON":
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\n[{\"page\": 1}")
+            else:
+                body = _fake_page(code, page, per_page)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n")
+                for i in range(0, len(body), 7):  # pedaços pequenos cortam números e strings ao meio
+                    part = body[i:i + 7]
+                    writer.write(f"{len(part):x}\r\n".encode() + part + b"\r\n")
+                    await writer.drain()
+                writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            state["active"] -= 1
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def _synthetic_body(n: int, chunk: int = ingest.CHUNK_BYTES):
+    """Resposta de ``n`` registros gerada aos poucos (nunca inteira na memória)."""
+    head = json.dumps({"page": 1, "pages": 1, "per_page": str(n), "total": n})
+    buf = f"[{head},["
+    for i in range(n):
+        buf += ('{"indicator":{"id":"X","value":"X"},"country":{"id":"BR","value":"Brazil"},'
+                f'"countryiso3code":"BRA","date":"{1960 + i % 64}","value":{i * 0.25},'
+                '"unit":"","obs_status":"","decimal":1}' + ("," if i < n - 1 else "]]"))
+        if len(buf) >= chunk:
+            yield buf.encode("utf-8")
+            buf = ""
+    yield buf.encode("utf-8")
+
+
+def _parse_synthetic(n: int) -> tuple:
+    wb = ingest.WorldBankSource("all", {"X": "X"}, 1960, 2024, per_page=n)
+
+    async def go():
+        await wb.parse(wb.requests()[0], _synthetic_body(n))
+
+    t0 = time.perf_counter()
+    asyncio.run(go())
+    nbytes = wb._buffers["X"].nbytes
+    return time.perf_counter() - t0, wb.finish("X", []), nbytes
+
+
+# ---------- JsonStream ----------
+def test_json_stream_byte_by_byte():
+    body = _fake_page("X", n=5)
+    stream, items = ingest.JsonStream(), []
+    for i in range(len(body)):
+        items += stream.feed(body[i:i + 1])
+    items += stream.feed(b"", final=True)
+    assert items == json.loads(body)[1]
+    assert stream.head == [json.loads(body)[0]]
+
+
+def test_json_stream_compact_chunks():
+    # Sem espaços entre os registros o parse usa o atalho em lote
+    compact = json.dumps(json.loads(_fake_page("X", n=200)), separators=(",", ":")).encode("utf-8")
+    stream, items = ingest.JsonStream(), []
+    for i in range(0, len(compact), 5):
+        items += stream.feed(compact[i:i + 5])
+    items += stream.feed(b"", final=True)
+    assert items == json.loads(compact)[1]
+
+
+# ---------- Runner contra o servidor falso ----------
+@pytest.fixture(scope="module")
+def fake_run():
+    codes = {f"Indicador {i}": f"FAKE.{i}" for i in range(8)}
+    state = {"active": 0, "max_active": 0}
+
+    async def go():
+        server = await _fake_server(delay=0.02, flaky={"FAKE.3": 1}, state=state)
+        port = server.sockets[0].getsockname()[1]
+        base = f"http://127.0.0.1:{port}"
+        async with server:
+            wb = ingest.WorldBankSource("BR", codes, 2000, 2024, base_url=base, per_page=7)
+            bad = ingest.WorldBankSource("BR", {"Quebrado": "BAD.JSON"}, 2000, 2024, base_url=base)
+            t0 = time.perf_counter()
+            out = await ingest.run_async([wb, bad], max_per_host=2, rate=100.0, retries=1)
+            return out, time.perf_counter() - t0, f"127.0.0.1:{port}"
+
+    out, elapsed, host = asyncio.run(go())
+    return {"codes": codes, "state": state, "out": out, "elapsed": elapsed, "host": host,
+            "by_key": {r["key"]: r for r in out["results"]}}
+
+
+def test_pages_are_joined_in_order(fake_run):
+    for name, code in fake_run["codes"].items():
+        r = fake_run["by_key"][name]
+        assert r["error"] is None, r["error"]
+        assert r["pages"] == 4   # 25 linhas, 7 por página
+        expected = _fake_rows(code)
+        assert r["data"]["year"].tolist() == [float(x["date"]) for x in expected]
+        assert r["data"]["value"].equals(pd.Series([x["value"] for x in expected], dtype=float))
+
+
+def test_transient_errors_are_retried(fake_run):
+    assert fake_run["by_key"]["Indicador 3"]["attempts"] == 5   # 4 páginas + 1 retry do 503
+
+
+def test_bad_json_is_an_error_without_retry(fake_run):
+    bad = fake_run["by_key"]["Quebrado"]
+    assert bad["error"] and bad["data"] is None and bad["attempts"] == 1
+
+
+def test_per_host_limits(fake_run):
+    host = fake_run["out"]["hosts"][fake_run["host"]]
+    assert fake_run["state"]["max_active"] <= 2 and host["max_active"] <= 2
+    assert fake_run["elapsed"] >= (host["requests"] - 1) / 100.0
+
+
+# ---------- Escala ----------
+def test_parse_scales_linearly():
+    small, _, _ = _parse_synthetic(100_000)
+    big, frame, _ = _parse_synthetic(400_000)
+    assert len(frame) == 400_000 and frame["value"].iloc[-1] == 399_999 * 0.25
+    assert big < 6 * small
+
+
+def test_parse_memory_is_columns_plus_one_chunk():
+    tracemalloc.start()
+    try:
+        _, _, columns = _parse_synthetic(100_000)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 4 * columns + 8 * 2**20
@@ -0,0 +1,96 @@
+# tests/test_macro_quality.py
+# -------------------------------------------------------------
+# Checagens de qualidade da ingestão (core/macro/quality.py), em tabela:
+# faixa, ano repetido, salto, ano faltando e esquema — sempre só nas
+# partições novas em relação à versão anterior.
+# -------------------------------------------------------------
+import pandas as pd
+import pytest
+
+from core.macro import quality
+
+NOME = "Desemprego (% força de trabalho)"   # faixa [0, 40], salto máximo 5 p.p.
+ANTERIOR = {2000: 10.0, 2001: 10.5, 2002: 11.0}
+
+
+def _raw(rows) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["year", "value"])
+
+
+def _check(rows, previous=ANTERIOR):
+    prev = None if previous is None else pd.Series(previous, dtype=float)
+    series, section = quality.validate(NOME, _raw(rows), prev, last_year=2024)
+    found = sorted((i["check"], i["severity"], i["year"]) for i in section["issues"])
+    return series, section, found
+
+
+BASE = list(ANTERIOR.items())
+
+CASES = [
+    # (id, linhas cruas, problemas esperados, anos na série final)
+    ("sem_mudanca", BASE, [], [2000, 2001, 2002]),
+    ("ano_novo_ok", BASE + [(2003, 11.4)], [], [2000, 2001, 2002, 2003]),
+    ("salto_valor_alterado", [(2000, 10.0), (2001, 17.0), (2002, 11.0)],
+     [("salto", "aviso", 2001), ("salto", "aviso", 2002)], [2000, 2001, 2002]),
+    ("salto_ano_novo", BASE + [(2003, 17.5)], [("salto", "aviso", 2003)], [2000, 2001, 2002, 2003]),
+    ("fora_da_faixa", BASE + [(2003, 55.0)], [("faixa", "erro", 2003)], [2000, 2001, 2002]),
+    ("abaixo_da_faixa_alterado", [(2000, 10.0), (2001, -1.0), (2002, 11.0)],
+     [("faixa", "erro", 2001)], [2000, 2001, 2002]),
+    ("ano_repetido", BASE + [(2003, 12.0), (2003, 11.5)], [("duplicidade", "erro", 2003)],
+     [2000, 2001, 2002, 2003]),
+    ("ano_faltando", BASE + [(2005, 11.2)],
+     [("completude", "aviso", 2003), ("completude", "aviso", 2004)], [2000, 2001, 2002, 2005]),
+    ("ano_fora_da_janela", BASE + [(1950, 9.0), (2030, 9.0)],
+     [("esquema", "erro", 1950), ("esquema", "erro", 2030)], [2000, 2001, 2002]),
+    ("valor_nao_numerico", BASE + [(2003, "n/d")], [("esquema", "erro", 2003)], [2000, 2001, 2002]),
+    ("ainda_nao_publicado", BASE + [(2003, None)], [("completude", "info", 2003)], [2000, 2001, 2002]),
+]
+
+
+@pytest.mark.parametrize("rows, expected, years", [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_validate_cases(rows, expected, years):
+    series, _, found = _check(rows)
+    assert found == sorted(expected)
+    assert list(series.index) == years
+
+
+def test_changed_value_in_range_replaces_previous():
+    series, section, _ = _check([(2000, 10.0), (2001, 17.0), (2002, 11.0)])
+    assert section["new"] == 1 and section["dropped"] == 0
+    assert series[2001] == 17.0
+
+
+def test_rejected_row_keeps_previous_value():
+    series, section, _ = _check([(2000, 10.0), (2001, 55.0), (2002, 11.0)])
+    assert section["dropped"] == 1
+    assert series[2001] == 10.5
+
+
+# Problemas que já existiam na versão anterior não são reavaliados
+OLD_PROBLEMS = [
+    ("salto_antigo", {2000: 10.0, 2001: 20.0, 2002: 20.5}, [(2000, 10.0), (2001, 20.0), (2002, 20.5)]),
+    ("salto_antigo_com_ano_novo", {2000: 10.0, 2001: 20.0, 2002: 20.5},
+     [(2000, 10.0), (2001, 20.0), (2002, 20.5), (2003, 21.0)]),
+    ("buraco_antigo_com_ano_novo", {2000: 10.0, 2001: 10.5, 2005: 11.0},
+     [(2000, 10.0), (2001, 10.5), (2005, 11.0), (2006, 11.2)]),
+    ("so_partes_novas_na_carga", {2000: 10.0, 2001: 20.0}, [(2002, 20.4)]),
+]
+
+
+@pytest.mark.parametrize("previous, rows", [c[1:] for c in OLD_PROBLEMS], ids=[c[0] for c in OLD_PROBLEMS])
+def test_only_new_partitions_are_checked(previous, rows):
+    series, section, found = _check(rows, previous)
+    assert found == []
+    assert section["new"] == len(set(y for y, _ in rows) - set(previous))
+    assert set(previous) <= set(series.index)
+
+
+def test_first_load_checks_everything():
+    _, section, found = _check([(2000, 10.0), (2001, 20.0), (2002, 20.5)], previous=None)
+    assert section["new"] == 3
+    assert found == [("salto", "aviso", 2001)]
+
+
+def test_missing_columns():
+    _, section = quality.validate(NOME, pd.DataFrame({"year": [2000]}))
+    assert [(i["check"], i["severity"]) for i in section["issues"]] == [("esquema", "erro")]
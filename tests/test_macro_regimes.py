@@ -0,0 +1,37 @@
+# tests/test_macro_regimes.py
+# -------------------------------------------------------------
+# Ajuste dos regimes no próprio processo (workers=1), como na página.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+
+from core.macro import regimes
+
+
+def _frame(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    years = np.arange(1990, 2020)
+    shift = np.where(years < 2005, 0.0, 4.0)
+    return pd.DataFrame({"year": years,
+                         "A": shift + rng.normal(0, 0.5, len(years)),
+                         "B": -shift + rng.normal(0, 0.5, len(years))})
+
+
+def test_fit_all_in_process_uses_its_own_features():
+    regimes._worker.clear()
+    feats = regimes.build_features(_frame(0))
+    table = regimes.fit_all(feats, ks=(2,), workers=1)
+    assert regimes._worker == {}
+    assert len(table) == 1
+    labels = table.loc[0, "labels"]
+    assert len(labels) == len(feats)
+    # A quebra em 2005 separa os dois regimes
+    assert len(set(labels[feats.index < 2005])) == 1 and len(set(labels[feats.index >= 2005])) == 1
+
+
+def test_fit_all_results_do_not_leak_between_panels():
+    a, b = regimes.build_features(_frame(0)), regimes.build_features(_frame(1).iloc[:20])
+    fa = regimes.fit_all(a, ks=(2,), workers=1)
+    fb = regimes.fit_all(b, ks=(2,), workers=1)
+    assert len(fa.loc[0, "labels"]) == len(a)
+    assert len(fb.loc[0, "labels"]) == len(b)
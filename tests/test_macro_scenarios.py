@@ -0,0 +1,92 @@
+# tests/test_macro_scenarios.py
+# -------------------------------------------------------------
+# Motor de cenários (core/macro/scenarios.py) sobre os sistemas que
+# ``pairs.fit_pair`` devolve: a base é a própria previsão do ajuste (VAR,
+# com e sem séries diferenciadas, e VECM) e as respostas unitárias mantêm
+# a série chocada exatamente +1 acima da base durante m anos.
+# -------------------------------------------------------------
+import numpy as np
+import pytest
+
+from core.macro import batch, pairs, scenarios
+
+STEPS = 8
+PAIRS = [("a", "b"), ("a", "c"), ("a", "d"), ("c", "e"), ("c", "d")]
+
+
+def _fit(panel, cols, engine=pairs.ENGINE):
+    frame = batch.frames_for(panel, [cols])[0]
+    out = pairs.fit_pair(frame, STEPS, engine=engine)
+    assert out["system"] is not None, cols
+    return out
+
+
+def test_pairs_cover_every_system_layout(macro_panel):
+    systems = [_fit(macro_panel, cols)["system"] for cols in PAIRS]
+    kinds = {s["kind"] for s in systems}
+    diffed = {bool(len(s["state"]) % len(s["columns"])) for s in systems if s["kind"] == "VAR"}
+    assert kinds == {"VAR", "VECM"}
+    assert diffed == {True, False}         # VAR só em níveis e VAR com diferença seletiva
+
+
+@pytest.mark.parametrize("cols", PAIRS)
+def test_baseline_equals_fit_pair_forecast(macro_panel, cols):
+    out = _fit(macro_panel, cols)
+    base = scenarios.baseline(out["system"], STEPS)
+    np.testing.assert_allclose(base, out["pred"].to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.filterwarnings("ignore")   # avisos de índice/API do statsmodels, irrelevantes aqui
+@pytest.mark.parametrize("cols", PAIRS)
+def test_baseline_equals_statsmodels_forecast(macro_panel, cols):
+    pytest.importorskip("statsmodels")
+    out = _fit(macro_panel, cols, engine="statsmodels")
+    np.testing.assert_allclose(scenarios.baseline(out["system"], STEPS), out["pred"].to_numpy(),
+                               rtol=1e-8, atol=1e-8)
+
+
+@pytest.mark.parametrize("cols", PAIRS)
+@pytest.mark.parametrize("var", [0, 1])
+def test_unit_response_holds_shocked_series(macro_panel, cols, var):
+    system = _fit(macro_panel, cols)["system"]
+    durations = [1, 3, STEPS]
+    resp = scenarios.unit_responses(system, var, durations, STEPS)
+    assert resp.shape == (len(durations), STEPS, 2)
+    for i, m in enumerate(durations):
+        np.testing.assert_allclose(resp[i, :m, var], 1.0, atol=1e-9)
+
+
+def test_unit_response_matches_simulation(macro_panel):
+    # Simula o sistema com as inovações implícitas e confere com base + resposta
+    system = _fit(macro_panel, ("a", "d"))["system"]
+    var, m = 1, 3
+    sigma = system["sigma"]
+    g = sigma[:, var] / sigma[var, var]
+    resp = scenarios.unit_responses(system, var, [m], STEPS)[0]
+    base = scenarios.baseline(system, STEPS)
+
+    s, path, u = system["state"], [], []
+    for h in range(STEPS):
+        s_free = system["F"] @ s + system["c"]
+        gap = 1.0 - (system["L"] @ s_free - base[h])[var] if h < m else 0.0
+        u.append(gap / (system["L"] @ system["E"] @ g)[var])
+        s = s_free + system["E"] @ g * u[-1]
+        path.append(system["L"] @ s)
+    np.testing.assert_allclose(np.array(path) - base, resp, atol=1e-9)
+
+
+def test_scenario_grid_is_linear(macro_panel):
+    system = _fit(macro_panel, ("a", "b"))["system"]
+    shocks = [-2.0, 0.0, 0.5, 3.0]
+    durations = [1, 4]
+    grid = scenarios.scenario_grid(system, 0, shocks, durations, STEPS)
+    assert grid["paths"].shape == (len(shocks), len(durations), STEPS, 2)
+    np.testing.assert_allclose(grid["paths"][1, 0], grid["baseline"])
+    np.testing.assert_allclose(grid["paths"][3, 1] - grid["baseline"], 3.0 * grid["responses"][1])
+    np.testing.assert_allclose(grid["paths"][3, 1, :4, 0] - grid["baseline"][:4, 0], 3.0)
+    assert grid["years"][0] == system["last_year"] + 1
+
+    frame = scenarios.grid_frame(system, grid)
+    assert len(frame) == grid["paths"].size
+    row = frame[(frame["choque"] == 3.0) & (frame["duracao"] == 4) & (frame["serie"] == "a")].iloc[0]
+    assert row["desvio"] == pytest.approx(3.0)
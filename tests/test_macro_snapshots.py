@@ -0,0 +1,122 @@
+# tests/test_macro_snapshots.py
+# -------------------------------------------------------------
+# Versões por conteúdo (core/macro/snapshots.py): commit sem mudanças,
+# indicador ausente, diff linha a linha e a ordem das escritas (HEAD por
+# último).
+# -------------------------------------------------------------
+import os
+
+import pandas as pd
+import pytest
+
+from core.macro import snapshots
+
+
+def _frame(**cols) -> pd.DataFrame:
+    return pd.DataFrame(cols).rename_axis("year").reset_index()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return snapshots.SnapshotStore(str(tmp_path / "snap"))
+
+
+@pytest.fixture
+def base():
+    return _frame(inflacao=pd.Series({2000: 7.0, 2001: 6.8, 2002: 8.4}),
+                  juros=pd.Series({2000: 17.6, 2001: 17.5, 2002: 19.1}))
+
+
+def _versions(store) -> list:
+    folder = os.path.join(store.root, "versions")
+    return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+
+def test_first_commit_adds_everything(store, base):
+    man = store.commit(base, source="teste")
+    assert man["version"] == 1 and man["parent"] == 0 and store.head == 1
+    assert {ch["status"] for ch in man["changes"].values()} == {"added"}
+    assert man["dataset"] == snapshots.token(snapshots.column_hashes(base))
+    pd.testing.assert_frame_equal(store.load(), base, check_dtype=False)
+
+
+def test_unchanged_commit_returns_parent(store, base):
+    first = store.commit(base)
+    # Mesmo conteúdo em outra ordem de linhas/colunas e com uma linha vazia
+    same = pd.concat([base.iloc[::-1], pd.DataFrame({"year": [2003]})])[["year", "juros", "inflacao"]]
+    again = store.commit(same)
+    assert again == first
+    assert store.head == 1
+    assert _versions(store) == ["000001.json"]
+
+
+def test_missing_indicator_keeps_previous_hash(store, base):
+    first = store.commit(base)
+    update = _frame(juros=pd.Series({2000: 17.6, 2001: 17.5, 2002: 19.1, 2003: 23.3}))
+    man = store.commit(update)
+    assert man["version"] == 2
+    assert list(man["changes"]) == ["juros"]
+    assert man["indicators"]["inflacao"] == first["indicators"]["inflacao"]
+    assert store.changed_since(1) == ["juros"]
+    pd.testing.assert_series_equal(store.load()["inflacao"].dropna(), base["inflacao"], check_names=False)
+
+
+def test_empty_column_does_not_erase(store, base):
+    first = store.commit(base)
+    blank = base.assign(inflacao=float("nan"))
+    assert store.commit(blank) == first
+
+
+@pytest.mark.parametrize("old, new, expected", [
+    ({2000: 1.0, 2001: 2.0}, {2000: 1.0, 2001: 2.0}, {"added": [], "removed": [], "changed": []}),
+    ({2000: 1.0, 2001: 2.0}, {2000: 1.0, 2001: 2.0, 2002: 3.0}, {"added": [2002], "removed": [], "changed": []}),
+    ({2000: 1.0, 2001: 2.0}, {2001: 2.0}, {"added": [], "removed": [2000], "changed": []}),
+    ({2000: 1.0, 2001: 2.0}, {2000: 1.0, 2001: 2.5},
+     {"added": [], "removed": [], "changed": [{"year": 2001, "old": 2.0, "new": 2.5}]}),
+    ({2000: 1.0, 2001: 2.0}, {2001: 3.0, 2002: 4.0},
+     {"added": [2002], "removed": [2000], "changed": [{"year": 2001, "old": 2.0, "new": 3.0}]}),
+    (None, {2000: 1.0}, {"added": [2000], "removed": [], "changed": []}),
+    ({2000: 1.0}, None, {"added": [], "removed": [2000], "changed": []}),
+])
+def test_diff_series(old, new, expected):
+    as_series = (lambda d: None if d is None else pd.Series(d))
+    assert snapshots.diff_series(as_series(old), as_series(new)) == expected
+
+
+def test_store_diff_between_versions(store, base):
+    store.commit(base)
+    store.commit(base.assign(inflacao=[7.0, 6.9, 8.4]))
+    assert store.diff(1, 2) == {"inflacao": {"added": [], "removed": [],
+                                             "changed": [{"year": 2001, "old": 6.8, "new": 6.9}]}}
+
+
+def test_head_written_last(store, base, monkeypatch):
+    store.commit(base)
+    written = []
+    real = snapshots._write_atomic
+
+    def spy(path, payload):
+        written.append(os.path.relpath(path, store.root))
+        real(path, payload)
+
+    monkeypatch.setattr(snapshots, "_write_atomic", spy)
+    store.commit(base.assign(juros=[18.0, 17.5, 19.1]))
+    assert written[-1] == "HEAD"
+    assert written[-2] == os.path.join("versions", "000002.json")
+    assert all(p.startswith("objects") for p in written[:-2])
+
+
+def test_interrupted_commit_keeps_head(store, base, monkeypatch):
+    store.commit(base)
+    real = snapshots._write_atomic
+
+    def crash_on_head(path, payload):
+        if os.path.basename(path) == "HEAD":
+            raise OSError("disco cheio")
+        real(path, payload)
+
+    monkeypatch.setattr(snapshots, "_write_atomic", crash_on_head)
+    with pytest.raises(OSError):
+        store.commit(base.assign(juros=[18.0, 17.5, 19.1]))
+    assert store.head == 1
+    pd.testing.assert_frame_equal(store.load(), base, check_dtype=False)
@@ -0,0 +1,79 @@
+# tests/test_offload.py
+# -------------------------------------------------------------
+# Pool compartilhado (core/offload.py): fila cheia (PoolBusy) e timeout,
+# com a configuração lida das variáveis LPB_* como no servidor.
+# -------------------------------------------------------------
+import importlib
+import threading
+import time
+
+import pytest
+
+from core import offload
+
+
+def _wait(cond, limit=10.0):
+    stop = time.monotonic() + limit
+    while not cond():
+        if time.monotonic() > stop:
+            raise AssertionError("condição não atingida a tempo")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Módulo recarregado com 1 worker e no máximo 1 tarefa na fila."""
+    offload.shutdown()
+    monkeypatch.setenv("LPB_OFFLOAD", "1")
+    monkeypatch.setenv("LPB_POOL_WORKERS", "1")
+    monkeypatch.setenv("LPB_POOL_MAX_PENDING", "1")
+    mod = importlib.reload(offload)
+    yield mod
+    mod.shutdown()
+    monkeypatch.undo()
+    importlib.reload(offload)
+
+
+def test_config_from_env(pool):
+    assert pool.stats()["max_pending"] == 1
+    assert pool.stats()["workers"] == 1
+
+
+def test_full_queue_raises_pool_busy(pool):
+    assert pool.run(abs, -2) == 2
+    slow = threading.Thread(target=pool.run, args=(time.sleep, 0.5))
+    slow.start()
+    _wait(lambda: pool.stats()["pending"] == 1)
+    with pytest.raises(pool.PoolBusy):
+        pool.run(abs, -3)
+    slow.join()
+    st = pool.stats()
+    assert st["rejected"] == 1 and st["completed"] == 2 and st["pending"] == 0
+    assert pool.run(abs, -4) == 4          # a vaga voltou
+
+
+def test_timeout_restarts_pool(pool):
+    assert pool.run(abs, -1) == 1
+    old = pool._pool
+    workers = list(old._processes.values())
+    with pytest.raises(TimeoutError):
+        pool.run(time.sleep, 60, timeout=0.3)
+    # O filho preso é encerrado e a vaga volta sem esperar os 60 s
+    _wait(lambda: pool.stats()["pending"] == 0)
+    _wait(lambda: not any(p.is_alive() for p in workers))
+    st = pool.stats()
+    assert st["timeouts"] == 1 and st["restarts"] == 1
+    assert pool.run(abs, -5) == 5
+    assert pool._pool is not old
+
+
+def test_disabled_runs_inline(monkeypatch):
+    offload.shutdown()
+    monkeypatch.setenv("LPB_OFFLOAD", "0")
+    mod = importlib.reload(offload)
+    try:
+        assert mod.run(abs, -6) == 6
+        assert mod.stats()["inline"] == 1 and mod.stats()["workers"] == 0
+    finally:
+        monkeypatch.undo()
+        importlib.reload(offload)
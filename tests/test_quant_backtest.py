@@ -0,0 +1,89 @@
+# tests/test_quant_backtest.py
+# -------------------------------------------------------------
+# Backtest sobre arquivos de preços sintéticos gravados em tmp_path.
+#
+# O caso "à mão" tem dois ativos e cinco pregões; o segundo só começa a
+# negociar no 3º pregão (NaN no início do painel). Com ``ma_cross`` 1×2
+# o sinal é o sinal de (preço − média de 2 dias):
+#
+#   dia          0     1     2      3      4
+#   A close    100   110    99  108.9 119.79   (ret: +10% −10% +10% +10%)
+#   B close      —     —    50     55     44   (ret:            +10% −20%)
+#   sinal A      —    +1    −1     +1     +1
+#   sinal B      —     —     —     +1     −1
+#   pesos    (0,0) (1,0) (−1,0) (.5,.5) (.5,−.5)
+#
+#   bruto       0     0   −0.10  −0.10  −0.05
+#   giro        0     0     1      2      2
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.quant import backtest, data
+
+COST_BPS = 10.0
+
+
+def _write(folder, ticker, dates, close):
+    pd.DataFrame({"date": dates, "close": close}).to_csv(folder / f"{ticker}.csv", index=False)
+
+
+@pytest.fixture
+def staggered(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    _write(tmp_path, "AAA", dates, [100.0, 110.0, 99.0, 108.9, 119.79])
+    _write(tmp_path, "BBB", dates[2:], [50.0, 55.0, 44.0])
+    return data.load_price_files(str(tmp_path))["close"]
+
+
+def test_load_keeps_leading_nan(staggered):
+    assert list(staggered.columns) == ["AAA", "BBB"]
+    assert staggered["BBB"].isna().tolist() == [True, True, False, False, False]
+
+
+def test_signals_with_late_listing(staggered):
+    ind = backtest.Indicators(staggered.to_numpy())
+    pos = backtest.signal_ma_cross(ind, 1, 2)
+    np.testing.assert_array_equal(pos[1:, 0], [1, -1, 1, 1])
+    assert np.isnan(pos[:3, 1]).all()
+    np.testing.assert_array_equal(pos[3:, 1], [1, -1])
+
+
+def test_returns_costs_and_stats(staggered):
+    out = backtest.run(staggered.to_numpy(), "ma_cross", {"fast": 1, "slow": 2}, cost_bps=COST_BPS)
+    gross = np.array([0.0, 0.0, -0.10, -0.10, -0.05])
+    turnover = np.array([0.0, 0.0, 1.0, 2.0, 2.0])
+    expected = gross - turnover * COST_BPS / 1e4
+    np.testing.assert_allclose(out["daily"], expected, atol=1e-6)
+
+    equity = np.cumprod(1 + expected)
+    st = out["stats"]
+    assert all(np.isfinite(v) for v in st.values())
+    assert st["cagr"] == pytest.approx(equity[-1] ** (252 / 5) - 1, rel=1e-4)
+    assert st["max_drawdown"] == pytest.approx(equity[-1] - 1, rel=1e-5)
+    assert st["vol"] == pytest.approx(expected.std() * np.sqrt(252), rel=1e-4)
+    assert st["turnover"] == pytest.approx(turnover.mean() * 252, rel=1e-6)
+    assert st["hit_rate"] == 0.0
+
+
+def test_cost_is_turnover_times_bps(staggered):
+    close = staggered.to_numpy()
+    free = backtest.run(close, "ma_cross", {"fast": 1, "slow": 2}, cost_bps=0.0)["daily"]
+    paid = backtest.run(close, "ma_cross", {"fast": 1, "slow": 2}, cost_bps=COST_BPS)["daily"]
+    np.testing.assert_allclose(free - paid, [0, 0, 1e-3, 2e-3, 2e-3], atol=1e-7)
+
+
+def test_sweep_in_process_matches_run_without_global_state(tmp_path):
+    panel = data.synthetic_panel(n_tickers=6, n_days=300, seed=1)
+    data.write_price_files(panel, str(tmp_path))
+    close = data.load_price_files(str(tmp_path))["close"].to_numpy()
+    grid = {"fast": [5, 10], "slow": [20, 40]}
+
+    backtest._worker.clear()
+    table = backtest.sweep(close, "ma_cross", grid, cost_bps=COST_BPS, workers=1)
+    assert backtest._worker == {}
+    assert len(table) == 4
+    for row in table.itertuples():
+        single = backtest.run(close, "ma_cross", {"fast": row.fast, "slow": row.slow}, cost_bps=COST_BPS)
+        assert row.sharpe == pytest.approx(single["stats"]["sharpe"], rel=1e-6)
@@ -0,0 +1,114 @@
+# tests/test_quant_optimize.py
+# -------------------------------------------------------------
+# Solvers de carteira contra formas fechadas (2 ativos) e contra o SLSQP
+# do SciPy numa covariância fixa; warm start por sessão e guarda de
+# histórico curto na estimação.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import minimize
+
+from core.quant import optimize
+
+
+def _est(seed: int = 0, n: int = 6) -> dict:
+    rng = np.random.default_rng(seed)
+    a = rng.standard_normal((n, n))
+    return {"tickers": [f"T{i}" for i in range(n)], "mu": rng.normal(0.08, 0.05, n),
+            "cov": a @ a.T / n * 0.04 + np.eye(n) * 0.01}
+
+
+def _slsqp(Q, c, cap):
+    n = len(c)
+    res = minimize(lambda w: 0.5 * w @ Q @ w - c @ w, np.full(n, 1 / n), jac=lambda w: Q @ w - c,
+                   bounds=[(0, cap)] * n, constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1}],
+                   method="SLSQP", options={"ftol": 1e-14, "maxiter": 500})
+    return res.x
+
+
+# ---------- Projeção ----------
+@pytest.mark.parametrize("v, cap, expected", [
+    ([0.5, 0.5, 0.0], 1.0, [0.5, 0.5, 0.0]),
+    ([2.0, 0.0, 0.0], 0.5, [0.5, 0.25, 0.25]),
+    ([1.0, 1.0, 1.0, 1.0], 1.0, [0.25] * 4),
+    ([0.9, -3.0, 0.3], 1.0, [0.8, 0.0, 0.2]),
+])
+def test_project_capped_simplex(v, cap, expected):
+    np.testing.assert_allclose(optimize.project_capped_simplex(np.array(v), cap)[0], expected, atol=1e-9)
+
+
+def test_project_rejects_infeasible_cap():
+    with pytest.raises(ValueError):
+        optimize.project_capped_simplex(np.ones(4), cap=0.2)
+
+
+# ---------- Conjunto ativo ----------
+def test_min_variance_two_assets_closed_form():
+    s1, s2, rho = 0.2, 0.3, 0.25
+    c = rho * s1 * s2
+    est = {"tickers": ["A", "B"], "mu": np.zeros(2), "cov": np.array([[s1 ** 2, c], [c, s2 ** 2]])}
+    w1 = (s2 ** 2 - c) / (s1 ** 2 + s2 ** 2 - 2 * c)
+    w, _ = optimize.min_variance(est)
+    np.testing.assert_allclose(w[0], [w1, 1 - w1], atol=1e-10)
+
+
+@pytest.mark.parametrize("lam, cap", [(1.0, 1.0), (5.0, 0.3), (50.0, 0.25), (0.2, 0.5)])
+def test_active_set_matches_slsqp(lam, cap):
+    est = _est()
+    w, _ = optimize.mean_variance(est, lam, cap)
+    ref = _slsqp(lam * est["cov"], est["mu"], cap)
+    obj = lambda x: 0.5 * x @ (lam * est["cov"]) @ x - est["mu"] @ x  # noqa: E731
+    assert w[0].sum() == pytest.approx(1.0) and w.min() >= 0 and w.max() <= cap + 1e-12
+    assert obj(w[0]) <= obj(ref) + 1e-10
+    np.testing.assert_allclose(w[0], ref, atol=1e-5)
+
+
+def test_warm_start_reaches_the_same_point_in_fewer_iterations():
+    est = _est(1, n=12)
+    cold, it_cold = optimize._active_set_qp(5.0 * est["cov"], est["mu"], 0.2)
+    warm, it_warm = optimize._active_set_qp(5.5 * est["cov"], est["mu"], 0.2, w0=cold)
+    ref, _ = optimize._active_set_qp(5.5 * est["cov"], est["mu"], 0.2)
+    np.testing.assert_allclose(warm, ref, atol=1e-10)
+    assert it_warm <= it_cold
+
+
+# ---------- Paridade de risco ----------
+def test_risk_parity_two_assets_is_inverse_vol():
+    s = np.array([0.1, 0.4])
+    cov = np.diag(s ** 2) + 0.3 * np.outer(s, s) * (1 - np.eye(2))
+    w, _ = optimize.risk_parity({"tickers": ["A", "B"], "mu": np.zeros(2), "cov": cov})
+    np.testing.assert_allclose(w[0], (1 / s) / (1 / s).sum(), atol=1e-10)
+
+
+def test_risk_parity_equal_contributions_and_budget():
+    est = _est(2)
+    w, _ = optimize.risk_parity(est)
+    np.testing.assert_allclose(optimize.risk_contributions(est, w), 1 / 6, atol=1e-8)
+    budget = np.arange(1, 7, dtype=float)
+    w, _ = optimize.risk_parity(est, budget=budget)
+    np.testing.assert_allclose(optimize.risk_contributions(est, w), budget / budget.sum(), atol=1e-8)
+
+
+# ---------- Interface da página ----------
+def test_warm_state_is_per_caller_and_bounded():
+    est = _est()
+    assert optimize.solve(est, "min_variance", cap=0.5)["warm"] is False   # sem dicionário: nada guardado
+    mine, other = {}, {}
+    assert optimize.solve(est, "min_variance", cap=0.5, warm=mine)["warm"] is False
+    assert optimize.solve(est, "min_variance", cap=0.5, warm=mine)["warm"] is True
+    assert optimize.solve(est, "min_variance", cap=0.5, warm=other)["warm"] is False
+    for i in range(optimize.WARM_MAX + 3):
+        optimize.solve(dict(est, tickers=[f"U{i}_{j}" for j in range(6)]), "min_variance", warm=mine)
+    assert len(mine) == optimize.WARM_MAX
+
+
+def test_estimate_with_short_history_returns_a_message():
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    rng = np.random.default_rng(0)
+    rets = pd.DataFrame(rng.normal(0, 0.01, (60, 3)), index=dates, columns=["A", "B", "NOVO"])
+    rets.iloc[:55, 2] = np.nan
+    est = optimize.estimate(rets, ("A", "B", "NOVO"), 60, "teste-curto")
+    assert est["n_obs"] == 5 and "NOVO" in est["error"]
+    ok = optimize.estimate(rets, ("A", "B"), 60, "teste-ok")
+    assert ok["error"] is None and ok["cov"].shape == (2, 2)
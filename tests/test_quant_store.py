@@ -0,0 +1,104 @@
+# tests/test_quant_store.py
+# -------------------------------------------------------------
+# Base de preços mapeada em memória: append-only, tickers novos,
+# crescimento de capacidade (troca de geração) e leitura só-leitura.
+# -------------------------------------------------------------
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.quant import data, store
+
+
+def _panel(start: str, days: int, tickers: list, base: float = 10.0) -> dict:
+    dates = pd.bdate_range(start, periods=days)
+    close = pd.DataFrame(base + np.arange(days * len(tickers), dtype="float32").reshape(days, len(tickers)),
+                         index=dates, columns=tickers)
+    return {"close": close, "volume": close * 100}
+
+
+@pytest.fixture
+def db(tmp_path):
+    root = str(tmp_path / "store")
+    s = store.PriceStore.create(["AAA", "BBB"], root, fields=["close", "volume"], row_capacity=4, ticker_capacity=2)
+    s.append(_panel("2024-01-01", 3, ["AAA", "BBB"]))
+    return s
+
+
+def test_append_only(db):
+    with pytest.raises(ValueError, match="append-only"):
+        db.append(_panel("2024-01-02", 2, ["AAA", "BBB"]))
+    with pytest.raises(ValueError, match="crescentes"):
+        db.append({"close": _panel("2024-02-01", 3, ["AAA"])["close"].iloc[::-1]})
+    assert db.n_rows == 3
+
+
+def test_read_only_rejects_writes_and_sees_appends(db):
+    reader = store.PriceStore(db.root)
+    with pytest.raises(PermissionError):
+        reader.append(_panel("2024-02-01", 1, ["AAA"]))
+    db.append(_panel("2024-01-04", 1, ["AAA", "BBB"], base=99.0))
+    assert reader.n_rows == 3          # só enxerga depois do refresh
+    reader.refresh()
+    assert reader.n_rows == 4
+    np.testing.assert_array_equal(reader.get("close")[-1], [99.0, 100.0])
+
+
+def test_new_ticker_and_capacity_growth(db):
+    before = db.get("close").copy()
+    added = db.append(_panel("2024-01-04", 3, ["BBB", "CCC", "AAA"], base=50.0))
+    assert added == 3
+    assert db.tickers == ["AAA", "BBB", "CCC"]
+    assert db.meta["row_capacity"] == 8 and db.meta["ticker_capacity"] == 4
+    close = db.frame("close")
+    np.testing.assert_array_equal(close.to_numpy()[:3, :2], before)
+    assert close["CCC"].iloc[:3].isna().all()
+    assert close.loc["2024-01-04", ["BBB", "CCC", "AAA"]].tolist() == [50.0, 51.0, 52.0]
+
+    # Nova geração confirmada pelo meta; a anterior foi apagada
+    files = sorted(f for f in os.listdir(db.root) if f.endswith(".bin"))
+    assert files == ["close.2.bin", "dates.2.bin", "volume.2.bin"]
+    reopened = store.PriceStore(db.root)
+    np.testing.assert_array_equal(reopened.get("close"), db.get("close"))
+    assert list(reopened.dates) == list(db.dates)
+
+
+def test_interrupted_growth_keeps_the_old_layout(db, monkeypatch):
+    def crash(*args, **kwargs):
+        raise OSError("queda antes do meta.json")
+
+    monkeypatch.setattr(store.PriceStore, "_write_meta", staticmethod(crash))
+    with pytest.raises(OSError):
+        db.append(_panel("2024-01-04", 5, ["AAA", "BBB"]))
+    monkeypatch.undo()
+
+    with open(os.path.join(db.root, "meta.json"), encoding="utf-8") as f:
+        assert json.load(f)["generation"] == 1
+    reader = store.PriceStore(db.root)
+    assert reader.n_rows == 3
+    np.testing.assert_array_equal(reader.get("close"), _panel("2024-01-01", 3, ["AAA", "BBB"])["close"].to_numpy())
+
+
+def test_legacy_store_without_generation(db):
+    # Bases antigas: arquivos sem sufixo e meta sem "generation"
+    for name in ("close", "volume", "dates"):
+        os.replace(os.path.join(db.root, f"{name}.1.bin"), os.path.join(db.root, f"{name}.bin"))
+    meta = dict(db.meta)
+    meta.pop("generation")
+    store.PriceStore._write_meta(db.root, meta)
+    legacy = store.PriceStore(db.root, mode="r+")
+    legacy.append(_panel("2024-01-04", 4, ["AAA", "BBB"]))
+    assert legacy.meta["generation"] == 1 and legacy.n_rows == 7
+    assert not os.path.exists(os.path.join(db.root, "close.bin"))
+
+
+def test_sync_from_files(tmp_path):
+    panel = data.synthetic_panel(n_tickers=3, n_days=10, seed=0)
+    data.write_price_files(panel, str(tmp_path / "prices"))
+    root = str(tmp_path / "store")
+    assert store.sync_from_files(str(tmp_path / "prices"), root) == 10
+    assert store.sync_from_files(str(tmp_path / "prices"), root) == 0
+    np.testing.assert_allclose(store.PriceStore(root).get("close"), panel["close"].to_numpy(), rtol=1e-5)
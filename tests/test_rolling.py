@@ -0,0 +1,91 @@
+# tests/test_rolling.py
+# -------------------------------------------------------------
+# Estatísticas móveis (core/rolling.py) contra o ``pandas.rolling``:
+# API em lote e incremental (``RollingWindow``), com buracos de NaN e
+# ``min_periods``.
+# -------------------------------------------------------------
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import rolling
+
+WINDOW = 10
+
+
+@pytest.fixture(scope="module")
+def panel():
+    rng = np.random.default_rng(7)
+    x = 100 + np.cumsum(rng.standard_normal((120, 4)), axis=0)   # nível alto: testa o cancelamento
+    x[5:9, 0] = np.nan          # buraco curto
+    x[30:55, 1] = np.nan        # buraco maior que a janela
+    x[::7, 2] = np.nan          # ausências espalhadas
+    bench = x[:, 3] * 0.5 + rng.standard_normal(120)
+    bench[60:64] = np.nan
+    return x, bench
+
+
+@pytest.mark.parametrize("min_periods", [None, 3, 7])
+def test_batch_mean_var_std_zscore(panel, min_periods):
+    x, _ = panel
+    roll = pd.DataFrame(x).rolling(WINDOW, min_periods=min_periods)
+    np.testing.assert_allclose(rolling.rolling_mean(x, WINDOW, min_periods), roll.mean(), rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(rolling.rolling_var(x, WINDOW, min_periods=min_periods), roll.var(), rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(rolling.rolling_std(x, WINDOW, ddof=0, min_periods=min_periods), roll.std(ddof=0),
+                               rtol=1e-8, atol=1e-10)
+    z = (pd.DataFrame(x) - roll.mean()) / roll.std()
+    np.testing.assert_allclose(rolling.rolling_zscore(x, WINDOW, min_periods=min_periods), z, rtol=1e-7, atol=1e-9)
+
+
+@pytest.mark.parametrize("min_periods", [None, 4])
+def test_batch_cov_corr_beta(panel, min_periods):
+    x, bench = panel
+    df, b = pd.DataFrame(x), pd.Series(bench)
+    roll = df.rolling(WINDOW, min_periods=min_periods)
+    np.testing.assert_allclose(rolling.rolling_cov(x, bench, WINDOW, min_periods=min_periods),
+                               roll.cov(b), rtol=1e-8, atol=1e-10)
+    np.testing.assert_allclose(rolling.rolling_corr(x, bench, WINDOW, min_periods=min_periods),
+                               roll.corr(b), rtol=1e-7, atol=1e-9)
+    # beta = cov(y, x) / var(x), com var(x) só nas datas em que y também existe
+    expected = pd.DataFrame({c: df[c].rolling(WINDOW, min_periods=min_periods).cov(b)
+                                / b.where(df[c].notna()).rolling(WINDOW, min_periods=min_periods).var()
+                             for c in df.columns})
+    np.testing.assert_allclose(rolling.rolling_beta(x, bench, WINDOW, min_periods=min_periods), expected,
+                               rtol=1e-7, atol=1e-9)
+
+
+def test_batch_keeps_shape_and_float32(panel):
+    x, _ = panel
+    assert rolling.rolling_mean(x[:, 0], WINDOW).shape == (len(x),)
+    assert rolling.rolling_zscore(x.astype("float32"), WINDOW).dtype == np.float32
+
+
+def test_streaming_matches_pandas(panel):
+    x, bench = panel
+    df, b = pd.DataFrame(x), pd.Series(bench)
+    # RollingWindow usa o que houver de válido na janela (min_periods = 1; 2 para var/corr)
+    mean = df.rolling(WINDOW, min_periods=1).mean().to_numpy()
+    var = df.rolling(WINDOW, min_periods=2).var().to_numpy()
+    corr = np.column_stack([df[c].rolling(WINDOW, min_periods=2).corr(b) for c in df.columns])
+    beta = np.column_stack([df[c].rolling(WINDOW, min_periods=2).cov(b)
+                            / b.where(df[c].notna()).rolling(WINDOW, min_periods=2).var() for c in df.columns])
+    rw = rolling.RollingWindow(WINDOW, n_series=x.shape[1])
+    for t in range(len(x)):
+        rw.push(x[t], bench[t])
+        np.testing.assert_allclose(rw.mean, mean[t], rtol=1e-9, atol=1e-9, err_msg=f"mean t={t}")
+        np.testing.assert_allclose(rw.var(), var[t], rtol=1e-7, atol=1e-8, err_msg=f"var t={t}")
+        np.testing.assert_allclose(rw.corr(), corr[t], rtol=1e-6, atol=1e-8, err_msg=f"corr t={t}")
+        np.testing.assert_allclose(rw.beta(), beta[t], rtol=1e-6, atol=1e-8, err_msg=f"beta t={t}")
+
+
+def test_streaming_extend_equals_batch_tail(panel):
+    x, _ = panel
+    rw = rolling.RollingWindow(WINDOW, n_series=x.shape[1])
+    rw.extend(x)
+    np.testing.assert_allclose(rw.mean, rolling.rolling_mean(x, WINDOW, min_periods=1)[-1], rtol=1e-9)
+    np.testing.assert_allclose(rw.zscore(), rolling.rolling_zscore(x, WINDOW, min_periods=2)[-1], rtol=1e-7)
+
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError):
+        rolling.RollingWindow(0)
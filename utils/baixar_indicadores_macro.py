@@ -0,0 +1,134 @@
+# =========================================================
+# Objetivo: baixar indicadores macro do Brasil (World Bank API)
+# e salvar em CSVs: um por indicador + um merged para modelagem.
+#
+# Cada execução vira uma versão em core/macro/snapshots.py (cópias por
+# conteúdo + diff linha a linha); os CSVs só são regravados quando algum
+# indicador mudou, junto com o manifesto da mudança (manifest_macro_br.json).
+# Antes disso, as linhas novas passam pelas checagens de core/macro/quality.py
+# (esquema, faixa, anos faltando, saltos) e o relatório vai para
+# quality_macro_br.json.
+#
+# Os downloads rodam juntos no runner assíncrono de core/macro/ingest.py
+# (limite de conexões e de requisições por host, JSON lido em streaming).
+#
+# Uso (na raiz do projeto): python -m utils.baixar_indicadores_macro
+# =========================================================
+
+import os
+import json
+import pandas as pd
+from datetime import datetime
+
+from core.macro import ingest, quality, snapshots
+
+# ======= CONFIG =======
+# AVISO: Se sua estrutura de projeto for diferente, estou saindo da estrutura.
+OUTPUT_DIR = os.path.join("assets", "macro_br")        # pasta onde os CSVs serão salvos
+COUNTRY = "BR"                      # Brasil
+YEARS_BACK = 25                     # janela para download (ajuste se quiser)
+SNAPSHOT_DIR = snapshots.SNAPSHOT_DIR   # versões por indicador (fora do git)
+# ======================
+
+# Indicadores (World Bank codes)
+INDICADORES = {
+    "Inflação (CPI, % a.a.)": "FP.CPI.TOTL.ZG",
+    "PIB real — crescimento (% a.a.)": "NY.GDP.MKTP.KD.ZG",
+    "Desemprego (% força de trabalho)": "SL.UEM.TOTL.ZS",
+    "Conta Corrente (% do PIB)": "BN.CAB.XOKA.GD.ZS",
+    "Juros reais (% a.a.)": "FR.INR.RINR",
+}
+
+# Quais indicadores baixar (por nome da chave acima)
+SELECIONADOS = [
+    "Inflação (CPI, % a.a.)",
+    "PIB real — crescimento (% a.a.)",
+    "Desemprego (% força de trabalho)",
+    "Conta Corrente (% do PIB)",
+    "Juros reais (% a.a.)",
+]
+
+def fetch_wb_series(country_code: str, indicator_code: str, start_year: int, end_year: int) -> pd.DataFrame:
+    """
+    Busca UM indicador da API do Banco Mundial (atalho síncrono para o runner
+    de core/macro/ingest.py, com paginação). Retorna DataFrame com colunas
+    ['year', 'value', 'country']; anos/valores fora do padrão ficam como NaN
+    ou com o valor cru, para a validação de core/macro/quality.py apontar.
+    """
+    fonte = ingest.WorldBankSource(country_code, {indicator_code: indicator_code}, start_year, end_year)
+    resultado = ingest.run([fonte])["results"][0]
+    if resultado["error"]:
+        raise RuntimeError(resultado["error"])
+    return resultado["data"]
+
+def baixar_todos(start_year: int, end_year: int) -> dict:
+    """Baixa os SELECIONADOS em paralelo; devolve nome -> DataFrame cru ou a mensagem de erro."""
+    fonte = ingest.WorldBankSource(COUNTRY, {nome: INDICADORES[nome] for nome in SELECIONADOS}, start_year, end_year)
+    saida = ingest.run([fonte])
+    return {r["key"]: r["data"] if r["error"] is None else r["error"] for r in saida["results"]}
+
+def nome_arquivo(nome: str) -> str:
+    # nome_simplificado.csv
+    return nome.lower().replace(" ", "_").replace("%", "pct").replace("—", "-").replace("–", "-") + ".csv"
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    ano_atual = datetime.now().year
+    start_year = ano_atual - YEARS_BACK
+
+    print(f"[INFO] Baixando dados {COUNTRY} de {start_year} a {ano_atual}...")
+    store = snapshots.SnapshotStore(SNAPSHOT_DIR)
+    atual = store.manifest()["indicators"]
+    dfs_por_nome = {}
+    secoes = []
+
+    for nome, df in baixar_todos(start_year, ano_atual).items():
+        code = INDICADORES[nome]
+        if isinstance(df, str):
+            print(f"[ERRO] Falha ao baixar {nome} ({code}): {df}")
+            continue
+        if df.empty:
+            print(f"[AVISO] Sem dados para {nome} ({code}).")
+            continue
+
+        # Valida só as linhas novas/alteradas em relação à versão atual
+        anterior = store.read_series(atual[nome]["hash"]) if nome in atual else None
+        serie, secao = quality.validate(nome, df, anterior, last_year=ano_atual)
+        secoes.append(secao)
+        print(f"[OK] {nome} ({code}) baixado (linhas={len(df)}, novas={secao['new']}, "
+              f"descartadas={secao['dropped']}, problemas={quality.summarize(secao)})")
+        if not serie.empty:
+            dfs_por_nome[nome] = serie.to_frame()
+
+    if not dfs_por_nome:
+        print("[ERRO] Nenhum indicador disponível para gerar merged.")
+        return
+
+    # Nova versão só se algum indicador mudou (os que falharam mantêm a versão anterior)
+    antes = store.head
+    merged = pd.concat(dfs_por_nome.values(), axis=1).sort_index()
+    man = store.commit(merged, source="api.worldbank.org", codes=INDICADORES)
+    quality_out = os.path.join(OUTPUT_DIR, "quality_macro_br.json")
+    quality.write_report(secoes, quality_out, version=man["version"], dataset=man.get("dataset"))
+    print(f"[OK] Relatório de qualidade salvo em: {quality_out}")
+    if man["version"] == antes and os.path.exists(os.path.join(OUTPUT_DIR, "merged_macro_br.csv")):
+        print(f"[OK] Nenhum indicador mudou (versão {antes}); CSVs mantidos.")
+        return
+
+    # CSV por indicador: só os que mudaram
+    for nome in man["changes"]:
+        out_path = os.path.join(OUTPUT_DIR, nome_arquivo(nome))
+        store.read_series(man["indicators"][nome]["hash"]).rename("value").to_csv(out_path, index_label="year")
+        print(f"[OK] {nome} -> {out_path}")
+
+    # Merged (versão completa) + manifesto da mudança
+    merged = store.load()
+    merged_out = os.path.join(OUTPUT_DIR, "merged_macro_br.csv")
+    merged.to_csv(merged_out, index=False)
+    print(f"[OK] Merged salvo em: {merged_out} (linhas={len(merged)})")
+    with open(os.path.join(OUTPUT_DIR, "manifest_macro_br.json"), "w", encoding="utf-8") as f:
+        json.dump(man, f, ensure_ascii=False, indent=2)
+    print(f"[OK] Versão {man['version']} ({man['dataset']}):\n{snapshots.summarize(man)}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
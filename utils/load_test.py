@@ -0,0 +1,233 @@
+# utils/load_test.py
+# -------------------------------------------------------------
+# Teste de carga local do app: N visitantes simultâneos navegando pelas
+# páginas do menu lateral, cada um com a própria sessão (AppTest).
+#
+# Todos os visitantes rodam como threads de UM processo — o mesmo modelo
+# do servidor do Streamlit (uma thread de script por sessão, GIL
+# compartilhado). O option_menu é um componente customizado que o AppTest
+# não consegue clicar, então o harness o troca por uma função que devolve a
+# página pedida pelo visitante (via session_state); o resto do app.py roda
+# exatamente como em produção.
+#
+# Duas fases:
+#   1) perfil isolado: cada página roda sozinha (1 visitante) e medimos
+#      latência, tempo de CPU do processo e crescimento do RSS;
+#   2) carga: N visitantes em paralelo por ``--duration`` segundos;
+#      relatório com p50/p95/p99 por página, vazão, uso de CPU e RSS pico.
+#
+# Uso (na raiz do repositório):
+#   python utils/load_test.py --visitors 8 --duration 60
+#   python utils/load_test.py --pages "Home,Macro Economia" --visitors 4 --json carga.json
+# -------------------------------------------------------------
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import streamlit_option_menu  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+# ======= CONFIG =======
+APP_FILE = os.path.join(ROOT, "app.py")
+PAGES = ["Home", "Currículo", "Dados & F1", "Governança de Dados", "Macro Economia", "Valuation", "Análise Quant"]
+PAGE_KEY = "__load_test_page__"
+TIMEOUT_S = 300
+# ======================
+
+
+# ---------- Navegação simulada ----------
+def _fake_option_menu(menu_title, options, default_index=0, **kwargs):
+    import streamlit as st
+
+    return st.session_state.get(PAGE_KEY, options[default_index])
+
+
+def install_menu_stub() -> None:
+    """Faz o ``option_menu`` devolver a página escolhida pelo visitante."""
+    streamlit_option_menu.option_menu = _fake_option_menu
+
+
+# ---------- Métricas do processo ----------
+def rss_mb() -> float:
+    """RSS atual (Linux: /proc; nos demais, o pico informado pelo resource)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system
+
+
+# ---------- Visitante ----------
+class Visitor:
+    """Uma sessão do app; ``visit(page)`` faz um rerun completo do app.py naquela página."""
+
+    def __init__(self):
+        self.app = AppTest.from_file(APP_FILE, default_timeout=TIMEOUT_S)
+
+    def visit(self, page: str) -> dict:
+        self.app.session_state[PAGE_KEY] = page
+        t0 = time.perf_counter()
+        error = None
+        try:
+            self.app.run()
+            if self.app.exception:
+                error = self.app.exception[0].value
+        except Exception as e:  # timeout ou erro fora do script
+            error = f"{type(e).__name__}: {e}"
+        return {"page": page, "latency_ms": (time.perf_counter() - t0) * 1e3, "error": error}
+
+
+# ---------- Fases ----------
+def solo_profile(pages: list, repeats: int = 2) -> pd.DataFrame:
+    """Cada página isolada: 1ª visita (fria) e a média das seguintes, com CPU e RSS."""
+    rows = []
+    for page in pages:
+        visitor = Visitor()
+        cpu0, rss0 = cpu_seconds(), rss_mb()
+        cold = visitor.visit(page)
+        cold_cpu = cpu_seconds() - cpu0
+        warm, cpu1 = [], cpu_seconds()
+        for _ in range(repeats):
+            warm.append(visitor.visit(page)["latency_ms"])
+        rows.append({
+            "page": page,
+            "cold_ms": cold["latency_ms"],
+            "warm_ms": float(np.mean(warm)) if warm else np.nan,
+            "cold_cpu_s": cold_cpu,
+            "warm_cpu_s": (cpu_seconds() - cpu1) / max(repeats, 1),
+            "rss_growth_mb": rss_mb() - rss0,
+            "error": cold["error"],
+        })
+        print(f"[INFO] {page}: fria {rows[-1]['cold_ms']:.0f} ms, quente {rows[-1]['warm_ms']:.0f} ms")
+    return pd.DataFrame(rows)
+
+
+def load_phase(pages: list, visitors: int, duration: float, think: float, seed: int = 0) -> tuple:
+    """N visitantes em paralelo até ``duration`` segundos; devolve (amostras, resumo do processo)."""
+    samples, lock = [], threading.Lock()
+    stop_at = time.perf_counter() + duration
+    peak = {"rss": rss_mb()}
+
+    def worker(i: int):
+        rng = random.Random(seed + i)
+        visitor = Visitor()
+        while time.perf_counter() < stop_at:
+            result = visitor.visit(rng.choice(pages))
+            result["visitor"] = i
+            with lock:
+                samples.append(result)
+                peak["rss"] = max(peak["rss"], rss_mb())
+            if think > 0:
+                time.sleep(rng.expovariate(1.0 / think))
+
+    cpu0, t0 = cpu_seconds(), time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(visitors)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    cpu = cpu_seconds() - cpu0
+    summary = {
+        "visitors": visitors,
+        "wall_s": wall,
+        "reruns": len(samples),
+        "reruns_per_s": len(samples) / wall if wall else np.nan,
+        "cpu_s": cpu,
+        # Fração de UM núcleo usada pelo processo (o GIL limita o script Python a ~1)
+        "cpu_util": cpu / wall if wall else np.nan,
+        "cores": os.cpu_count(),
+        "peak_rss_mb": max(peak["rss"], rss_mb()),
+    }
+    return pd.DataFrame(samples), summary
+
+
+def latency_table(samples: pd.DataFrame) -> pd.DataFrame:
+    """p50/p95/p99 por página (e no total), em ms."""
+    if samples.empty:
+        return pd.DataFrame()
+
+    def stats(group: pd.DataFrame) -> pd.Series:
+        lat = group["latency_ms"].to_numpy()
+        return pd.Series({
+            "n": len(lat),
+            "p50_ms": np.percentile(lat, 50),
+            "p95_ms": np.percentile(lat, 95),
+            "p99_ms": np.percentile(lat, 99),
+            "max_ms": lat.max(),
+            "errors": int(group["error"].notna().sum()),
+        })
+
+    table = samples.groupby("page").apply(stats, include_groups=False)
+    table.loc["(total)"] = stats(samples)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do app (visitantes simultâneos via AppTest).")
+    parser.add_argument("--visitors", type=int, default=4, help="sessões simultâneas")
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos de carga")
+    parser.add_argument("--think", type=float, default=0.5, help="pausa média entre cliques (s)")
+    parser.add_argument("--pages", default=",".join(PAGES), help="páginas separadas por vírgula")
+    parser.add_argument("--skip-solo", action="store_true", help="pula o perfil isolado por página")
+    parser.add_argument("--json", default=None, help="grava o relatório completo em JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # o app lê assets/ e data/ com caminhos relativos
+    pages = [p.strip() for p in args.pages.split(",") if p.strip()]
+    unknown = [p for p in pages if p not in PAGES]
+    if unknown:
+        parser.error(f"Páginas desconhecidas: {unknown}. Opções: {PAGES}")
+    install_menu_stub()
+
+    report = {}
+    if not args.skip_solo:
+        print("[INFO] Perfil isolado por página...")
+        solo = solo_profile(pages)
+        print(solo.round(2).to_string(index=False))
+        report["solo"] = solo.to_dict(orient="records")
+
+    print(f"[INFO] Carga: {args.visitors} visitantes por {args.duration:.0f} s...")
+    samples, summary = load_phase(pages, args.visitors, args.duration, args.think, args.seed)
+    table = latency_table(samples)
+    print(table.round(1).to_string())
+    print(
+        f"[OK] {summary['reruns']} reruns em {summary['wall_s']:.1f} s ({summary['reruns_per_s']:.2f}/s) · "
+        f"CPU {summary['cpu_util']:.0%} de um núcleo ({summary['cores']} disponíveis) · RSS pico {summary['peak_rss_mb']:.0f} MB"
+    )
+    report["load"] = {"summary": summary, "latency": table.reset_index().to_dict(orient="records")}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=float)
+        print(f"[OK] Relatório salvo em {args.json}")
+
+
+if __name__ == "__main__":
+    main()